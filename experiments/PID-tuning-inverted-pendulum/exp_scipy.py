@@ -0,0 +1,332 @@
+import os
+import time
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import LogNorm
+from scipy.constants import g as gravity
+from scipy.optimize import differential_evolution
+
+# --- Model Constants ---
+m_c: Final = 1.0  # Mass of the cart [kg]
+m_p: Final = 0.2  # Mass of the pendulum rod [kg]
+L: Final = 0.5  # Distance from pivot to rod center of mass [m]
+J: Final = (1 / 12) * m_p * (2 * L) ** 2  # Moment of inertia of the rod [kg·m²]
+b: Final = 10.0  # Viscous damping coefficient of the cart [N·s/m]
+g: Final = gravity  # Gravitational acceleration [m/s²]
+
+# --- Tuning Problem ---
+theta0: Final = np.deg2rad(30.0)  # Initial angle [rad]
+t_end: Final = 3.0  # Simulated time [s]
+dt: Final = 2e-3  # RK4 step [s]
+settling_band: Final = 0.02  # Settling band, fraction of the initial angle
+theta_reject: Final = 2 * theta0  # Angle at which a loop is stopped as unstable [rad]
+F_limit: Final = 100.0  # Largest acceptable peak force [N]
+overshoot_limit: Final = 0.05  # Largest acceptable overshoot, fraction of theta0
+
+# Gains of the original PID experiment
+Kp_ref, Ki_ref, Kd_ref = -500.0, -300.0, -20.0
+
+
+def closed_loop(y: np.ndarray, gains: np.ndarray):
+    """
+    Inverted pendulums under PID control, for a batch of gain sets.
+
+    Parameters:
+    - y: states [theta, omega, x, v, integral of error], shape (N, 5)
+    - gains: [Kp, Ki, Kd] of each loop, shape (N, 3)
+    Returns:
+    - dydt: state derivatives, shape (N, 5)
+    - F: force applied to each cart [N], shape (N,)
+    """
+    theta, omega, v, Ie = y[:, 0], y[:, 1], y[:, 3], y[:, 4]
+
+    e = -theta  # Error (setpoint 0)
+    de = -omega  # Derivative of the error
+    F = gains[:, 0] * e + gains[:, 1] * Ie + gains[:, 2] * de
+
+    # 2x2 mass matrix of [domega/dt, dv/dt], solved in closed form
+    m11 = m_p * L**2 + J
+    m12 = m_p * L * np.cos(theta)
+    m22 = m_c + m_p
+    rhs1 = m_p * g * L * np.sin(theta)
+    rhs2 = F - b * v + m_p * L * omega**2 * np.sin(theta)
+    det = m11 * m22 - m12**2
+
+    dydt = np.empty_like(y)
+    dydt[:, 0] = omega
+    dydt[:, 1] = (m22 * rhs1 - m12 * rhs2) / det
+    dydt[:, 2] = v
+    dydt[:, 3] = (m11 * rhs2 - m12 * rhs1) / det
+    dydt[:, 4] = e
+    return dydt, F
+
+
+def tuning_cost(ise: np.ndarray, overshoot: np.ndarray, peak_force: np.ndarray):
+    """
+    ISE penalized by the peak force and overshoot beyond their limits.
+
+    The cost grows with each index, and the indices only grow during a
+    simulation, so the cost of a partial simulation is a lower bound.
+    """
+    penalty = 1 + 10 * (
+        np.maximum(peak_force / F_limit - 1, 0)
+        + np.maximum(overshoot / overshoot_limit - 1, 0)
+    )
+    return ise * penalty
+
+
+def evaluate(
+    gains: np.ndarray,
+    early_stop: bool = True,
+    cost_cutoff: float = np.inf,
+    record: bool = False,
+):
+    """
+    Performance indices of a batch of PID gain sets, from one batched RK4 run.
+
+    The indices are accumulated during the integration, so no trajectory is
+    stored. A loop whose angle exceeds theta_reject is marked unstable, and a
+    loop whose tuning cost already exceeds cost_cutoff is marked pruned. With
+    early_stop, these loops are removed from the batch, and the remaining steps
+    only integrate the others.
+
+    Parameters:
+    - gains: [Kp, Ki, Kd] of each candidate, shape (N, 3)
+    - early_stop: stop integrating the unstable and pruned loops
+    - cost_cutoff: tuning cost above which a candidate is of no interest
+    - record: also return the angle and force trajectories
+    Returns:
+    - indices: dict of arrays of shape (N,): ISE [rad²·s], IAE [rad·s],
+      overshoot [fraction of theta0], settling time [s], peak force [N],
+      stable, pruned (the indices of unstable and pruned loops are partial)
+    - work: number of loop-steps integrated
+    """
+    n = len(gains)
+    n_steps = round(t_end / dt)
+    y = np.zeros((n, 5))
+    y[:, 0] = theta0
+
+    ise, iae = np.zeros(n), np.zeros(n)
+    overshoot, peak_force = np.zeros(n), np.zeros(n)
+    last_outside = np.zeros(n)  # Last time outside the settling band [s]
+    stable = np.ones(n, dtype=bool)
+    pruned = np.zeros(n, dtype=bool)
+    active = np.arange(n)  # Loops still integrated
+    work = 0
+    if record:
+        theta_rec = np.full((n_steps + 1, n), np.nan)
+        F_rec = np.full((n_steps + 1, n), np.nan)
+
+    gains_active = gains
+    for step in range(n_steps):
+        t = step * dt
+        k1, F = closed_loop(y, gains_active)
+        k2, _ = closed_loop(y + dt / 2 * k1, gains_active)
+        k3, _ = closed_loop(y + dt / 2 * k2, gains_active)
+        k4, _ = closed_loop(y + dt * k3, gains_active)
+
+        theta = y[:, 0]
+        ise[active] += theta**2 * dt
+        iae[active] += np.abs(theta) * dt
+        overshoot[active] = np.maximum(overshoot[active], -theta / theta0)
+        peak_force[active] = np.maximum(peak_force[active], np.abs(F))
+        outside = np.abs(theta) > settling_band * theta0
+        last_outside[active[outside]] = t
+        if record:
+            theta_rec[step, active] = theta
+            F_rec[step, active] = F
+
+        y = y + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        work += len(active)
+
+        fallen = ~(np.abs(y[:, 0]) < theta_reject)  # Also catches NaN and inf
+        stable[active[fallen]] = False
+        partial_cost = tuning_cost(ise[active], overshoot[active], peak_force[active])
+        pruned[active] |= partial_cost > cost_cutoff
+        stop = fallen | pruned[active]
+        if early_stop and stop.any():
+            active, y = active[~stop], y[~stop]
+            gains_active = gains[active]
+            if len(active) == 0:
+                break
+
+    if record:
+        theta_rec[n_steps, active] = y[:, 0]
+    settling_time = np.where(stable, last_outside + dt, np.inf)
+    indices = {
+        "ISE": np.where(stable, ise, np.inf),
+        "IAE": np.where(stable, iae, np.inf),
+        "overshoot": overshoot,
+        "settling_time": settling_time,
+        "peak_force": peak_force,
+        "stable": stable,
+        "pruned": pruned,
+    }
+    if record:
+        return indices, work, theta_rec, F_rec
+    return indices, work
+
+
+def objective(log_gains: np.ndarray, search: dict) -> np.ndarray:
+    """
+    Penalized ISE of a population, for a vectorized differential evolution.
+
+    A trial replaces its parent only if its cost is lower, so a trial that is
+    already worse than the worst parent can be pruned without changing the
+    search.
+
+    Parameters:
+    - log_gains: log10 of the gain magnitudes |Kp|, |Ki|, |Kd|, shape (3, S)
+    - search: state of the search (cutoff, counters), updated in place
+    """
+    gains = -(10.0**log_gains.T)
+    indices, work = evaluate(gains, cost_cutoff=search["cutoff"])
+    search["candidates"] += len(gains)
+    search["loop_steps"] += work
+    cost = tuning_cost(indices["ISE"], indices["overshoot"], indices["peak_force"])
+    cost = np.where(indices["stable"], cost, 1e3)
+    return np.where(indices["pruned"], np.inf, cost)
+
+
+def tune(prune: bool):
+    """Differential evolution over the three gains, optionally with pruning."""
+    search = {"cutoff": np.inf, "candidates": 0, "loop_steps": 0, "history": []}
+
+    def callback(intermediate_result):
+        search["history"].append(intermediate_result.fun)
+        if prune:
+            search["cutoff"] = np.max(intermediate_result.population_energies)
+
+    start = time.perf_counter()
+    result = differential_evolution(
+        objective,
+        bounds=[(0, 3.5), (0, 3.5), (-1, 2)],
+        args=(search,),
+        popsize=15,
+        maxiter=30,
+        tol=1e-6,
+        seed=0,
+        vectorized=True,
+        updating="deferred",
+        polish=False,
+        callback=callback,
+    )
+    elapsed = time.perf_counter() - start
+    fraction = search["loop_steps"] / (search["candidates"] * round(t_end / dt))
+    print(
+        f"Differential evolution, pruning {prune}: {search['candidates']} candidates in"
+        f" {len(search['history'])} generations, {elapsed:.2f} s,"
+        f" {fraction:.0%} of the loop-steps integrated, best cost {result.fun:.5f}"
+    )
+    return result, search["history"]
+
+
+# --- Population-Based Search over Kp, Ki and Kd ---
+tune(prune=False)
+result, history = tune(prune=True)
+gains_de = -(10.0**result.x)
+
+# --- Grid Search over Kp and Kd, at the Ki found above ---
+n_grid: Final = 100
+Kp_grid, Kd_grid = np.meshgrid(
+    -np.logspace(0, 3.5, n_grid), -np.logspace(-1, 2, n_grid), indexing="ij"
+)
+gains_grid = np.column_stack(
+    [Kp_grid.ravel(), np.full(Kp_grid.size, gains_de[1]), Kd_grid.ravel()]
+)
+
+start = time.perf_counter()
+grid, work = evaluate(gains_grid)
+elapsed = time.perf_counter() - start
+print(
+    f"Grid of {len(gains_grid)} gain sets: {elapsed:.2f} s,"
+    f" {work / (len(gains_grid) * round(t_end / dt)):.0%} of the loop-steps integrated"
+)
+n_serial = 5
+start = time.perf_counter()
+for i in range(n_serial):
+    evaluate(gains_grid[i : i + 1])
+time_serial = (time.perf_counter() - start) / n_serial * len(gains_grid)
+print(f"Same grid one gain set at a time (estimated): {time_serial:.0f} s")
+print(f"Unstable gain sets: {np.count_nonzero(~grid['stable'])} of {len(gains_grid)}")
+
+feasible = (
+    grid["stable"]
+    & (grid["peak_force"] <= F_limit)
+    & (grid["overshoot"] <= overshoot_limit)
+)
+best_grid = np.flatnonzero(feasible)[np.argmin(grid["ISE"][feasible])]
+
+# --- Compare the tunings ---
+candidates = {
+    "Original": np.array([Kp_ref, Ki_ref, Kd_ref]),
+    "Best of grid": gains_grid[best_grid],
+    "Differential evolution": gains_de,
+}
+final, _, theta_rec, F_rec = evaluate(np.array(list(candidates.values())), record=True)
+for i, (name, gains) in enumerate(candidates.items()):
+    print(
+        f"{name}: Kp = {gains[0]:.1f}, Ki = {gains[1]:.1f}, Kd = {gains[2]:.2f};"
+        f" ISE = {final['ISE'][i]:.4f} rad²·s, IAE = {final['IAE'][i]:.3f} rad·s,"
+        f" overshoot = {final['overshoot'][i]:.1%},"
+        f" settling time = {final['settling_time'][i]:.2f} s,"
+        f" peak force = {final['peak_force'][i]:.0f} N"
+    )
+
+# --- Plot results ---
+fig, axs = plt.subplots(2, 2, figsize=(12, 9), constrained_layout=True)
+fig.suptitle("PID Tuning of the Inverted Pendulum")
+
+ise_map = np.where(grid["stable"], grid["ISE"], np.nan).reshape(Kp_grid.shape)
+mesh = axs[0, 0].pcolormesh(-Kp_grid, -Kd_grid, ise_map, norm=LogNorm(), shading="auto")
+fig.colorbar(mesh, ax=axs[0, 0], label="ISE / rad$^2\\cdot$s")
+contour = axs[0, 0].contour(
+    -Kp_grid,
+    -Kd_grid,
+    grid["peak_force"].reshape(Kp_grid.shape),
+    levels=[F_limit],
+    colors="white",
+)
+axs[0, 0].clabel(contour, fmt=f"{F_limit:.0f} N")
+axs[0, 0].set_title(f"ISE, $K_i = {gains_de[1]:.1f}$ (white: unstable)")
+
+settling_map = np.where(grid["stable"], grid["settling_time"], np.nan)
+mesh = axs[0, 1].pcolormesh(
+    -Kp_grid, -Kd_grid, settling_map.reshape(Kp_grid.shape), shading="auto"
+)
+fig.colorbar(mesh, ax=axs[0, 1], label="Settling time / s")
+axs[0, 1].set_title("Settling Time (2%)")
+
+for ax in axs[0]:
+    ax.plot(-Kp_ref, -Kd_ref, "o", mfc="white", mec="black", label="Original")
+    ax.plot(-gains_grid[best_grid, 0], -gains_grid[best_grid, 2], "r*", markersize=12)
+    ax.plot([], [], "r*", label="Best of grid")
+    ax.set_xscale("log")
+    ax.set_yscale("log")
+    ax.set_xlabel("$-K_p$")
+    ax.set_ylabel("$-K_d$")
+    ax.legend(loc="lower left")
+
+t = np.arange(theta_rec.shape[0]) * dt
+for i, name in enumerate(candidates):
+    axs[1, 0].plot(t, np.rad2deg(theta_rec[:, i]), label=name)
+    axs[1, 1].plot(t, F_rec[:, i], label=name)
+axs[1, 0].axhline(0, color="tab:red", linestyle="--", label="Setpoint")
+axs[1, 0].set_ylabel("Angle / deg")
+axs[1, 1].axhline(F_limit, color="black", linestyle=":", label="Force limit")
+axs[1, 1].axhline(-F_limit, color="black", linestyle=":")
+axs[1, 1].set_ylabel("Applied force / N")
+for ax in axs[1]:
+    ax.set_xlim(0, 1.5)
+    ax.set_xlabel("Time / s")
+    ax.grid(True)
+    ax.legend()
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
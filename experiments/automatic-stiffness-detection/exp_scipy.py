@@ -0,0 +1,334 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import zero_Celsius
+from scipy.integrate import BDF, RK45, OdeSolution, solve_ivp
+
+rtol: Final = 1e-6
+atol: Final = 1e-9
+
+max_nfev: Final = 200_000
+"""Number of calls to the model after which a run is stopped"""
+
+rk45_stability: Final = 3.3
+"""Length of the stability interval of RK45 on the negative real axis"""
+
+
+# --- Test Problems ---
+def van_der_pol(mu: float):
+    """Van der Pol oscillator, for a nonlinearity parameter mu"""
+
+    def model(t, y):
+        return [y[1], mu * (1 - y[0] ** 2) * y[1] - y[0]]
+
+    return model, [2.0, 0.0], (0, max(20.0, 2 * mu))
+
+
+def diode_circuit(C: float):
+    """Series RLC circuit with a parallel Shockley diode, for a capacitance C [F]"""
+    R, L, i_S, n, V_T, epsilon = 100.0, 0.1, 1e-12, 1.5, 26e-3, 5.0
+
+    def model(t, y):
+        Id = i_S * (np.exp(y[0] / (n * V_T)) - 1)
+        return [(y[1] - Id) / C, (epsilon - R * y[1] - y[0]) / L]
+
+    return model, [0.0, 0.0], (0, 0.2)
+
+
+def cstr(k0: float):
+    """CSTR with cooling jacket, for a pre-exponential factor k0 [1/s]"""
+    rho, cp, rho_c, cp_c = 1000.0, 239.0, 1000.0, 4180.0
+    E_R, delta_Hr, UA, V_c = 8.75e3, -5.0e7, 915.6 * 2.752, 0.55
+    q1, C_A1, T1 = 0.1, 1.0, zero_Celsius + 50.0
+    q_c, T_c0 = 0.005, zero_Celsius + 20.0
+
+    def model(t, y):
+        V, C_A, T, T_c = y
+        Gamma = k0 * np.exp(-E_R / T) * C_A
+        return [
+            0.0,
+            ((C_A1 - C_A) * q1 - Gamma * V) / V,
+            (rho * q1 * cp * (T1 - T) - delta_Hr * Gamma * V + UA * (T_c - T))
+            / (rho * V * cp),
+            (rho_c * q_c * cp_c * (T_c0 - T_c) - UA * (T_c - T)) / (rho_c * V_c * cp_c),
+        ]
+
+    return model, [1.5, 0.9, zero_Celsius + 25.0, zero_Celsius + 20.0], (0, 1200)
+
+
+# --- Stiffness Probe ---
+def spectral_radius(fun: Callable, t: float, y: np.ndarray, f: np.ndarray) -> float:
+    """
+    Spectral radius of the Jacobian of fun at (t, y), by forward differences.
+
+    Parameters:
+    - fun: right-hand side of the ODE
+    - t, y: time and state
+    - f: fun(t, y), already evaluated
+
+    Returns:
+    - Largest magnitude of the eigenvalues of the Jacobian
+    """
+    J = np.empty((len(y), len(y)))
+    for j in range(len(y)):
+        dy = np.sqrt(np.finfo(float).eps) * max(1.0, abs(y[j]))
+        y_j = y.copy()
+        y_j[j] += dy
+        J[:, j] = (np.asarray(fun(t, y_j)) - f) / dy
+    return np.max(np.abs(np.linalg.eigvals(J)))
+
+
+class Decision:
+    """Stiffness check at the end of a segment, and the method chosen after it."""
+
+    def __init__(self, t: float, method: str, h: float, rho: float, switch: bool):
+        self.t, self.method, self.h, self.rho, self.switch = t, method, h, rho, switch
+
+    def __str__(self):
+        action = "switch to" if self.switch else "stay with"
+        return (
+            f"t = {self.t:.4g}: h = {self.h:.2e}, rho = {self.rho:.2e}, "
+            f"h*rho = {self.h * self.rho:.2f}, {action} {self.method}"
+        )
+
+
+def solve_auto(
+    fun: Callable,
+    t_span: tuple,
+    y0: list,
+    n_check: int = 20,
+    stiff_limit: float = 0.75 * rk45_stability,
+    nonstiff_limit: float = 0.3 * rk45_stability,
+    log: Callable | None = None,
+    **options,
+):
+    """
+    Solve an ODE, switching between RK45 and BDF according to its stiffness.
+
+    The integration runs in segments of n_check steps. At the end of each
+    segment, the spectral radius rho of the Jacobian is estimated, and compared
+    with the step size h:
+    - RK45 switches to BDF when h * rho approaches the stability limit of RK45:
+      its steps are limited by stability, not by accuracy.
+    - BDF switches to RK45 when h * rho falls well inside the stability limit:
+      RK45 can take the same steps, at a lower cost per step.
+
+    Parameters:
+    - fun: right-hand side of the ODE
+    - t_span: initial and final times
+    - y0: initial state
+    - n_check: number of steps between stiffness checks
+    - stiff_limit, nonstiff_limit: thresholds of h * rho for the switches
+    - log: function called with each Decision, or None
+    - options: options of the solvers (rtol, atol)
+
+    Returns:
+    - Dense solution, and the list of decisions
+    """
+    methods = {"RK45": RK45, "BDF": BDF}
+    method = "RK45"
+    solver = RK45(fun, t_span[0], np.asarray(y0, dtype=float), t_span[1], **options)
+    ts, interpolants, decisions = [t_span[0]], [], []
+    while solver.status == "running":
+        for _ in range(n_check):
+            solver.step()
+            if solver.status == "failed":
+                raise RuntimeError(f"{method} failed at t = {solver.t}")
+            ts.append(solver.t)
+            interpolants.append(solver.dense_output())
+            if solver.status == "finished":
+                break
+        if solver.status == "finished":
+            break
+
+        t, y, h = solver.t, solver.y, solver.step_size
+        rho = spectral_radius(fun, t, y, np.asarray(fun(t, y)))
+        stiff = h * rho > stiff_limit if method == "RK45" else h * rho > nonstiff_limit
+        next_method = "BDF" if stiff else "RK45"
+        decisions.append(Decision(t, next_method, h, rho, next_method != method))
+        if log is not None:
+            log(decisions[-1])
+        if next_method != method:  # Restart with the other method
+            solver = methods[next_method](fun, t, y, t_span[1], **options)
+            method = next_method
+
+    return OdeSolution(ts, interpolants), decisions
+
+
+# --- Benchmark ---
+class BudgetExceeded(Exception):
+    """Raised when a run exceeds max_nfev calls to the model."""
+
+
+def run(method: str, problem: tuple) -> dict:
+    """
+    Solve a test problem with a method (a solve_ivp method, or "Auto").
+
+    Returns:
+    - Dictionary with the calls to the model, the time, the final state, and
+      for "Auto" the decisions
+    """
+    model, y0, t_span = problem
+    nfev = 0
+
+    def fun(t, y):
+        nonlocal nfev
+        nfev += 1
+        if nfev > max_nfev:
+            raise BudgetExceeded
+        return np.asarray(model(t, y), dtype=float)
+
+    result = {"decisions": []}
+    t_start = time.perf_counter()
+    # The trial stages of RK45 can overflow the exponential of the diode
+    with np.errstate(over="ignore", invalid="ignore"):
+        try:
+            if method == "Auto":
+                sol, result["decisions"] = solve_auto(
+                    fun, t_span, y0, rtol=rtol, atol=atol
+                )
+                result["y_end"] = sol(t_span[1])
+            else:
+                sol = solve_ivp(fun, t_span, y0, method=method, rtol=rtol, atol=atol)
+                result["y_end"] = sol.y[:, -1]
+            result["completed"] = True
+        except BudgetExceeded:
+            result["completed"] = False
+    result["time"] = time.perf_counter() - t_start
+    result["nfev"] = nfev
+    return result
+
+
+def reference(problem: tuple) -> np.ndarray:
+    """Final state, solved with tight tolerances by a stiff solver"""
+    model, y0, t_span = problem
+    sol = solve_ivp(model, t_span, y0, method="Radau", rtol=1e-11, atol=1e-13)
+    return sol.y[:, -1]
+
+
+def bdf_share(decisions: list, t_span: tuple) -> float:
+    """Share of the time span solved with BDF by the automatic solver"""
+    t_bdf, method, t_last = 0.0, "RK45", t_span[0]
+    for d in decisions:
+        t_bdf += (d.t - t_last) * (method == "BDF")
+        method, t_last = d.method, d.t
+    t_bdf += (t_span[1] - t_last) * (method == "BDF")
+    return t_bdf / (t_span[1] - t_span[0])
+
+
+def error(result: dict, y_ref: np.ndarray) -> float:
+    """Largest error of the final state, relative to atol + rtol * |y_ref|"""
+    if not result["completed"]:
+        return np.nan
+    return np.max(np.abs(result["y_end"] - y_ref) / (atol + rtol * np.abs(y_ref)))
+
+
+methods = ["RK45", "BDF", "Radau", "LSODA", "Auto"]
+
+# --- Decision Log ---
+print("Van der Pol oscillator, mu = 1000, switches of the automatic solver:")
+model, y0, t_span = van_der_pol(1000.0)
+sol_vdp, decisions = solve_auto(
+    model, t_span, y0, rtol=rtol, atol=atol, log=lambda d: d.switch and print(d)
+)
+
+# --- Parameter Sweeps ---
+sweeps = {
+    "Van der Pol oscillator": (van_der_pol, "$\\mu$", np.logspace(0, 3, 7)),
+    "Diode circuit": (diode_circuit, "$C$ / F", np.logspace(-2, -7, 6)),
+    "CSTR with cooling": (cstr, "$k_0$ / s$^{-1}$", np.logspace(9, 14, 6)),
+}
+results = {}
+for name, (build, _, values) in sweeps.items():
+    print(f"\n{name}: calls to the model")
+    print(
+        f"{'Parameter':>10}{''.join(f'{m:>10}' for m in methods)}"
+        f"{'Auto/better':>13}{'BDF share':>11}{'Switches':>10}{'Error':>12}"
+    )
+    for value in values:
+        problem = build(value)
+        y_ref = reference(problem)
+        row = {m: run(m, problem) for m in methods}
+        results[name, value] = row
+
+        auto = row["Auto"]
+        share = bdf_share(auto["decisions"], problem[2])
+        switches = sum(d.switch for d in auto["decisions"])
+        # The better of the two methods the automatic solver switches between
+        best = min(row[m]["nfev"] for m in ["RK45", "BDF"] if row[m]["completed"])
+        errors = [error(r, y_ref) for m, r in row.items() if m != "Auto"]
+        calls = "".join(
+            f"{r['nfev']:>10}" if r["completed"] else f"{'>' + str(max_nfev):>10}"
+            for r in row.values()
+        )
+        print(
+            f"{value:>10.0e}{calls}{auto['nfev'] / best:>12.2f}x{share:>11.0%}"
+            f"{switches:>10}{error(auto, y_ref):>6.1f} ({np.nanmax(errors):.1f})"
+        )
+
+    print("Total time: ", end="")
+    for method in methods:
+        total = sum(results[name, v][method]["time"] for v in values)
+        print(f"{method} {total:.2f} s", end=", " if method != methods[-1] else "\n")
+
+# --- Plot Results ---
+fig, axs = plt.subplots(2, 2, figsize=(13, 10), constrained_layout=True)
+fig.suptitle("Automatic Stiffness Detection and Solver Switching")
+colors = {
+    "RK45": "tab:red",
+    "BDF": "tab:blue",
+    "Radau": "tab:purple",
+    "LSODA": "tab:gray",
+    "Auto": "tab:green",
+}
+
+for ax, (name, (_, label, values)) in zip(axs.flat, sweeps.items(), strict=False):
+    for method, color in colors.items():
+        nfev = [results[name, v][method]["nfev"] for v in values]
+        done = [results[name, v][method]["completed"] for v in values]
+        ax.loglog(values, nfev, "o-", color=color, label=method)
+        stopped = [v for v, d in zip(values, done, strict=True) if not d]
+        if stopped:
+            ax.loglog(
+                stopped, [max_nfev] * len(stopped), "x", color=color, markersize=12
+            )
+    ax.set_title(name)
+    ax.set_xlabel(label)
+    ax.set_ylabel("Calls to the model")
+    ax.grid(True, which="both", alpha=0.3)
+    ax.legend()
+
+# Stiffness checks of the automatic solver for the Van der Pol oscillator
+ax = axs[1, 1]
+for method in ["RK45", "BDF"]:
+    checks = [d for d in decisions if d.method == method]
+    ax.semilogy(
+        [d.t for d in checks],
+        [d.h * d.rho for d in checks],
+        "o",
+        color=colors[method],
+        label=f"Check, {method} next",
+    )
+ax.axhline(0.75 * rk45_stability, color="tab:red", linestyle="--", label="RK45 to BDF")
+ax.axhline(0.3 * rk45_stability, color="tab:blue", linestyle="--", label="BDF to RK45")
+ax.set_title("Van der Pol oscillator, $\\mu = 1000$: stiffness checks of Auto")
+ax.set_xlabel("Time / s")
+ax.set_ylabel("$h \\cdot \\rho(J)$")
+ax.grid(True)
+ax.legend(loc="upper left")
+
+ax_x = ax.twinx()
+t_plot = np.linspace(*t_span, 2000)
+ax_x.plot(t_plot, sol_vdp(t_plot)[0], color="black", alpha=0.4)
+ax_x.set_ylabel("Position $x(t)$ / m")
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -0,0 +1,499 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import LogNorm
+from scipy.constants import g as gravity
+from scipy.constants import zero_Celsius
+
+
+# --- Controller Blocks ---
+class Block(ABC):
+    """
+    Base class of the controller blocks.
+
+    A block maps the setpoint r and the measurement y of N independent loops to
+    N control actions. Its internal states have shape (N, n_states) and evolve
+    continuously (derivatives) or at the end of each integration step (update).
+    Every parameter is broadcast against the loops, so each loop can have its
+    own tuning.
+    """
+
+    n_states = 0
+
+    def initial_state(self, r: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """States of a block starting in steady operation."""
+        return np.zeros((len(y), self.n_states))
+
+    @abstractmethod
+    def output(self, x: np.ndarray, r: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Control signal of each loop."""
+
+    def derivatives(self, x: np.ndarray, r: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return np.zeros_like(x)
+
+    def update(self, x: np.ndarray, r: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return x
+
+
+class PID(Block):
+    """
+    PID controller with setpoint weighting, derivative filter and anti-windup.
+
+        u = Kp (b r - y) + I + Kd s / (Tf s + 1) (c r - y) + u_bias
+
+    The integral is computed with back-calculation: when the output saturates,
+    dI/dt = Ki (r - y) + Kaw (u_sat - u) bleeds the integral back towards the
+    limit. States: [integral term I, filtered derivative input].
+
+    Parameters:
+    - Kp, Ki, Kd: proportional, integral and derivative gains
+    - Tf: time constant of the derivative filter
+    - b, c: setpoint weights of the proportional and derivative terms
+    - u_min, u_max: output limits
+    - Kaw: back-calculation gain (0 disables anti-windup)
+    - u_bias: output at zero error
+    """
+
+    n_states = 2
+
+    def __init__(
+        self,
+        Kp,
+        Ki,
+        Kd=0.0,
+        Tf=1.0,
+        b=1.0,
+        c=0.0,
+        u_min=-np.inf,
+        u_max=np.inf,
+        Kaw=0.0,
+        u_bias=0.0,
+    ):
+        self.Kp, self.Ki, self.Kd, self.Tf = Kp, Ki, Kd, Tf
+        self.b, self.c = b, c
+        self.u_min, self.u_max = u_min, u_max
+        self.Kaw, self.u_bias = Kaw, u_bias
+
+    def initial_state(self, r, y):
+        x = np.empty((len(y), 2))
+        x[:, 0] = self.Kp * (1 - self.b) * r  # Same start as without setpoint weight
+        x[:, 1] = self.c * r - y  # No derivative kick at the start
+        return x
+
+    def _unsaturated(self, x, r, y):
+        derivative = self.Kd * (self.c * r - y - x[:, 1]) / self.Tf
+        return self.Kp * (self.b * r - y) + x[:, 0] + derivative + self.u_bias
+
+    def output(self, x, r, y):
+        return np.clip(self._unsaturated(x, r, y), self.u_min, self.u_max)
+
+    def derivatives(self, x, r, y):
+        u = self._unsaturated(x, r, y)
+        u_sat = np.clip(u, self.u_min, self.u_max)
+        dx = np.empty_like(x)
+        dx[:, 0] = self.Ki * (r - y) + self.Kaw * (u_sat - u)
+        dx[:, 1] = (self.c * r - y - x[:, 1]) / self.Tf
+        return dx
+
+
+class LeadLag(Block):
+    """
+    Lead-lag compensator acting on the error, with output limits.
+
+        u = K (T_lead s + 1) / (T_lag s + 1) (r - y) + u_bias
+
+    State: the error filtered by the lag, w = (r - y) / (T_lag s + 1).
+    """
+
+    n_states = 1
+
+    def __init__(self, K, T_lead, T_lag, u_min=-np.inf, u_max=np.inf, u_bias=0.0):
+        self.K, self.T_lead, self.T_lag = K, T_lead, T_lag
+        self.u_min, self.u_max, self.u_bias = u_min, u_max, u_bias
+
+    def initial_state(self, r, y):
+        return (r - y)[:, None]
+
+    def output(self, x, r, y):
+        ratio = self.T_lead / self.T_lag
+        u = self.K * (ratio * (r - y) + (1 - ratio) * x[:, 0]) + self.u_bias
+        return np.clip(u, self.u_min, self.u_max)
+
+    def derivatives(self, x, r, y):
+        return ((r - y)[:, None] - x) / self.T_lag
+
+
+class OnOff(Block):
+    """
+    On/off controller with a hysteresis band.
+
+    The output switches to u_on when the error exceeds half the band, and back
+    to u_off when it falls below minus half the band. State: 1 when on. It only
+    changes at the end of each integration step.
+    """
+
+    n_states = 1
+
+    def __init__(self, u_on, u_off, hysteresis):
+        self.u_on, self.u_off, self.hysteresis = u_on, u_off, hysteresis
+
+    def initial_state(self, r, y):
+        return (r - y > 0).astype(float)[:, None]
+
+    def output(self, x, r, y):
+        return np.where(x[:, 0] > 0.5, self.u_on, self.u_off)
+
+    def update(self, x, r, y):
+        e = r - y
+        on = np.where(e > self.hysteresis / 2, 1.0, x[:, 0])
+        on = np.where(e < -self.hysteresis / 2, 0.0, on)
+        return on[:, None]
+
+
+def simulate(
+    plant: Callable[[float, np.ndarray, np.ndarray], np.ndarray],
+    measure: int,
+    block: Block,
+    x0: np.ndarray,
+    setpoint: Callable[[float], float],
+    t: np.ndarray,
+    cost: Callable[[np.ndarray], np.ndarray] | None = None,
+    stride: int = 1,
+):
+    """
+    Closed-loop simulation of N plant/controller pairs with fixed-step RK4.
+
+    The plant and controller states are stacked side by side, so the N loops
+    are integrated as one batched system.
+
+    Parameters:
+    - plant: batched model right-hand side f(t, x, u), with x of shape (N, n)
+    - measure: index of the controlled state
+    - block: controller block
+    - x0: initial plant states, shape (N, n)
+    - setpoint: setpoint as a function of time
+    - t: time grid (the integration step is the grid spacing)
+    - cost: optional integrand g(e) accumulated over time (e.g. e**2 for ISE)
+    - stride: record every stride-th time point only, to save memory
+    Returns:
+    - x: plant states, shape (len(t[::stride]), N, n)
+    - u: control actions, shape (len(t[::stride]), N)
+    - J: accumulated cost, shape (N,) (only when cost is given)
+    """
+    n = x0.shape[1]
+
+    def rhs(t_k: float, z: np.ndarray) -> np.ndarray:
+        r = np.full(len(z), setpoint(t_k))
+        y = z[:, measure]
+        u = block.output(z[:, n:], r, y)
+        dz = np.empty_like(z)
+        dz[:, :n] = plant(t_k, z[:, :n], u)
+        dz[:, n:] = block.derivatives(z[:, n:], r, y)
+        return dz
+
+    r0 = np.full(len(x0), setpoint(t[0]))
+    z = np.hstack([x0, block.initial_state(r0, x0[:, measure])])
+    x = np.empty((len(t[::stride]), *x0.shape))
+    u = np.empty((len(t[::stride]), len(x0)))
+    J = np.zeros(len(x0))
+
+    for k in range(len(t)):
+        r = np.full(len(z), setpoint(t[k]))
+        z[:, n:] = block.update(z[:, n:], r, z[:, measure])
+        if k % stride == 0:
+            x[k // stride] = z[:, :n]
+            u[k // stride] = block.output(z[:, n:], r, z[:, measure])
+        if k == len(t) - 1:
+            break
+
+        dt = t[k + 1] - t[k]
+        if cost is not None:
+            J += cost(r - z[:, measure]) * dt
+        k1 = rhs(t[k], z)
+        k2 = rhs(t[k] + dt / 2, z + dt / 2 * k1)
+        k3 = rhs(t[k] + dt / 2, z + dt / 2 * k2)
+        k4 = rhs(t[k] + dt, z + dt * k3)
+        z = z + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+
+    return (x, u, J) if cost is not None else (x, u)
+
+
+# --- Batched Inverted Pendulum Model ---
+m_c: Final = 1.0  # Mass of the cart [kg]
+m_p: Final = 0.2  # Mass of the pendulum rod [kg]
+L_p: Final = 0.5  # Distance from pivot to rod center of mass [m]
+J_p: Final = (1 / 12) * m_p * (2 * L_p) ** 2  # Moment of inertia of the rod [kg·m²]
+b_c: Final = 10.0  # Viscous damping coefficient of the cart [N·s/m]
+g: Final = gravity  # Gravitational acceleration [m/s²]
+
+
+def pendulum_model(t: float, y: np.ndarray, F: np.ndarray):
+    """
+    Differential equations of N inverted pendulums on carts.
+
+    Parameters:
+    - t: time [s]
+    - y: states [theta, omega, x, v], shape (N, 4)
+    - F: force applied to each cart [N], shape (N,)
+    """
+    theta, omega, v = y[:, 0], y[:, 1], y[:, 3]
+
+    # 2x2 mass matrix of [domega/dt, dv/dt], solved in closed form
+    m11 = m_p * L_p**2 + J_p
+    m12 = m_p * L_p * np.cos(theta)
+    m22 = m_c + m_p
+    rhs1 = m_p * g * L_p * np.sin(theta)
+    rhs2 = F - b_c * v + m_p * L_p * omega**2 * np.sin(theta)
+    det = m11 * m22 - m12**2
+
+    dydt = np.empty_like(y)
+    dydt[:, 0] = omega
+    dydt[:, 1] = (m22 * rhs1 - m12 * rhs2) / det
+    dydt[:, 2] = v
+    dydt[:, 3] = (m11 * rhs2 - m12 * rhs1) / det
+    return dydt
+
+
+# --- Batched Heated Tank Model ---
+rho: Final = 1000.0  # Liquid density (water) [kg/m³]
+cp: Final = 4180.0  # Specific heat capacity (water) [J/(kg·K)]
+rho_j: Final = 958.0  # Condensate density (liquid water at 100°C) [kg/m³]
+lambda_j: Final = 2.256e6  # Latent heat of condensation of water [J/kg]
+A_c: Final = np.pi * (1.5**2)  # Tank cross-sectional area [m²]
+k: Final = 0.12  # Outlet discharge parameter [m^2.5/s]
+q_in: Final = 0.2  # Inlet flow rate [m³/s]
+T_in: Final = zero_Celsius + 28.0  # Inlet temperature [K]
+q_j_max: Final = 0.0225  # Maximum jacket condensate flow [m³/s]
+tau_valve: Final = 10.0  # Time constant of the jacket valve [s]
+tau_sensor: Final = 15.0  # Time constant of the temperature sensor [s]
+
+
+def tank_model(t: float, y: np.ndarray, q_j_sp: np.ndarray):
+    """
+    Differential equations of N heated tanks, with a valve on the jacket flow
+    and a temperature sensor, both modeled as first-order lags.
+
+    Parameters:
+    - t: time [s]
+    - y: states [L, T, q_j, T_m], shape (N, 4)
+    - q_j_sp: jacket flow requested from the valve [m³/s], shape (N,)
+    """
+    L, T, q_j, T_m = y.T
+
+    dydt = np.empty_like(y)
+    dydt[:, 0] = (q_in - k * np.sqrt(L)) / A_c
+    heat_in = rho * q_in * cp * (T_in - T)
+    heat_jacket = rho_j * q_j * lambda_j
+    dydt[:, 1] = (heat_in + heat_jacket) / (rho * A_c * L * cp)
+    dydt[:, 2] = (q_j_sp - q_j) / tau_valve
+    dydt[:, 3] = (T - T_m) / tau_sensor
+    return dydt
+
+
+# --- Heated Tank: Temperature Control with Different Blocks ---
+q_j_ss: Final = 0.015  # Initial jacket flow [m³/s]
+L_ss = (q_in / k) ** 2  # Steady-state level [m]
+T_ss = T_in + rho_j * q_j_ss * lambda_j / (rho * q_in * cp)  # Steady-state temp. [K]
+y0_tank = np.array([L_ss, T_ss, q_j_ss, T_ss])
+
+
+def T_setpoint(t: float) -> float:
+    """Temperature setpoint [K]: a small step, a large step, and back."""
+    if t < 60:
+        return T_ss
+    if t < 1200:
+        return T_ss + 4.0
+    if t < 2400:
+        return T_ss + 15.0
+    return T_ss
+
+
+t_tank = np.arange(0, 3600 + 1.0, 1.0)  # Simulation time, 1 s step [s]
+T_sp = np.array([T_setpoint(ti) for ti in t_tank])
+
+# SIMC tuning: gain 2585 K/(m³/s), time constant 98 s, the lags act as a 25 s delay
+Kp_simc: Final = 7.6e-4  # Proportional gain [m³/(s·K)]
+Ti_simc: Final = 98.0  # Integral time [s]
+pid_limits = {"u_min": 0.0, "u_max": q_j_max, "u_bias": q_j_ss}
+
+# Three PID variants, integrated as one batch of three loops
+pid_tank = PID(
+    Kp=Kp_simc,
+    Ki=Kp_simc / Ti_simc,
+    b=np.array([1.0, 1.0, 0.5]),
+    Kaw=np.array([0.0, 1 / Ti_simc, 1 / Ti_simc]),
+    **pid_limits,
+)
+labels_tank = ["PID, no anti-windup", "PID, anti-windup", "PID, anti-windup, $b = 0.5$"]
+x0_tank = np.tile(y0_tank, (3, 1))
+x_pid, u_pid, ise_pid = simulate(
+    tank_model, 3, pid_tank, x0_tank, T_setpoint, t_tank, cost=np.square
+)
+
+onoff_tank = OnOff(u_on=q_j_max, u_off=0.0, hysteresis=1.0)
+x_onoff, u_onoff = simulate(tank_model, 3, onoff_tank, x0_tank[:1], T_setpoint, t_tank)
+
+for label, x, ise in zip(labels_tank, x_pid.transpose(1, 0, 2), ise_pid, strict=True):
+    error = T_sp - x[:, 1]
+    overshoot_small = np.max(-error[(t_tank >= 60) & (t_tank < 1200)])
+    overshoot_large = np.max(-error[(t_tank >= 1200) & (t_tank < 2400)])
+    undershoot = np.max(error[t_tank >= 2400])
+    print(
+        f"{label}: ISE = {ise:.0f} K²·s, overshoot {overshoot_small:.2f} K (small step),"
+        f" {overshoot_large:.2f} K (large step), {undershoot:.2f} K (step down)"
+    )
+T_onoff = x_onoff[:, 0, 1]
+print(
+    f"On/off: temperature band {np.ptp(T_onoff[(t_tank > 600) & (t_tank < 1200)]):.2f} K,"
+    f" {np.count_nonzero(np.diff(u_onoff[:, 0]))} switches"
+)
+
+# --- Inverted Pendulum: PID and Lead-Lag with Force Limits ---
+F_max: Final = 40.0  # Force limit [N]
+t_pend = np.arange(0, 2 + 1e-3, 1e-3)  # Simulation time, 1 ms step [s]
+x0_pend = np.array([[np.deg2rad(30.0), 0.0, 0.0, 0.0]])
+
+blocks_pend = {
+    "PID": PID(
+        Kp=-500.0,
+        Ki=-300.0,
+        Kd=-20.0,
+        Tf=0.01,
+        c=1.0,
+        u_min=-F_max,
+        u_max=F_max,
+        Kaw=1.0,
+    ),
+    "Lead-lag": LeadLag(K=-400.0, T_lead=0.1, T_lag=0.02, u_min=-F_max, u_max=F_max),
+}
+results_pend = {
+    name: simulate(pendulum_model, 0, block, x0_pend, lambda t: 0.0, t_pend)
+    for name, block in blocks_pend.items()
+}
+
+# --- Autotuning Sweep: Thousands of Gain Sets in One Integration ---
+n_grid: Final = 64
+Kp_grid, Ti_grid = np.meshgrid(
+    np.logspace(-4, -2, n_grid), np.logspace(1, 3, n_grid), indexing="ij"
+)
+Kp_sweep, Ti_sweep = Kp_grid.ravel(), Ti_grid.ravel()
+
+
+def sweep(Kp: np.ndarray, Ti: np.ndarray, stride: int = 1):
+    """Closed-loop responses and ISE [K²·s] of the temperature loop for each gain set."""
+    pid = PID(Kp=Kp, Ki=Kp / Ti, Kaw=1 / Ti, **pid_limits)
+    x0 = np.tile(y0_tank, (len(Kp), 1))
+    return simulate(tank_model, 3, pid, x0, T_setpoint, t_tank, np.square, stride)
+
+
+stride: Final = 10
+start = time.perf_counter()
+x_sweep, _, ise = sweep(Kp_sweep, Ti_sweep, stride)
+time_batched = time.perf_counter() - start
+
+n_serial = 5
+start = time.perf_counter()
+for i in range(n_serial):
+    sweep(Kp_sweep[i : i + 1], Ti_sweep[i : i + 1], stride)
+time_serial = (time.perf_counter() - start) / n_serial * len(Kp_sweep)
+print(
+    f"Sweep of {len(ise)} PID gain sets: {time_batched:.2f} s batched,"
+    f" {time_serial:.0f} s estimated one loop at a time"
+    f" ({time_serial / time_batched:.0f}x faster)"
+)
+
+# A loop is settled when the error stays below 0.1 K in the last 5 min before each step
+t_rec = t_tank[::stride]
+before_step = t_rec % 1200 >= 900
+error_sweep = T_sp[::stride, None] - x_sweep[:, :, 1]
+settled = np.max(np.abs(error_sweep[before_step]), axis=0) < 0.1
+
+best_any = np.argmin(ise)
+best = np.flatnonzero(settled)[np.argmin(ise[settled])]
+for label, i in [("Best ISE", best_any), ("Best settled ISE", best)]:
+    print(
+        f"{label}: Kp = {Kp_sweep[i]:.2e} m³/(s·K), Ti = {Ti_sweep[i]:.0f} s,"
+        f" ISE = {ise[i]:.0f} K²·s, settled = {settled[i]}"
+    )
+print(f"Settled loops: {np.count_nonzero(settled)} of {len(ise)}")
+x_best = sweep(Kp_sweep[best : best + 1], Ti_sweep[best : best + 1])[0]
+
+# --- Plot results ---
+fig, axs = plt.subplots(3, 2, figsize=(12, 10), constrained_layout=True)
+fig.suptitle("Controller Blocks")
+t_min = t_tank / 60
+
+axs[0, 0].set_title("Heated Tank: Temperature Control")
+for label, x, u in zip(labels_tank, x_pid.transpose(1, 0, 2), u_pid.T, strict=True):
+    axs[0, 0].plot(t_min, x[:, 1] - zero_Celsius, label=label)
+    axs[1, 0].plot(t_min, u, label=label)
+axs[0, 0].plot(
+    t_min, T_onoff - zero_Celsius, label="On/off", color="tab:gray", alpha=0.6
+)
+axs[1, 0].plot(t_min, u_onoff[:, 0], label="On/off", color="tab:gray", alpha=0.3)
+axs[0, 0].plot(
+    t_min, T_sp - zero_Celsius, color="tab:red", linestyle="--", label="Setpoint"
+)
+axs[0, 0].set_ylabel("Temperature / °C")
+axs[1, 0].set_ylabel("Jacket flow $q_j$ / m$^3\\cdot$s$^{-1}$")
+axs[1, 0].set_xlabel("Time / min")
+
+axs[0, 1].set_title("Inverted Pendulum: Force Limited to ±40 N")
+for name, (x, u) in results_pend.items():
+    axs[0, 1].plot(t_pend, np.rad2deg(x[:, 0, 0]), label=name)
+    axs[1, 1].plot(t_pend, u[:, 0], label=name)
+axs[0, 1].axhline(0, color="tab:red", linestyle="--", label="Setpoint")
+axs[0, 1].set_ylabel("Angle / deg")
+axs[1, 1].set_ylabel("Applied force / N")
+axs[1, 1].set_xlabel("Time / s")
+
+axs[2, 0].set_title(f"Gain Sweep: {len(ise)} Loops in One Integration")
+mesh = axs[2, 0].pcolormesh(
+    Kp_grid, Ti_grid, ise.reshape(Kp_grid.shape), norm=LogNorm(), shading="auto"
+)
+axs[2, 0].contourf(
+    Kp_grid,
+    Ti_grid,
+    settled.reshape(Kp_grid.shape),
+    levels=[-0.5, 0.5],
+    colors="none",
+    hatches=["//"],
+)
+axs[2, 0].plot([], [], " ", label="Hatched: not settled")
+axs[2, 0].plot(
+    Kp_sweep[best_any], Ti_sweep[best_any], "kx", markersize=10, label="Best ISE"
+)
+axs[2, 0].plot(
+    Kp_sweep[best], Ti_sweep[best], "r*", markersize=12, label="Best settled ISE"
+)
+axs[2, 0].plot(Kp_simc, Ti_simc, "wo", label="SIMC tuning")
+axs[2, 0].set_xscale("log")
+axs[2, 0].set_yscale("log")
+axs[2, 0].set_xlabel("$K_p$ / m$^3\\cdot$s$^{-1}\\cdot$K$^{-1}$")
+axs[2, 0].set_ylabel("$T_i$ / s")
+fig.colorbar(mesh, ax=axs[2, 0], label="ISE / K$^2\\cdot$s")
+
+axs[2, 1].set_title("Heated Tank: Best Gains of the Sweep")
+axs[2, 1].plot(t_min, x_best[:, 0, 1] - zero_Celsius, label="Best settled ISE")
+axs[2, 1].plot(t_min, x_pid[:, 1, 1] - zero_Celsius, label="SIMC tuning")
+axs[2, 1].plot(
+    t_min, T_sp - zero_Celsius, color="tab:red", linestyle="--", label="Setpoint"
+)
+axs[2, 1].set_ylabel("Temperature / °C")
+axs[2, 1].set_xlabel("Time / min")
+
+for ax in axs.flat:
+    ax.grid(True)
+    ax.legend()
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
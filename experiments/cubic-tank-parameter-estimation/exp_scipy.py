@@ -0,0 +1,318 @@
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import repeat
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import g
+from scipy.integrate import solve_ivp
+from scipy.optimize import least_squares
+
+# --- Define Model ---
+rho: Final = 1000.0  # Density of water [kg/m³]
+
+gamma: Final = rho * g  # Specific weight [N/m³]
+
+L: Final = 4  # Tank side length [m]
+
+A_p: Final = np.pi * (0.20 / 2) ** 2  # Pipe cross-sectional area [m²]
+
+k_f: Final = 1.0  # Friction coefficient [kg/m]
+
+# True parameters, unknown to the estimator
+alpha_true: Final = A_p * np.sqrt(gamma * A_p / k_f)  # Discharge param. [m^{2.5}/s]
+A_true: Final = L**2  # Cross-sectional area [m²]
+
+
+def model(t: float, y: np.ndarray, Q_in: np.ndarray, alpha: float, A: float):
+    """
+    Tank level and its sensitivities, for a batch of independent segments.
+
+    Each row of y holds [h, ∂h/∂alpha, ∂h/∂A, ∂h/∂h0] of one segment.
+
+    Parameters:
+    - t: time [s]
+    - y: flattened states, shape (n_segments * 4,)
+    - Q_in: inlet flow of each segment [m³/s]
+    - alpha: outlet discharge parameter [m^{2.5}/s]
+    - A: cross-sectional area [m²]
+    """
+    h, S_alpha, S_A, S_h0 = y.reshape(-1, 4).T
+    sqrt_h = np.sqrt(np.maximum(h, 1e-6))
+
+    dhdt = (Q_in - alpha * sqrt_h) / A
+    df_dh = -alpha / (2 * A * sqrt_h)
+    df_dalpha = -sqrt_h / A
+    df_dA = -dhdt / A
+
+    return np.column_stack(
+        [
+            dhdt,
+            df_dh * S_alpha + df_dalpha,
+            df_dh * S_A + df_dA,
+            df_dh * S_h0,
+        ]
+    ).ravel()
+
+
+def shoot(
+    theta: np.ndarray, s: np.ndarray, Q: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Integrate all shooting segments of one experiment at once.
+
+    The record is split into len(s) segments of equal duration, and segment j
+    starts from the level s[j]. Since the segment duration is a multiple of the
+    switching period, the inlet flow changes at the same local time in every
+    segment, so all segments are stacked into a single system.
+
+    Parameters:
+    - theta: parameters [alpha, A]
+    - s: initial level of each segment [m]
+    - Q: inlet flow of each switching period [m³/s]
+
+    Returns:
+    - y: levels and sensitivities at the sampling times, shape (n_seg, n_samples, 4)
+    - y_end: levels and sensitivities at the end of each segment, shape (n_seg, 4)
+    """
+    n_seg = s.size
+    Q = Q.reshape(n_seg, -1)
+    y_end = np.column_stack([s, np.zeros(n_seg), np.zeros(n_seg), np.ones(n_seg)])
+
+    y = []
+    for k in range(Q.shape[1]):
+        t_span = (k * T_switch, (k + 1) * T_switch)
+        sol = solve_ivp(
+            model,
+            t_span,
+            y_end.ravel(),
+            t_eval=np.arange(t_span[0], t_span[1] + dt, dt),
+            args=(Q[:, k], *theta),
+            rtol=1e-8,
+            atol=1e-10,
+        )
+        y_k = sol.y.T.reshape(-1, n_seg, 4)
+        y.append(y_k[:-1])
+        y_end = y_k[-1]
+    return np.concatenate(y).transpose(1, 0, 2), y_end
+
+
+# --- Experimental Data (PRBS) ---
+Q_low: Final = 0.3  # Low flow [m³/s]
+Q_high: Final = 1.0  # High flow [m³/s]
+T_switch: Final = 20  # Switching period [s]
+t_end: Final = 2400  # Duration of each experiment [s]
+dt: Final = 1  # Sampling period [s]
+sigma: Final = 0.02  # Standard deviation of the level sensor noise [m]
+
+
+def run_experiment(seed: int, h0: float) -> dict:
+    """
+    Simulate a PRBS experiment with the true parameters and add sensor noise.
+
+    Returns a dictionary with the inlet flow of each switching period and the
+    measured level at each sampling time.
+    """
+    rng = np.random.default_rng(seed)
+    Q = rng.choice([Q_low, Q_high], size=t_end // T_switch)
+    y, _ = shoot(np.array([alpha_true, A_true]), np.array([h0]), Q)
+    h_meas = y[0, :, 0] + rng.normal(0.0, sigma, y.shape[1])
+    return {"Q": Q, "h_meas": h_meas}
+
+
+# --- Multiple Shooting Least Squares ---
+w_cont: Final = 10.0 / sigma  # Weight of the continuity residuals [1/m]
+
+
+def evaluate_experiment(
+    theta: np.ndarray, s: np.ndarray, experiment: dict
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Residuals and Jacobian of one experiment.
+
+    The residuals are the scaled output errors (h - h_meas) / sigma of every
+    sample, followed by the continuity errors between consecutive segments.
+    The Jacobian columns are [alpha, A, s_1, ..., s_n], built from the
+    sensitivities integrated with the model.
+    """
+    n_seg = s.size
+    y, y_end = shoot(theta, s, experiment["Q"])
+    n_samples = y.shape[1]
+
+    r_meas = (y[:, :, 0] - experiment["h_meas"].reshape(n_seg, -1)) / sigma
+    r_cont = w_cont * (y_end[:-1, 0] - s[1:])
+
+    jac_meas = np.zeros((n_seg, n_samples, 2 + n_seg))
+    jac_meas[:, :, :2] = y[:, :, 1:3] / sigma
+    jac_meas[np.arange(n_seg), :, 2 + np.arange(n_seg)] = y[:, :, 3] / sigma
+
+    jac_cont = np.zeros((n_seg - 1, 2 + n_seg))
+    jac_cont[:, :2] = w_cont * y_end[:-1, 1:3]
+    jac_cont[np.arange(n_seg - 1), 2 + np.arange(n_seg - 1)] = w_cont * y_end[:-1, 3]
+    jac_cont[np.arange(n_seg - 1), 3 + np.arange(n_seg - 1)] = -w_cont
+
+    residuals = np.concatenate([r_meas.ravel(), r_cont])
+    jacobian = np.vstack([jac_meas.reshape(-1, 2 + n_seg), jac_cont])
+    return residuals, jacobian
+
+
+def fit(
+    experiments: list[dict],
+    theta0: np.ndarray,
+    n_seg: int,
+    executor: Executor | None = None,
+) -> dict:
+    """
+    Estimate [alpha, A] from several experiments by multiple shooting.
+
+    The unknowns are the parameters followed by the initial level of every
+    segment of every experiment. The segment levels start at the measured
+    values, so each segment starts close to the data even when the parameter
+    guess is poor. With n_seg = 1, this reduces to single shooting.
+
+    Parameters:
+    - experiments: list of experiments from run_experiment
+    - theta0: initial guess of [alpha, A]
+    - n_seg: number of shooting segments per experiment
+    - executor: optional pool that evaluates the experiments in parallel
+
+    Returns a dictionary with the least_squares result, the estimated
+    parameters, their standard deviations, and the history of the parameters
+    and wall time of each iteration.
+    """
+    n_samples = experiments[0]["h_meas"].size // n_seg
+    s0 = [e["h_meas"][::n_samples] for e in experiments]
+    x0 = np.concatenate([theta0, *s0])
+    cache = {}
+
+    def evaluate(x: np.ndarray):
+        key = x.tobytes()
+        if key not in cache:
+            theta = x[:2]
+            s = np.split(x[2:], len(experiments))
+            map_func = executor.map if executor is not None else map
+            results = list(map_func(evaluate_experiment, repeat(theta), s, experiments))
+
+            jacobian = np.zeros((sum(r.size for r, _ in results), x.size))
+            row = 0
+            for i, (r, jac) in enumerate(results):
+                jacobian[row : row + r.size, :2] = jac[:, :2]
+                col = 2 + i * n_seg
+                jacobian[row : row + r.size, col : col + n_seg] = jac[:, 2:]
+                row += r.size
+            cache.clear()
+            cache[key] = (np.concatenate([r for r, _ in results]), jacobian)
+        return cache[key]
+
+    history = [x0[:2]]
+    wall_times = []
+    start = time.perf_counter()
+
+    def callback(intermediate_result):
+        nonlocal start
+        history.append(intermediate_result.x[:2].copy())
+        wall_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+
+    result = least_squares(
+        lambda x: evaluate(x)[0],
+        x0,
+        jac=lambda x: evaluate(x)[1],
+        bounds=(1e-3, np.inf),
+        x_scale="jac",
+        callback=callback,
+    )
+
+    # Maximum likelihood estimate of the noise and parameter covariance
+    n_meas = sum(e["h_meas"].size for e in experiments)
+    r_meas = np.concatenate(
+        [r[: n_samples * n_seg] for r in np.split(result.fun, len(experiments))]
+    )
+    sigma_hat = sigma * np.sqrt(np.sum(r_meas**2) / (n_meas - result.x.size))
+    cov = (sigma_hat / sigma) ** 2 * np.linalg.inv(result.jac.T @ result.jac)
+
+    return {
+        "result": result,
+        "theta": result.x[:2],
+        "theta_std": np.sqrt(np.diag(cov)[:2]),
+        "sigma": sigma_hat,
+        "history": np.array(history),
+        "wall_times": np.array(wall_times),
+    }
+
+
+# --- Estimation ---
+if __name__ == "__main__":
+    experiments = [
+        run_experiment(seed, h0)
+        for seed, h0 in ((42, 0.2), (7, 3.0), (2024, 1.0), (123, 2.0))
+    ]
+    theta0 = np.array([0.2, 40.0])  # Poor initial guess of [alpha, A]
+
+    fits = {
+        "Single shooting": fit(experiments, theta0, n_seg=1),
+        "Multiple shooting": fit(experiments, theta0, n_seg=12),
+    }
+    with ProcessPoolExecutor(max_workers=len(experiments)) as executor:
+        fits["Multiple shooting, process pool"] = fit(
+            experiments, theta0, n_seg=12, executor=executor
+        )
+
+    print(
+        f"True: alpha = {alpha_true:.4f} m^2.5/s, A = {A_true:.3f} m², sigma = {sigma}"
+    )
+    for name, est in fits.items():
+        (alpha, A), (std_alpha, std_A) = est["theta"], est["theta_std"]
+        print(
+            f"{name}: alpha = {alpha:.4f} ± {2 * std_alpha:.4f}, "
+            f"A = {A:.3f} ± {2 * std_A:.3f}, sigma = {est['sigma']:.4f}, "
+            f"{est['result'].nfev} evaluations, {len(est['wall_times'])} iterations, "
+            f"{np.mean(est['wall_times']) * 1e3:.0f} ms/iteration"
+        )
+
+    # --- Plot results ---
+    fig, axs = plt.subplots(3, 1, figsize=(9, 10), constrained_layout=True)
+    fig.suptitle("Cubic Tank: Parameter Estimation from PRBS Data")
+
+    t = np.arange(0, t_end, dt)
+    experiment = experiments[0]
+    axs[0].plot(t, experiment["h_meas"], ".", ms=2, color="gray", label="Measured")
+    for theta, s, n_seg, label in (
+        (theta0, experiment["h_meas"][::200], 12, "Initial guess (12 segments)"),
+        (fits["Multiple shooting"]["theta"], experiment["h_meas"][:1], 1, "Fitted"),
+    ):
+        y, _ = shoot(theta, s, experiment["Q"])
+        h = y[:, :, 0].copy()
+        h[:, -1] = np.nan  # Show the gaps between shooting segments
+        axs[0].plot(t, h.ravel(), label=label)
+    axs[0].set_xlabel("Time / s")
+    axs[0].set_ylabel("Level / m")
+    axs[0].set_title("Experiment 1")
+
+    for name, est in list(fits.items())[:2]:
+        history = est["history"]
+        axs[1].plot(history[:, 0] / alpha_true, "o-", label=f"$\\alpha$, {name}")
+        axs[1].plot(history[:, 1] / A_true, "s--", label=f"$A$, {name}")
+    axs[1].axhline(1.0, color="k", lw=0.8)
+    axs[1].set_xlabel("Iteration")
+    axs[1].set_ylabel("Estimate / true value")
+    axs[1].set_title("Convergence")
+
+    for name, est in fits.items():
+        axs[2].plot(est["wall_times"] * 1e3, "o-", label=name)
+    axs[2].set_xlabel("Iteration")
+    axs[2].set_ylabel("Wall time / ms")
+    axs[2].set_title("Wall Time per Iteration")
+
+    for ax in axs:
+        ax.grid(True)
+        ax.legend()
+
+    # Save plot to file
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+    save_path = os.path.join(script_dir, "results", "scipy.png")
+    plt.savefig(save_path)
+    print(f"Plot saved to {save_path}")
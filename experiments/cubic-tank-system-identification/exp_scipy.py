@@ -0,0 +1,405 @@
+import os
+import time
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.constants import g
+from scipy.linalg import solve_triangular
+from scipy.signal import lfilter
+
+# --- Define Model ---
+rho: Final = 1000.0  # Density of water [kg/m³]
+
+gamma: Final = rho * g  # Specific weight [N/m³]
+
+L: Final = 4  # Tank side length [m]
+
+A: Final = L**2  # Cross-sectional area [m²]
+
+D_p: Final = 0.20  # Pipe diameter [m]
+
+A_p: Final = np.pi * (D_p / 2) ** 2  # Pipe cross-sectional area [m²]
+
+k_f: Final = 1.0  # Friction coefficient [kg/m]
+
+alpha = A_p * np.sqrt(gamma * A_p / k_f)  # Outlet discharge parameter [m^{2.5}/s]
+
+
+def diff_equation(h: np.ndarray, Q_in: np.ndarray):
+    dhdt = (Q_in - alpha * np.sqrt(np.maximum(h, 0.0))) / A
+    return dhdt
+
+
+# --- Reference Plant ---
+Ts: Final = 5.0  # Sampling period [s]
+Q_op: Final = 0.7  # Operating point inlet flow [m³/s]
+h_op: Final = (Q_op / alpha) ** 2  # Operating point level [m]
+dQ: Final = 0.1  # PRBS amplitude around the operating point [m³/s]
+sigma: Final = 0.01  # Standard deviation of the level sensor noise [m]
+
+
+def prbs(n: int, rng: np.random.Generator, hold: int = 3) -> np.ndarray:
+    """PRBS input sequence, held for `hold` samples between switches [m³/s]"""
+    levels = rng.choice([Q_op - dQ, Q_op + dQ], size=-(-n // hold))
+    return np.repeat(levels, hold)[:n]
+
+
+def simulate_plant(Q_in: np.ndarray, chunk: int = 1000, warm_up: int = 200):
+    """
+    Simulate the nonlinear tank sampled every Ts, with a zero-order hold input.
+
+    Long records are split into chunks of `chunk` samples that are integrated
+    side by side with a fixed-step RK4 (4 steps per sample). Each chunk starts
+    `warm_up` samples earlier at the operating point, and the warm-up is then
+    discarded: it spans about 14 time constants, so the initial condition is
+    forgotten and the chunks join seamlessly.
+
+    Returns the level at each sampling time [m].
+    """
+    n = Q_in.size
+    n_chunks = -(-n // chunk)
+    padded = np.full(warm_up + n_chunks * chunk, Q_op)
+    padded[warm_up : warm_up + n] = Q_in
+    # Row c holds the inputs of chunk c, preceded by its warm-up samples
+    inputs = sliding_window_view(padded, warm_up + chunk)[::chunk]
+
+    h = np.full(n_chunks, h_op)
+    out = np.empty((n_chunks, warm_up + chunk))
+    dt = Ts / 4
+    for k in range(warm_up + chunk):
+        out[:, k] = h
+        u = inputs[:, k]
+        for _ in range(4):
+            k1 = diff_equation(h, u)
+            k2 = diff_equation(h + dt / 2 * k1, u)
+            k3 = diff_equation(h + dt / 2 * k2, u)
+            k4 = diff_equation(h + dt * k3, u)
+            h = h + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+    return out[:, warm_up:].ravel()[:n]
+
+
+# --- Identification ---
+def lagged(x: np.ndarray, first_lag: int, n_lags: int, n0: int) -> np.ndarray:
+    """
+    Regressor block [x(t - first_lag), ..., x(t - first_lag - n_lags + 1)]
+    for t = n0, ..., N - 1, as a strided view (Toeplitz structure, no loop).
+    """
+    windows = sliding_window_view(x, n_lags)[:, ::-1]
+    start = n0 - first_lag - n_lags + 1
+    return windows[start : start + x.size - n0]
+
+
+def qr_solve(Phi: np.ndarray, Y: np.ndarray, block: int = 10_000) -> np.ndarray:
+    """
+    Least squares solution of Phi θ = Y by QR factorization.
+
+    Only the triangular factor of [Phi, Y] is needed: its last column holds
+    Qᵀ Y, so the tall orthogonal factor Q is never formed. The factor is
+    computed block by block (tall-skinny QR): the triangular factors of the
+    row blocks are stacked and factorized again, which keeps each block in
+    cache.
+    """
+    R = np.vstack(
+        [
+            np.linalg.qr(np.column_stack([Phi[i : i + block], Y[i : i + block]]), "r")
+            for i in range(0, Y.size, block)
+        ]
+    )
+    R = np.linalg.qr(R, mode="r")
+    n = Phi.shape[1]
+    return solve_triangular(R[:n, :n], R[:n, n])
+
+
+def arx_regressors(y: np.ndarray, u: np.ndarray, na: int, nb: int, nk: int):
+    """Regressor matrix and targets of A(q) y = B(q) u + e."""
+    n0 = max(na, nb + nk - 1)
+    Phi = np.hstack([-lagged(y, 1, na, n0), lagged(u, nk, nb, n0)])
+    return Phi, y[n0:]
+
+
+def fit_arx(y: np.ndarray, u: np.ndarray, na: int, nb: int, nk: int = 1):
+    """
+    ARX model A(q) y = B(q) u + e.
+
+    Returns the polynomials A = [1, a1, ..., a_na] and B = [0, ..., b1, ..., b_nb]
+    (with nk leading zeros), as used by scipy.signal.lfilter.
+    """
+    theta = qr_solve(*arx_regressors(y, u, na, nb, nk))
+    return np.r_[1.0, theta[:na]], np.r_[np.zeros(nk), theta[na:]]
+
+
+def fit_armax(
+    y: np.ndarray,
+    u: np.ndarray,
+    na: int,
+    nb: int,
+    nc: int,
+    nk: int = 1,
+    n_high: int = 5,
+    iterations: int = 3,
+    tol: float = 1e-9,
+):
+    """
+    ARMAX model A(q) y = B(q) u + C(q) e.
+
+    The initial estimate follows Hannan-Rissanen: the innovations e are
+    estimated by a high-order ARX model and used as extra regressors. It is then
+    refined by Gauss-Newton on the prediction errors ε = (A y - B u) / C:
+
+        ∂ε/∂a_i = q^{-i}/C y,   ∂ε/∂b_i = -q^{-nk-i+1}/C u,   ∂ε/∂c_i = -q^{-i}/C ε
+
+    Steps that increase the cost or make C unstable are halved.
+
+    Returns the polynomials A, B, and C.
+    """
+    A_high, B_high = fit_arx(y, u, n_high, n_high, nk)
+    e = lfilter(A_high, 1.0, y) - lfilter(B_high, 1.0, u)
+
+    n0 = max(na, nb + nk - 1, nc)
+    Phi = np.hstack(
+        [-lagged(y, 1, na, n0), lagged(u, nk, nb, n0), lagged(e, 1, nc, n0)]
+    )
+    theta = qr_solve(Phi, y[n0:])
+
+    def prediction_errors(theta: np.ndarray) -> np.ndarray:
+        A_, B_, C_ = (
+            np.r_[1.0, theta[:na]],
+            np.r_[np.zeros(nk), theta[na : na + nb]],
+            np.r_[1.0, theta[na + nb :]],
+        )
+        return lfilter(A_, C_, y) - lfilter(B_, C_, u)
+
+    eps = prediction_errors(theta)
+    cost = np.sum(eps[n0:] ** 2)
+    for _ in range(iterations):
+        C_ = np.r_[1.0, theta[na + nb :]]
+        J = np.hstack(
+            [
+                lagged(lfilter([1.0], C_, y), 1, na, n0),
+                -lagged(lfilter([1.0], C_, u), nk, nb, n0),
+                -lagged(lfilter([1.0], C_, eps), 1, nc, n0),
+            ]
+        )
+        step = -qr_solve(J, eps[n0:])
+        for _ in range(20):
+            theta_new = theta + step
+            if np.all(np.abs(np.roots(np.r_[1.0, theta_new[na + nb :]])) < 1):
+                eps_new = prediction_errors(theta_new)
+                cost_new = np.sum(eps_new[n0:] ** 2)
+                if cost_new <= cost:
+                    break
+            step /= 2
+        else:
+            break
+        converged = cost - cost_new <= tol * cost
+        theta, eps, cost = theta_new, eps_new, cost_new
+        if converged:
+            break
+    return (
+        np.r_[1.0, theta[:na]],
+        np.r_[np.zeros(nk), theta[na : na + nb]],
+        np.r_[1.0, theta[na + nb :]],
+    )
+
+
+def fit_oe(
+    y: np.ndarray,
+    u: np.ndarray,
+    nb: int,
+    nf: int,
+    nk: int = 1,
+    iterations: int = 20,
+    tol: float = 1e-9,
+):
+    """
+    Output-error model y = B(q) / F(q) u + e, by Gauss-Newton.
+
+    The simulated output and its gradient are obtained by filtering:
+
+        ŷ = B/F u,   ∂ŷ/∂b_i = q^{-nk-i+1}/F u,   ∂ŷ/∂f_i = -q^{-i}/F ŷ
+
+    The iterations start from an ARX estimate. Steps that increase the cost or
+    make F unstable are halved.
+
+    Returns the polynomials B and F.
+    """
+    F, B = fit_arx(y, u, nf, nb, nk)
+    n0 = max(nf, nb + nk - 1)
+    y_hat = lfilter(B, F, u)
+    cost = np.sum((y - y_hat) ** 2)
+    for _ in range(iterations):
+        u_f = lfilter([1.0], F, u)
+        y_f = lfilter([1.0], F, y_hat)
+        J = np.hstack([lagged(u_f, nk, nb, n0), -lagged(y_f, 1, nf, n0)])
+        step = qr_solve(J, y[n0:] - y_hat[n0:])
+        for _ in range(20):
+            B_new, F_new = B.copy(), F.copy()
+            B_new[nk:] += step[:nb]
+            F_new[1:] += step[nb:]
+            if np.all(np.abs(np.roots(F_new)) < 1):
+                y_new = lfilter(B_new, F_new, u)
+                cost_new = np.sum((y - y_new) ** 2)
+                if cost_new <= cost:
+                    break
+            step /= 2
+        else:
+            break
+        converged = cost - cost_new <= tol * cost
+        B, F, y_hat, cost = B_new, F_new, y_new, cost_new
+        if converged:
+            break
+    return B, F
+
+
+def recursive_least_squares(
+    Phi: np.ndarray, Y: np.ndarray, forgetting: float = 1.0, block: int = 1000
+) -> np.ndarray:
+    """
+    Recursive least squares in information form, updated one block of rows at
+    a time.
+
+    The information matrix R = Σ λ^(N-i) φ_i φ_iᵀ and vector r = Σ λ^(N-i) φ_i y_i
+    are updated by matrix products over each block, with the forgetting factor
+    applied sample by sample, so the result equals the sample-by-sample
+    recursion (with a non-informative start) at every block boundary.
+
+    Returns the estimate after each block, shape (n_blocks, n_params).
+    """
+    n_params = Phi.shape[1]
+    R = np.zeros((n_params, n_params))
+    r = np.zeros(n_params)
+    estimates = []
+    for start in range(0, Y.size, block):
+        Phi_b, Y_b = Phi[start : start + block], Y[start : start + block]
+        weights = forgetting ** np.arange(Y_b.size - 1, -1, -1)
+        R = forgetting**Y_b.size * R + (Phi_b.T * weights) @ Phi_b
+        r = forgetting**Y_b.size * r + (Phi_b.T * weights) @ Y_b
+        estimates.append(np.linalg.solve(R, r))
+    return np.array(estimates)
+
+
+def fit_percent(y: np.ndarray, y_hat: np.ndarray) -> float:
+    """Normalized fit: 100 (1 - ‖y - ŷ‖ / ‖y - mean(y)‖) [%]"""
+    return 100 * (1 - np.linalg.norm(y - y_hat) / np.linalg.norm(y - np.mean(y)))
+
+
+# --- Estimation Data (10⁶ samples) ---
+rng = np.random.default_rng(seed=42)
+n_samples = 1_000_000
+
+start = time.perf_counter()
+Q_est = prbs(n_samples, rng)
+h_est = simulate_plant(Q_est) + rng.normal(0.0, sigma, n_samples)
+print(
+    f"Simulated {n_samples} samples ({n_samples * Ts / 86400:.0f} days) "
+    f"in {time.perf_counter() - start:.2f} s"
+)
+
+# Deviation variables around the operating point
+u = Q_est - Q_op
+y = h_est - h_op
+
+# --- Benchmark ---
+fits = {
+    "ARX": lambda y, u: fit_arx(y, u, na=1, nb=1),
+    "ARMAX": lambda y, u: fit_armax(y, u, na=1, nb=1, nc=1),
+    "OE": lambda y, u: fit_oe(y, u, nb=1, nf=1),
+    "RLS (ARX)": lambda y, u: recursive_least_squares(
+        *arx_regressors(y, u, na=1, nb=1, nk=1)
+    ),
+}
+sizes = np.logspace(3, 6, 7).astype(int)
+timings = {name: [] for name in fits}
+models = {}
+for name, fit in fits.items():
+    for n in sizes:
+        start = time.perf_counter()
+        result = fit(y[:n], u[:n])
+        timings[name].append(time.perf_counter() - start)
+    models[name] = result
+    print(f"{name}: {timings[name][-1] * 1e3:.0f} ms for {n} samples")
+
+# --- Validation on a fresh record ---
+n_val = 2000
+Q_val = prbs(n_val, rng)
+h_val = simulate_plant(Q_val)  # Noise-free, to compare the model outputs
+u_val = Q_val - Q_op
+y_val = h_val - h_op
+
+simulated = {
+    "ARX": lfilter(models["ARX"][1], models["ARX"][0], u_val),
+    "ARMAX": lfilter(models["ARMAX"][1], models["ARMAX"][0], u_val),
+    "OE": lfilter(*models["OE"], u_val),
+}
+for name, y_hat in simulated.items():
+    print(f"{name}: validation fit {fit_percent(y_val, y_hat):.2f}%")
+
+# Linearization at the operating point, discretized with a zero-order hold
+tau = 2 * A * np.sqrt(h_op) / alpha  # Time constant [s]
+K = 2 * np.sqrt(h_op) / alpha  # Static gain [s/m²]
+a1 = -np.exp(-Ts / tau)
+print(f"Linearization: A = [1, {a1:.5f}], B = [0, {K * (1 + a1):.5f}]")
+print(
+    f"ARX:   A = {np.round(models['ARX'][0], 5)}, B = {np.round(models['ARX'][1], 5)}"
+)
+print(
+    f"ARMAX: A = {np.round(models['ARMAX'][0], 5)}, C = {np.round(models['ARMAX'][2], 5)}"
+)
+print(f"OE:    F = {np.round(models['OE'][1], 5)}, B = {np.round(models['OE'][0], 5)}")
+
+# --- Plot results ---
+fig, axs = plt.subplots(2, 2, figsize=(12, 8), constrained_layout=True)
+fig.suptitle("Cubic Tank: Discrete-Time System Identification")
+
+t_val = np.arange(n_val) * Ts
+axs[0, 0].plot(t_val, h_val, "k", lw=2, label="Nonlinear plant")
+for name, y_hat in simulated.items():
+    axs[0, 0].plot(t_val, y_hat + h_op, label=name)
+axs[0, 0].set_xlim(0, 2000)
+axs[0, 0].set_xlabel("Time / s")
+axs[0, 0].set_ylabel("Level / m")
+axs[0, 0].set_title("Validation (Simulated Output)")
+
+n_step = 120
+u_step = np.full(n_step, dQ)
+t_step = np.arange(n_step) * Ts
+h_step = simulate_plant(Q_op + u_step)
+axs[0, 1].plot(t_step, h_step - h_op, "k", lw=2, label="Nonlinear plant")
+axs[0, 1].plot(t_step, lfilter(models["ARX"][1], models["ARX"][0], u_step), label="ARX")
+axs[0, 1].plot(
+    t_step, lfilter(models["ARMAX"][1], models["ARMAX"][0], u_step), label="ARMAX"
+)
+axs[0, 1].plot(t_step, lfilter(*models["OE"], u_step), "--", label="OE")
+axs[0, 1].set_xlabel("Time / s")
+axs[0, 1].set_ylabel("Level change / m")
+axs[0, 1].set_title(f"Step Response ($\\Delta Q$ = {dQ} m$^3\\cdot$s$^{{-1}}$)")
+
+for name, times in timings.items():
+    axs[1, 0].loglog(sizes, times, "o-", label=name)
+axs[1, 0].set_xlabel("Number of samples")
+axs[1, 0].set_ylabel("Wall time / s")
+axs[1, 0].set_title("Identification Time")
+
+Phi, Y = arx_regressors(y, u, na=1, nb=1, nk=1)
+for forgetting in (1.0, 0.9999):
+    rls = recursive_least_squares(Phi, Y, forgetting)
+    samples = np.minimum(np.arange(1, len(rls) + 1) * 1000, Y.size)
+    axs[1, 1].semilogx(samples, rls[:, 0], label=f"RLS, $\\lambda$ = {forgetting}")
+axs[1, 1].axhline(a1, color="k", ls="--", label="Linearization")
+axs[1, 1].axhline(models["OE"][1][1], color="tab:green", ls=":", label="OE")
+axs[1, 1].set_xlabel("Number of samples")
+axs[1, 1].set_ylabel("$a_1$")
+axs[1, 1].set_title("Recursive Least Squares (ARX)")
+
+for ax in axs.flat:
+    ax.grid(True)
+    ax.legend()
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -0,0 +1,322 @@
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import ListedColormap
+from scipy.integrate import solve_ivp
+
+# --- Model Constants ---
+alpha: Final = -1.0
+"""Linear stiffness coefficient (negative: double-well potential)"""
+
+delta: Final = 0.15
+"""Damping coefficient [1/s]"""
+
+attractors: Final = np.array([[-1.0, 0.0], [1.0, 0.0]])
+"""Stable equilibria, at the bottom of the two wells: x = ±sqrt(-alpha), v = 0"""
+
+capture_radius: Final = 0.3
+"""
+Radius of the neighbourhood of each attractor where a trajectory is stopped.
+The circle lies inside the region of negative energy of its well, which no
+damped trajectory can leave, so a captured trajectory never changes basin.
+"""
+
+x_range: Final = (-3.0, 3.0)
+"""Initial positions [m]"""
+
+v_range: Final = (-3.0, 3.0)
+"""Initial velocities [m/s]"""
+
+
+# --- System Dynamics ---
+def model(t: float, y: np.ndarray):
+    """
+    Damped Duffing oscillator (unforced).
+
+    Parameters:
+    - t: time [s]
+    - y: state vector, or a stack of state vectors
+    """
+    x = y[0]  # Position [m]
+    v = y[1]  # Velocity [m/s]
+
+    dxdt = v
+    # x * x**2 rather than x**3: NumPy squares with a multiplication, but cubes
+    # with the general power function, about 100 times slower for negative x
+    d2x_dt2 = -delta * v - alpha * x - x * x**2
+    return [dxdt, d2x_dt2]
+
+
+def energy(x, v):
+    """Mechanical energy [J/kg], which the damping can only decrease"""
+    return v**2 / 2 + alpha * x**2 / 2 + x**4 / 4
+
+
+# --- Basin Engine ---
+def classify(
+    x: np.ndarray,
+    v: np.ndarray,
+    h: float = 0.05,
+    t_max: float = 100.0,
+    check_every: int = 10,
+    early_stop: bool = True,
+):
+    """
+    Integrate a batch of initial conditions and find the attractor of each one.
+
+    The batch is integrated with a fixed-step RK4 method. Every check_every
+    steps, the trajectories inside the capture radius of an attractor are
+    labelled and, with early_stop, removed from the batch, so the cost of each
+    step falls as the batch settles.
+
+    Parameters:
+    - x, v: initial positions and velocities (1-D arrays)
+    - h: step size [s]
+    - t_max: time after which the remaining trajectories are left unlabelled
+    - check_every: number of steps between captures
+    - early_stop: remove the captured trajectories from the batch
+
+    Returns:
+    - Label of each initial condition (index of the attractor plus one, or 0)
+    - Time of capture [s] (t_max if not captured)
+    - Number of trajectory-steps computed
+    """
+    x, v = np.array(x, dtype=float), np.array(v, dtype=float)
+    labels = np.zeros(x.size, dtype=np.int8)
+    t_capture = np.full(x.size, t_max, dtype=np.float32)
+    active = np.arange(x.size)
+    work = 0
+
+    for k in range(1, round(t_max / h) + 1):
+        # Classic fourth-order Runge-Kutta step, for the whole batch
+        k1x, k1v = model(0.0, (x, v))
+        k2x, k2v = model(0.0, (x + h / 2 * k1x, v + h / 2 * k1v))
+        k3x, k3v = model(0.0, (x + h / 2 * k2x, v + h / 2 * k2v))
+        k4x, k4v = model(0.0, (x + h * k3x, v + h * k3v))
+        x = x + h / 6 * (k1x + 2 * k2x + 2 * k3x + k4x)
+        v = v + h / 6 * (k1v + 2 * k2v + 2 * k3v + k4v)
+        work += x.size
+
+        if k % check_every:
+            continue
+        distance = np.hypot(
+            x - attractors[:, 0, None], v - attractors[:, 1, None]
+        )  # Shape (n_attractors, n_active)
+        captured = distance.min(axis=0) < capture_radius
+        new = captured & (labels[active] == 0)
+        labels[active[new]] = distance[:, new].argmin(axis=0) + 1
+        t_capture[active[new]] = k * h
+        if early_stop:
+            x, v, active = x[~captured], v[~captured], active[~captured]
+            if active.size == 0:
+                break
+        elif (labels > 0).all():
+            break
+
+    return labels, t_capture, work
+
+
+def run_tile(
+    labels_path: Path,
+    times_path: Path,
+    rows: slice,
+    cols: slice,
+    n: int,
+    early_stop: bool,
+) -> int:
+    """Worker: classify one tile of the grid and write it into the memory maps."""
+    x_grid = np.linspace(*x_range, n)[cols]
+    v_grid = np.linspace(*v_range, n)[rows]
+    X, V = np.meshgrid(x_grid, v_grid)
+    labels, t_capture, work = classify(X.ravel(), V.ravel(), early_stop=early_stop)
+
+    image = np.load(labels_path, mmap_mode="r+")
+    image[rows, cols] = labels.reshape(X.shape)
+    image.flush()
+    times = np.load(times_path, mmap_mode="r+")
+    times[rows, cols] = t_capture.reshape(X.shape)
+    times.flush()
+    return work
+
+
+def basin_map(
+    n: int,
+    work_dir: Path,
+    tile: int = 250,
+    max_workers: int | None = None,
+    early_stop: bool = True,
+):
+    """
+    Map the basins of attraction over an n x n grid of initial conditions.
+
+    The grid is split into tiles of tile x tile initial conditions, which are
+    classified in parallel over a process pool. Each worker writes its tile
+    straight into two ``.npy`` memory-mapped images in ``work_dir``, so no
+    image is sent back to the main process, and the images never need to fit
+    in memory.
+
+    Parameters:
+    - n: number of initial conditions along each axis
+    - work_dir: folder of the memory-mapped images
+    - tile: side of the tiles
+    - max_workers: number of processes (default: all cores)
+    - early_stop: remove the captured trajectories from the batches
+
+    Returns:
+    - Read-only memory maps of the labels and the capture times, with the
+      velocity along the rows and the position along the columns
+    - Number of trajectory-steps computed
+    """
+    work_dir.mkdir(parents=True, exist_ok=True)
+    labels_path = work_dir / f"basins-{n}-labels.npy"
+    times_path = work_dir / f"basins-{n}-times.npy"
+    np.lib.format.open_memmap(labels_path, "w+", dtype=np.int8, shape=(n, n)).flush()
+    np.lib.format.open_memmap(times_path, "w+", dtype=np.float32, shape=(n, n)).flush()
+
+    tiles = [
+        (slice(i, i + tile), slice(j, j + tile))
+        for i in range(0, n, tile)
+        for j in range(0, n, tile)
+    ]
+    work = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                run_tile, labels_path, times_path, rows, cols, n, early_stop
+            )
+            for rows, cols in tiles
+        ]
+        for future in as_completed(futures):
+            work += future.result()
+
+    return np.load(labels_path, mmap_mode="r"), np.load(times_path, mmap_mode="r"), work
+
+
+def reference_label(x0: float, v0: float) -> int:
+    """Attractor of one initial condition, with a tight adaptive solver"""
+
+    def trapped(t, y):
+        return energy(*y) + 0.01  # Below the energy of the saddle (0)
+
+    trapped.terminal = True
+    sol = solve_ivp(
+        model,
+        (0, 1000),
+        [x0, v0],
+        method="DOP853",
+        rtol=1e-10,
+        atol=1e-12,
+        events=trapped,
+    )
+    return 1 if sol.y[0, -1] < 0 else 2
+
+
+# --- Make simulations ---
+if __name__ == "__main__":
+    work_dir = Path(tempfile.gettempdir()) / "model-library-basins"
+    shutil.rmtree(work_dir, ignore_errors=True)  # Start from clean images
+    workers = os.cpu_count()
+
+    # Early stopping, on a smaller map
+    n_small = 500
+    timings = {}
+    for early_stop in [False, True]:
+        start = time.perf_counter()
+        labels_small, _, work = basin_map(
+            n_small, work_dir / str(early_stop), early_stop=early_stop
+        )
+        timings[early_stop] = time.perf_counter() - start, work, np.array(labels_small)
+    print(f"{n_small} x {n_small} map, {workers} worker(s):")
+    for early_stop, (elapsed, work, _) in timings.items():
+        print(
+            f"  early stop {early_stop!s:>5}: {elapsed:6.1f} s, "
+            f"{work / n_small**2:.0f} steps per initial condition"
+        )
+    same = np.mean(timings[True][2] == timings[False][2])
+    print(f"  Same labels with and without early stop: {same:.2%}")
+
+    # Full map
+    n = 2000
+    start = time.perf_counter()
+    labels, t_capture, work = basin_map(n, work_dir)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{n} x {n} map, {workers} worker(s): {elapsed:.1f} s, "
+        f"{work / n**2:.0f} steps per initial condition, "
+        f"{np.mean(labels == 0):.3%} not captured"
+    )
+
+    # Check random pixels, and pixels on a basin boundary, with an adaptive solver
+    rng = np.random.default_rng(0)
+    x_grid, v_grid = np.linspace(*x_range, n), np.linspace(*v_range, n)
+    edge = np.zeros((n, n), dtype=bool)
+    edge[:, :-1] |= labels[:, :-1] != labels[:, 1:]
+    edge[:-1, :] |= labels[:-1, :] != labels[1:, :]
+    boundary = np.argwhere(edge)
+    samples = {
+        "random pixels": rng.integers(0, n, size=(1000, 2)),
+        "boundary pixels": boundary[rng.choice(len(boundary), 1000, replace=False)],
+    }
+    for name, sample in samples.items():
+        agree = [
+            labels[i, j] == reference_label(x_grid[j], v_grid[i]) for i, j in sample
+        ]
+        print(f"Agreement with DOP853 on {len(sample)} {name}: {np.mean(agree):.1%}")
+    print(f"Boundary pixels: {edge.mean():.2%} of the map")
+
+    # --- Plot results ---
+    fig, axs = plt.subplots(2, 2, figsize=(13, 11), constrained_layout=True)
+    fig.suptitle("Basins of Attraction of the Damped Duffing Oscillator")
+    extent = [*x_range, *v_range]
+    cmap = ListedColormap(["tab:gray", "tab:blue", "tab:orange"])
+
+    ax = axs[0, 0]
+    ax.imshow(labels, origin="lower", extent=extent, cmap=cmap, vmin=0, vmax=2)
+    ax.plot(*attractors.T, "o", ms=8, mfc="white", mec="black", linestyle="none")
+    ax.plot(0, 0, "X", ms=9, color="black")
+    ax.set_title(f"Basins, {n} × {n} initial conditions")
+
+    ax = axs[0, 1]
+    image = ax.imshow(t_capture, origin="lower", extent=extent, cmap="magma", vmin=0)
+    fig.colorbar(image, ax=ax, label="Time to capture / s")
+    ax.set_title("Time to reach the capture radius")
+
+    # Zoom on the spirals, at full resolution
+    ax = axs[1, 0]
+    rows, cols = slice(1500, 2000), slice(1500, 2000)
+    zoom = [x_grid[cols][0], x_grid[cols][-1], v_grid[rows][0], v_grid[rows][-1]]
+    ax.imshow(
+        labels[rows, cols], origin="lower", extent=zoom, cmap=cmap, vmin=0, vmax=2
+    )
+    ax.set_title("Zoom, 500 × 500 initial conditions")
+
+    for ax in axs.flat[:3]:
+        ax.set_xlabel("Initial position / m")
+        ax.set_ylabel("Initial velocity / m$\\cdot$s$^{-1}$")
+
+    ax = axs[1, 1]
+    t = np.linspace(0, t_capture.max(), 501)
+    remaining = 1 - np.searchsorted(np.sort(t_capture.ravel()), t, "right") / n**2
+    ax.plot(t, remaining)
+    ax.set_yscale("log")
+    ax.set_title("Share of the trajectories still integrated (early stop)")
+    ax.set_xlabel("Time / s")
+    ax.set_ylabel("Share of the batch")
+    ax.grid(True, which="both", alpha=0.3)
+
+    # Save plot to file
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+    save_path = os.path.join(script_dir, "results", "scipy.png")
+    plt.savefig(save_path)
+    print(f"Plot saved to {save_path}")
+
+    # Remove the memory-mapped images from the temporary folder
+    shutil.rmtree(work_dir)
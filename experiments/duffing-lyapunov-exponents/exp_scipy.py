@@ -0,0 +1,377 @@
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.colors import ListedColormap
+from scipy.integrate import solve_ivp
+
+# --- Model Constants ---
+alpha: Final = -1.0
+"""Linear stiffness coefficient (negative: double-well potential)"""
+
+delta: Final = 0.3
+"""Damping coefficient [1/s]"""
+
+y0: Final = (1.0, 0.0)
+"""Initial position [m] and velocity [m/s], at the bottom of the right well"""
+
+gamma_range: Final = (0.05, 0.8)
+"""Forcing amplitudes [m/s²]"""
+
+omega_range: Final = (0.6, 1.8)
+"""Forcing frequencies [rad/s]"""
+
+# --- Integration Constants ---
+steps_per_period: Final = 50
+"""RK4 steps per period of the forcing"""
+
+n_transient: Final = 100
+"""Periods of the forcing discarded before the exponents are averaged"""
+
+n_periods: Final = 200
+"""Periods of the forcing over which the exponents are averaged"""
+
+n_strobe: Final = 32
+"""Last periods at which the position is sampled (stroboscopic map)"""
+
+
+# --- System Dynamics ---
+def model(t, y, gamma, omega):
+    """
+    Forced Duffing oscillator, for a batch of parameter points.
+
+    Parameters:
+    - t: time [s] (scalar, or one time per point)
+    - y: states, of shape (2, n_points)
+    - gamma, omega: forcing amplitude [m/s²] and frequency [rad/s] of each point
+    """
+    x = y[0]  # Position [m]
+    v = y[1]  # Velocity [m/s]
+
+    dxdt = v
+    # x * x**2 rather than x**3, see the basins of attraction experiment
+    d2x_dt2 = -delta * v - alpha * x - x * x**2 + gamma * np.cos(omega * t)
+    return np.array([dxdt, d2x_dt2])
+
+
+def jacobian(t, y, gamma, omega):
+    """Jacobian df/dy of each point of the batch, of shape (2, 2, n_points)"""
+    x = y[0]
+    J = np.zeros((2, 2, x.size))
+    J[0, 1] = 1.0
+    J[1, 0] = -alpha - 3 * x**2
+    J[1, 1] = -delta
+    return J
+
+
+# --- Lyapunov Engine ---
+def orthonormalize(Q: np.ndarray):
+    """
+    QR decomposition of a batch of tangent bases, by Gram-Schmidt.
+
+    For a few tangent vectors, a loop over the columns, vectorized over the
+    batch, is several times faster than np.linalg.qr on a stack of matrices.
+
+    Parameters:
+    - Q: tangent vectors, of shape (n, k, n_points)
+
+    Returns:
+    - Orthonormal bases, of the same shape, and the diagonals of R (k, n_points)
+    """
+    Q = Q.copy()
+    norms = np.empty(Q.shape[1:])
+    for j in range(Q.shape[1]):
+        for i in range(j):
+            Q[:, j] -= np.einsum("nb,nb->b", Q[:, i], Q[:, j]) * Q[:, i]
+        norms[j] = np.sqrt(np.einsum("nb,nb->b", Q[:, j], Q[:, j]))
+        Q[:, j] /= norms[j]
+    return Q, norms
+
+
+def lyapunov(
+    gamma: np.ndarray,
+    omega: np.ndarray,
+    n_vectors: int = 2,
+    qr_every: int = 5,
+):
+    """
+    Lyapunov exponents of a batch of parameter points.
+
+    The states and k = n_vectors tangent vectors of every point are integrated
+    together with a fixed-step RK4 method, over the same number of steps per
+    period of the forcing. Every qr_every steps, the tangent vectors are
+    re-orthonormalized, and the logarithms of the diagonal of R are summed.
+    With n_vectors = 1, only the maximal exponent is computed, and the QR
+    decomposition reduces to a normalization.
+
+    Parameters:
+    - gamma, omega: forcing amplitude and frequency of each point (1-D arrays)
+    - n_vectors: number of exponents
+    - qr_every: number of steps between re-orthonormalizations
+
+    Returns:
+    - Lyapunov exponents, in decreasing order, of shape (n_points, n_vectors)
+      [1/s]
+    - Positions at the last n_strobe periods of the forcing (n_points,
+      n_strobe) [m]
+    """
+    gamma = np.asarray(gamma, dtype=float)
+    omega = np.asarray(omega, dtype=float)
+    h = 2 * np.pi / omega / steps_per_period
+    y = np.repeat(np.array(y0)[:, None], gamma.size, axis=1)
+    # Batch along the last axis: the products J @ Q of the 2 x 2 blocks are
+    # then a few long vector operations, 6 times faster than np.matmul on a
+    # stack of (n_points, 2, 2) matrices
+    Q = np.repeat(np.eye(2)[:, :n_vectors, None], gamma.size, axis=2)
+    log_sum = np.zeros((n_vectors, gamma.size))
+    strobe = np.empty((gamma.size, n_strobe))
+
+    def rhs(t, y, Q):
+        J = jacobian(t, y, gamma, omega)
+        return model(t, y, gamma, omega), np.einsum("ijb,jkb->ikb", J, Q)
+
+    n_steps = (n_transient + n_periods) * steps_per_period
+    for k in range(n_steps):
+        t = k * h
+        k1y, k1Q = rhs(t, y, Q)
+        k2y, k2Q = rhs(t + h / 2, y + h / 2 * k1y, Q + h / 2 * k1Q)
+        k3y, k3Q = rhs(t + h / 2, y + h / 2 * k2y, Q + h / 2 * k2Q)
+        k4y, k4Q = rhs(t + h, y + h * k3y, Q + h * k3Q)
+        y = y + h / 6 * (k1y + 2 * k2y + 2 * k3y + k4y)
+        Q = Q + h / 6 * (k1Q + 2 * k2Q + 2 * k3Q + k4Q)
+
+        if (k + 1) % qr_every == 0:
+            Q, norms = orthonormalize(Q)
+            if k >= n_transient * steps_per_period:
+                log_sum += np.log(norms)
+        period, step = divmod(k + 1, steps_per_period)
+        if step == 0 and period > n_transient + n_periods - n_strobe:
+            strobe[:, period - (n_transient + n_periods - n_strobe) - 1] = y[0]
+
+    averaging_time = n_periods * 2 * np.pi / omega
+    return (log_sum / averaging_time).T, strobe
+
+
+def classify(exponents: np.ndarray, strobe: np.ndarray, tol: float = 1e-4):
+    """
+    Regime of each point: 0 for chaos (positive maximal exponent), 1 to 3 for
+    a periodic orbit of 1 to 3 periods of the forcing, or 4 for longer or
+    quasi-periodic orbits.
+    """
+    regime = np.full(len(strobe), 4, dtype=np.int8)
+    for p in range(3, 0, -1):
+        repeats = np.abs(strobe[:, p:] - strobe[:, :-p]).max(axis=1) < tol
+        regime[repeats] = p
+    regime[exponents[:, 0] > 0.01] = 0
+    return regime
+
+
+def run_tile(path: Path, rows: slice, n: int) -> None:
+    """Worker: compute the exponents of some rows of the map, into the memory map."""
+    G, W = np.meshgrid(np.linspace(*gamma_range, n), np.linspace(*omega_range, n)[rows])
+    exponents, strobe = lyapunov(G.ravel(), W.ravel())
+    regime = classify(exponents, strobe)
+
+    results = np.load(path, mmap_mode="r+")
+    results[rows, :, :2] = exponents.reshape(*G.shape, 2)
+    results[rows, :, 2] = regime.reshape(G.shape)
+    results.flush()
+
+
+def regime_map(n: int, work_dir: Path, rows_per_tile: int = 25, max_workers=None):
+    """
+    Lyapunov spectrum and regime over an n x n grid of forcing parameters.
+
+    The rows of the grid are split into tiles of rows_per_tile rows, computed
+    as batches in parallel over a process pool. Each worker writes its tile
+    straight into a ``.npy`` memory map in ``work_dir``.
+
+    Returns:
+    - Read-only memory map of shape (n, n, 3), with the frequency along the
+      rows and the amplitude along the columns: the two exponents, and the
+      regime (see classify)
+    """
+    work_dir.mkdir(parents=True, exist_ok=True)
+    path = work_dir / f"lyapunov-{n}.npy"
+    np.lib.format.open_memmap(path, "w+", dtype=np.float64, shape=(n, n, 3)).flush()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(run_tile, path, slice(i, i + rows_per_tile), n)
+            for i in range(0, n, rows_per_tile)
+        ]
+        for future in as_completed(futures):
+            future.result()
+
+    return np.load(path, mmap_mode="r")
+
+
+def reference_exponent(gamma: float, omega: float) -> float:
+    """
+    Maximal exponent of one point with an adaptive solver (DOP853), with the
+    same transient, averaging time and renormalization every period.
+    """
+    T = 2 * np.pi / omega
+
+    def augmented(t, z):
+        J = jacobian(t, z[:2, None], gamma, omega)[:, :, 0]
+        return np.concatenate([model(t, z[:2], gamma, omega), J @ z[2:]])
+
+    z = np.array([*y0, 1.0, 0.0])
+    log_sum = 0.0
+    for period in range(n_transient + n_periods):
+        t_span = (period * T, (period + 1) * T)
+        z = solve_ivp(augmented, t_span, z, method="DOP853", rtol=1e-10, atol=1e-12).y[
+            :, -1
+        ]
+        norm = np.linalg.norm(z[2:])
+        z[2:] /= norm
+        if period >= n_transient:
+            log_sum += np.log(norm)
+    return log_sum / (n_periods * T)
+
+
+# --- Make simulations ---
+if __name__ == "__main__":
+    work_dir = Path(tempfile.gettempdir()) / "model-library-lyapunov"
+    shutil.rmtree(work_dir, ignore_errors=True)  # Start from a clean map
+    workers = os.cpu_count()
+
+    # Line through the map, at a fixed frequency
+    omega_line = 1.2
+    gamma_line = np.linspace(*gamma_range, 1000)
+    for n_vectors in [1, 2]:
+        start = time.perf_counter()
+        exponents, strobe = lyapunov(
+            gamma_line, np.full_like(gamma_line, omega_line), n_vectors
+        )
+        print(
+            f"Line of {gamma_line.size} points, {n_vectors} exponent(s): "
+            f"{time.perf_counter() - start:.1f} s"
+        )
+        if n_vectors == 1:
+            lambda_max = exponents[:, 0]
+    print(
+        f"  Maximal exponent, 1 vs 2 tangent vectors: max difference "
+        f"{np.abs(lambda_max - exponents[:, 0]).max():.1e}"
+    )
+    print(
+        f"  Sum of the exponents + delta: max {np.abs(exponents.sum(axis=1) + delta).max():.1e}"
+    )
+
+    # Cost of the same engine, one point at a time
+    start = time.perf_counter()
+    for gamma in gamma_line[:5]:
+        lyapunov([gamma], [omega_line])
+    t_single = (time.perf_counter() - start) / 5
+    print(
+        f"  One point at a time: {t_single:.2f} s per point, "
+        f"about {t_single * gamma_line.size:.0f} s for the line"
+    )
+
+    # Check against an adaptive solver
+    rng = np.random.default_rng(0)
+    sample = rng.choice(gamma_line.size, 10, replace=False)
+    print("Maximal exponent, batch RK4 vs DOP853:")
+    start = time.perf_counter()
+    for i in sorted(sample):
+        reference = reference_exponent(gamma_line[i], omega_line)
+        print(
+            f"  gamma = {gamma_line[i]:.3f}: {exponents[i, 0]:+.4f} vs "
+            f"{reference:+.4f} 1/s"
+        )
+    print(f"  DOP853: {(time.perf_counter() - start) / len(sample):.1f} s per point")
+
+    # Regime map
+    n = 200
+    start = time.perf_counter()
+    results = regime_map(n, work_dir)
+    elapsed = time.perf_counter() - start
+    regime = results[:, :, 2].astype(int)
+    print(
+        f"{n} x {n} map, {workers} worker(s): {elapsed:.1f} s, "
+        f"{elapsed / n**2 * 1e3:.1f} ms per point"
+    )
+    print(
+        f"  Sum of the exponents + delta: max "
+        f"{np.abs(results[:, :, :2].sum(axis=2) + delta).max():.1e}"
+    )
+    for r, name in enumerate(["chaos", "period 1", "period 2", "period 3", "other"]):
+        print(f"  {name}: {np.mean(regime == r):.1%}")
+
+    # --- Plot results ---
+    fig, axs = plt.subplots(2, 2, figsize=(13, 11), constrained_layout=True)
+    fig.suptitle("Lyapunov Exponents of the Forced Duffing Oscillator")
+    extent = [*gamma_range, *omega_range]
+
+    ax = axs[0, 0]
+    lambda_1 = results[:, :, 0]
+    limit = np.abs(lambda_1).max()
+    image = ax.imshow(
+        lambda_1,
+        origin="lower",
+        extent=extent,
+        aspect="auto",
+        cmap="RdBu_r",
+        vmin=-limit,
+        vmax=limit,
+    )
+    fig.colorbar(image, ax=ax, label="Maximal exponent / s$^{-1}$")
+    ax.set_title(f"Maximal Lyapunov exponent, {n} × {n} points")
+
+    ax = axs[0, 1]
+    colors = ["black", "tab:blue", "tab:orange", "tab:green", "tab:gray"]
+    image = ax.imshow(
+        regime,
+        origin="lower",
+        extent=extent,
+        aspect="auto",
+        cmap=ListedColormap(colors),
+        vmin=-0.5,
+        vmax=4.5,
+        interpolation="nearest",
+    )
+    bar = fig.colorbar(image, ax=ax, ticks=range(5))
+    bar.ax.set_yticklabels(["Chaos", "Period 1", "Period 2", "Period 3", "Other"])
+    ax.set_title("Regime (period of the stroboscopic map)")
+
+    for ax in axs[0]:
+        ax.axhline(omega_line, color="white", ls="--", lw=1)
+        ax.set_xlabel("Forcing amplitude $\\gamma$ / m$\\cdot$s$^{-2}$")
+        ax.set_ylabel("Forcing frequency $\\omega$ / rad$\\cdot$s$^{-1}$")
+
+    ax = axs[1, 0]
+    ax.plot(
+        np.repeat(gamma_line, n_strobe), strobe.ravel(), ",", color="black", alpha=0.5
+    )
+    ax.set_title(f"Stroboscopic map, $\\omega = {omega_line}$")
+    ax.set_ylabel("Position / m")
+
+    ax = axs[1, 1]
+    ax.plot(gamma_line, exponents[:, 0], label="$\\lambda_1$")
+    ax.plot(gamma_line, exponents[:, 1], label="$\\lambda_2$")
+    ax.axhline(-delta, color="black", ls="--", lw=1, label="$-\\delta$")
+    ax.axhline(0, color="gray", lw=0.8)
+    ax.set_title(f"Lyapunov spectrum, $\\omega = {omega_line}$")
+    ax.set_ylabel("Exponent / s$^{-1}$")
+    ax.legend()
+
+    for ax in axs[1]:
+        ax.set_xlabel("Forcing amplitude $\\gamma$ / m$\\cdot$s$^{-2}$")
+        ax.grid(True, alpha=0.3)
+
+    # Save plot to file
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+    save_path = os.path.join(script_dir, "results", "scipy.png")
+    plt.savefig(save_path)
+    print(f"Plot saved to {save_path}")
+
+    # Remove the memory-mapped map from the temporary folder
+    shutil.rmtree(work_dir)
@@ -0,0 +1,740 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.sparse import csr_matrix, lil_matrix
+
+# --- Physical Constants ---
+# Same constants as the two-CSTRs-and-separator model (time in hours)
+rho: Final = 1000.0  # Fluid density [kg/m³]
+Cp: Final = 4.2  # Heat capacity [kJ/kg·K]
+m: Final = 0.00279  # Molality [kmol/kg]
+R: Final = 8.314  # Universal gas constant [kJ/kmol·K]
+k1: Final = 2.77e3 * 3600  # Pre-exponential factor for reaction A -> B [1/h]
+k2: Final = 2.5e3 * 3600  # Pre-exponential factor for reaction B -> C [1/h]
+E1: Final = 5.0e4  # Activation energy for reaction A -> B [kJ/kmol]
+E2: Final = 6.0e4  # Activation energy for reaction B -> C [kJ/kmol]
+dH1: Final = -6.0e4  # Heat of reaction A -> B [kJ/kmol]
+dH2: Final = -7.0e4  # Heat of reaction B -> C [kJ/kmol]
+alphaA: Final = 5.0  # Relative volatility of component A [-]
+alphaB: Final = 1.0  # Relative volatility of component B [-]
+alphaC: Final = 0.5  # Relative volatility of component C [-]
+
+# A stream is a row [F, T, xA, xB]: flow rate [m³/h], temperature [K] and mole
+# fractions of A and B [-]
+STREAM: Final = 4
+
+
+# --- Outlet Laws ---
+class Pump:
+    """Outlet with a fixed flow rate F [m³/h]."""
+
+    def __init__(self, F: float):
+        self.F, self.Cv = F, 0.0
+
+
+class Valve:
+    """Gravity-driven outlet through a valve, F = Cv·√V [m³/h]."""
+
+    def __init__(self, Cv: float):
+        self.F, self.Cv = 0.0, Cv
+
+
+# --- Unit Models ---
+class Unit(ABC):
+    """
+    Base class of the unit models.
+
+    A unit has n_states states and named outlet ports. All its inlets are mixed,
+    so the unit only sees their totals, inflow = [ΣF, ΣF·T, ΣF·xA, ΣF·xB].
+
+    The model methods are written for a batch of k units of the same class:
+    x has shape (k, n_states), each parameter has shape (k, ...), and the
+    outputs have shape (k, n_ports, STREAM).
+    """
+
+    n_states = 0
+    algebraic = False  # True when the outputs depend on the inlets
+
+    def __init__(self, name: str, ports: tuple[str, ...]):
+        self.name = name
+        self.ports = ports
+
+    def parameters(self) -> dict:
+        return {}
+
+    @classmethod
+    @abstractmethod
+    def outputs(cls, t: float, x: np.ndarray, p: dict, inflow: np.ndarray):
+        """Streams leaving each port, shape (k, n_ports, STREAM)"""
+
+    @classmethod
+    def derivatives(cls, t: float, x: np.ndarray, p: dict, inflow: np.ndarray):
+        return np.empty((len(x), 0))
+
+
+class Feed(Unit):
+    """Fresh feed, with an optional step of its temperature at t_step."""
+
+    def __init__(self, name, F, T, xA=1.0, xB=0.0, T_step=None, t_step=np.inf):
+        super().__init__(name, ("out",))
+        self.F, self.T, self.xA, self.xB = F, T, xA, xB
+        self.T_step = T if T_step is None else T_step
+        self.t_step = t_step
+
+    def parameters(self):
+        return {k: getattr(self, k) for k in ("F", "T", "xA", "xB", "T_step", "t_step")}
+
+    @classmethod
+    def outputs(cls, t, x, p, inflow):
+        T = np.where(t < p["t_step"], p["T"], p["T_step"])
+        return np.stack([p["F"], T, p["xA"], p["xB"]], axis=1)[:, None, :]
+
+
+class Mixer(Unit):
+    """Mixes all its inlets into one stream."""
+
+    algebraic = True
+
+    def __init__(self, name):
+        super().__init__(name, ("out",))
+
+    @classmethod
+    def outputs(cls, t, x, p, inflow):
+        out = inflow.copy()
+        out[:, 1:] /= inflow[:, :1]
+        return out[:, None, :]
+
+
+class Splitter(Unit):
+    """Splits its mixed inlet into streams with the given flow fractions."""
+
+    algebraic = True
+
+    def __init__(self, name, fractions):
+        super().__init__(name, tuple(f"out{i}" for i in range(len(fractions))))
+        self.fractions = fractions
+
+    def parameters(self):
+        return {"fractions": self.fractions}
+
+    @classmethod
+    def outputs(cls, t, x, p, inflow):
+        mixed = Mixer.outputs(t, x, p, inflow)
+        out = np.repeat(mixed, p["fractions"].shape[1], axis=1)
+        out[:, :, 0] *= p["fractions"]
+        return out
+
+
+class Holdup(Unit):
+    """
+    Perfectly mixed liquid holdup with states [V, T, xA, xB].
+
+    Each outlet port has an outlet law (Pump or Valve). The liquid outlets leave
+    with the composition of the holdup; subclasses can change the composition of
+    some outlets (vapor) and add reactions.
+    """
+
+    n_states = 4
+
+    def __init__(self, name, outlets: dict, Q=0.0):
+        super().__init__(name, tuple(outlets))
+        self.outlets = outlets
+        self.Q = Q
+
+    def parameters(self):
+        return {
+            "Q": self.Q,
+            "F": [law.F for law in self.outlets.values()],
+            "Cv": [law.Cv for law in self.outlets.values()],
+        }
+
+    @classmethod
+    def flows(cls, x, p):
+        return p["F"] + p["Cv"] * np.sqrt(x[:, :1])
+
+    @classmethod
+    def compositions(cls, x, p):
+        return np.repeat(x[:, None, 2:], p["F"].shape[1], axis=1)
+
+    @classmethod
+    def reaction(cls, x):
+        """Heating rate [K/h] and reaction rates of A and B [1/h]."""
+        return 0.0, 0.0, 0.0
+
+    @classmethod
+    def outputs(cls, t, x, p, inflow):
+        out = np.empty((len(x), p["F"].shape[1], STREAM))
+        out[:, :, 0] = cls.flows(x, p)
+        out[:, :, 1] = x[:, 1:2]
+        out[:, :, 2:] = cls.compositions(x, p)
+        return out
+
+    @classmethod
+    def derivatives(cls, t, x, p, inflow):
+        V, T = x[:, 0], x[:, 1]
+        out = cls.outputs(t, x, p, inflow)
+        F_in = inflow[:, 0]
+        # Outlets leaving with another composition than the holdup (vapor)
+        dx_out = np.einsum("kp,kpc->kc", out[:, :, 0], out[:, :, 2:] - x[:, None, 2:])
+        heating, rA, rB = cls.reaction(x)
+
+        dxdt = np.empty_like(x)
+        dxdt[:, 0] = F_in - out[:, :, 0].sum(axis=1)
+        dxdt[:, 1] = (inflow[:, 1] - F_in * T) / V + p["Q"] / (rho * Cp * V) + heating
+        dxdt[:, 2:] = (inflow[:, 2:] - F_in[:, None] * x[:, 2:] - dx_out) / V[:, None]
+        dxdt[:, 2] += rA
+        dxdt[:, 3] += rB
+        return dxdt
+
+
+class Tank(Holdup):
+    """Storage tank, without reactions."""
+
+
+class CSTR(Holdup):
+    """Heated CSTR with the reactions A -> B -> C."""
+
+    @classmethod
+    def reaction(cls, x):
+        T, xA, xB = x[:, 1], x[:, 2], x[:, 3]
+        r1 = k1 * np.exp(-E1 / (R * T)) * xA
+        r2 = k2 * np.exp(-E2 / (R * T)) * xB
+        return -(m / Cp) * (r1 * dH1 + r2 * dH2), -r1, r1 - r2
+
+
+class Separator(Holdup):
+    """
+    Flash separator with a liquid product, a vapor recycle and a vapor purge.
+
+    The vapor is in equilibrium with the liquid (constant relative
+    volatilities), and the purge flow is a fraction eps of the recycle flow.
+    """
+
+    def __init__(self, name, product, recycle, Q=0.0, eps=0.02):
+        super().__init__(
+            name, {"product": product, "recycle": recycle, "purge": Pump(0)}, Q
+        )
+        self.eps = eps
+
+    def parameters(self):
+        return super().parameters() | {"eps": self.eps}
+
+    @classmethod
+    def flows(cls, x, p):
+        F = super().flows(x, p)
+        F[:, 2] = p["eps"] * F[:, 1]
+        return F
+
+    @classmethod
+    def compositions(cls, x, p):
+        xA, xB = x[:, 2], x[:, 3]
+        denom = alphaA * xA + alphaB * xB + alphaC * (1 - xA - xB)
+        comp = super().compositions(x, p)
+        comp[:, 1:, 0] = (alphaA * xA / denom)[:, None]
+        comp[:, 1:, 1] = (alphaB * xB / denom)[:, None]
+        return comp
+
+
+# --- Flowsheet ---
+class Flowsheet:
+    """
+    Units connected through named ports, flattened into a single ODE system.
+
+    build() fixes everything that does not change during the integration:
+    - the state slice of each unit in the global state vector;
+    - a row of a preallocated stream array for each outlet port;
+    - a sparse incidence matrix that sums the streams entering each unit;
+    - the evaluation order: units whose outputs depend only on their states
+      (or on time) first, then the algebraic units (mixers, splitters) in
+      topological order;
+    - the sparsity pattern of the Jacobian, from the connectivity.
+    Units of the same class at the same stage are evaluated as one batch.
+    """
+
+    def __init__(self):
+        self.units: dict[str, Unit] = {}
+        self.connections: dict[tuple[str, str], str] = {}
+
+    def add(self, unit: Unit) -> Unit:
+        if unit.name in self.units:
+            raise ValueError(f"Duplicate unit name: {unit.name}")
+        self.units[unit.name] = unit
+        return unit
+
+    def connect(self, source: str, destination: str):
+        """Connect the outlet port source ("unit.port") to the unit destination."""
+        name, port = source.split(".")
+        if port not in self.units[name].ports:
+            raise ValueError(f"Unit {name} has no port {port}")
+        if destination not in self.units:
+            raise ValueError(f"Unknown unit: {destination}")
+        if (name, port) in self.connections:
+            raise ValueError(f"Port {source} is already connected")
+        self.connections[(name, port)] = destination
+
+    def build(self, batched: bool = True):
+        """
+        Flatten the flowsheet.
+
+        Parameters:
+        - batched: evaluate the units of the same class together (otherwise
+          one at a time)
+        """
+        units = list(self.units.values())
+        index = {u.name: i for i, u in enumerate(units)}
+
+        # State slices and stream rows
+        self.slices, offset = {}, 0
+        for u in units:
+            self.slices[u.name] = slice(offset, offset + u.n_states)
+            offset += u.n_states
+        self.n_states = offset
+        self.rows, row = {}, 0
+        for u in units:
+            for port in u.ports:
+                self.rows[(u.name, port)] = row
+                row += 1
+        self.streams = np.zeros((row, STREAM))
+
+        incidence = lil_matrix((len(units), row))
+        inlets = defaultdict(list)
+        for (name, port), destination in self.connections.items():
+            incidence[index[destination], self.rows[(name, port)]] = 1.0
+            inlets[destination].append(name)
+        incidence = csr_matrix(incidence)
+
+        # Evaluation order (Kahn's algorithm on the algebraic units)
+        algebraic = [u.name for u in units if u.algebraic]
+        n_upstream = {
+            a: sum(self.units[s].algebraic for s in inlets[a]) for a in algebraic
+        }
+        levels = [[a for a in algebraic if n_upstream[a] == 0]]
+        done = len(levels[0])
+        while levels[-1]:
+            level = []
+            for a in levels[-1]:
+                for (name, _), destination in self.connections.items():
+                    if name == a and self.units[destination].algebraic:
+                        n_upstream[destination] -= 1
+                        if n_upstream[destination] == 0:
+                            level.append(destination)
+            levels.append(level)
+            done += len(level)
+        if done < len(algebraic):
+            raise ValueError("The flowsheet has an algebraic loop")
+        self.order = [u.name for u in units if not u.algebraic] + [
+            a for level in levels for a in level
+        ]
+
+        def group(names):
+            groups = defaultdict(list)
+            for name in names:
+                u = self.units[name]
+                key = (type(u), len(u.ports)) if batched else name
+                groups[key].append(u)
+            return [self._group(g, index, incidence) for g in groups.values()]
+
+        self.source_groups = group(u.name for u in units if not u.algebraic)
+        self.algebraic_groups = [group(level) for level in levels if level]
+        self.state_groups = [g for g in self.source_groups if g["cls"].n_states]
+
+        # Jacobian pattern: the states each stream depends on, propagated in
+        # the evaluation order
+        depends = {}
+        for name in self.order:
+            u = self.units[name]
+            if u.algebraic:
+                deps = set().union(
+                    *(
+                        depends[(s, p)]
+                        for (s, p), d in self.connections.items()
+                        if d == name
+                    )
+                )
+            else:
+                deps = {name} if u.n_states else set()
+            for port in u.ports:
+                depends[(name, port)] = deps
+        pattern = lil_matrix((self.n_states, self.n_states), dtype=bool)
+        for u in units:
+            if not u.n_states or u.algebraic:
+                continue
+            deps = {u.name}.union(
+                *(depends[k] for k, d in self.connections.items() if d == u.name)
+            )
+            rows = self.slices[u.name]
+            for dep in deps:
+                pattern[rows, self.slices[dep]] = True
+        self.jac_sparsity = csr_matrix(pattern)
+        return self
+
+    def _group(self, units, index, incidence):
+        params = [u.parameters() for u in units]
+        return {
+            "cls": type(units[0]),
+            "p": {k: np.array([p[k] for p in params], dtype=float) for k in params[0]},
+            "states": np.array(
+                [
+                    np.arange(self.slices[u.name].start, self.slices[u.name].stop)
+                    for u in units
+                ]
+            ),
+            "rows": np.array(
+                [[self.rows[(u.name, port)] for port in u.ports] for u in units]
+            ),
+            "incidence": incidence[[index[u.name] for u in units]],
+        }
+
+    def _terms(self):
+        # Stream terms [F, F·T, F·xA, F·xB], which add up when streams mix
+        terms = self.streams * self.streams[:, :1]
+        terms[:, 0] = self.streams[:, 0]
+        return terms
+
+    def rhs(self, t: float, y: np.ndarray) -> np.ndarray:
+        """Right-hand side of the flattened system."""
+        for g in self.source_groups:
+            x = y[g["states"]]
+            self.streams[g["rows"]] = g["cls"].outputs(t, x, g["p"], None)
+        for level in self.algebraic_groups:
+            terms = self._terms()
+            for g in level:
+                inflow = g["incidence"] @ terms
+                self.streams[g["rows"]] = g["cls"].outputs(t, None, g["p"], inflow)
+
+        terms = self._terms()
+        dydt = np.empty_like(y)
+        for g in self.state_groups:
+            x = y[g["states"]]
+            inflow = g["incidence"] @ terms
+            dydt[g["states"]] = g["cls"].derivatives(t, x, g["p"], inflow)
+        return dydt
+
+    def initial_state(self, y0: dict) -> np.ndarray:
+        """Global state vector from the initial states of each unit."""
+        y = np.empty(self.n_states)
+        for name, s in self.slices.items():
+            if s.stop > s.start:
+                y[s] = y0[name]
+        return y
+
+    def state(self, y: np.ndarray, name: str) -> np.ndarray:
+        """States of one unit, from a global state vector or trajectory."""
+        return y[self.slices[name]]
+
+
+# --- Monolithic Model ---
+# The two-CSTRs-and-separator model of the library, written as one function
+Ff1: Final = 5.04  # Feed flow rate to reactor 1 [m³/h]
+Ff2: Final = 5.04  # Feed flow rate to reactor 2 [m³/h]
+F1: Final = 22.04  # Outlet flow rate from reactor 1 [m³/h]
+F2: Final = 27.08  # Outlet flow rate from reactor 2 [m³/h]
+F3: Final = 9.74  # Product stream flow rate from separator [m³/h]
+FR: Final = 17.0  # Recycle flow rate [m³/h]
+Q1: Final = 715.3e3  # Heat input to reactor 1 [kJ/h]
+Q2: Final = 579.8e3  # Heat input to reactor 2 [kJ/h]
+Q3: Final = 568.7e3  # Heat input to separator [kJ/h]
+eps: Final = 0.02  # Purge ratio [-]
+xA0: Final = 1.0  # Feed mole fraction of component A [-]
+
+
+def T0(t: float) -> float:
+    """Feed temperature [K]"""
+    return 359.1 if t < 0.2 else 370.0
+
+
+def model(t: float, y: np.ndarray) -> np.ndarray:
+    V1, V2, V3, T1, T2, T3, xA1, xB1, xA2, xB2, xA3, xB3 = y
+
+    xC3 = 1 - xA3 - xB3
+    FP = eps * FR
+
+    k11 = k1 * np.exp(-E1 / (R * T1))
+    k21 = k2 * np.exp(-E2 / (R * T1))
+    k12 = k1 * np.exp(-E1 / (R * T2))
+    k22 = k2 * np.exp(-E2 / (R * T2))
+
+    denom = alphaA * xA3 + alphaB * xB3 + alphaC * xC3
+    xAR = alphaA * xA3 / denom
+    xBR = alphaB * xB3 / denom
+
+    return np.array(
+        [
+            Ff1 + FR - F1,
+            Ff2 + F1 - F2,
+            F2 - FP - FR - F3,
+            (Ff1 / V1) * (T0(t) - T1)
+            + (FR / V1) * (T3 - T1)
+            + Q1 / (rho * Cp * V1)
+            - (m / Cp) * (k11 * xA1 * dH1 + k21 * xB1 * dH2),
+            (Ff2 / V2) * (T0(t) - T2)
+            + (F1 / V2) * (T1 - T2)
+            + Q2 / (rho * Cp * V2)
+            - (m / Cp) * (k12 * xA2 * dH1 + k22 * xB2 * dH2),
+            (F2 / V3) * (T2 - T3) + Q3 / (rho * Cp * V3),
+            (Ff1 / V1) * (xA0 - xA1) + (FR / V1) * (xAR - xA1) - k11 * xA1,
+            (FR / V1) * (xBR - xB1) - (Ff1 / V1) * xB1 + k11 * xA1 - k21 * xB1,
+            (Ff2 / V2) * (xA0 - xA2) + (F1 / V2) * (xA1 - xA2) - k12 * xA2,
+            (F1 / V2) * (xB1 - xB2) - (Ff2 / V2) * xB2 + k12 * xA2 - k22 * xB2,
+            (F2 / V3) * (xA2 - xA3) - ((FP + FR) / V3) * (xAR - xA3),
+            (F2 / V3) * (xB2 - xB3) - ((FP + FR) / V3) * (xBR - xB3),
+        ]
+    )
+
+
+y0_train: Final = {
+    "R1": [1.0, 432.4, 0.536, 0.448],
+    "R2": [0.5, 427.1, 0.545, 0.438],
+    "S": [1.0, 432.1, 0.298, 0.670],
+}
+
+
+# --- Composed Flowsheets ---
+V_feed: Final = 2.0  # Volume of the feed tank [m³]
+V_product: Final = 10.0  # Volume of the product tank [m³]
+
+
+def add_train(fs: Flowsheet, prefix: str, duty: float = 1.0):
+    """
+    Add a train of two CSTRs and a separator, as in the library model.
+
+    Parameters:
+    - fs: flowsheet
+    - prefix: prefix of the unit names
+    - duty: factor on the heat inputs
+    Returns:
+    - names of the reactor 1, reactor 2 and separator units
+    """
+    r1, r2, s = f"{prefix}R1", f"{prefix}R2", f"{prefix}S"
+    fs.add(CSTR(r1, {"out": Pump(F1)}, Q=duty * Q1))
+    fs.add(CSTR(r2, {"out": Pump(F2)}, Q=duty * Q2))
+    fs.add(Separator(s, product=Pump(F3), recycle=Pump(FR), Q=duty * Q3, eps=eps))
+    fs.connect(f"{r1}.out", r2)
+    fs.connect(f"{r2}.out", s)
+    fs.connect(f"{s}.recycle", r1)
+    return r1, r2, s
+
+
+def reactor_separator() -> Flowsheet:
+    """The library model, composed from unit models."""
+    fs = Flowsheet()
+    for name in ("feed 1", "feed 2"):
+        fs.add(Feed(name, Ff1, 359.1, xA0, T_step=370.0, t_step=0.2))
+    r1, r2, _ = add_train(fs, "")
+    fs.connect("feed 1.out", r1)
+    fs.connect("feed 2.out", r2)
+    return fs.build()
+
+
+def plant(n_trains: int, batched: bool = True) -> Flowsheet:
+    """
+    Parallel reactor-separator trains between a feed tank and a product tank.
+
+    The feed passes through a tank and is split between the trains; the products
+    are mixed into a tank with a valve outlet.
+    """
+    fs = Flowsheet()
+    F_feed = 2 * n_trains * Ff1
+    F_product = n_trains * F3
+    fs.add(Feed("feed", F_feed, 359.1, xA0, T_step=370.0, t_step=0.2))
+    fs.add(Tank("feed tank", {"out": Pump(F_feed)}))
+    fs.add(Splitter("header", np.full(2 * n_trains, 1 / (2 * n_trains))))
+    fs.add(Mixer("collector"))
+    fs.add(Tank("product tank", {"out": Valve(F_product / np.sqrt(V_product))}))
+    fs.connect("feed.out", "feed tank")
+    fs.connect("feed tank.out", "header")
+    fs.connect("collector.out", "product tank")
+
+    duties = 1 + 0.02 * np.linspace(-1, 1, n_trains)
+    for i in range(n_trains):
+        r1, r2, s = add_train(fs, f"T{i}/", duties[i])
+        fs.connect(f"header.out{2 * i}", r1)
+        fs.connect(f"header.out{2 * i + 1}", r2)
+        fs.connect(f"{s}.product", "collector")
+    return fs.build(batched)
+
+
+def plant_initial_state(fs: Flowsheet, n_trains: int) -> np.ndarray:
+    y0 = {
+        "feed tank": [V_feed, 359.1, xA0, 0.0],
+        "product tank": [V_product, 432.1, 0.298, 0.670],
+    }
+    for i in range(n_trains):
+        y0 |= {f"T{i}/{k}": v for k, v in y0_train.items()}
+    return fs.initial_state(y0)
+
+
+# --- Verification Against the Monolithic Model ---
+t_span: Final = (0.0, 2.5)  # Simulation time [h]
+t_eval = np.linspace(*t_span, 501)
+tol: Final = {"rtol": 1e-8, "atol": 1e-10}
+
+fs_small = reactor_separator()
+# Index of each state of the monolithic model in the flowsheet state vector
+to_mono = np.array(
+    [fs_small.slices[u].start + k for k in (0, 1) for u in ("R1", "R2", "S")]
+    + [fs_small.slices[u].start + k for u in ("R1", "R2", "S") for k in (2, 3)]
+)
+y0_small = fs_small.initial_state(y0_train)
+y0_mono = y0_small[to_mono]
+
+mono = solve_ivp(model, t_span, y0_mono, t_eval=t_eval, **tol)
+composed = solve_ivp(fs_small.rhs, t_span, y0_small, t_eval=t_eval, **tol)
+rhs_error = np.abs(fs_small.rhs(0.0, y0_small)[to_mono] - model(0.0, y0_mono)).max()
+traj_error = np.abs(composed.y[to_mono] - mono.y)
+
+print(f"Evaluation order: {fs_small.order}")
+print(f"Largest deviation of the right-hand side: {rhs_error:.1e}")
+print(f"Largest deviation of the trajectories: {traj_error.max():.1e}")
+
+
+# --- Jacobian Pattern ---
+def numeric_jacobian(f, t, y):
+    f0 = f(t, y)
+    J = np.empty((len(y), len(y)))
+    for j in range(len(y)):
+        dy = 1e-7 * max(abs(y[j]), 1.0)
+        y_j = y.copy()
+        y_j[j] += dy
+        J[:, j] = (f(t, y_j) - f0) / dy
+    return J
+
+
+fs_pattern = plant(3)
+y0_pattern = plant_initial_state(fs_pattern, 3)
+J = numeric_jacobian(fs_pattern.rhs, 0.5, y0_pattern)
+outside = np.count_nonzero((J != 0) & ~fs_pattern.jac_sparsity.toarray())
+print(
+    f"\nPlant with 3 trains: {len(fs_pattern.units)} units, "
+    f"{fs_pattern.n_states} states, evaluation order ends with "
+    f"{fs_pattern.order[-2:]}"
+)
+print(
+    f"Jacobian pattern: {fs_pattern.jac_sparsity.nnz} of {J.size} entries, "
+    f"{np.count_nonzero(J)} nonzero in the numeric Jacobian, {outside} outside"
+)
+
+
+# --- Scaling ---
+def counted(f):
+    """Wrap f to count its calls."""
+
+    def wrapper(t, y):
+        wrapper.calls += 1
+        return f(t, y)
+
+    wrapper.calls = 0
+    return wrapper
+
+
+def time_rhs(fs: Flowsheet, y: np.ndarray, n_calls: int = 50) -> float:
+    start = time.perf_counter()
+    for _ in range(n_calls):
+        fs.rhs(0.5, y)
+    return (time.perf_counter() - start) / n_calls
+
+
+solvers: Final = {
+    "RK45": {"method": "RK45"},
+    "BDF, dense Jacobian": {"method": "BDF"},
+    "BDF, sparse Jacobian": {"method": "BDF", "sparse": True},
+}
+n_trains_list: Final = [1, 3, 10, 33, 100]
+n_units, rhs_time, rhs_time_unbatched = [], [], []
+solve_time = {name: [] for name in solvers}
+rhs_calls = {name: [] for name in solvers}
+
+print(f"\n{'Units':>6} {'States':>7} {'Solver':<22} {'RHS calls':>10} {'Time':>8}")
+for n_trains in n_trains_list:
+    fs = plant(n_trains)
+    y0 = plant_initial_state(fs, n_trains)
+    n_units.append(len(fs.units))
+    rhs_time.append(time_rhs(fs, y0))
+    rhs_time_unbatched.append(time_rhs(plant(n_trains, batched=False), y0, 10))
+
+    for name, options in solvers.items():
+        f = counted(fs.rhs)
+        jac = {"jac_sparsity": fs.jac_sparsity} if options.get("sparse") else {}
+        start = time.perf_counter()
+        sol = solve_ivp(
+            f, t_span, y0, method=options["method"], rtol=1e-6, atol=1e-8, **jac
+        )
+        solve_time[name].append(time.perf_counter() - start)
+        rhs_calls[name].append(f.calls)
+        if n_trains == n_trains_list[-1] and options.get("sparse"):
+            big, sol_big = fs, sol
+        print(
+            f"{len(fs.units):>6} {fs.n_states:>7} {name:<22} "
+            f"{f.calls:>10} {solve_time[name][-1]:>7.2f}s"
+        )
+
+print(f"\n{'Units':>6} {'RHS batched':>12} {'RHS unit by unit':>17}")
+for n, tb, tu in zip(n_units, rhs_time, rhs_time_unbatched):
+    print(f"{n:>6} {tb * 1e3:>10.2f}ms {tu * 1e3:>15.2f}ms")
+
+# --- Plot Results ---
+fig, axs = plt.subplots(2, 2, figsize=(12, 9), constrained_layout=True)
+fig.suptitle("Flowsheet Composition")
+
+ax = axs[0, 0]
+for k, (unit, color) in enumerate(zip(("Reactor 1", "Reactor 2", "Separator"), "brg")):
+    ax.plot(mono.t, mono.y[3 + k], color=color, label=f"{unit}, monolithic")
+    ax.plot(
+        composed.t[::25],
+        composed.y[to_mono][3 + k, ::25],
+        "o",
+        color=color,
+        fillstyle="none",
+        label=f"{unit}, composed",
+    )
+ax.set_title("Two CSTRs and a separator")
+ax.set_xlabel("Time / h")
+ax.set_ylabel("Temperature / K")
+ax.legend(fontsize=8)
+ax.grid()
+
+ax = axs[0, 1]
+ax.spy(fs_pattern.jac_sparsity, markersize=1.5)
+ax.set_title(f"Jacobian pattern, 3 trains ({fs_pattern.n_states} states)")
+
+ax = axs[1, 0]
+for i in range(0, n_trains_list[-1], 5):
+    ax.plot(sol_big.t, big.state(sol_big.y, f"T{i}/R1")[1], color="tab:blue", lw=0.8)
+ax.plot(
+    sol_big.t, big.state(sol_big.y, "product tank")[1], "k", lw=2, label="Product tank"
+)
+ax.plot([], [], color="tab:blue", lw=0.8, label="Reactor 1 of every 5th train")
+ax.set_title(f"Plant with {n_trains_list[-1]} trains ({n_units[-1]} units)")
+ax.set_xlabel("Time / h")
+ax.set_ylabel("Temperature / K")
+ax.legend()
+ax.grid()
+
+ax = axs[1, 1]
+for name, marker in zip(solvers, "s^o"):
+    ax.loglog(n_units, solve_time[name], marker=marker, label=name)
+ax.loglog(
+    n_units,
+    np.array(rhs_time_unbatched) * 1e3,
+    "k--",
+    label="1000 RHS calls, unit by unit",
+)
+ax.loglog(n_units, np.array(rhs_time) * 1e3, "k:", label="1000 RHS calls, batched")
+ax.set_title("Simulation time")
+ax.set_xlabel("Number of units")
+ax.set_ylabel("Time / s")
+ax.legend(fontsize=8)
+ax.grid(which="both", alpha=0.3)
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
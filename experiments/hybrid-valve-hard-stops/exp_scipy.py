@@ -0,0 +1,642 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import psi
+from scipy.integrate import solve_ivp
+from scipy.optimize import brentq
+
+rtol: Final = 1e-6
+atol: Final = 1e-9
+
+
+# --- Hybrid Automaton ---
+class Transition:
+    """
+    Jump out of a mode when guard(t, y) crosses zero in the given direction.
+
+    The reset map jump(t, y) returns the next mode and the state after the jump.
+    """
+
+    def __init__(self, guard: Callable, direction: int, jump: Callable):
+        self.guard, self.direction, self.jump = guard, direction, jump
+
+    def event(self, t_last: float):
+        """Guard as a terminal event of solve_ivp, seen up to t_last."""
+
+        def event(t, y):
+            return self.guard(min(t, t_last), y)
+
+        event.terminal, event.direction = True, self.direction
+        return event
+
+
+class HybridSolution:
+    """Piecewise solution of a hybrid automaton, one segment per mode visit."""
+
+    def __init__(self, segments: list, events: list, nfev: int):
+        self.segments = segments  # (mode, solve_ivp solution) pairs
+        self.events = events  # (t, mode before, mode after) triples
+        self.nfev = nfev
+        self.t_steps = np.unique(np.concatenate([sol.t for _, sol in segments]))
+
+    def __call__(self, t: np.ndarray) -> np.ndarray:
+        y = np.empty((self.segments[0][1].y.shape[0], len(t)))
+        for _, sol in self.segments:
+            in_segment = (t >= sol.t[0]) & (t <= sol.t[-1])
+            if in_segment.any():
+                y[:, in_segment] = sol.sol(t[in_segment])
+        return y
+
+
+class HybridAutomaton:
+    """
+    Hybrid system: a set of modes, each with its own flow f(t, y) and its own
+    outgoing transitions.
+
+    The simulation integrates the flow of the current mode until a guard
+    crosses zero, located exactly by the events of solve_ivp, applies the
+    reset map of the transition, and restarts the solver in the next mode. The
+    solver also restarts at the breakpoints t_breaks (steps of the inputs), so
+    it never steps over a discontinuity.
+    """
+
+    def __init__(self, flows: dict[str, Callable], transitions: dict[str, list]):
+        self.flows, self.transitions = flows, transitions
+
+    def simulate(
+        self,
+        mode: str,
+        t_span: tuple[float, float],
+        y0,
+        t_breaks=(),
+        max_events: int = 10_000,
+        **options,
+    ) -> HybridSolution:
+        """
+        Parameters:
+        - mode: initial mode
+        - t_span: initial and final times
+        - y0: initial state
+        - t_breaks: times where the inputs are discontinuous
+        - max_events: limit on the number of transitions, against Zeno behavior
+        - options: passed to solve_ivp
+
+        Returns:
+        - The piecewise solution, with the list of events
+        """
+        t_now, t_end = t_span
+        y = np.asarray(y0, dtype=float)
+        t_stops = sorted({*(t for t in t_breaks if t_now < t < t_end), t_end})
+        segments, events, nfev = [], [], 0
+        first_step = None
+        while t_now < t_end:
+            t_next = next(t for t in t_stops if t > t_now)
+            transitions = self.transitions.get(mode, [])
+
+            # Inside a segment, the inputs are seen from the left of the next
+            # breakpoint: the last stage of a step at t_next must not see the
+            # input step, nor trigger a guard with it.
+            t_last = np.nextafter(t_next, t_now)
+
+            def flow(t, y, f=self.flows[mode], t_last=t_last):
+                return f(min(t, t_last), y)
+
+            sol = solve_ivp(
+                flow,
+                (t_now, t_next),
+                y,
+                events=[tr.event(t_last) for tr in transitions],
+                first_step=first_step,
+                dense_output=True,
+                **options,
+            )
+            nfev += sol.nfev
+
+            # A guard that is zero after a jump (a bounce off a stop) is seen
+            # as crossed if the first step jumps over the whole excursion:
+            # retry with a smaller first step before accepting the event.
+            span = t_next - t_now
+            if sol.status == 1 and sol.t[-1] == t_now:
+                first_step = 1e-6 * span if first_step is None else 1e-3 * first_step
+                if first_step > 1e-12 * span:
+                    continue
+
+            segments.append((mode, sol))
+            t_now, y, first_step = sol.t[-1], sol.y[:, -1].copy(), None
+            if sol.status == 1:
+                k = next(k for k, t_k in enumerate(sol.t_events) if len(t_k))
+            else:  # A step of the inputs may cross a guard at the breakpoint
+                k = next(
+                    (
+                        k
+                        for k, tr in enumerate(transitions)
+                        if tr.direction * tr.guard(t_last, y)
+                        < 0
+                        <= tr.direction * tr.guard(t_now, y)
+                    ),
+                    None,
+                )
+            if k is not None and t_now < t_end:
+                next_mode, y = transitions[k].jump(t_now, y)
+                events.append((t_now, mode, next_mode))
+                mode = next_mode
+                if len(events) > max_events:
+                    raise RuntimeError(f"More than {max_events} events at t = {t_now}")
+
+        return HybridSolution(segments, events, nfev)
+
+
+def hard_stops(
+    free: Callable,
+    stopped: Callable,
+    F_rest: Callable,
+    x_min: float,
+    x_max: float,
+    e: float,
+    v_stick: float = 1e-3,
+    F_stick: float = 1e-6,
+) -> HybridAutomaton:
+    """
+    Hybrid automaton of an actuator with travel limits, with modes "free",
+    "lower" and "upper" (held by the stop at x_min or x_max).
+
+    Parameters:
+    - free, stopped: flows f(t, y) of the free and held actuator; the position
+      and velocity are y[0] and y[1]
+    - F_rest: net force on the actuator at rest, f(t, y) [N]
+    - x_min, x_max: positions of the stops [m]
+    - e: coefficient of restitution of the stops [-]
+    - v_stick: impact speed below which the actuator stays at the stop [m/s]
+    - F_stick: net force needed to pull the actuator away from a stop [N]
+
+    Returns:
+    - The hybrid automaton
+    """
+
+    def pull_off_lower(t, y):
+        return F_rest(t, y) - F_stick
+
+    def pull_off_upper(t, y):
+        return -F_rest(t, y) - F_stick
+
+    def impact(stop, x_stop, pull_off):
+        def jump(t, y):
+            y = y.copy()
+            y[0], y[1] = x_stop, -e * y[1]
+            if abs(y[1]) < v_stick and pull_off(t, y) < 0:
+                y[1] = 0.0
+                return stop, y
+            return "free", y
+
+        return jump
+
+    def release(t, y):
+        return "free", y
+
+    return HybridAutomaton(
+        flows={"free": free, "lower": stopped, "upper": stopped},
+        transitions={
+            "free": [
+                Transition(
+                    lambda t, y: y[0] - x_min,
+                    -1,
+                    impact("lower", x_min, pull_off_lower),
+                ),
+                Transition(
+                    lambda t, y: x_max - y[0],
+                    -1,
+                    impact("upper", x_max, pull_off_upper),
+                ),
+            ],
+            "lower": [Transition(pull_off_lower, 1, release)],
+            "upper": [Transition(pull_off_upper, 1, release)],
+        },
+    )
+
+
+def single_mode(flow: Callable) -> HybridAutomaton:
+    """A smooth system, as a hybrid automaton without transitions."""
+    return HybridAutomaton(flows={"free": flow}, transitions={})
+
+
+# --- Solenoid Valve ---
+# Same model as models/mechanical/solenoid-valve, opened at 24 V and closed
+# again by the spring
+m_s: Final = 0.02  # Equivalent moving mass [kg]
+c_s: Final = 50.0  # Viscous damping coefficient [N·s/m]
+k_s: Final = 500.0  # Spring stiffness [N/m]
+R_coil: Final = 2.0  # Coil electrical resistance [Ω]
+A_s: Final = (2.5 / 100) ** 2 * np.pi  # Effective area of the fluid pressure [m²]
+L0: Final = 0.005  # Inductance model constant [H]
+L1: Final = 0.0005  # Inductance model constant [H·m]
+g0: Final = 4.0 / 100  # Inductance model constant [m]
+xs_min: Final = 0.0  # Fully closed position [m]
+xs_max: Final = 3.0 / 100  # Fully open position [m]
+e_s: Final = 0.5  # Coefficient of restitution of the stops [-]
+dP: Final = 20000.0  # Pressure differential [Pa]
+
+t_solenoid: Final = (0.0, 0.8)  # Simulation time [s]
+t_breaks_solenoid: Final = (0.05, 0.5)  # Steps of the coil voltage [s]
+
+
+def u_solenoid(t: float) -> float:
+    """Coil voltage: 24 V between 0.05 s and 0.5 s [V]"""
+    return 24.0 if 0.05 <= t < 0.5 else 0.0
+
+
+def solenoid_force(x, v, i):
+    """Net force on the plunger, positive towards the open position [N]"""
+    F_magnetic = 0.5 * L1 / (g0 - x) ** 2 * i**2
+    return F_magnetic - c_s * v - k_s * x - dP * A_s * x / xs_max
+
+
+def solenoid_current(t, x, v, i):
+    """Derivative of the coil current [A/s]"""
+    L = L0 + L1 / (g0 - x)
+    return (u_solenoid(t) - R_coil * i - i * L1 / (g0 - x) ** 2 * v) / L
+
+
+def solenoid_free(t, y):
+    x, v, i = y
+    return [v, solenoid_force(x, v, i) / m_s, solenoid_current(t, x, v, i)]
+
+
+def solenoid_stopped(t, y):
+    x, _, i = y
+    return [0.0, 0.0, solenoid_current(t, x, 0.0, i)]
+
+
+def solenoid_clip(t, y):
+    """Original model: the position is clipped, the velocity still integrates"""
+    x, v, i = np.clip(y[0], xs_min, xs_max), y[1], y[2]
+    return [v, solenoid_force(x, v, i) / m_s, solenoid_current(t, x, v, i)]
+
+
+def solenoid_rest(t, y):
+    return solenoid_force(y[0], 0.0, y[2])
+
+
+# --- Pneumatic Control Valve ---
+# Same model as models/mechanical/pneumatic-control-valve, driven to 18 psi
+# (above the 15 psi range, against the closed stop), then vented to 0 psi
+m_p: Final = 0.5  # Equivalent moving mass [kg]
+b_p: Final = 200.0  # Viscous friction coefficient [N·s/m]
+k_p: Final = 8000.0  # Spring stiffness [N/m]
+A_p: Final = np.pi * (6 / 100) ** 2  # Effective diaphragm area [m²]
+xp_min: Final = 2.92 / 100  # Fully open position [m]
+xp_max: Final = 14.62 / 100  # Fully closed position [m]
+e_p: Final = 0.3  # Coefficient of restitution of the stops [-]
+
+t_pneumatic: Final = (0.0, 1.0)  # Simulation time [s]
+t_breaks_pneumatic: Final = (0.1, 0.5)  # Steps of the pressure [s]
+
+
+def P_pneumatic(t: float) -> float:
+    """Pressure: 3 psi, 18 psi from 0.1 s, vented from 0.5 s [Pa]"""
+    if t < 0.1:
+        return 3 * psi
+    return 18 * psi if t < 0.5 else 0.0
+
+
+def pneumatic_free(t, y):
+    x, v = y
+    return [v, (A_p * P_pneumatic(t) - b_p * v - k_p * x) / m_p]
+
+
+def pneumatic_stopped(t, y):
+    return [0.0, 0.0]
+
+
+def pneumatic_clip(t, y):
+    x, v = np.clip(y[0], xp_min, xp_max), y[1]
+    return [v, (A_p * P_pneumatic(t) - b_p * v - k_p * x) / m_p]
+
+
+def pneumatic_rest(t, y):
+    return A_p * P_pneumatic(t) - k_p * y[0]
+
+
+# --- Penalty Contact ---
+def penalty(flow: Callable, m: float, x_min: float, x_max: float, e: float, k_c):
+    """
+    Stops as a stiff spring-damper acting beyond the travel limits.
+
+    The damping of the contact gives the same coefficient of restitution e as
+    the hybrid model, for a linear contact.
+    """
+    zeta = -np.log(e) / np.sqrt(np.pi**2 + np.log(e) ** 2)
+    c_c = 2 * zeta * np.sqrt(k_c * m)
+
+    def contact(t, y):
+        dydt = flow(t, y)
+        x, v = y[0], y[1]
+        delta = min(x - x_min, 0.0) + max(x - x_max, 0.0)  # Penetration [m]
+        if delta != 0.0:
+            dydt[1] -= (k_c * delta + c_c * v) / m
+        return dydt
+
+    return contact
+
+
+# --- Simulations ---
+valves = {
+    "Solenoid valve": {
+        "free": solenoid_free,
+        "stopped": solenoid_stopped,
+        "clip": solenoid_clip,
+        "rest": solenoid_rest,
+        "m": m_s,
+        "x_min": xs_min,
+        "x_max": xs_max,
+        "e": e_s,
+        "y0": [xs_min, 0.0, 0.0],
+        "mode0": "lower",
+        "t_span": t_solenoid,
+        "t_breaks": t_breaks_solenoid,
+    },
+    "Pneumatic valve": {
+        "free": pneumatic_free,
+        "stopped": pneumatic_stopped,
+        "clip": pneumatic_clip,
+        "rest": pneumatic_rest,
+        "m": m_p,
+        "x_min": xp_min,
+        "x_max": xp_max,
+        "e": e_p,
+        "y0": [A_p * 3 * psi / k_p, 0.0],
+        "mode0": "free",
+        "t_span": t_pneumatic,
+        "t_breaks": t_breaks_pneumatic,
+    },
+}
+k_contact: Final = 1e6  # Stiffness of the penalty contact [N/m]
+
+
+def approaches(valve: dict, k_c: float = k_contact) -> dict:
+    """Clipped, penalty and hybrid versions of a valve model."""
+    lims = (valve["x_min"], valve["x_max"])
+    return {
+        "Clip in the RHS": (single_mode(valve["clip"]), "free"),
+        "Penalty contact": (
+            single_mode(penalty(valve["free"], valve["m"], *lims, valve["e"], k_c)),
+            "free",
+        ),
+        "Hybrid (events)": (
+            hard_stops(
+                valve["free"], valve["stopped"], valve["rest"], *lims, valve["e"]
+            ),
+            valve["mode0"],
+        ),
+    }
+
+
+# --- Comparison of the Approaches ---
+results = {}
+print(
+    f"{'Valve':<16} {'Approach':<16} {'RHS calls':>9} {'Steps':>6} {'Events':>6}"
+    f" {'Time':>8} {'Overtravel':>11}  Final state"
+)
+for name, valve in valves.items():
+    results[name] = {}
+    t = np.linspace(*valve["t_span"], 4001)
+    for label, (automaton, mode0) in approaches(valve).items():
+        start = time.perf_counter()
+        sol = automaton.simulate(
+            mode0, valve["t_span"], valve["y0"], valve["t_breaks"], rtol=rtol, atol=atol
+        )
+        elapsed = time.perf_counter() - start
+        y = sol(t)
+        overtravel = max(valve["x_min"] - y[0].min(), y[0].max() - valve["x_max"], 0)
+        results[name][label] = {"sol": sol, "t": t, "y": y}
+        print(
+            f"{name:<16} {label:<16} {sol.nfev:>9} {len(sol.t_steps) - 1:>6}"
+            f" {len(sol.events):>6} {elapsed * 1000:>6.1f}ms {overtravel * 1000:>9.3f}mm"
+            f"  {np.array2string(y[:, -1], precision=4)}"
+        )
+
+
+# --- Exact Events of the Pneumatic Valve ---
+# Between the steps of the pressure, the free stem follows a linear ODE with a
+# closed-form solution, so the exact times of the impacts can be found with
+# brentq, and compared with the events located by the solver.
+def pneumatic_flight(x0: float, v0: float, P: float):
+    """Closed-form position x(τ) of the free stem at constant pressure [m]"""
+    r1, r2 = np.roots([m_p, b_p, k_p])  # Overdamped: two real roots [1/s]
+    x_eq = A_p * P / k_p
+    C2 = (v0 - r1 * (x0 - x_eq)) / (r2 - r1)
+    C1 = x0 - x_eq - C2
+
+    def x(tau):
+        return x_eq + C1 * np.exp(r1 * tau) + C2 * np.exp(r2 * tau)
+
+    def v(tau):
+        return r1 * C1 * np.exp(r1 * tau) + r2 * C2 * np.exp(r2 * tau)
+
+    return x, v
+
+
+def pneumatic_exact_events(v_stick: float = 1e-3) -> list:
+    """Exact (t, mode before, mode after) events of the pneumatic scenario."""
+    valve = valves["Pneumatic valve"]
+    t_now, (x, v), mode = valve["t_span"][0], valve["y0"], valve["mode0"]
+    events = []
+    for t_next in (*valve["t_breaks"], valve["t_span"][1]):
+        P = P_pneumatic(t_now)
+        while t_now < t_next:
+            if mode != "free":  # Held until the pressure pulls the stem away
+                F = A_p * P - k_p * x
+                if (F if mode == "lower" else -F) <= 0:
+                    break
+                events.append((t_now, mode, "free"))
+                mode = "free"
+
+            x_tau, v_tau = pneumatic_flight(x, v, P)
+            tau = np.geomspace(1e-12, t_next - t_now, 20_001)
+            x_tol = 1e-12  # Round-off of x_tau(τ) on a stop [m]
+            outside = (x_tau(tau) < xp_min - x_tol) | (x_tau(tau) > xp_max + x_tol)
+            if not outside.any():
+                x, v, t_now = x_tau(tau[-1]), v_tau(tau[-1]), t_next
+                break
+
+            j = np.argmax(outside)
+            x_stop, stop = (
+                (xp_min, "lower") if x_tau(tau[j]) < xp_min else (xp_max, "upper")
+            )
+            tau_hit = brentq(
+                lambda s, x_tau=x_tau, x_stop=x_stop: x_tau(s) - x_stop,
+                tau[j - 1],
+                tau[j],
+                xtol=1e-15,
+            )
+            t_now, x, v = t_now + tau_hit, x_stop, -e_p * v_tau(tau_hit)
+            F = A_p * P - k_p * x
+            if abs(v) < v_stick and (F if stop == "lower" else -F) < 0:
+                events.append((t_now, "free", stop))
+                mode, v = stop, 0.0
+            else:
+                events.append((t_now, "free", "free"))
+        t_now = t_next
+    return events
+
+
+exact = pneumatic_exact_events()
+hybrid = approaches(valves["Pneumatic valve"])["Hybrid (events)"][0]
+tolerances = [1e-3, 1e-4, 1e-5, 1e-6, 1e-7, 1e-8, 1e-9, 1e-10]
+event_error, event_nfev = [], []
+print(f"\nPneumatic valve: {len(exact)} exact events")
+print(f"{'rtol':>8} {'Events':>6} {'RHS calls':>9} {'Event time error':>17}")
+for tol in tolerances:
+    sol = hybrid.simulate(
+        "free",
+        t_pneumatic,
+        valves["Pneumatic valve"]["y0"],
+        t_breaks_pneumatic,
+        rtol=tol,
+        atol=tol * 1e-3,
+    )
+    same = [ev[1:] for ev in sol.events] == [ev[1:] for ev in exact]
+    error = max(abs(ev[0] - ex[0]) for ev, ex in zip(sol.events, exact))
+    event_error.append(error if same else np.nan)
+    event_nfev.append(sol.nfev)
+    print(
+        f"{tol:>8.0e} {len(sol.events):>6} {sol.nfev:>9} {error:>16.1e}s"
+        + ("" if same else "  (different sequence of events)")
+    )
+
+# --- Coefficient of Restitution ---
+solenoid = valves["Solenoid valve"]
+restitutions = [0.0, 0.25, 0.5, 0.75, 0.9]
+bounces = {}
+print(f"\n{'e':>5} {'Impacts':>8} {'Settling':>9} {'RHS calls':>9}")
+for e in restitutions:
+    automaton = hard_stops(
+        solenoid_free, solenoid_stopped, solenoid_rest, xs_min, xs_max, e
+    )
+    sol = automaton.simulate(
+        "lower", t_solenoid, solenoid["y0"], t_breaks_solenoid, rtol=rtol, atol=atol
+    )
+    impacts = [ev[0] for ev in sol.events if ev[1] == "free" and ev[2] != "lower"]
+    held = next(ev[0] for ev in sol.events if ev[2] == "upper")
+    t = np.linspace(impacts[0] - 0.3e-3, impacts[0] + 3e-3, 2001)
+    bounces[e] = (t - impacts[0], sol(t)[0])
+    print(
+        f"{e:>5.2f} {len(impacts):>8} {(held - impacts[0]) * 1000:>7.2f}ms {sol.nfev:>9}"
+    )
+
+# --- Stiffness of the Penalty Contact ---
+# Below about 2.4e5 N/m, the contact cannot hold the plunger against the
+# magnetic force, which grows without bound as the plunger approaches g0
+stiffnesses = [1e6, 1e7, 1e8]
+penalty_nfev = {"RK45": [], "Radau": [], "LSODA": []}
+penalty_overtravel = []
+print(
+    f"\n{'k_c':>8} {'Overtravel':>11}" + "".join(f" {m:>7} calls" for m in penalty_nfev)
+)
+for k_c in stiffnesses:
+    flow = penalty(solenoid_free, m_s, xs_min, xs_max, e_s, k_c)
+    for method, nfev in penalty_nfev.items():
+        sol = single_mode(flow).simulate(
+            "free",
+            t_solenoid,
+            solenoid["y0"],
+            t_breaks_solenoid,
+            method=method,
+            rtol=rtol,
+            atol=atol,
+        )
+        nfev.append(sol.nfev)
+    y = sol(np.linspace(*t_solenoid, 4001))
+    penalty_overtravel.append(max(xs_min - y[0].min(), y[0].max() - xs_max))
+    print(
+        f"{k_c:>8.0e} {penalty_overtravel[-1] * 1000:>9.4f}mm"
+        + "".join(f" {nfev[-1]:>13}" for nfev in penalty_nfev.values())
+    )
+
+# --- Plot Results ---
+fig, axs = plt.subplots(2, 3, figsize=(16, 9), constrained_layout=True)
+fig.suptitle("Hybrid Valve Simulation: Hard Stops as Events")
+styles = {
+    "Clip in the RHS": {"color": "tab:red", "linestyle": ":"},
+    "Penalty contact": {"color": "tab:orange", "linestyle": "--"},
+    "Hybrid (events)": {"color": "tab:blue"},
+}
+
+for ax, name, scale, unit in (
+    (axs[0, 0], "Solenoid valve", 1000, "mm"),
+    (axs[1, 0], "Pneumatic valve", 100, "cm"),
+):
+    valve = valves[name]
+    for label, r in results[name].items():
+        ax.plot(r["t"], r["y"][0] * scale, label=label, **styles[label])
+    for x_stop in (valve["x_min"], valve["x_max"]):
+        ax.axhline(x_stop * scale, color="k", linewidth=0.8)
+    span = (valve["x_max"] - valve["x_min"]) * scale
+    ax.set_ylim(
+        valve["x_min"] * scale - 0.2 * span, valve["x_max"] * scale + 0.3 * span
+    )
+    ax.set_title(f"{name}, position (stops in black)")
+    ax.set_xlabel("Time / s")
+    ax.set_ylabel(f"Displacement / {unit}")
+    ax.legend(fontsize=8)
+    ax.grid()
+
+ax = axs[0, 1]
+for label, r in results["Solenoid valve"].items():
+    ax.plot(r["t"], r["y"][2], label=label, **styles[label])
+ax.set_title("Solenoid valve, coil current")
+ax.set_xlabel("Time / s")
+ax.set_ylabel("Current / A")
+ax.legend(fontsize=8)
+ax.grid()
+
+ax = axs[0, 2]
+for label, r in results["Solenoid valve"].items():
+    t_steps = r["sol"].t_steps
+    ax.semilogy(
+        t_steps[1:],
+        np.diff(t_steps),
+        ".",
+        markersize=3,
+        label=label,
+        color=styles[label]["color"],
+    )
+ax.set_title("Solenoid valve, step sizes")
+ax.set_xlabel("Time / s")
+ax.set_ylabel("Step size / s")
+ax.legend(fontsize=8)
+ax.grid(which="both", alpha=0.3)
+
+ax = axs[1, 1]
+ax.loglog(
+    tolerances,
+    event_error,
+    "o-",
+    label=f"Largest error of the {len(exact)} event times",
+)
+ax.set_title("Pneumatic valve, event times vs exact solution")
+ax.set_xlabel("Relative tolerance (rtol)")
+ax.set_ylabel("Event time error / s")
+ax.legend(fontsize=8)
+ax.grid(which="both", alpha=0.3)
+
+ax = axs[1, 2]
+for e, (t_rel, x) in bounces.items():
+    ax.plot(t_rel * 1000, x * 1000, label=f"e = {e}")
+ax.axhline(xs_max * 1000, color="k", linewidth=0.8)
+ax.set_ylim(xs_max * 1000 - 0.15, xs_max * 1000 + 0.01)
+ax.set_title("Solenoid valve, bounces on the open stop")
+ax.set_xlabel("Time after the first impact / ms")
+ax.set_ylabel("Displacement / mm")
+ax.legend(fontsize=8)
+ax.grid()
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -0,0 +1,909 @@
+import os
+import time
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import atm, psi, zero_Celsius
+from scipy.constants import g as gravity
+from scipy.constants import gas_constant as R_gas
+from scipy.integrate import solve_ivp
+
+# --- Optional JIT Backend ---
+try:
+    import numba
+except ImportError:  # numba is optional: without it, only NumPy is benchmarked
+    numba = None
+
+backends: Final = ["NumPy"] if numba is None else ["NumPy", "numba"]
+
+if numba is not None:
+    from numba import types
+
+    # Every model has the same signature, so the steppers take it as a typed
+    # function argument and are compiled once for all models, instead of once
+    # per model (which takes seconds each)
+    vector = types.float64[::1]
+    model_type = vector(types.float64, vector)
+    model_arg = types.FunctionType(model_type)
+    signatures = {
+        "model": model_type,
+        "rk4": types.float64[:, ::1](
+            model_arg, types.float64, types.float64, vector, types.int64
+        ),
+        "dopri45": types.Tuple((vector, types.int64, types.int64))(
+            model_arg,
+            types.float64,
+            types.float64,
+            vector,
+            types.float64,
+            types.float64,
+        ),
+        "fd_jacobian": types.float64[:, ::1](model_arg, types.float64, vector),
+    }
+
+
+def jit(func, backend: str = "numba"):
+    """
+    Compile a model, stepper or Jacobian with the given backend.
+
+    The "numba" backend compiles the function to machine code, with the
+    signature of its kind (given by its name). The "NumPy" backend returns it
+    unchanged, and it is also the fallback when numba is not installed, so the
+    same source runs in both cases.
+    """
+    if backend == "numba" and numba is not None:
+        return numba.njit(signatures[func.__name__])(func)
+    return func
+
+
+# --- Library Models ---
+# Each factory returns the model of a library simulation with its default inputs
+# bound, as f(t, y) -> dydt. The equations are those of the library, written on
+# scalars and returning a NumPy array, so numba can compile them unchanged.
+def rc_circuit_charge():
+    """electrical/RC-circuit-series-charge"""
+    R, C = 50.0, 5000e-6  # Resistance [Ω], capacitance [F]
+    epsilon = 5.0  # Applied voltage [V]
+
+    def model(t, y):
+        q = y[0]  # Charge on the capacitor [C]
+        return np.array([-q / (R * C) + epsilon / R])
+
+    return model
+
+
+def rc_circuit_voltage():
+    """electrical/RC-circuit-series-voltage"""
+    R, C = 50.0, 5000e-6  # Resistance [Ω], capacitance [F]
+    epsilon = 5.0  # Applied voltage [V]
+
+    def model(t, y):
+        Vc = y[0]  # Capacitor voltage [V]
+        return np.array([(epsilon - Vc) / (R * C)])
+
+    return model
+
+
+def rlc_circuit_charge():
+    """electrical/RLC-circuit-series-charge"""
+    R, L, C = 10.0, 2.0, 5000e-6  # Resistance [Ω], inductance [H], capacitance [F]
+    epsilon = 5.0  # Applied voltage [V]
+
+    def model(t, y):
+        q, I = y[0], y[1]  # Charge [C], current [A]
+        return np.array([I, (epsilon - R * I - q / C) / L])
+
+    return model
+
+
+def rlc_circuit_voltage():
+    """electrical/RLC-circuit-series-voltage"""
+    R, L, C = 10.0, 2.0, 5000e-6  # Resistance [Ω], inductance [H], capacitance [F]
+    epsilon = 5.0  # Applied voltage [V]
+
+    def model(t, y):
+        Vc, Vc_dot = y[0], y[1]  # Capacitor voltage [V] and its derivative [V/s]
+        d2Vc_dt2 = (epsilon / (L * C)) - (R / L) * Vc_dot - (Vc / (L * C))
+        return np.array([Vc_dot, d2Vc_dt2])
+
+    return model
+
+
+def rlc_diode():
+    """electrical/RLC-series-with-parallel-diode-shockley"""
+    R, L, C = 100.0, 0.1, 5000e-6  # Resistance [Ω], inductance [H], capacitance [F]
+    i_S, n, V_T = 1e-12, 1.5, 26e-3  # Shockley diode parameters [A], [-], [V]
+    epsilon = 5.0  # Applied voltage [V]
+
+    def model(t, y):
+        Vc, I = y[0], y[1]  # Capacitor voltage [V], circuit current [A]
+        Id = i_S * (np.exp(Vc / (n * V_T)) - 1)  # Diode current [A]
+        return np.array([(I - Id) / C, (epsilon - R * I - Vc) / L])
+
+    return model
+
+
+def dc_motor():
+    """mechanical/dc-motor"""
+    J, b, K1, K2, R = 0.03, 0.02, 0.01, 0.01, 10.0
+    epsilon = 24.0  # Applied voltage [V]
+
+    def model(t, y):
+        omega = y[1]  # Angular velocity [rad/s]
+        domega_dt = ((K1 / R) * epsilon - (K1 * K2 / R + b) * omega) / J
+        return np.array([omega, domega_dt])
+
+    return model
+
+
+def inverted_pendulum():
+    """mechanical/inverted-pendulum"""
+    m_c, m_p, L, b, g = 1.0, 0.2, 0.5, 10.0, gravity
+    J = (1 / 12) * m_p * (2 * L) ** 2  # Rod moment of inertia [kg·m²]
+    F = 0.0  # External force [N]
+
+    def model(t, y):
+        theta, omega, v = y[0], y[1], y[3]
+        A = np.array(
+            [
+                [1.0, 0.0, 0.0, 0.0],
+                [0.0, m_p * L**2 + J, 0.0, m_p * L * np.cos(theta)],
+                [0.0, 0.0, 1.0, 0.0],
+                [0.0, m_p * L * np.cos(theta), 0.0, m_c + m_p],
+            ]
+        )
+        b_rhs = np.array(
+            [
+                omega,
+                m_p * g * L * np.sin(theta),
+                v,
+                F - b * v + m_p * L * omega**2 * np.sin(theta),
+            ]
+        )
+        return np.linalg.solve(A, b_rhs)
+
+    return model
+
+
+def linear_inverted_pendulum():
+    """mechanical/linear-inverted-pendulum"""
+    m_c, m_p, L, g = 1.0, 0.2, 1.0, gravity
+    F = 0.0  # External force [N]
+
+    def model(t, y):
+        theta, omega, v = y[0], y[1], y[3]
+        A = np.array(
+            [
+                [1.0, 0.0, 0.0, 0.0],
+                [0.0, m_p * L**2, 0.0, m_p * L],
+                [0.0, 0.0, 1.0, 0.0],
+                [0.0, m_p * L, 0.0, m_c + m_p],
+            ]
+        )
+        b_rhs = np.array([omega, m_p * g * L * theta, v, F])
+        return np.linalg.solve(A, b_rhs)
+
+    return model
+
+
+def simple_pendulum():
+    """mechanical/simple-pendulum"""
+    g, L = gravity, 1.0
+
+    def model(t, y):
+        return np.array([y[1], -(g / L) * np.sin(y[0])])
+
+    return model
+
+
+def linear_simple_pendulum():
+    """mechanical/linear-simple-pendulum"""
+    g, L = gravity, 1.0
+
+    def model(t, y):
+        return np.array([y[1], -(g / L) * y[0]])
+
+    return model
+
+
+def physical_pendulum():
+    """mechanical/physical-pendulum"""
+    m, L, k, g = 1.0, 0.5, 0.3, gravity
+    J = (1 / 3) * m * (L * 2) ** 2  # Rod moment of inertia about the pivot [kg·m²]
+
+    def model(t, y):
+        theta, omega = y[0], y[1]
+        domega_dt = -(k / J) * omega - (3 * g / (4 * L)) * np.sin(theta)
+        return np.array([omega, domega_dt])
+
+    return model
+
+
+def mass_spring_damper():
+    """mechanical/mass–spring–damper"""
+    m, c, k = 1.0, 2.0, 20.0
+    F_ext = 10.0  # External force [N]
+
+    def model(t, y):
+        x, v = y[0], y[1]
+        return np.array([v, (F_ext - c * v - k * x) / m])
+
+    return model
+
+
+def two_mass_spring_damper():
+    """mechanical/two-mass-spring-damper"""
+    m1, m2, c, k = 5.0, 2.0, 1.0, 8.0
+    u = 2.0  # External force [N]
+
+    def model(t, y):
+        x1, v1, x2, v2 = y[0], y[1], y[2], y[3]
+        dx, dv = x2 - x1, v2 - v1
+        return np.array([v1, (c * dv + k * dx) / m1, v2, (u - c * dv - k * dx) / m2])
+
+    return model
+
+
+def pneumatic_valve():
+    """mechanical/pneumatic-control-valve"""
+    m, b, k = 0.5, 200.0, 8000.0
+    A = np.pi * (6 / 100) ** 2  # Diaphragm area [m²]
+
+    def model(t, y):
+        x, v = y[0], y[1]
+        P = 3 * psi if t < 0.5 else 15 * psi  # Pressure input [Pa]
+        return np.array([v, (A * P - b * v - k * x) / m])
+
+    return model
+
+
+def solenoid_valve():
+    """mechanical/solenoid-valve"""
+    m, c, k, R = 0.02, 50.0, 500.0, 2.0
+    A = (2.5 / 100) ** 2 * np.pi  # Area where the fluid pressure acts [m²]
+    L0, L1, g0 = 0.005, 0.0005, 4.0 / 100  # Inductance model constants
+    x_min, x_max = 0.0, 3.0 / 100  # Position limits [m]
+    dP = 20000.0  # Pressure differential [Pa]
+
+    def model(t, y):
+        x, v, i = y[0], y[1], y[2]
+        u = 0.0 if t < 0.2 else (12.0 if t < 0.6 else 24.0)  # Coil voltage [V]
+        x = min(max(x, x_min), x_max)
+        L = L0 + L1 / (g0 - x)
+        dLdx = L1 / (g0 - x) ** 2
+        F_magnetic = 0.5 * dLdx * i**2
+        F_fluid = dP * A * (x / x_max)
+        dvdt = (F_magnetic - c * v - k * x - F_fluid) / m
+        return np.array([v, dvdt, (u - R * i - i * dLdx * v) / L])
+
+    return model
+
+
+def duffing():
+    """other/duffing-oscillator-unforced"""
+    alpha = 1.0
+
+    def model(t, y):
+        x, v = y[0], y[1]
+        return np.array([v, -alpha * x - x**3])
+
+    return model
+
+
+def van_der_pol():
+    """other/van-der-pol-unforced"""
+    mu = 1.0
+
+    def model(t, y):
+        x, v = y[0], y[1]
+        return np.array([v, mu * (1 - x**2) * v - x])
+
+    return model
+
+
+def cstr_with_cooling():
+    """reactor/CSTR-with-cooling"""
+    rho, cp, rho_c, cp_c = 1000.0, 239.0, 1000.0, 4180.0
+    k0, E, delta_Hr = 1.2e9, 8.75e3 * R_gas, -5.0e7
+    U, A, V_c = 915.6, 2.7520, 0.55
+    q1, q, C_A1, T1 = 0.1, 0.1, 1.0, zero_Celsius + 50.0  # Inlet and outlet
+    q_c, T_c0 = 0.005, zero_Celsius + 20.0  # Coolant
+
+    def model(t, y):
+        V, C_A, T, T_c = y[0], y[1], y[2], y[3]
+        Gamma = k0 * np.exp(-E / (R_gas * T)) * C_A
+        dVdt = q1 - q
+        dCAdt = ((C_A1 - C_A) * q1 - Gamma * V) / V
+        dTdt = (
+            rho * q1 * cp * (T1 - T) + (-delta_Hr) * Gamma * V + U * A * (T_c - T)
+        ) / (rho * V * cp)
+        dTcdt = (rho_c * q_c * cp_c * (T_c0 - T_c) - U * A * (T_c - T)) / (
+            rho_c * V_c * cp_c
+        )
+        return np.array([dVdt, dCAdt, dTdt, dTcdt])
+
+    return model
+
+
+def two_cstrs_and_separator():
+    """reactor/two-CSTRs-and-separator"""
+    rho, Cp, m, R = 1000.0, 4.2, 0.00279, 8.314
+    k1, k2, E1, E2 = 2.77e3 * 3600, 2.5e3 * 3600, 5.0e4, 6.0e4
+    dH1, dH2 = -6.0e4, -7.0e4
+    alphaA, alphaB, alphaC, eps, xA0 = 5.0, 1.0, 0.5, 0.02, 1.0
+    Ff1, Ff2, F1, F2, F3, FR = 5.04, 5.04, 22.04, 27.08, 9.74, 17.0
+    Q1, Q2, Q3 = 715.3e3, 579.8e3, 568.7e3
+
+    def model(t, y):
+        V1, V2, V3, T1, T2, T3 = y[0], y[1], y[2], y[3], y[4], y[5]
+        xA1, xB1, xA2, xB2, xA3, xB3 = y[6], y[7], y[8], y[9], y[10], y[11]
+        T0 = 359.1 if t < 0.2 else 370.0  # Feed temperature [K]
+
+        xC3 = 1 - xA3 - xB3
+        FP = eps * FR
+        k11 = k1 * np.exp(-E1 / (R * T1))
+        k21 = k2 * np.exp(-E2 / (R * T1))
+        k12 = k1 * np.exp(-E1 / (R * T2))
+        k22 = k2 * np.exp(-E2 / (R * T2))
+        denom = alphaA * xA3 + alphaB * xB3 + alphaC * xC3
+        xAR = alphaA * xA3 / denom
+        xBR = alphaB * xB3 / denom
+
+        dT1dt = (
+            (Ff1 / V1) * (T0 - T1)
+            + (FR / V1) * (T3 - T1)
+            + Q1 / (rho * Cp * V1)
+            - (m / Cp) * (k11 * xA1 * dH1 + k21 * xB1 * dH2)
+        )
+        dT2dt = (
+            (Ff2 / V2) * (T0 - T2)
+            + (F1 / V2) * (T1 - T2)
+            + Q2 / (rho * Cp * V2)
+            - (m / Cp) * (k12 * xA2 * dH1 + k22 * xB2 * dH2)
+        )
+        dT3dt = (F2 / V3) * (T2 - T3) + Q3 / (rho * Cp * V3)
+        return np.array(
+            [
+                Ff1 + FR - F1,
+                Ff2 + F1 - F2,
+                F2 - FP - FR - F3,
+                dT1dt,
+                dT2dt,
+                dT3dt,
+                (Ff1 / V1) * (xA0 - xA1) + (FR / V1) * (xAR - xA1) - k11 * xA1,
+                (FR / V1) * (xBR - xB1) - (Ff1 / V1) * xB1 + k11 * xA1 - k21 * xB1,
+                (Ff2 / V2) * (xA0 - xA2) + (F1 / V2) * (xA1 - xA2) - k12 * xA2,
+                (F1 / V2) * (xB1 - xB2) - (Ff2 / V2) * xB2 + k12 * xA2 - k22 * xB2,
+                (F2 / V3) * (xA2 - xA3) - ((FP + FR) / V3) * (xAR - xA3),
+                (F2 / V3) * (xB2 - xB3) - ((FP + FR) / V3) * (xBR - xB3),
+            ]
+        )
+
+    return model
+
+
+def simple_two_cstrs_and_separator():
+    """reactor/simple-two-CSTRs-and-separator"""
+    rho, Cp, m, R = 1000.0, 4.2, 0.00279, 8.314
+    k1, k2, E1, E2 = 2.77e3 * 3600, 2.5e3 * 3600, 5.0e4, 6.0e4
+    dH1, dH2 = -6.0e4, -7.0e4
+    alphaA, alphaB, alphaC, eps, xA0 = 5.0, 1.0, 0.5, 0.02, 1.0
+    V1, V2, V3 = 1.0, 0.5, 1.0
+    Ff1, Ff2, FR = 5.04, 5.04, 17.0
+    Q1, Q2, Q3 = 715.3e3, 579.8e3, 568.7e3
+
+    def model(t, y):
+        T1, T2, T3 = y[0], y[1], y[2]
+        xA1, xB1, xA2, xB2, xA3, xB3 = y[3], y[4], y[5], y[6], y[7], y[8]
+        T0 = 359.1 if t < 0.2 else 370.0  # Feed temperature [K]
+
+        F1 = Ff1 + FR
+        F2 = Ff2 + F1
+        xC3 = 1 - xA3 - xB3
+        FP = eps * FR
+        k11 = k1 * np.exp(-E1 / (R * T1))
+        k21 = k2 * np.exp(-E2 / (R * T1))
+        k12 = k1 * np.exp(-E1 / (R * T2))
+        k22 = k2 * np.exp(-E2 / (R * T2))
+        denom = alphaA * xA3 + alphaB * xB3 + alphaC * xC3
+        xAR = alphaA * xA3 / denom
+        xBR = alphaB * xB3 / denom
+
+        dT1dt = (
+            (Ff1 / V1) * (T0 - T1)
+            + (FR / V1) * (T3 - T1)
+            + Q1 / (rho * Cp * V1)
+            - (m / Cp) * (k11 * xA1 * dH1 + k21 * xB1 * dH2)
+        )
+        dT2dt = (
+            (Ff2 / V2) * (T0 - T2)
+            + (F1 / V2) * (T1 - T2)
+            + Q2 / (rho * Cp * V2)
+            - (m / Cp) * (k12 * xA2 * dH1 + k22 * xB2 * dH2)
+        )
+        dT3dt = (F2 / V3) * (T2 - T3) + Q3 / (rho * Cp * V3)
+        return np.array(
+            [
+                dT1dt,
+                dT2dt,
+                dT3dt,
+                (Ff1 / V1) * (xA0 - xA1) + (FR / V1) * (xAR - xA1) - k11 * xA1,
+                (FR / V1) * (xBR - xB1) - (Ff1 / V1) * xB1 + k11 * xA1 - k21 * xB1,
+                (Ff2 / V2) * (xA0 - xA2) + (F1 / V2) * (xA1 - xA2) - k12 * xA2,
+                (F1 / V2) * (xB1 - xB2) - (Ff2 / V2) * xB2 + k12 * xA2 - k22 * xB2,
+                (F2 / V3) * (xA2 - xA3) - ((FP + FR) / V3) * (xAR - xA3),
+                (F2 / V3) * (xB2 - xB3) - ((FP + FR) / V3) * (xBR - xB3),
+            ]
+        )
+
+    return model
+
+
+def cubic_tank():
+    """tank/cubic"""
+    gamma, A = 1000.0 * gravity, 4.0**2  # Specific weight [N/m³], area [m²]
+    A_p, k_f = np.pi * (0.20 / 2) ** 2, 1.0  # Pipe area [m²], friction [kg/m]
+    alpha = A_p * np.sqrt(gamma * A_p / k_f)  # Outlet discharge parameter
+    Q_in = 1.0  # Inlet flow rate [m³/s]
+
+    def model(t, y):
+        return np.array([(Q_in - alpha * np.sqrt(y[0])) / A])
+
+    return model
+
+
+def cubic_tank_with_momentum():
+    """tank/cubic-with-momentum"""
+    rho, gamma, A = 1000.0, 1000.0 * gravity, 4.0**2
+    A_p, L_p, k_f = np.pi * (0.20 / 2) ** 2, 1.0, 1.0
+    m_p = rho * A_p * L_p  # Mass of fluid inside the pipe [kg]
+    Q_in = 1.0  # Inlet flow rate [m³/s]
+
+    def model(t, y):
+        h, v_p = y[0], y[1]
+        return np.array(
+            [(Q_in - A_p * v_p) / A, (gamma * A_p * h - k_f * v_p**2) / m_p]
+        )
+
+    return model
+
+
+def cubic_tank_pump_controlled():
+    """tank/cubic-pump-controlled"""
+    A = 4.0**2  # Cross-sectional area [m²]
+    Q_in, Q_out = 0.3, 0.5  # Pump flow rates [m³/s]
+
+    def model(t, y):
+        return np.array([(Q_in - Q_out) / A])
+
+    return model
+
+
+def conical_tank():
+    """tank/conical"""
+    H, R, k = 4.0, 1.5, 0.8
+    q_in = 1.5  # Inlet flow rate [m³/s]
+
+    def model(t, y):
+        h = y[0]
+        return np.array([(H**2 / (np.pi * R**2)) * (q_in / h**2 - k / np.sqrt(h**3))])
+
+    return model
+
+
+def heated_tank():
+    """tank/with-heating"""
+    rho, cp, rho_j, lambda_j = 1000.0, 4180.0, 958.0, 2.256e6
+    A, k = np.pi * (1.5**2), 0.12
+    q_in, q_j, T_in = 0.2, 0.015, zero_Celsius + 28.0
+
+    def model(t, y):
+        L, T = y[0], y[1]
+        heat_in = rho * q_in * cp * (T_in - T)
+        heat_jacket = rho_j * q_j * lambda_j
+        return np.array(
+            [(q_in - k * np.sqrt(L)) / A, (heat_in + heat_jacket) / (rho * A * L * cp)]
+        )
+
+    return model
+
+
+def mixer_with_heating():
+    """tank/mixer-with-heating"""
+    rho, cp, rho_c, lambda_c = 1000.0, 4180.0, 958.0, 2.256e6
+    q1, q2, q_c = 0.10, 0.08, 0.015
+    q = q1 + q2
+    C_A1, C_A2, C_B1, C_B2 = 2.0, 1.5, 3.0, 2.5
+    T1, T2 = zero_Celsius + 25.0, zero_Celsius + 35.0
+
+    def model(t, y):
+        V, C_A, C_B, T = y[0], y[1], y[2], y[3]
+        heat_in = (
+            rho * q1 * cp * (T1 - T) + rho * q2 * cp * (T2 - T) + rho_c * q_c * lambda_c
+        )
+        return np.array(
+            [
+                q1 + q2 - q,
+                ((C_A1 - C_A) * q1 + (C_A2 - C_A) * q2) / V,
+                ((C_B1 - C_B) * q1 + (C_B2 - C_B) * q2) / V,
+                heat_in / (rho * V * cp),
+            ]
+        )
+
+    return model
+
+
+def isothermal_accumulator():
+    """vessel/isothermal-accumulator"""
+    V, MM, T, k1, k2 = 1.0, 0.0289647, 293.0, 0.01, 0.015
+    P1, P2 = 2 * atm, atm  # Inlet and outlet pressures [Pa]
+
+    def model(t, y):
+        P = y[0]
+        return np.array(
+            [(R_gas * T / (V * MM)) * (k1 * np.sqrt(P1 - P) - k2 * np.sqrt(P - P2))]
+        )
+
+    return model
+
+
+# Library simulations: model, initial state and final time
+models: Final = {
+    "RC circuit (charge)": (rc_circuit_charge, [0.0], 3.0),
+    "RC circuit (voltage)": (rc_circuit_voltage, [0.0], 3.0),
+    "RLC circuit (charge)": (rlc_circuit_charge, [0.0, 0.0], 3.0),
+    "RLC circuit (voltage)": (rlc_circuit_voltage, [0.0, 0.0], 3.0),
+    "RLC with diode": (rlc_diode, [0.0, 0.0], 0.2),
+    "DC motor": (dc_motor, [0.0, 0.0], 10.0),
+    "Inverted pendulum": (inverted_pendulum, [np.deg2rad(10.0), 0.0, 0.0, 0.0], 10.0),
+    "Linear inverted pendulum": (
+        linear_inverted_pendulum,
+        [np.deg2rad(10.0), 0.0, 0.0, 0.0],
+        1.5,
+    ),
+    "Simple pendulum": (simple_pendulum, [np.deg2rad(30.0), 0.0], 10.0),
+    "Linear simple pendulum": (linear_simple_pendulum, [np.deg2rad(10.0), 0.0], 10.0),
+    "Physical pendulum": (physical_pendulum, [np.deg2rad(30.0), 0.0], 10.0),
+    "Mass–spring–damper": (mass_spring_damper, [0.0, 0.0], 10.0),
+    "Two-mass–spring–damper": (two_mass_spring_damper, [0.0, 0.0, 0.0, 0.0], 8.0),
+    "Pneumatic valve": (pneumatic_valve, [2.92 / 100, 0.0], 1.0),
+    "Solenoid valve": (solenoid_valve, [0.0, 0.0, 0.0], 1.0),
+    "Duffing oscillator": (duffing, [1.0, 0.0], 10.0),
+    "Van der Pol oscillator": (van_der_pol, [1.0, 0.0], 50.0),
+    "CSTR with cooling": (
+        cstr_with_cooling,
+        [1.5, 0.9, zero_Celsius + 25.0, zero_Celsius + 20.0],
+        1200.0,
+    ),
+    "Two CSTRs and separator": (
+        two_cstrs_and_separator,
+        [1.0, 0.5, 1.0, 432.4, 427.1, 432.1, 0.536, 0.448, 0.545, 0.438, 0.298, 0.67],
+        2.5,
+    ),
+    "Simple two CSTRs and separator": (
+        simple_two_cstrs_and_separator,
+        [432.4, 427.1, 432.1, 0.536, 0.448, 0.545, 0.438, 0.298, 0.67],
+        2.5,
+    ),
+    "Cubic tank": (cubic_tank, [0.1], 600.0),
+    "Cubic tank with momentum": (cubic_tank_with_momentum, [0.1, 0.0], 600.0),
+    "Pump-controlled tank": (cubic_tank_pump_controlled, [2.0], 100.0),
+    "Conical tank": (conical_tank, [0.5], 100.0),
+    "Heated tank": (heated_tank, [0.5, zero_Celsius + 28.0], 1000.0),
+    "Mixer with heating": (
+        mixer_with_heating,
+        [2.0, 1.0, 1.0, zero_Celsius + 28.0],
+        50.0,
+    ),
+    "Isothermal accumulator": (isothermal_accumulator, [1.5 * atm], 3.0),
+}
+
+
+# --- Steppers and Jacobian ---
+# Plain Python loops over NumPy arrays: compiled by the numba backend, they run
+# the whole integration without returning to the interpreter.
+def rk4(f, t0: float, t1: float, y0: np.ndarray, n_steps: int) -> np.ndarray:
+    """
+    Classical fixed-step Runge-Kutta method.
+
+    Returns:
+    - y: trajectory at the n_steps + 1 equally spaced times, shape (n_steps + 1, n)
+    """
+    h = (t1 - t0) / n_steps
+    y = np.empty((n_steps + 1, len(y0)))
+    y[0] = y0
+    for i in range(n_steps):
+        t = t0 + i * h
+        k1 = f(t, y[i])
+        k2 = f(t + h / 2, y[i] + h / 2 * k1)
+        k3 = f(t + h / 2, y[i] + h / 2 * k2)
+        k4 = f(t + h, y[i] + h * k3)
+        y[i + 1] = y[i] + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+    return y
+
+
+# Dormand-Prince 5(4) coefficients, the method of solve_ivp's RK45
+C_DP = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1])
+A_DP = np.array(
+    [
+        [0, 0, 0, 0, 0],
+        [1 / 5, 0, 0, 0, 0],
+        [3 / 40, 9 / 40, 0, 0, 0],
+        [44 / 45, -56 / 15, 32 / 9, 0, 0],
+        [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0],
+        [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    ]
+)
+B_DP = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+E_DP = np.array(
+    [-71 / 57600, 0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40]
+)
+
+
+def dopri45(f, t0: float, t1: float, y0: np.ndarray, rtol: float, atol: float):
+    """
+    Adaptive Dormand-Prince 5(4) method, with the step size control of RK45.
+
+    Returns:
+    - y: state at t1
+    - n_steps: number of accepted steps
+    - nfev: number of calls to f
+    """
+    n = len(y0)
+    K = np.empty((7, n))
+    t, y = t0, y0.copy()
+    K[0] = f(t, y)
+    nfev, n_steps = 1, 0
+
+    # Initial step, as in solve_ivp
+    scale = atol + np.abs(y) * rtol
+    d0 = np.sqrt(np.mean((y / scale) ** 2))
+    d1 = np.sqrt(np.mean((K[0] / scale) ** 2))
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    f1 = f(t + h0, y + h0 * K[0])
+    nfev += 1
+    d2 = np.sqrt(np.mean(((f1 - K[0]) / scale) ** 2)) / h0
+    if d1 <= 1e-15 and d2 <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / 5)
+    h = min(100 * h0, h1, t1 - t0)
+
+    while t < t1:
+        h = min(h, t1 - t)
+        for s in range(1, 6):
+            K[s] = f(t + C_DP[s] * h, y + h * (A_DP[s, :s] @ K[:s]))
+        y_new = y + h * (B_DP @ K[:6])
+        K[6] = f(t + h, y_new)
+        nfev += 6
+
+        scale = atol + np.maximum(np.abs(y), np.abs(y_new)) * rtol
+        error = np.sqrt(np.mean((h * (E_DP @ K) / scale) ** 2))
+        if error < 1:
+            factor = 10.0 if error == 0 else min(10.0, 0.9 * error**-0.2)
+            t, y = t + h, y_new
+            K[0] = K[6]
+            n_steps += 1
+        else:
+            factor = max(0.2, 0.9 * error**-0.2)
+        h *= factor
+    return y, n_steps, nfev
+
+
+def fd_jacobian(f, t: float, y: np.ndarray) -> np.ndarray:
+    """Jacobian of f at (t, y), by forward finite differences."""
+    f0 = f(t, y)
+    J = np.empty((len(f0), len(y)))
+    for j in range(len(y)):
+        dy = 1.5e-8 * max(1.0, abs(y[j]))
+        y_j = y.copy()
+        y_j[j] += dy
+        J[:, j] = (f(t, y_j) - f0) / dy
+    return J
+
+
+# --- Benchmark ---
+rtol: Final = 1e-6  # Relative tolerance of the adaptive solvers
+atol: Final = 1e-9  # Absolute tolerance of the adaptive solvers
+n_rk4: Final = 10_000  # Steps of the fixed-step method
+repeats: Final = 3  # Timings keep the best of these runs...
+max_time: Final = 0.3  # ...unless they already took this long [s]
+
+
+def best_time(run) -> tuple[float, object]:
+    """Best wall time of a few runs, and the result of the last one."""
+    times = []
+    while len(times) < repeats and sum(times) < max_time:
+        start = time.perf_counter()
+        result = run()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def relative_error(y: np.ndarray, y_ref: np.ndarray) -> float:
+    return np.max(np.abs(y - y_ref) / np.maximum(np.abs(y_ref), 1e-3))
+
+
+def benchmark(steppers: dict, f, y0: np.ndarray, t_end: float, y_ref: np.ndarray):
+    """
+    Time the model and the solvers with one backend.
+
+    Returns:
+    - r: times [s], errors relative to y_ref and counters, by name
+    """
+    rk4_b, dopri45_b, jacobian_b = steppers.values()
+    r = {}
+
+    r["call"], _ = best_time(lambda: [f(0.0, y0) for _ in range(1000)])
+    r["call"] /= 1000
+
+    r["solve_ivp"], sol = best_time(
+        lambda: solve_ivp(f, (0, t_end), y0, rtol=rtol, atol=atol)
+    )
+    r["solve_ivp error"] = relative_error(sol.y[:, -1], y_ref)
+    r["solve_ivp nfev"] = sol.nfev
+
+    r["dopri45"], (y, _, nfev) = best_time(
+        lambda: dopri45_b(f, 0.0, t_end, y0, rtol, atol)
+    )
+    r["dopri45 y"] = y
+    r["dopri45 error"] = relative_error(y, y_ref)
+    r["dopri45 nfev"] = nfev
+
+    r["rk4"], y = best_time(lambda: rk4_b(f, 0.0, t_end, y0, n_rk4))
+    r["rk4 error"] = relative_error(y[-1], y_ref)
+
+    def jac(t, y):
+        return jacobian_b(f, t, y)
+
+    r["LSODA"], sol = best_time(
+        lambda: solve_ivp(
+            f, (0, t_end), y0, method="LSODA", jac=jac, rtol=rtol, atol=atol
+        )
+    )
+    r["LSODA error"] = relative_error(sol.y[:, -1], y_ref)
+    return r
+
+
+# The steppers are compiled once for all models
+steppers, compile_time = {}, {}
+for backend in backends:
+    start = time.perf_counter()
+    steppers[backend] = {
+        s.__name__: jit(s, backend) for s in (rk4, dopri45, fd_jacobian)
+    }
+    compile_time[backend] = time.perf_counter() - start
+
+results = {name: {} for name in models}
+for name, (factory, y0, t_end) in models.items():
+    y0 = np.array(y0, dtype=float)
+    # Reference solution. Some trial steps of the solenoid valve overflow, and
+    # are rejected by the step size control.
+    with np.errstate(over="ignore", invalid="ignore"):
+        y_ref = solve_ivp(
+            factory(), (0, t_end), y0, method="DOP853", rtol=1e-11, atol=1e-12
+        ).y[:, -1]
+    results[name]["n_states"] = len(y0)
+    for backend in backends:
+        start = time.perf_counter()
+        f = jit(factory(), backend)
+        results[name][backend, "compile"] = time.perf_counter() - start
+        for key, value in benchmark(steppers[backend], f, y0, t_end, y_ref).items():
+            results[name][backend, key] = value
+
+# --- Results ---
+print(f"Backends: {', '.join(backends)}")
+columns = ["call", "solve_ivp", "dopri45", "rk4", "LSODA"]
+header = f"{'Model':<32} {'n':>2} {'Backend':<7} {'Compile':>8}"
+header += "".join(f" {c:>10}" for c in columns)
+print(header)
+for name, r in results.items():
+    for backend in backends:
+        line = f"{name:<32} {r['n_states']:>2} {backend:<7}"
+        line += f" {r[backend, 'compile']:>7.3f}s"
+        line += f" {r[backend, 'call'] * 1e6:>8.2f}us"
+        line += "".join(f" {r[backend, c] * 1e3:>8.2f}ms" for c in columns[1:])
+        print(line)
+
+print(f"\n{'Model':<32} {'RK45 calls':>10} {'DOPRI calls':>11}", end="")
+print("".join(f" {c + ' error':>16}" for c in columns[1:]))
+for name, r in results.items():
+    b = backends[-1]
+    line = f"{name:<32} {r[b, 'solve_ivp nfev']:>10} {r[b, 'dopri45 nfev']:>11}"
+    line += "".join(f" {r[b, c + ' error']:>16.1e}" for c in columns[1:])
+    print(line)
+
+if "numba" in backends:
+    difference = max(
+        relative_error(r["numba", "dopri45 y"], r["NumPy", "dopri45 y"])
+        for r in results.values()
+    )
+    print(f"\nLargest difference between the backends (DOPRI45): {difference:.1e}")
+    for c in columns:
+        speedup = [r["NumPy", c] / r["numba", c] for r in results.values()]
+        print(
+            f"Speedup of {c:<9}: median {np.median(speedup):6.1f}x,"
+            f" from {min(speedup):6.1f}x to {max(speedup):6.1f}x"
+        )
+    speedup = [
+        r["NumPy", "solve_ivp"] / r["numba", "dopri45"] for r in results.values()
+    ]
+    print(
+        f"Compiled DOPRI45 over solve_ivp with NumPy: median {np.median(speedup):.1f}x,"
+        f" from {min(speedup):.1f}x to {max(speedup):.1f}x"
+    )
+    total = sum(r["numba", "compile"] for r in results.values())
+    print(
+        f"Compile time: {compile_time['numba']:.1f} s for the steppers,"
+        f" {total:.1f} s for the {len(models)} models"
+    )
+
+# --- Plot Results ---
+names = list(models)
+position = np.arange(len(names))
+fig, axs = plt.subplots(1, 3, figsize=(18, 9), sharey=True, constrained_layout=True)
+fig.suptitle("JIT-Compiled Models: NumPy and numba Backends")
+
+ax = axs[0]
+for k, backend in enumerate(backends):
+    ax.barh(
+        position + 0.4 * k - 0.2,
+        [results[n][backend, "call"] * 1e6 for n in names],
+        height=0.4,
+        label=backend,
+    )
+ax.set_xscale("log")
+ax.set_title("Time per model call from Python")
+ax.set_xlabel("Time / µs")
+ax.legend()
+
+ax = axs[1]
+for backend, marker in zip(backends, "os"):
+    for c, color in zip(["solve_ivp", "dopri45", "LSODA"], ["C0", "C1", "C2"]):
+        label = {"solve_ivp": "solve_ivp RK45", "dopri45": "DOPRI45 stepper"}
+        ax.scatter(
+            [results[n][backend, c] * 1e3 for n in names],
+            position,
+            marker=marker,
+            color=color,
+            facecolors="none" if backend == "NumPy" else color,
+            label=f"{label.get(c, 'LSODA, Jacobian')} ({backend})",
+        )
+ax.set_xscale("log")
+ax.set_title(f"Adaptive solvers (rtol = {rtol:g}, atol = {atol:g})")
+ax.set_xlabel("Time / ms")
+ax.legend(fontsize=8)
+
+ax = axs[2]
+for k, backend in enumerate(backends):
+    ax.barh(
+        position + 0.4 * k - 0.2,
+        [results[n][backend, "rk4"] * 1e3 for n in names],
+        height=0.4,
+        label=f"RK4 ({backend})",
+    )
+if "numba" in backends:
+    ax.scatter(
+        [results[n]["numba", "compile"] * 1e3 for n in names],
+        position,
+        marker="|",
+        s=200,
+        color="k",
+        label="numba compile time",
+    )
+ax.set_xscale("log")
+ax.set_title(f"Fixed-step RK4 ({n_rk4} steps)")
+ax.set_xlabel("Time / ms")
+ax.legend()
+
+for ax in axs:
+    ax.grid(axis="x", which="both", alpha=0.3)
+axs[0].set_yticks(position, names)
+axs[0].invert_yaxis()
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
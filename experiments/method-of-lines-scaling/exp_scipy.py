@@ -0,0 +1,232 @@
+import os
+import time
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import gas_constant, zero_Celsius
+from scipy.integrate import solve_ivp
+from scipy.sparse import diags_array
+
+# --- Tubular Reactor Model ---
+# Same model as models/reactor/tubular-reactor-with-cooling, states [C_A, T, T_c]
+# of each cell stored together
+rho: Final = 1000.0  # Reactor fluid density [kg/m³]
+cp: Final = 239.0  # Reactor fluid heat capacity [J/(kg·K)]
+rho_c: Final = 1000.0  # Coolant density [kg/m³]
+cp_c: Final = 4180.0  # Coolant heat capacity [J/(kg·K)]
+k0: Final = 1.2e9  # Pre-exponential factor [1/s]
+R: Final = gas_constant  # Universal gas constant [J/(mol·K)]
+E: Final = 8.75e3 * R  # Activation energy [J/mol]
+delta_Hr: Final = -5.0e7  # Reaction enthalpy [J/mol]
+U: Final = 915.6  # Overall heat transfer coefficient [W/(m²·K)]
+L: Final = 6.0  # Tube length [m]
+A_t: Final = 0.25  # Tube cross-sectional area [m²]
+A_c: Final = 0.55 / L  # Cooling jacket cross-sectional area [m²]
+P: Final = 2 * np.sqrt(np.pi * A_t)  # Tube perimeter [m]
+D_ax: Final = 0.024  # Axial dispersion coefficient [m²/s]
+
+q: Final = 0.1  # Process flow rate [m³/s]
+C_A1: Final = 1.0  # Feed concentration of A [mol/m³]
+T1: Final = zero_Celsius + 70.0  # Feed temperature [K]
+q_c: Final = 0.005  # Coolant flow rate [m³/s]
+T_c0: Final = zero_Celsius + 20.0  # Coolant inlet temperature [K]
+
+
+def reactor(t: float, y: np.ndarray) -> np.ndarray:
+    C_A, T, T_c = y[0::3], y[1::3], y[2::3]
+    dz = L / len(C_A)
+    v, v_c = q / A_t, q_c / A_c
+
+    Gamma = k0 * np.exp(-E / (R * T)) * C_A
+    Q = U * P * (T_c - T)
+
+    def face_flux(x, x_in):
+        flux = np.empty(len(x) + 1)
+        flux[0] = v * x_in
+        flux[1:] = v * x
+        flux[1:-1] -= D_ax * np.diff(x) / dz
+        return flux
+
+    N_c = np.append(v_c * T_c, v_c * T_c0)
+
+    dydt = np.empty_like(y)
+    dydt[0::3] = -np.diff(face_flux(C_A, C_A1)) / dz - Gamma
+    dydt[1::3] = -np.diff(face_flux(T, T1)) / dz + ((-delta_Hr) * Gamma + Q / A_t) / (
+        rho * cp
+    )
+    dydt[2::3] = np.diff(N_c) / dz - Q / (rho_c * cp_c * A_c)
+    return dydt
+
+
+def reactor_initial_state(n_cells: int) -> np.ndarray:
+    return np.tile([0.0, zero_Celsius + 25.0, zero_Celsius + 20.0], n_cells)
+
+
+# --- Double-Pipe Heat Exchanger Model ---
+# Same model as models/heat-exchanger/double-pipe-countercurrent, states
+# [T_h, T_c] of each cell stored together, at constant inlet temperatures
+cp_w: Final = 4180.0  # Heat capacity of water [J/(kg·K)]
+U_hx: Final = 1500.0  # Overall heat transfer coefficient [W/(m²·K)]
+L_hx: Final = 10.0  # Exchanger length [m]
+A_h: Final = 2.0e-3  # Cross-sectional area of the inner tube [m²]
+A_a: Final = 3.0e-3  # Cross-sectional area of the annulus [m²]
+P_hx: Final = 0.157  # Perimeter of the inner tube [m]
+q_h: Final = 0.3e-3  # Hot fluid flow rate [m³/s]
+q_a: Final = 0.4e-3  # Cold fluid flow rate [m³/s]
+T_h_in: Final = zero_Celsius + 90.0  # Hot fluid inlet temperature [K]
+T_a_in: Final = zero_Celsius + 20.0  # Cold fluid inlet temperature [K]
+
+
+def exchanger(t: float, y: np.ndarray) -> np.ndarray:
+    T_h, T_a = y[0::2], y[1::2]
+    dz = L_hx / len(T_h)
+    Q = U_hx * P_hx * (T_h - T_a)
+
+    dydt = np.empty_like(y)
+    dydt[0::2] = -q_h / A_h * np.diff(T_h, prepend=T_h_in) / dz - Q / (rho * cp_w * A_h)
+    dydt[1::2] = q_a / A_a * np.diff(T_a, append=T_a_in) / dz + Q / (rho * cp_w * A_a)
+    return dydt
+
+
+def exchanger_duty_ntu() -> float:
+    """Steady-state heat duty from the effectiveness-NTU relation [W]"""
+    C_h, C_a = rho * cp_w * q_h, rho * cp_w * q_a
+    C_min, C_r = min(C_h, C_a), min(C_h, C_a) / max(C_h, C_a)
+    e = np.exp(-U_hx * P_hx * L_hx / C_min * (1 - C_r))
+    return (1 - e) / (1 - C_r * e) * C_min * (T_h_in - T_a_in)
+
+
+# --- Solver Configurations ---
+def band_pattern(n: int, bandwidth: int):
+    """Sparsity pattern of a banded Jacobian, for jac_sparsity."""
+    offsets = range(-bandwidth, bandwidth + 1)
+    return diags_array([np.ones(n - abs(k)) for k in offsets], offsets=offsets)
+
+
+solvers: Final = {
+    "LSODA, banded": {"method": "LSODA", "lband": 3, "uband": 3},
+    "BDF, jac_sparsity": {"method": "BDF", "sparse": True},
+    "LSODA, dense": {"method": "LSODA"},
+    "RK45 (explicit)": {"method": "RK45"},
+}
+max_cells: Final = {  # Largest grid run with each solver, to keep the run short
+    "LSODA, banded": 10_000,
+    "BDF, jac_sparsity": 1000,
+    "LSODA, dense": 100,
+    "RK45 (explicit)": 100,
+}
+n_cells_list: Final = [10, 30, 100, 300, 1000, 3000, 10_000]
+t_span: Final = (0.0, 240.0)  # Simulation time [s]
+tol: Final = {"rtol": 1e-4, "atol": 1e-6}
+
+# --- Scaling Benchmark: Tubular Reactor ---
+results = {name: {"n": [], "time": [], "nfev": []} for name in solvers}
+profiles = {}
+hot_spot, T_out = {}, {}
+
+print(f"{'Cells':>6} {'States':>7} {'Solver':<18} {'RHS calls':>10} {'Time':>8}")
+for n_cells in n_cells_list:
+    y0 = reactor_initial_state(n_cells)
+    for name, options in solvers.items():
+        if n_cells > max_cells[name]:
+            continue
+        options = dict(options)
+        if options.pop("sparse", False):
+            options["jac_sparsity"] = band_pattern(3 * n_cells, 3)
+        start = time.perf_counter()
+        sol = solve_ivp(reactor, t_span, y0, **options, **tol)
+        elapsed = time.perf_counter() - start
+        results[name]["n"].append(n_cells)
+        results[name]["time"].append(elapsed)
+        results[name]["nfev"].append(sol.nfev)
+        print(
+            f"{n_cells:>6} {3 * n_cells:>7} {name:<18} {sol.nfev:>10} {elapsed:>7.2f}s"
+        )
+        if name == "LSODA, banded":
+            T = sol.y[1::3, -1]
+            hot_spot[n_cells], T_out[n_cells] = T.max(), T[-1]
+            profiles[n_cells] = T
+
+# --- Grid Convergence ---
+# Reactor: compared with the finest grid. Heat exchanger: compared with the
+# effectiveness-NTU relation, from the steady state of each grid.
+reference = n_cells_list[-1]
+Q_ntu = exchanger_duty_ntu()
+Q_error = {}
+print(
+    f"\n{'Cells':>6} {'Hot spot':>9} {'Error':>8} {'T outlet':>9} {'Error':>8}"
+    f" {'Exchanger duty error':>21}"
+)
+for n_cells in n_cells_list:
+    sol = solve_ivp(
+        exchanger,
+        (0.0, 1800.0),
+        np.full(2 * n_cells, T_a_in),
+        method="LSODA",
+        lband=2,
+        uband=2,
+        **tol,
+    )
+    Q = rho * cp_w * q_h * (T_h_in - sol.y[-2, -1])
+    Q_error[n_cells] = abs(Q - Q_ntu) / Q_ntu
+    print(
+        f"{n_cells:>6} {hot_spot[n_cells] - zero_Celsius:>8.2f}C"
+        f" {abs(hot_spot[n_cells] - hot_spot[reference]):>7.3f}K"
+        f" {T_out[n_cells] - zero_Celsius:>8.2f}C"
+        f" {abs(T_out[n_cells] - T_out[reference]):>7.3f}K"
+        f" {Q_error[n_cells]:>20.1e}"
+    )
+
+# --- Plot Results ---
+fig, axs = plt.subplots(2, 2, figsize=(12, 9), constrained_layout=True)
+fig.suptitle("Method of Lines: Banded Jacobians from 10 to 10 000 Cells")
+
+ax = axs[0, 0]
+for n_cells in (10, 30, 100, 1000, 10_000):
+    z = (np.arange(n_cells) + 0.5) * L / n_cells
+    ax.plot(z, profiles[n_cells] - zero_Celsius, label=f"{n_cells} cells")
+ax.set_title("Tubular reactor, temperature at t = 240 s")
+ax.set_xlabel("Axial position / m")
+ax.set_ylabel("Temperature / °C")
+ax.legend()
+ax.grid()
+
+ax = axs[0, 1]
+n_conv = np.array(n_cells_list[:-1])
+ax.loglog(
+    n_conv,
+    [abs(T_out[n] - T_out[reference]) for n in n_conv],
+    "o-",
+    label="Reactor outlet temperature (vs 10 000 cells)",
+)
+ax.loglog(
+    n_cells_list,
+    [Q_error[n] for n in n_cells_list],
+    "s-",
+    label="Exchanger duty, relative (vs ε-NTU)",
+)
+ax.loglog(n_conv, 10 / n_conv, "k--", label="First order, $\\propto 1/N$")
+ax.set_title("Grid convergence")
+ax.set_xlabel("Number of cells")
+ax.set_ylabel("Error")
+ax.legend(fontsize=8)
+ax.grid(which="both", alpha=0.3)
+
+for ax, key, ylabel in zip(axs[1], ("time", "nfev"), ("Time / s", "RHS calls")):
+    for name, marker in zip(solvers, "os^v"):
+        r = results[name]
+        ax.loglog(r["n"], r[key], marker=marker, label=name)
+    ax.set_xlabel("Number of cells")
+    ax.set_ylabel(ylabel)
+    ax.legend()
+    ax.grid(which="both", alpha=0.3)
+axs[1, 0].set_title("Tubular reactor, solve time")
+axs[1, 1].set_title("Tubular reactor, RHS calls (including Jacobians)")
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
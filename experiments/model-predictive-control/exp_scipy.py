@@ -0,0 +1,491 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import g as gravity
+from scipy.constants import zero_Celsius
+from scipy.integrate import solve_ivp
+from scipy.linalg import cho_factor, cho_solve, expm, solve_discrete_are
+
+# --- Inverted Pendulum Model ---
+m_c: Final = 1.0  # Mass of the cart [kg]
+m_p: Final = 0.2  # Mass of the pendulum rod [kg]
+L_p: Final = 0.5  # Distance from pivot to rod center of mass [m]
+J: Final = (1 / 12) * m_p * (2 * L_p) ** 2  # Moment of inertia of the rod [kg·m²]
+b: Final = 10.0  # Viscous damping coefficient of the cart [N·s/m]
+g: Final = gravity  # Gravitational acceleration [m/s²]
+
+
+def pendulum_model(t: float, y: np.ndarray, u: np.ndarray):
+    """
+    Differential equations of the inverted pendulum on a cart.
+
+    Parameters:
+    - t: time [s]
+    - y: state vector [theta, omega, x, v]
+    - u: input vector [F]
+    """
+    theta, omega, _, v = y
+    F = u[0]
+
+    mass_matrix = np.array(
+        [
+            [1, 0, 0, 0],
+            [0, m_p * L_p**2 + J, 0, m_p * L_p * np.cos(theta)],
+            [0, 0, 1, 0],
+            [0, m_p * L_p * np.cos(theta), 0, m_c + m_p],
+        ]
+    )
+    b_rhs = np.array(
+        [
+            omega,
+            m_p * g * L_p * np.sin(theta),
+            v,
+            F - b * v + m_p * L_p * omega**2 * np.sin(theta),
+        ]
+    )
+    return np.linalg.solve(mass_matrix, b_rhs)
+
+
+# --- Heated Tank Model ---
+rho: Final = 1000.0  # Liquid density (water) [kg/m³]
+cp: Final = 4180.0  # Specific heat capacity (water) [J/(kg·K)]
+rho_j: Final = 958.0  # Condensate density (liquid water at 100°C) [kg/m³]
+lambda_j: Final = 2.256e6  # Latent heat of condensation of water [J/kg]
+A_c: Final = np.pi * (1.5**2)  # Tank cross-sectional area [m²]
+k: Final = 0.12  # Outlet discharge parameter [m^2.5/s]
+
+
+def tank_model(t: float, y: np.ndarray, u: np.ndarray, T_in: float):
+    """
+    Differential equations of the heated tank.
+
+    Parameters:
+    - t: time [s]
+    - y: state vector [L, T]
+    - u: input vector [q_in, q_j]
+    - T_in: inlet temperature [K]
+    """
+    L, T = y
+    q_in, q_j = u
+
+    dLdt = (q_in - k * np.sqrt(L)) / A_c
+    heat_in = rho * q_in * cp * (T_in - T)
+    heat_jacket = rho_j * q_j * lambda_j
+    dTdt = (heat_in + heat_jacket) / (rho * A_c * L * cp)
+    return np.array([dLdt, dTdt])
+
+
+def tank_steady_inputs(L: float, T: float, T_in: float) -> np.ndarray:
+    """Inputs that hold the tank at level L and temperature T."""
+    q_in = k * np.sqrt(L)
+    q_j = rho * q_in * cp * (T - T_in) / (rho_j * lambda_j)
+    return np.array([q_in, q_j])
+
+
+# --- Linearization ---
+def linearize(
+    f: Callable[..., np.ndarray],
+    x_op: np.ndarray,
+    u_op: np.ndarray,
+    args: tuple = (),
+    rel_step: float = 1e-6,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Jacobians of a model f(t, x, u, *args) by central finite differences.
+
+    Parameters:
+    - f: model right-hand side, as written in the library
+    - x_op, u_op: operating point
+    - args: extra (constant) model arguments
+    - rel_step: relative perturbation size
+    Returns:
+    - A, B: state and input Jacobians
+    """
+    n, m = len(x_op), len(u_op)
+    z_op = np.concatenate([x_op, u_op])
+    steps = rel_step * np.maximum(np.abs(z_op), 1.0)
+
+    jac = np.empty((n, n + m))
+    for i in range(n + m):
+        dz = np.zeros(n + m)
+        dz[i] = steps[i]
+        z_plus, z_minus = z_op + dz, z_op - dz
+        f_plus = f(0.0, z_plus[:n], z_plus[n:], *args)
+        f_minus = f(0.0, z_minus[:n], z_minus[n:], *args)
+        jac[:, i] = (f_plus - f_minus) / (2 * steps[i])
+
+    return jac[:, :n], jac[:, n:]
+
+
+def discretize(A: np.ndarray, B: np.ndarray, Ts: float):
+    """Zero-order-hold discretization through the augmented matrix exponential."""
+    n, m = B.shape
+    M = np.zeros((n + m, n + m))
+    M[:n, :n] = A
+    M[:n, n:] = B
+    Md = expm(M * Ts)
+    return Md[:n, :n], Md[:n, n:]
+
+
+# --- Model Predictive Controller ---
+class LinearMPC:
+    """
+    Linear MPC on a condensed QP with input bounds.
+
+    The predicted states are eliminated with the prediction matrices
+    X = Phi x0 + Gamma U, so each step solves
+
+        min 1/2 U' H U + (F x0)' U   subject to   u_min <= U <= u_max
+
+    H and F depend only on the model and the weights, so H is factorized once
+    and its inverse and the unconstrained gain -H^-1 F are cached. The inputs
+    are scaled by their range to keep H well conditioned.
+    """
+
+    def __init__(
+        self,
+        Ad: np.ndarray,
+        Bd: np.ndarray,
+        Q: np.ndarray,
+        R: np.ndarray,
+        N: int,
+        u_min: np.ndarray,
+        u_max: np.ndarray,
+    ):
+        n, m = Bd.shape
+        self.N, self.m = N, m
+        self.u_scale = np.tile(u_max - u_min, N)
+        self.z_min = np.tile(u_min, N) / self.u_scale
+        self.z_max = np.tile(u_max, N) / self.u_scale
+
+        # Terminal weight from the discrete Riccati equation (infinite-horizon tail)
+        P = solve_discrete_are(Ad, Bd, Q, R)
+
+        # Prediction matrices: x_{k+1} = Phi[k] x0 + sum_j Gamma[k, j] u_j
+        Phi = np.empty((N * n, n))
+        Gamma = np.zeros((N * n, N * m))
+        A_power = np.eye(n)
+        for i in range(N):
+            A_power = Ad @ A_power
+            Phi[i * n : (i + 1) * n] = A_power
+        for i in range(N):
+            for j in range(i + 1):
+                Gamma[i * n : (i + 1) * n, j * m : (j + 1) * m] = (
+                    Phi[(i - j - 1) * n : (i - j) * n] @ Bd if i > j else Bd
+                )
+        Gamma *= self.u_scale
+
+        Q_bar = np.kron(np.eye(N), Q)
+        Q_bar[-n:, -n:] = P
+        R_bar = np.kron(np.eye(N), R) * np.outer(self.u_scale, self.u_scale)
+
+        H = Gamma.T @ Q_bar @ Gamma + R_bar
+        self.H_inv = cho_solve(cho_factor(H), np.eye(N * m))
+        self.K = -self.H_inv @ (Gamma.T @ Q_bar @ Phi)  # Unconstrained MPC gain
+
+    def solve(
+        self, x0: np.ndarray, U0: np.ndarray, max_iter: int = 200
+    ) -> tuple[np.ndarray, int]:
+        """
+        Solve the QP for the current state deviation.
+
+        Primal active-set method: the inputs in the working set are fixed at
+        their bounds and the others are moved towards the minimizer, until a
+        bound blocks them or a multiplier shows that an input should leave its
+        bound. With the cached inverse Hessian, each iteration is a small linear
+        system in the fixed inputs only. The working set is initialized from the
+        bounds reached by U0.
+
+        Parameters:
+        - x0: current state deviation
+        - U0: initial guess for the input sequence (deviations)
+        - max_iter: maximum number of active-set iterations
+        Returns:
+        - U: optimal input sequence (deviations)
+        - iterations: number of active-set iterations (0 when unconstrained)
+        """
+        z_free = self.K @ x0  # Minimizer without bounds
+        if np.all((z_free >= self.z_min) & (z_free <= self.z_max)):
+            return z_free * self.u_scale, 0
+
+        z = np.clip(U0 / self.u_scale, self.z_min, self.z_max)
+        upper = z >= self.z_max
+        fixed = upper | (z <= self.z_min)
+        for iteration in range(1, max_iter + 1):
+            # Minimizer with the fixed inputs at their bounds:
+            # H_inv[W, W] mu_W = z_free[W] - z[W], z_target = z_free - H_inv[:, W] mu_W
+            mu = np.zeros_like(z)
+            if fixed.any():
+                mu[fixed] = np.linalg.solve(
+                    self.H_inv[np.ix_(fixed, fixed)], z_free[fixed] - z[fixed]
+                )
+            step = z_free - self.H_inv[:, fixed] @ mu[fixed] - z
+
+            if np.max(np.abs(step)) < 1e-12:
+                # Release the bound with the most negative multiplier, if any
+                mu_signed = np.where(upper, mu, -mu)
+                i = np.argmin(np.where(fixed, mu_signed, np.inf))
+                if mu_signed[i] >= -1e-12:
+                    break
+                fixed[i] = upper[i] = False
+                continue
+
+            # Longest step that keeps the free inputs within their bounds
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = np.where(
+                    step > 0, (self.z_max - z) / step, (self.z_min - z) / step
+                )
+            ratio[fixed | (step == 0)] = np.inf
+            i = np.argmin(ratio)
+            if ratio[i] < 1:
+                z += ratio[i] * step
+                z[i] = self.z_max[i] if step[i] > 0 else self.z_min[i]
+                fixed[i] = True
+                upper[i] = step[i] > 0
+            else:
+                z += step
+
+        return z * self.u_scale, iteration
+
+    def shift(self, U: np.ndarray) -> np.ndarray:
+        """Warm start for the next step: drop the first input and repeat the last."""
+        return np.concatenate([U[self.m :], U[-self.m :]])
+
+
+def run_closed_loop(
+    model: Callable[..., np.ndarray],
+    x_init: np.ndarray,
+    Ts: float,
+    n_steps: int,
+    operating_point: Callable[[int], tuple],
+    controllers: dict,
+    make_controller: Callable[..., LinearMPC],
+    warm_start: bool = True,
+):
+    """
+    Closed-loop simulation of a nonlinear model under linear MPC.
+
+    Parameters:
+    - model: model right-hand side f(t, x, u, *args)
+    - x_init: initial state
+    - Ts: sampling period
+    - n_steps: number of samples
+    - operating_point: function of the step returning (x_op, u_op, args)
+    - controllers: cache of controllers, keyed by operating point
+    - make_controller: builds a controller for an operating point
+    - warm_start: start each QP from the shifted previous solution
+    Returns:
+    - x, u: state and input records
+    - solve_times, iterations: per-step statistics of the QP solves
+    """
+    x = np.empty((n_steps + 1, len(x_init)))
+    x[0] = x_init
+    u = None
+    solve_times = np.empty(n_steps)
+    iterations = np.empty(n_steps, dtype=int)
+    U = None
+
+    for step in range(n_steps):
+        x_op, u_op, args = operating_point(step)
+        key = (tuple(x_op), tuple(u_op), args)
+        if key not in controllers:
+            controllers[key] = make_controller(x_op, u_op, args)
+        mpc = controllers[key]
+        if u is None:
+            u = np.empty((n_steps, len(u_op)))
+        if U is None or not warm_start:
+            U = np.zeros(mpc.N * mpc.m)
+
+        start = time.perf_counter()
+        U, iterations[step] = mpc.solve(x[step] - x_op, U)
+        solve_times[step] = time.perf_counter() - start
+
+        u[step] = u_op + U[: mpc.m]
+        U = mpc.shift(U)
+
+        # Plant: nonlinear model with the input held over the sample
+        sol = solve_ivp(model, [0, Ts], x[step], args=(u[step], *args), rtol=1e-8)
+        x[step + 1] = sol.y[:, -1]
+
+    return x, u, solve_times, iterations
+
+
+def report(name: str, Ts: float, n_steps: int, solve_times, iterations, wall_time):
+    ms = solve_times * 1e3
+    constrained = iterations[iterations > 0]
+    if constrained.size:
+        active_set = (
+            f"constrained steps {constrained.size}/{n_steps},"
+            f" mean active-set iterations {constrained.mean():.1f}"
+        )
+    else:
+        active_set = "no constrained steps"
+    print(
+        f"{name}: solve time mean {ms.mean():.3f} ms, p95 {np.percentile(ms, 95):.3f} ms,"
+        f" max {ms.max():.3f} ms (Ts = {Ts * 1e3:.0f} ms); {active_set};"
+        f" closed loop {n_steps * Ts / wall_time:.0f}x faster than real time"
+    )
+
+
+# --- Inverted Pendulum: swing back to upright ---
+Ts_p: Final = 0.02  # Sampling period [s]
+N_p: Final = 40  # Prediction horizon [samples]
+F_max: Final = 40.0  # Force limit [N]
+n_steps_p: Final = 200  # Closed-loop samples (4 s)
+
+x_op_p = np.zeros(4)  # Upright, cart at the origin
+u_op_p = np.zeros(1)
+Q_p = np.diag([10.0, 0.1, 1.0, 0.1])  # Weights on [theta, omega, x, v]
+R_p = np.diag([1e-3])
+
+
+def make_pendulum_controller(x_op, u_op, args):
+    A, B = linearize(pendulum_model, np.array(x_op), np.array(u_op), args)
+    Ad, Bd = discretize(A, B, Ts_p)
+    return LinearMPC(Ad, Bd, Q_p, R_p, N_p, -F_max - u_op, F_max - u_op)
+
+
+x_init_p = np.array([np.deg2rad(30.0), 0.0, 0.0, 0.0])
+controllers_p = {}
+results_p = {}
+for warm_start in [False, True]:
+    start = time.perf_counter()
+    results_p[warm_start] = run_closed_loop(
+        pendulum_model,
+        x_init_p,
+        Ts_p,
+        n_steps_p,
+        lambda step: (x_op_p, u_op_p, ()),
+        controllers_p,
+        make_pendulum_controller,
+        warm_start=warm_start,
+    )
+    wall_time = time.perf_counter() - start
+    label = "warm start" if warm_start else "cold start"
+    report(
+        f"Pendulum ({label})", Ts_p, n_steps_p, *results_p[warm_start][2:], wall_time
+    )
+
+# --- Heated Tank: setpoint changes and inlet temperature disturbance ---
+Ts_t: Final = 10.0  # Sampling period [s]
+N_t: Final = 40  # Prediction horizon [samples]
+u_min_t = np.array([0.0, 0.0])  # Input limits [m³/s, m³/s]
+u_max_t = np.array([0.3, 0.025])
+n_steps_t: Final = 240  # Closed-loop samples (40 min)
+Q_t = np.diag([1.0, 0.1])  # Weights on [L, T]
+R_t = np.diag([1.0, 1.0])  # Weights on the scaled inputs
+
+t_t = np.arange(n_steps_t) * Ts_t
+L_sp = np.where(t_t < 600, 3.5, 2.5)  # Level setpoint [m]
+T_sp = zero_Celsius + np.where(t_t < 1200, 60.0, 70.0)  # Temperature setpoint [K]
+T_in_t = zero_Celsius + np.where(t_t < 1800, 28.0, 18.0)  # Inlet temperature [K]
+
+
+def tank_operating_point(step: int):
+    """Steady state at the current setpoint and measured inlet temperature."""
+    x_op = np.array([L_sp[step], T_sp[step]])
+    return x_op, tank_steady_inputs(*x_op, T_in_t[step]), (T_in_t[step],)
+
+
+def make_tank_controller(x_op, u_op, args):
+    A, B = linearize(tank_model, np.array(x_op), np.array(u_op), args)
+    Ad, Bd = discretize(A, B, Ts_t)
+    u_op = np.array(u_op)
+    return LinearMPC(Ad, Bd, Q_t, R_t, N_t, u_min_t - u_op, u_max_t - u_op)
+
+
+x_init_t = np.array(
+    [(0.2 / k) ** 2, zero_Celsius + 66.8]
+)  # Near the nominal steady state
+controllers_t = {}
+start = time.perf_counter()
+x_t, u_t, solve_times_t, iterations_t = run_closed_loop(
+    tank_model,
+    x_init_t,
+    Ts_t,
+    n_steps_t,
+    tank_operating_point,
+    controllers_t,
+    make_tank_controller,
+)
+wall_time = time.perf_counter() - start
+report("Heated tank", Ts_t, n_steps_t, solve_times_t, iterations_t, wall_time)
+print(f"Heated tank: {len(controllers_t)} operating points linearized and factorized")
+
+start = time.perf_counter()
+make_tank_controller(*tank_operating_point(0))
+print(
+    "Controller build (linearization, prediction matrices, factorization):"
+    f" {(time.perf_counter() - start) * 1e3:.2f} ms"
+)
+
+# --- Plot results ---
+fig, axs = plt.subplots(4, 2, figsize=(12, 11), constrained_layout=True)
+fig.suptitle("Model Predictive Control with Warm-Started QP Solves")
+
+x_p, u_p, solve_times_p, _ = results_p[True]
+t_p = np.arange(n_steps_p + 1) * Ts_p
+axs[0, 0].set_title("Inverted Pendulum")
+axs[0, 0].plot(t_p, np.rad2deg(x_p[:, 0]), label="$\\theta(t)$")
+axs[0, 0].axhline(0, color="tab:red", linestyle="--", label="Setpoint")
+axs[0, 0].set_ylabel("Angle / deg")
+axs[1, 0].plot(t_p, x_p[:, 2], label="$x(t)$")
+axs[1, 0].axhline(0, color="tab:red", linestyle="--", label="Setpoint")
+axs[1, 0].set_ylabel("Cart position / m")
+axs[2, 0].stairs(u_p[:, 0], t_p, baseline=None, color="tab:orange", label="$F(t)$")
+axs[2, 0].axhline(F_max, color="black", linestyle=":", label="Limits")
+axs[2, 0].axhline(-F_max, color="black", linestyle=":")
+axs[2, 0].set_ylabel("Applied force / N")
+for warm_start, label in [(False, "Cold start"), (True, "Warm start")]:
+    axs[3, 0].plot(t_p[:-1], results_p[warm_start][2] * 1e3, label=label)
+axs[3, 0].axhline(Ts_p * 1e3, color="tab:red", linestyle="--", label="Sampling period")
+axs[3, 0].set_yscale("log")
+axs[3, 0].set_ylabel("QP solve time / ms")
+axs[3, 0].set_xlabel("Time / s")
+
+t_t_min = np.arange(n_steps_t + 1) * Ts_t / 60
+axs[0, 1].set_title("Heated Tank")
+axs[0, 1].plot(t_t_min, x_t[:, 0], label="$L(t)$")
+axs[0, 1].stairs(
+    L_sp, t_t_min, baseline=None, color="tab:red", linestyle="--", label="Setpoint"
+)
+axs[0, 1].set_ylabel("Level / m")
+axs[1, 1].plot(t_t_min, x_t[:, 1] - zero_Celsius, label="$T(t)$")
+axs[1, 1].stairs(
+    T_sp - zero_Celsius,
+    t_t_min,
+    baseline=None,
+    color="tab:red",
+    linestyle="--",
+    label="Setpoint",
+)
+axs[1, 1].stairs(
+    T_in_t - zero_Celsius,
+    t_t_min,
+    baseline=None,
+    color="tab:gray",
+    label="$T_{in}$ (disturbance)",
+)
+axs[1, 1].set_ylabel("Temperature / °C")
+axs[2, 1].stairs(u_t[:, 0] / u_max_t[0], t_t_min, baseline=None, label="$q_{in}$")
+axs[2, 1].stairs(u_t[:, 1] / u_max_t[1], t_t_min, baseline=None, label="$q_j$")
+axs[2, 1].set_ylabel("Input / fraction of maximum")
+axs[3, 1].plot(t_t_min[:-1], solve_times_t * 1e3, label="Warm start")
+axs[3, 1].set_yscale("log")
+axs[3, 1].set_ylabel("QP solve time / ms")
+axs[3, 1].set_xlabel("Time / min")
+
+for ax in axs.flat:
+    ax.grid(True)
+    ax.legend()
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -0,0 +1,343 @@
+import os
+import time
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import g, zero_Celsius
+from scipy.linalg import expm
+
+rng = np.random.default_rng(seed=42)
+
+
+# --- Recursive Least Squares ---
+def rls_update(
+    theta: np.ndarray,
+    P: np.ndarray,
+    phi: np.ndarray,
+    y: np.ndarray,
+    forgetting: float = 1.0,
+):
+    """
+    One recursive least squares update with exponential forgetting, for a batch
+    of independent units.
+
+        K = P φ / (λ + φᵀ P φ)
+        θ = θ + K (y - φᵀ θ)
+        P = (P - K φᵀ P) / λ
+
+    The cost is O(n²) per unit and sample. Works in place.
+
+    Parameters:
+    - theta: parameter estimates, shape (n_units, n_params)
+    - P: covariance matrices, shape (n_units, n_params, n_params)
+    - phi: regressors, shape (n_units, n_params)
+    - y: measurements, shape (n_units,)
+    - forgetting: forgetting factor λ (1 for no forgetting)
+    """
+    P_phi = np.einsum("nij,nj->ni", P, phi)
+    K = P_phi / (forgetting + np.einsum("ni,ni->n", phi, P_phi))[:, None]
+    theta += K * (y - np.einsum("ni,ni->n", phi, theta))[:, None]
+    P -= np.einsum("ni,nj->nij", K, P_phi)
+    P /= forgetting
+
+
+# --- Plant 1: Cubic Tanks with Clogging Outlets ---
+rho: Final = 1000.0  # Density of water [kg/m³]
+A: Final = 4**2  # Cross-sectional area [m²]
+A_p: Final = np.pi * (0.20 / 2) ** 2  # Pipe cross-sectional area [m²]
+alpha0: Final = A_p * np.sqrt(rho * g * A_p / 1.0)  # Clean outlet [m^{2.5}/s]
+
+Ts: Final = 5.0  # Sampling period [s]
+n_samples: Final = 2000  # Samples per unit
+n_tanks: Final = 500  # Number of parallel tanks
+sigma_h: Final = 0.001  # Level sensor noise [m]
+
+t = np.arange(n_samples + 1) * Ts
+clogging = rng.uniform(0.0, 0.4, n_tanks)  # Loss of discharge at the end [-]
+alpha = alpha0 * (1 - np.outer(clogging, t / t[-1]))  # Discharge param. (n_tanks, t)
+Q_in = np.repeat(rng.choice([0.4, 0.8], size=(n_tanks, n_samples // 6 + 1)), 6, 1)
+Q_in = Q_in[:, :n_samples]  # PRBS inlet flow [m³/s]
+
+# Simulate all tanks side by side (RK4, 5 steps per sample)
+h = np.empty((n_tanks, n_samples + 1))
+h[:, 0] = (0.6 / alpha0) ** 2
+for k in range(n_samples):
+    x = h[:, k]
+    dt = Ts / 5
+    for _ in range(5):
+        k1 = (Q_in[:, k] - alpha[:, k] * np.sqrt(x)) / A
+        k2 = (Q_in[:, k] - alpha[:, k] * np.sqrt(x + dt / 2 * k1)) / A
+        k3 = (Q_in[:, k] - alpha[:, k] * np.sqrt(x + dt / 2 * k2)) / A
+        k4 = (Q_in[:, k] - alpha[:, k] * np.sqrt(x + dt * k3)) / A
+        x = x + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+    h[:, k + 1] = x
+h_meas = h + rng.normal(0.0, sigma_h, h.shape)
+
+# Integrated mass balance over one sample (trapezoidal rule), linear in [alpha, A]:
+#   Ts Q_in = alpha Ts (√h_k + √h_k+1) / 2 + A Δh
+y_reg = Ts * Q_in
+phi_reg = np.stack(
+    [
+        Ts * (np.sqrt(h_meas[:, :-1]) + np.sqrt(h_meas[:, 1:])) / 2,
+        np.diff(h_meas, axis=1),
+    ],
+    axis=-1,
+)
+
+
+def run_rls(forgetting: float, units: slice = slice(None)) -> np.ndarray:
+    """Estimate [alpha, A] online. Returns the estimates at every sample."""
+    phi, y = phi_reg[units], y_reg[units]
+    theta = np.tile([0.5, 10.0], (phi.shape[0], 1))
+    P = np.tile(np.diag([1.0, 100.0]), (phi.shape[0], 1, 1))
+    estimates = np.empty((phi.shape[0], n_samples, 2))
+    for k in range(n_samples):
+        rls_update(theta, P, phi[:, k], y[:, k], forgetting)
+        estimates[:, k] = theta
+    return estimates
+
+
+# Throughput: all tanks in one batch vs one tank at a time
+start = time.perf_counter()
+rls = {forgetting: run_rls(forgetting) for forgetting in (1.0, 0.99)}
+t_batch = (time.perf_counter() - start) / (2 * n_tanks * n_samples)
+start = time.perf_counter()
+for i in range(10):
+    run_rls(0.99, slice(i, i + 1))
+t_single = (time.perf_counter() - start) / (10 * n_samples)
+print(
+    f"RLS: {t_batch * 1e6:.2f} µs per tank and sample in a batch of {n_tanks}, "
+    f"{t_single * 1e6:.1f} µs one tank at a time"
+)
+for forgetting, est in rls.items():
+    error = np.abs(est[:, -1, 0] / alpha[:, -1] - 1)
+    error_A = np.abs(est[:, -1, 1] / A - 1)
+    print(
+        f"  λ = {forgetting}: final alpha error {100 * np.median(error):.2f}% "
+        f"(median), {100 * np.max(error):.2f}% (max), A error "
+        f"{100 * np.median(error_A):.2f}% (median)"
+    )
+
+
+# --- Plant 2: CSTRs with Cooling Jacket Fouling ---
+rho_r: Final = 1000.0  # Reactor fluid density [kg/m³]
+cp: Final = 239.0  # Reactor fluid heat capacity [J/(kg·K)]
+rho_c: Final = 1000.0  # Coolant density [kg/m³]
+cp_c: Final = 4180.0  # Coolant heat capacity [J/(kg·K)]
+k0: Final = 1.2e9  # Pre-exponential factor [1/s]
+E_R: Final = 8.75e3  # Activation energy over the gas constant [K]
+delta_Hr: Final = -5.0e7  # Reaction enthalpy [J/mol]
+U0: Final = 915.6  # Clean heat transfer coefficient [W/(m²·K)]
+A_c: Final = 2.7520  # Heat transfer area [m²]
+V: Final = 1.5  # Reactor volume [m³]
+V_c: Final = 0.55  # Cooling jacket volume [m³]
+q1: Final = 0.1  # Inlet flow rate [m³/s]
+C_A1: Final = 1.0  # Inlet concentration of A [mol/m³]
+q_c: Final = 0.005  # Coolant flow rate [m³/s]
+T_c0: Final = zero_Celsius + 20.0  # Coolant inlet temperature [K]
+
+
+def cstr_model(x: np.ndarray, T1: np.ndarray) -> np.ndarray:
+    """
+    CSTR with cooling jacket at constant volume, with the heat transfer
+    coefficient U as an extra state that only changes by fouling.
+
+    Parameters:
+    - x: states [C_A, T, T_c, U], shape (n_units, 4)
+    - T1: inlet temperature of each unit [K]
+    """
+    C_A, T, T_c, U = x.T
+    Gamma = k0 * np.exp(-E_R / T) * C_A
+    Q_jacket = U * A_c * (T_c - T)
+    return np.column_stack(
+        [
+            (C_A1 - C_A) * q1 / V - Gamma,
+            q1 * (T1 - T) / V
+            + (-delta_Hr) * Gamma / (rho_r * cp)
+            + Q_jacket / (rho_r * V * cp),
+            q_c * (T_c0 - T_c) / V_c - Q_jacket / (rho_c * V_c * cp_c),
+            np.zeros_like(U),
+        ]
+    )
+
+
+def cstr_jacobian(x: np.ndarray) -> np.ndarray:
+    """Jacobian of cstr_model with respect to the states, shape (n_units, 4, 4)."""
+    C_A, T, T_c, U = x.T
+    k = k0 * np.exp(-E_R / T)
+    dk_dT = k * E_R / T**2
+    heat = -delta_Hr / (rho_r * cp)
+    a_r = A_c / (rho_r * V * cp)
+    a_c = A_c / (rho_c * V_c * cp_c)
+
+    J = np.zeros((x.shape[0], 4, 4))
+    J[:, 0, 0] = -q1 / V - k
+    J[:, 0, 1] = -dk_dT * C_A
+    J[:, 1, 0] = heat * k
+    J[:, 1, 1] = -q1 / V + heat * dk_dT * C_A - U * a_r
+    J[:, 1, 2] = U * a_r
+    J[:, 1, 3] = (T_c - T) * a_r
+    J[:, 2, 1] = U * a_c
+    J[:, 2, 2] = -q_c / V_c - U * a_c
+    J[:, 2, 3] = -(T_c - T) * a_c
+    return J
+
+
+def rk4(x: np.ndarray, T1: np.ndarray, duration: float, n_steps: int = 10):
+    dt = duration / n_steps
+    for _ in range(n_steps):
+        k1 = cstr_model(x, T1)
+        k2 = cstr_model(x + dt / 2 * k1, T1)
+        k3 = cstr_model(x + dt / 2 * k2, T1)
+        k4 = cstr_model(x + dt * k3, T1)
+        x = x + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+    return x
+
+
+def ekf_step(
+    x: np.ndarray,
+    P: np.ndarray,
+    z: np.ndarray,
+    T1: np.ndarray,
+    Q: np.ndarray,
+    R: np.ndarray,
+):
+    """
+    One step of a batched extended Kalman filter.
+
+    The states are predicted by integrating the model over one sampling period,
+    and the covariance by the transition matrix Φ = exp(J Ts) of the model
+    linearized at the current estimate. The temperatures T and T_c are
+    measured.
+
+    Parameters:
+    - x: state estimates, shape (n_units, 4)
+    - P: covariance matrices, shape (n_units, 4, 4)
+    - z: measured [T, T_c], shape (n_units, 2)
+    - T1: inlet temperatures during the period [K]
+    - Q: process noise covariance, shape (4, 4)
+    - R: measurement noise covariance, shape (2, 2)
+    """
+    # Prediction
+    Phi = expm(cstr_jacobian(x) * Ts_cstr)
+    x = rk4(x, T1, Ts_cstr)
+    P = Phi @ P @ Phi.transpose(0, 2, 1) + Q
+
+    # Correction (H selects T and T_c)
+    S = P[:, 1:3, 1:3] + R
+    K = np.linalg.solve(S, P[:, 1:3, :]).transpose(0, 2, 1)
+    x = x + np.einsum("nij,nj->ni", K, z - x[:, 1:3])
+    P = P - K @ P[:, 1:3, :]
+    return x, P
+
+
+Ts_cstr: Final = 10.0  # Sampling period [s]
+n_steps_cstr: Final = 720  # Two hours
+n_cstrs: Final = 200  # Number of parallel reactors
+sigma_T: Final = np.array([0.1, 0.05])  # Sensor noise of T and T_c [K]
+
+fouling = rng.uniform(0.0, 0.35, n_cstrs)  # Loss of U at the end [-]
+t_cstr = np.arange(n_steps_cstr + 1) * Ts_cstr
+U_true = U0 * (1 - np.outer(fouling, t_cstr / t_cstr[-1]))
+# PRBS on the inlet temperature (35 °C or 45 °C, held for 5 minutes)
+T1_in = zero_Celsius + np.repeat(
+    rng.choice([35.0, 45.0], size=(n_cstrs, n_steps_cstr // 30 + 1)), 30, 1
+)
+
+x_true = np.tile([0.99, zero_Celsius + 40.0, zero_Celsius + 22.0, U0], (n_cstrs, 1))
+states = [x_true]
+for k in range(n_steps_cstr):
+    x_true = rk4(x_true, T1_in[:, k], Ts_cstr)
+    x_true[:, 3] = U_true[:, k + 1]
+    states.append(x_true)
+states = np.stack(states, axis=1)
+z_meas = states[:, :, 1:3] + rng.normal(0.0, sigma_T, (n_cstrs, n_steps_cstr + 1, 2))
+
+# Filter starting from a wrong guess (U 20% high, C_A unknown)
+x_hat = np.tile([0.5, 0.0, 0.0, 1.2 * U0], (n_cstrs, 1))
+x_hat[:, 1:3] = z_meas[:, 0]
+P_hat = np.tile(np.diag([0.5**2, 0.5**2, 0.5**2, 200.0**2]), (n_cstrs, 1, 1))
+Q_ekf = np.diag([1e-6, 1e-4, 1e-4, 2.0**2])  # U drifts as a random walk
+R_ekf = np.diag(sigma_T**2)
+
+start = time.perf_counter()
+estimates = [x_hat]
+std = [np.sqrt(np.diagonal(P_hat, axis1=1, axis2=2))]
+for k in range(n_steps_cstr):
+    x_hat, P_hat = ekf_step(x_hat, P_hat, z_meas[:, k + 1], T1_in[:, k], Q_ekf, R_ekf)
+    estimates.append(x_hat)
+    std.append(np.sqrt(np.diagonal(P_hat, axis1=1, axis2=2)))
+t_ekf = (time.perf_counter() - start) / (n_cstrs * n_steps_cstr)
+estimates, std = np.stack(estimates, axis=1), np.stack(std, axis=1)
+
+# Throughput of a single reactor, for comparison
+x_one, P_one = estimates[:1, 0], np.diag([0.5**2, 0.5**2, 0.5**2, 200.0**2])[None]
+start = time.perf_counter()
+for k in range(n_steps_cstr):
+    x_one, P_one = ekf_step(x_one, P_one, z_meas[:1, k + 1], T1_in[:1, k], Q_ekf, R_ekf)
+t_ekf_single = (time.perf_counter() - start) / n_steps_cstr
+
+U_error = np.abs(estimates[:, -1, 3] / U_true[:, -1] - 1)
+print(
+    f"EKF: {t_ekf * 1e6:.1f} µs per reactor and sample in a batch of {n_cstrs}, "
+    f"{t_ekf_single * 1e6:.0f} µs one reactor at a time, final U error {100 * np.median(U_error):.2f}% (median), "
+    f"{100 * np.max(U_error):.2f}% (max)"
+)
+
+# --- Plot results ---
+fig, axs = plt.subplots(2, 2, figsize=(12, 8), constrained_layout=True)
+fig.suptitle("Online Estimation")
+
+unit = np.argmax(clogging)
+t_h = t[1:] / 3600
+axs[0, 0].plot(t_h, alpha[unit, 1:], "k", lw=2, label="True")
+for forgetting, est in rls.items():
+    axs[0, 0].plot(t_h, est[unit, :, 0], label=f"RLS, $\\lambda$ = {forgetting}")
+axs[0, 0].set_ylim(0.25, 0.65)
+axs[0, 0].set_xlabel("Time / h")
+axs[0, 0].set_ylabel("$\\alpha$ / m$^{2.5}\\cdot$s$^{-1}$")
+axs[0, 0].set_title("Cubic Tank: Clogging Outlet")
+
+for forgetting, est in rls.items():
+    axs[0, 1].plot(
+        alpha[:, -1], est[:, -1, 0], ".", ms=3, label=f"RLS, $\\lambda$ = {forgetting}"
+    )
+axs[0, 1].plot([0.3, 0.56], [0.3, 0.56], "k", lw=1)
+axs[0, 1].set_xlabel("True final $\\alpha$ / m$^{2.5}\\cdot$s$^{-1}$")
+axs[0, 1].set_ylabel("Estimated final $\\alpha$ / m$^{2.5}\\cdot$s$^{-1}$")
+axs[0, 1].set_title(f"Cubic Tank: {n_tanks} Units in Parallel")
+
+unit = np.argmax(fouling)
+t_h = t_cstr / 3600
+axs[1, 0].plot(t_h, U_true[unit], "k", lw=2, label="True")
+axs[1, 0].plot(t_h, estimates[unit, :, 3], label="EKF")
+axs[1, 0].fill_between(
+    t_h,
+    estimates[unit, :, 3] - 2 * std[unit, :, 3],
+    estimates[unit, :, 3] + 2 * std[unit, :, 3],
+    alpha=0.3,
+    label="±2$\\sigma$",
+)
+axs[1, 0].set_ylim(400, 1300)
+axs[1, 0].set_xlabel("Time / h")
+axs[1, 0].set_ylabel("$U$ / W$\\cdot$m$^{-2}\\cdot$K$^{-1}$")
+axs[1, 0].set_title("CSTR: Jacket Fouling")
+
+axs[1, 1].plot(t_h, states[unit, :, 0], "k", lw=2, label="True")
+axs[1, 1].plot(t_h, estimates[unit, :, 0], label="EKF")
+axs[1, 1].set_ylim(0.95, 1.0)
+axs[1, 1].set_xlabel("Time / h")
+axs[1, 1].set_ylabel("$C_A$ / mol$\\cdot$m$^{-3}$")
+axs[1, 1].set_title("CSTR: Unmeasured Concentration")
+
+for ax in axs.flat:
+    ax.grid(True)
+    ax.legend()
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -0,0 +1,236 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import gas_constant, zero_Celsius
+from scipy.integrate import solve_ivp
+
+# --- Define Model (CSTR with cooling jacket) ---
+rho: Final = 1000.0  # Reactor fluid density [kg/m³]
+cp: Final = 239.0  # Reactor fluid heat capacity [J/(kg·K)]
+rho_c: Final = 1000.0  # Coolant density [kg/m³]
+cp_c: Final = 4180.0  # Coolant heat capacity [J/(kg·K)]
+k0: Final = 1.2e9  # Pre-exponential factor [1/s]
+R: Final = gas_constant  # Universal gas constant [J/(mol·K)]
+E: Final = 8.75e3 * R  # Activation energy [J/mol]
+delta_Hr: Final = -5.0e7  # Reaction enthalpy [J/mol]
+U: Final = 915.6  # Overall heat transfer coefficient [W/(m²·K)]
+A: Final = 2.7520  # Heat transfer area [m²]
+V_c: Final = 0.55  # Cooling jacket volume [m³]
+
+q1: Final = 0.1  # Inlet flow rate (equal to the outlet flow rate) [m³/s]
+C_A1: Final = 1.0  # Inlet concentration of A [mol/m³]
+T_c0: Final = zero_Celsius + 20.0  # Coolant inlet temperature [K]
+
+N_STATES: Final = 4
+PARAM_NAMES: Final = ("q_c", "T1")
+
+
+def batch_model(t: float, y: np.ndarray, q_c: np.ndarray, T1: np.ndarray):
+    """
+    Differential equations for a batch of independent CSTRs.
+
+    The states of each reactor are stored next to each other, so a single call
+    evaluates the whole batch with array operations and the Jacobian of the
+    batch is banded.
+
+    Parameters:
+    - t: time [s]
+    - y: flattened state matrix, shape (n_batch * N_STATES,)
+    - q_c: coolant flow rate of each reactor [m³/s]
+    - T1: inlet temperature of each reactor [K]
+    """
+    V, C_A, T, T_c = y.reshape(-1, N_STATES).T
+
+    Gamma = k0 * np.exp(-E / (R * T)) * C_A  # Reaction rate [mol/(m³·s)]
+
+    dVdt = np.zeros_like(V)  # Inlet and outlet flows are equal
+    dCAdt = ((C_A1 - C_A) * q1 - Gamma * V) / V
+    dTdt = (rho * q1 * cp * (T1 - T) + (-delta_Hr) * Gamma * V + U * A * (T_c - T)) / (
+        rho * V * cp
+    )
+    dTcdt = (rho_c * q_c * cp_c * (T_c0 - T_c) - U * A * (T_c - T)) / (
+        rho_c * V_c * cp_c
+    )
+    return np.column_stack([dVdt, dCAdt, dTdt, dTcdt]).ravel()
+
+
+def simulate_chunk(points: np.ndarray, t_end: float) -> np.ndarray:
+    """
+    Integrate all parameter points of a chunk in one solver call.
+
+    Returns the final state of each point, shape (n_points, N_STATES).
+    """
+    n = points.shape[0]
+    y0 = np.tile(
+        [
+            1.5,  # Liquid volume [m³]
+            0.9,  # Concentration of A [mol/m³]
+            zero_Celsius + 25.0,  # Reactor temperature [K]
+            zero_Celsius + 20.0,  # Coolant temperature [K]
+        ],
+        n,
+    )
+    # Ignited reactors are stiff, LSODA switches to BDF and only needs the band
+    sol = solve_ivp(
+        batch_model,
+        [0, t_end],
+        y0,
+        method="LSODA",
+        args=(points[:, 0], points[:, 1]),
+        rtol=1e-6,
+        atol=1e-8,
+        lband=N_STATES - 1,
+        uband=N_STATES - 1,
+    )
+    return sol.y[:, -1].reshape(n, N_STATES)
+
+
+# --- Sweep Engine ---
+def run_chunk(
+    results_path: Path,
+    progress_path: Path,
+    chunk_points: np.ndarray,
+    chunk: int,
+    chunk_size: int,
+    t_end: float,
+) -> int:
+    """Worker: simulate one chunk and write it into the memory-mapped results."""
+    start = chunk * chunk_size
+    stop = start + chunk_points.shape[0]
+    final_states = simulate_chunk(chunk_points, t_end)
+
+    results = np.load(results_path, mmap_mode="r+")
+    results[start:stop] = final_states
+    results.flush()
+
+    # The chunk is marked as done only after its results are on disk
+    progress = np.load(progress_path, mmap_mode="r+")
+    progress[chunk] = True
+    progress.flush()
+    return chunk
+
+
+def run_sweep(
+    points: np.ndarray,
+    work_dir: Path,
+    chunk_size: int = 120,
+    t_end: float = 3 * 3600.0,
+    max_workers: int | None = None,
+    max_chunks: int | None = None,
+) -> np.ndarray:
+    """
+    Run a parameter sweep in chunks over a process pool.
+
+    Results are written to a ``.npy`` memory-mapped file in ``work_dir`` named
+    after a hash of the sweep, together with a per-chunk progress flag. Calling
+    the function again with the same sweep skips the completed chunks, so an
+    interrupted sweep resumes from where it stopped.
+
+    Parameters:
+    - points: parameter points, shape (n_points, len(PARAM_NAMES))
+    - work_dir: folder of the memory-mapped files
+    - chunk_size: number of points integrated together by a worker
+    - t_end: simulation time [s]
+    - max_workers: number of processes (default: all cores)
+    - max_chunks: stop after this many new chunks (used to emulate a crash)
+
+    Returns:
+    - Read-only memory map with the final state of each point
+    """
+    points = np.ascontiguousarray(points, dtype=float)
+    n_chunks = -(-points.shape[0] // chunk_size)
+
+    h = hashlib.sha256(points.tobytes())
+    h.update(f"{chunk_size}-{t_end}".encode())
+    sweep_id = h.hexdigest()[:16]
+    results_path = work_dir / f"sweep-{sweep_id}-results.npy"
+    progress_path = work_dir / f"sweep-{sweep_id}-progress.npy"
+
+    work_dir.mkdir(parents=True, exist_ok=True)
+    if not (results_path.exists() and progress_path.exists()):
+        np.lib.format.open_memmap(
+            results_path, mode="w+", shape=(points.shape[0], N_STATES)
+        ).flush()
+        np.lib.format.open_memmap(
+            progress_path, mode="w+", dtype=np.bool_, shape=(n_chunks,)
+        ).flush()
+
+    pending = np.flatnonzero(~np.load(progress_path))
+    print(f"{n_chunks - pending.size}/{n_chunks} chunks already completed")
+    if max_chunks is not None:
+        pending = pending[:max_chunks]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                run_chunk,
+                results_path,
+                progress_path,
+                points[c * chunk_size : (c + 1) * chunk_size],
+                c,
+                chunk_size,
+                t_end,
+            )
+            for c in pending
+        ]
+        for future in as_completed(futures):
+            future.result()
+
+    return np.load(results_path, mmap_mode="r")
+
+
+# --- Make simulations ---
+if __name__ == "__main__":
+    # Parameter grid
+    q_c_values = np.linspace(0.001, 0.02, 120)  # Coolant flow rate [m³/s]
+    T1_values = zero_Celsius + np.linspace(20.0, 90.0, 120)  # Inlet temperature [K]
+    Q_C, T_1 = np.meshgrid(q_c_values, T1_values)
+    points = np.column_stack([Q_C.ravel(), T_1.ravel()])
+
+    work_dir = Path(tempfile.gettempdir()) / "model-library-sweep"
+    shutil.rmtree(work_dir, ignore_errors=True)  # Start from a clean sweep
+
+    # First run stops after half of the chunks, as if the sweep had crashed
+    start = time.perf_counter()
+    run_sweep(points, work_dir, max_chunks=60)
+    t_first = time.perf_counter() - start
+
+    # Second run resumes from the last completed chunk
+    start = time.perf_counter()
+    results = run_sweep(points, work_dir)
+    t_second = time.perf_counter() - start
+
+    print(f"Interrupted run: {t_first:.2f} s, resumed run: {t_second:.2f} s")
+    print(f"{points.shape[0]} points in {t_first + t_second:.2f} s")
+
+    T_final = results[:, 2].reshape(Q_C.shape)
+
+    # --- Plot results ---
+    fig, ax = plt.subplots(figsize=(8, 5), constrained_layout=True)
+    fig.suptitle("CSTR with Cooling: Parameter Sweep")
+
+    mesh = ax.pcolormesh(
+        q_c_values * 1e3,
+        T1_values - zero_Celsius,
+        T_final - zero_Celsius,
+        shading="auto",
+        cmap="inferno",
+    )
+    fig.colorbar(mesh, ax=ax, label="Reactor temperature after 3 h / °C")
+    ax.set_xlabel("Coolant flow rate / L$\\cdot$s$^{-1}$")
+    ax.set_ylabel("Inlet temperature / °C")
+
+    # Save plot to file
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+    save_path = os.path.join(script_dir, "results", "scipy.png")
+    plt.savefig(save_path)
+    print(f"Plot saved to {save_path}")
@@ -0,0 +1,477 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.integrate import solve_ivp
+
+rtol: Final = 1e-10
+atol: Final = 1e-12
+
+newton_tol: Final = 1e-9
+"""Norm of the shooting residual at which Newton's method stops"""
+
+
+# --- Oscillators ---
+class Oscillator:
+    """
+    Right-hand side f(t, y) of a 2-D model and its Jacobian df/dy.
+
+    For a forced model, period is the period of the forcing, which is also the
+    period of the orbits. For an autonomous model, period is None, and the
+    period of each orbit is an unknown.
+    """
+
+    def __init__(self, f: Callable, jac: Callable, period: float | None = None):
+        self.f, self.jac, self.period = f, jac, period
+        self.nfev = 0
+
+
+def van_der_pol(mu: float) -> Oscillator:
+    """Van der Pol oscillator, for a nonlinearity parameter mu"""
+
+    def f(t, y):
+        return np.array([y[1], mu * (1 - y[0] ** 2) * y[1] - y[0]])
+
+    def jac(t, y):
+        return np.array([[0.0, 1.0], [-2 * mu * y[0] * y[1] - 1, mu * (1 - y[0] ** 2)]])
+
+    return Oscillator(f, jac)
+
+
+def forced_duffing(
+    omega: float, delta: float = 0.1, gamma: float = 0.5, alpha: float = 1.0
+) -> Oscillator:
+    """Duffing oscillator with damping delta and a forcing gamma * cos(omega * t)"""
+
+    def f(t, y):
+        return np.array(
+            [y[1], -delta * y[1] - alpha * y[0] - y[0] ** 3 + gamma * np.cos(omega * t)]
+        )
+
+    def jac(t, y):
+        return np.array([[0.0, 1.0], [-alpha - 3 * y[0] ** 2, -delta]])
+
+    return Oscillator(f, jac, period=2 * np.pi / omega)
+
+
+# --- Shooting ---
+def flow(osc: Oscillator, t0: float, y0: np.ndarray, dt: float):
+    """
+    Integrate the model and its variational equations, dPhi/dt = J(t, y) Phi.
+
+    Returns:
+    - State y(t0 + dt), and the sensitivity matrix Phi = dy(t0 + dt)/dy0
+    """
+    n = len(y0)
+
+    def augmented(t, z):
+        Phi = z[n:].reshape(n, n)
+        return np.concatenate([osc.f(t, z[:n]), (osc.jac(t, z[:n]) @ Phi).ravel()])
+
+    z0 = np.concatenate([y0, np.eye(n).ravel()])
+    sol = solve_ivp(augmented, (t0, t0 + dt), z0, method="DOP853", rtol=rtol, atol=atol)
+    osc.nfev += sol.nfev
+    return sol.y[:n, -1], sol.y[n:, -1].reshape(n, n)
+
+
+class PeriodicOrbit:
+    """Periodic orbit found by shooting, with its monodromy matrix."""
+
+    def __init__(
+        self,
+        osc: Oscillator,
+        states: np.ndarray,
+        period: float,
+        monodromy: np.ndarray,
+        residuals: list,
+    ):
+        self.osc, self.states, self.period = osc, states, period
+        self.monodromy, self.residuals = monodromy, residuals
+        self.multipliers = np.linalg.eigvals(monodromy)
+        """Floquet multipliers: eigenvalues of the monodromy matrix"""
+
+    @property
+    def stable(self) -> bool:
+        """Stable if every nontrivial multiplier is inside the unit circle"""
+        m = self.multipliers
+        if self.osc.period is None:  # The multiplier along the orbit is 1
+            m = np.delete(m, np.argmin(np.abs(m - 1)))
+        return bool(np.all(np.abs(m) < 1))
+
+    def solution(self, n_points: int = 1000):
+        """Times and states along one period of the orbit"""
+        t = np.linspace(0, self.period, n_points)
+        sol = solve_ivp(
+            self.osc.f,
+            (0, self.period),
+            self.states[0],
+            method="DOP853",
+            t_eval=t,
+            rtol=rtol,
+            atol=atol,
+        )
+        return sol.t, sol.y
+
+
+def shoot(
+    osc: Oscillator,
+    states: np.ndarray,
+    period: float | None = None,
+    max_iter: int = 30,
+    max_state: float = 100.0,
+    max_period: float = 1000.0,
+) -> PeriodicOrbit:
+    """
+    Find a periodic orbit by multiple shooting and Newton's method.
+
+    The period is split into N segments, with one unknown initial state s_i for
+    each (N = 1 is single shooting). Newton's method solves
+
+        phi(s_i, T / N) - s_{i+1} = 0,    i = 0, ..., N - 1 (s_N = s_0)
+
+    with the derivatives of each segment from its variational equations. For
+    an autonomous model, the period T is also an unknown, and a phase
+    condition f(s_0)^T (s_0_new - s_0) = 0 fixes the position of s_0 along the
+    orbit.
+
+    Parameters:
+    - osc: oscillator
+    - states: initial guess of the segment states, of shape (N, n)
+    - period: initial guess of the period (autonomous models only)
+    - max_iter: maximum number of Newton iterations
+    - max_state, max_period: bounds of the iterates, beyond which Newton's
+      method is considered to diverge
+
+    Returns:
+    - Periodic orbit
+    """
+    autonomous = osc.period is None
+    s = np.array(states, dtype=float)
+    N, n = s.shape
+    T = period if autonomous else osc.period
+    size = N * n + autonomous
+    residuals = []
+
+    for _ in range(max_iter):
+        if np.abs(s).max() > max_state or not 0 < T < max_period:
+            break  # The iterates left the region of interest
+        r = np.zeros(size)
+        A = np.zeros((size, size))
+        Phis = []
+        for i in range(N):
+            y_end, Phi = flow(osc, i * T / N, s[i], T / N)
+            Phis.append(Phi)
+            rows = slice(i * n, (i + 1) * n)
+            r[rows] = y_end - s[(i + 1) % N]
+            A[rows, i * n : (i + 1) * n] += Phi
+            A[rows, (i + 1) % N * n : ((i + 1) % N + 1) * n] -= np.eye(n)
+            if autonomous:
+                A[rows, -1] = osc.f(0.0, y_end) / N
+        if autonomous:
+            A[-1, :n] = osc.f(0.0, s[0])  # Phase condition (r[-1] = 0)
+
+        residuals.append(np.linalg.norm(r))
+        if not np.isfinite(residuals[-1]) or residuals[-1] > 1e6:
+            break
+        if residuals[-1] < newton_tol:
+            monodromy = np.linalg.multi_dot([*Phis[::-1], np.eye(n)])
+            return PeriodicOrbit(osc, s, T, monodromy, residuals)
+
+        try:
+            dz = np.linalg.solve(A, -r)
+        except np.linalg.LinAlgError:
+            break
+        s += dz[: N * n].reshape(N, n)
+        if autonomous:
+            T += dz[-1]
+
+    raise RuntimeError(f"Shooting did not converge (residuals: {residuals[-3:]})")
+
+
+def circle_guess(N: int) -> np.ndarray:
+    """Segment states on the limit cycle of the van der Pol oscillator at mu = 0"""
+    theta = 2 * np.pi * np.arange(N) / N
+    return np.column_stack([2 * np.cos(theta), -2 * np.sin(theta)])
+
+
+def section(t, y):
+    """Poincaré section v = 0, crossed downwards where x > 0"""
+    return y[1]
+
+
+section.direction = -1
+
+
+def transient(osc: Oscillator, y0: list, orbit: PeriodicOrbit, tol: float = 1e-8):
+    """
+    Integrate the model from y0 until it is within tol of the orbit, and return
+    the number of periods and of calls to the model.
+
+    For a forced model, the state is compared with the orbit once per period of
+    the forcing. For an autonomous model, it is compared at each crossing of
+    the Poincaré section v = 0.
+    """
+    calls = 0
+
+    def f(t, y):
+        nonlocal calls
+        calls += 1
+        return osc.f(t, y)
+
+    options = {"method": "DOP853", "rtol": rtol, "atol": atol}
+    if osc.period is not None:
+        y, periods = np.array(y0, dtype=float), 0
+        while np.linalg.norm(y - orbit.states[0]) > tol:
+            y = solve_ivp(f, (0, osc.period), y, **options).y[:, -1]
+            periods += 1
+        return periods, calls
+
+    # Crossing of the orbit with the section (after t = 0, where the phase
+    # condition may already place the first state on the section)
+    t_span = (0, 2 * orbit.period)
+    sol = solve_ivp(osc.f, t_span, orbit.states[0], events=section, **options)
+    x_star = sol.y_events[0][-1, 0]
+
+    t_span = (0, 1000 * orbit.period)
+    sol = solve_ivp(osc.f, t_span, y0, events=section, **options)
+    after = sol.t_events[0] > 0
+    close = np.abs(sol.y_events[0][after, 0] - x_star) < tol
+    if not close.any():
+        raise RuntimeError("The transient did not reach the orbit")
+    k = np.argmax(close)
+    t_end = sol.t_events[0][after][k]
+    solve_ivp(f, (0, t_end), y0, **options)  # Calls up to crossing k
+    return k + 1, calls
+
+
+def continuation(mus: np.ndarray, N: int) -> list:
+    """
+    Follow the limit cycle of the van der Pol oscillator along mus, from the
+    circle of mu = 0, with N shooting segments.
+
+    Each orbit starts from a secant predictor through the last two orbits. The
+    continuation stops at the first value of mu where shooting fails.
+
+    Returns:
+    - List of the periodic orbits found, with their cost in nfev
+    """
+    branch = []
+    guess, period = circle_guess(N), 2 * np.pi
+    for k, mu in enumerate(mus):
+        if k >= 2:  # Secant predictor from the last two orbits
+            a, b = branch[-2], branch[-1]
+            w = (mu - mus[k - 1]) / (mus[k - 1] - mus[k - 2])
+            guess = b.states + w * (b.states - a.states)
+            period = b.period + w * (b.period - a.period)
+        osc = van_der_pol(mu)
+        try:
+            orbit = shoot(osc, guess, period)
+        except RuntimeError:
+            break
+        orbit.nfev = osc.nfev
+        branch.append(orbit)
+        guess, period = orbit.states, orbit.period
+    return branch
+
+
+# --- Newton Convergence ---
+print("Van der Pol oscillator, mu = 1, from the circle of mu = 0:")
+for N in [1, 8]:
+    osc = van_der_pol(1.0)
+    orbit = shoot(osc, circle_guess(N), 2 * np.pi)
+    history = ", ".join(f"{r:.1e}" for r in orbit.residuals)
+    print(f"  N = {N}: residuals {history}; T = {orbit.period:.6f}")
+
+# --- Continuation in mu ---
+mus = np.concatenate([[0.05], np.geomspace(0.1, 30, 40)])
+print("\nContinuation in mu, stable limit cycle:")
+for N in [1, 16]:
+    start = time.perf_counter()
+    branch = continuation(mus, N)
+    elapsed = time.perf_counter() - start
+    iterations = [len(orbit.residuals) - 1 for orbit in branch]
+    print(
+        f"  N = {N:>2}: mu up to {mus[len(branch) - 1]:g} in {elapsed:.1f} s, "
+        f"{sum(orbit.nfev for orbit in branch)} calls, "
+        f"{min(iterations)} to {max(iterations)} iterations per orbit"
+    )
+branch = continuation(mus, 1)
+
+print(
+    f"{'mu':>7}{'T':>11}{'Multiplier':>12}{'Liouville':>12}{'Iterations':>12}{'Calls':>8}"
+)
+for target in [0.05, 0.1, 0.3, 1, 3, 10, 30]:
+    k = int(np.argmin(np.abs(mus - target)))
+    mu, orbit = mus[k], branch[k]
+    m = orbit.multipliers[np.argmax(np.abs(orbit.multipliers - 1))].real
+    # Liouville's formula: the product of the multipliers is exp(int tr J dt)
+    t, y = orbit.solution(20001)
+    liouville = np.exp(np.trapezoid(mu * (1 - y[0] ** 2), t))
+    print(
+        f"{mu:>7.3g}{orbit.period:>11.5f}{m:>12.3e}{liouville:>12.3e}"
+        f"{len(orbit.residuals) - 1:>12}{orbit.nfev:>8}"
+    )
+
+# For mu < 0, the same cycle is traversed backwards in time, and repels
+print("\nContinuation in mu < 0, unstable limit cycle:")
+unstable = {}
+for N in [1, 4, 16, 32]:
+    unstable[N] = continuation(-mus, N)
+    last = unstable[N][-1]
+    m = np.abs(last.multipliers).max()
+    print(
+        f"  N = {N:>2}: mu down to {-mus[len(unstable[N]) - 1]:.3g}, "
+        f"multiplier {m:.1e}, {sum(orbit.nfev for orbit in unstable[N])} calls"
+    )
+
+# --- Shooting vs Transient ---
+print("\nCost of the limit cycle (tolerance 1e-8), from (x, v) = (0.5, 0):")
+for mu in [0.1, 1.0, 10.0]:
+    orbit = branch[int(np.argmin(np.abs(mus - mu)))]
+    osc = van_der_pol(mu)
+    periods, calls = transient(osc, [0.5, 0.0], orbit)
+    print(
+        f"  mu = {mu:>4}: transient {periods:>3} periods, {calls:>7} calls; "
+        f"shooting {orbit.nfev:>7} calls of the variational equations"
+    )
+
+# --- Forced Duffing Oscillator ---
+omega = 1.6
+print(f"\nForced Duffing oscillator, omega = {omega}: orbits from a grid of guesses")
+duffing_orbits, counts = [], []
+for x0 in np.linspace(-2, 2, 9):
+    for v0 in np.linspace(-3, 3, 9):
+        osc = forced_duffing(omega)
+        try:
+            orbit = shoot(osc, [[x0, v0]])
+        except RuntimeError:
+            continue
+        for k, known in enumerate(duffing_orbits):
+            if np.allclose(orbit.states, known.states, atol=1e-6):
+                counts[k] += 1
+                break
+        else:
+            duffing_orbits.append(orbit)
+            counts.append(1)
+for orbit, count in zip(duffing_orbits, counts, strict=True):
+    x0, v0 = orbit.states[0]
+    amplitude = np.ptp(orbit.solution()[1][0]) / 2
+    multipliers = ", ".join(f"{m:.3f}" for m in orbit.multipliers)
+    kind = "stable" if orbit.stable else "unstable"
+    print(
+        f"  ({x0:7.4f}, {v0:7.4f}): amplitude {amplitude:.3f} m, {kind}, "
+        f"multipliers {multipliers}, from {count} of 81 guesses"
+    )
+
+large = max(duffing_orbits, key=lambda o: np.abs(o.states).max())
+osc = forced_duffing(omega)
+periods, calls = transient(osc, large.states[0] + [0.1, 0.0], large)
+osc = forced_duffing(omega)
+orbit = shoot(osc, [large.states[0] + [0.1, 0.0]])
+print(
+    f"  Large orbit from a guess 0.1 m away: transient {periods} periods, "
+    f"{calls} calls; shooting {len(orbit.residuals) - 1} iterations, {osc.nfev} calls"
+)
+
+# --- Plot Results ---
+fig, axs = plt.subplots(2, 2, figsize=(13, 10), constrained_layout=True)
+fig.suptitle("Periodic Orbits by Shooting")
+cmap = plt.get_cmap("viridis")
+
+ax = axs[0, 0]
+for mu in [0.1, 1, 3, 10, 30]:
+    orbit = branch[int(np.argmin(np.abs(mus - mu)))]
+    t, y = orbit.solution()
+    ax.plot(
+        t / orbit.period,
+        y[0],
+        color=cmap(np.log10(mu * 10) / 2.5),
+        label=f"$\\mu = {mu:g}$",
+    )
+ax.set_title("Van der Pol limit cycles, one period")
+ax.set_xlabel("Time / period")
+ax.set_ylabel("Position / m")
+ax.grid(True)
+ax.legend(loc="upper right")
+
+ax = axs[0, 1]
+periods = np.array([orbit.period for orbit in branch])
+ax.loglog(mus, periods, "o", label="Shooting")
+mu_fine = np.geomspace(mus[0], mus[-1], 200)
+ax.loglog(
+    mu_fine, 2 * np.pi * (1 + mu_fine**2 / 16), "--", label="$2\\pi (1 + \\mu^2/16)$"
+)
+ax.loglog(
+    mu_fine,
+    (3 - 2 * np.log(2)) * mu_fine + 7.014 * mu_fine ** (-1 / 3),
+    "--",
+    label="$(3 - 2 \\ln 2) \\mu + 7.014 \\mu^{-1/3}$",
+)
+ax.set_ylim(periods.min() * 0.8, periods.max() * 1.5)
+ax.set_title("Period of the limit cycle (continuation in $\\mu$)")
+ax.set_xlabel("$\\mu$")
+ax.set_ylabel("Period / s")
+ax.grid(True, which="both", alpha=0.3)
+ax.legend()
+
+ax = axs[1, 0]
+for orbits, label in [
+    (branch, "Stable cycle ($\\mu > 0$), $N = 1$"),
+    (unstable[32], "Unstable cycle ($\\mu < 0$), $N = 32$"),
+]:
+    m = [np.abs(o.multipliers[np.argmax(np.abs(o.multipliers - 1))]) for o in orbits]
+    ax.loglog(mus[: len(orbits)], m, "o", label=label)
+for N in [1, 4, 16]:
+    ax.axvline(mus[len(unstable[N]) - 1], color="gray", ls=":", lw=1)
+    ax.annotate(
+        f"$N = {N}$",
+        (mus[len(unstable[N]) - 1], 0.05),
+        xycoords=ax.get_xaxis_transform(),
+        rotation=90,
+        ha="right",
+        color="gray",
+    )
+ax.axhspan(1e-17, 1e-13, color="gray", alpha=0.2, label="Roundoff of the monodromy")
+ax.set_ylim(bottom=1e-17)
+ax.legend(loc="upper left")
+ax.set_title("Nontrivial Floquet multiplier (limit of the continuation for $\\mu < 0$)")
+ax.set_xlabel("$|\\mu|$")
+ax.set_ylabel("Multiplier")
+ax.grid(True, which="both", alpha=0.3)
+
+ax = axs[1, 1]
+osc = forced_duffing(omega)
+sol = solve_ivp(
+    osc.f,
+    (0, 40 * osc.period),
+    [0.0, 0.0],
+    method="DOP853",
+    rtol=1e-8,
+    atol=1e-10,
+    dense_output=True,
+)
+t_plot = np.linspace(0, 40 * osc.period, 8000)
+ax.plot(
+    *sol.sol(t_plot), color="tab:gray", alpha=0.4, lw=0.8, label="Transient from rest"
+)
+for orbit in duffing_orbits:
+    _, y = orbit.solution()
+    style = "-" if orbit.stable else "--"
+    kind = "stable" if orbit.stable else "unstable"
+    ax.plot(*y, style, lw=2, label=f"Periodic orbit ({kind})")
+    ax.plot(*orbit.states[0], "ko")
+ax.set_title(f"Forced Duffing oscillator, $\\omega = {omega}$")
+ax.set_xlabel("Position / m")
+ax.set_ylabel("Velocity / m$\\cdot$s$^{-1}$")
+ax.grid(True)
+ax.legend(loc="lower center", framealpha=0.9)
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
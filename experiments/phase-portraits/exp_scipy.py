@@ -0,0 +1,326 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+from scipy.constants import g
+from scipy.integrate import solve_ivp
+from scipy.optimize import root
+
+n_grid: Final = 1000
+"""Grid points along each axis of the vector field (10⁶ points in total)"""
+
+n_seeds: Final = 2000
+"""Number of seed trajectories integrated as a batch"""
+
+
+# --- 2-D Models ---
+# Equations and constants of the library models, written with y[0] and y[1] so
+# that y can also be a stack of grids or a batch of states.
+def van_der_pol(t, y, mu=1.0):
+    """Van der Pol oscillator: position [m] and velocity [m/s]"""
+    return [y[1], mu * (1 - y[0] ** 2) * y[1] - y[0]]
+
+
+def duffing(t, y, alpha=1.0):
+    """Unforced Duffing oscillator: position [m] and velocity [m/s]"""
+    return [y[1], -alpha * y[0] - y[0] ** 3]
+
+
+def simple_pendulum(t, y, L=1.0):
+    """Simple pendulum: angle [rad] and angular velocity [rad/s]"""
+    return [y[1], -(g / L) * np.sin(y[0])]
+
+
+def rlc_circuit(t, y, R=10.0, L=2.0, C=5000e-6, epsilon=5.0):
+    """Series RLC circuit: capacitor charge [C] and current [A]"""
+    return [y[1], (epsilon - R * y[1] - y[0] / C) / L]
+
+
+class PhasePlane:
+    """A 2-D model and the window of its phase plane"""
+
+    def __init__(
+        self,
+        name: str,
+        model: Callable,
+        x_range: tuple,
+        y_range: tuple,
+        labels: tuple,
+        t_end: float,
+    ):
+        self.name, self.model = name, model
+        self.x_range, self.y_range = x_range, y_range
+        self.labels, self.t_end = labels, t_end
+
+
+planes = [
+    PhasePlane(
+        "Van der Pol oscillator",
+        van_der_pol,
+        (-3, 3),
+        (-4, 4),
+        ("Position / m", "Velocity / m$\\cdot$s$^{-1}$"),
+        t_end=10.0,
+    ),
+    PhasePlane(
+        "Duffing oscillator (unforced)",
+        duffing,
+        (-2, 2),
+        (-3, 3),
+        ("Position / m", "Velocity / m$\\cdot$s$^{-1}$"),
+        t_end=5.0,
+    ),
+    PhasePlane(
+        "Simple pendulum",
+        simple_pendulum,
+        (-7, 7),
+        (-10, 10),
+        ("Angle / rad", "Angular velocity / rad$\\cdot$s$^{-1}$"),
+        t_end=2.0,
+    ),
+    PhasePlane(
+        "Series RLC circuit",
+        rlc_circuit,
+        (-0.05, 0.1),
+        (-0.5, 0.5),
+        ("Charge / C", "Current / A"),
+        t_end=1.5,
+    ),
+]
+
+
+# --- Phase-Plane Tools ---
+def vector_field(plane: PhasePlane, n: int = n_grid):
+    """
+    Evaluate the model over an n x n grid of the phase plane, in one call.
+
+    Returns:
+    - Grid coordinates X, Y and derivatives U, V, of shape (n, n), in the
+      layout of plt.streamplot
+    """
+    X, Y = np.meshgrid(np.linspace(*plane.x_range, n), np.linspace(*plane.y_range, n))
+    U, V = plane.model(0.0, np.stack([X, Y]))
+    return X, Y, np.broadcast_to(U, X.shape), np.broadcast_to(V, X.shape)
+
+
+def nullclines(X, Y, U, V):
+    """
+    Nullclines of the vector field, as the zero contours of U and V, traced by
+    Matplotlib on a figure that is closed afterwards.
+
+    Returns:
+    - Lists of (m, 2) arrays of points, for dx/dt = 0 and for dy/dt = 0
+    """
+    fig, ax = plt.subplots()
+    lines = tuple(ax.contour(X, Y, Z, levels=[0.0]).allsegs[0] for Z in (U, V))
+    plt.close(fig)
+    return lines
+
+
+def jacobian(model: Callable, y: np.ndarray) -> np.ndarray:
+    """Jacobian of the model at y, by central differences"""
+    J = np.empty((2, 2))
+    for j in range(2):
+        dy = 1e-6 * max(1.0, abs(y[j]))
+        y_plus, y_minus = y.copy(), y.copy()
+        y_plus[j] += dy
+        y_minus[j] -= dy
+        J[:, j] = (np.array(model(0.0, y_plus)) - np.array(model(0.0, y_minus))) / (
+            2 * dy
+        )
+    return J
+
+
+def classify(J: np.ndarray) -> str:
+    """Type of a 2-D equilibrium, from the trace and determinant of its Jacobian"""
+    tr, det = np.trace(J), np.linalg.det(J)
+    scale = max(1.0, np.abs(J).max())
+    if det < 0:
+        return "saddle"
+    if abs(tr) < 1e-6 * scale:
+        return "center"
+    stability = "stable" if tr < 0 else "unstable"
+    return f"{stability} {'focus' if tr**2 < 4 * det else 'node'}"
+
+
+def equilibria(plane: PhasePlane, X, Y, U, V) -> list:
+    """
+    Equilibria inside the grid.
+
+    The candidates are the cells of the grid where both U and V change sign.
+    Each one is refined with a root finder, and the duplicates are removed.
+
+    Returns:
+    - List of (point, type) tuples
+    """
+
+    def sign_change(F):
+        corners = np.stack([F[:-1, :-1], F[1:, :-1], F[:-1, 1:], F[1:, 1:]])
+        return (corners.min(axis=0) <= 0) & (corners.max(axis=0) >= 0)
+
+    cells = np.argwhere(sign_change(U) & sign_change(V))
+    dx, dy = X[0, 1] - X[0, 0], Y[1, 0] - Y[0, 0]
+    points = []
+    for i, j in cells:
+        guess = [X[i, j] + dx / 2, Y[i, j] + dy / 2]
+        sol = root(lambda y: plane.model(0.0, y), guess)
+        if not sol.success:
+            continue
+        if any(abs(sol.x[0] - p[0]) < dx and abs(sol.x[1] - p[1]) < dy for p in points):
+            continue
+        points.append(sol.x)
+    return [(p, classify(jacobian(plane.model, p))) for p in points]
+
+
+def integrate_batch(plane: PhasePlane, seeds: np.ndarray, n_points: int = 200):
+    """
+    Integrate a batch of seed trajectories as one system.
+
+    The seeds are stacked into a single state vector, so each step evaluates
+    the model once for the whole batch.
+
+    Parameters:
+    - plane: phase plane
+    - seeds: initial states, of shape (n_seeds, 2)
+    - n_points: number of output points along each trajectory
+
+    Returns:
+    - Trajectories, of shape (n_seeds, n_points, 2), and the number of calls
+    """
+    n = len(seeds)
+
+    def fun(t, y):
+        return np.concatenate(plane.model(t, y.reshape(2, n)))
+
+    t_eval = np.linspace(0, plane.t_end, n_points)
+    sol = solve_ivp(fun, (0, plane.t_end), seeds.T.ravel(), t_eval=t_eval, rtol=1e-6)
+    return sol.y.reshape(2, n, -1).transpose(1, 2, 0), sol.nfev
+
+
+def seed_grid(plane: PhasePlane, n: int) -> np.ndarray:
+    """Seeds spread over the phase plane (a jittered grid, with a fixed seed)"""
+    rng = np.random.default_rng(0)
+    side = int(np.ceil(np.sqrt(n)))
+    u, v = np.meshgrid((np.arange(side) + 0.5) / side, (np.arange(side) + 0.5) / side)
+    u = (u.ravel() + rng.uniform(-0.5, 0.5, side**2) / side)[:n]
+    v = (v.ravel() + rng.uniform(-0.5, 0.5, side**2) / side)[:n]
+    x = plane.x_range[0] + u * (plane.x_range[1] - plane.x_range[0])
+    y = plane.y_range[0] + v * (plane.y_range[1] - plane.y_range[0])
+    return np.column_stack([x, y])
+
+
+# --- Compute Portraits ---
+portraits = []
+for plane in planes:
+    print(f"{plane.name}:")
+
+    t_start = time.perf_counter()
+    X, Y, U, V = vector_field(plane)
+    t_field = time.perf_counter() - t_start
+
+    # The same evaluation, one point at a time, on a sample of the grid
+    sample = np.column_stack([X.ravel(), Y.ravel()])[:: X.size // 10_000]
+    t_start = time.perf_counter()
+    for y in sample:
+        plane.model(0.0, y)
+    t_loop = (time.perf_counter() - t_start) * X.size / len(sample)
+    print(
+        f"  Vector field, {X.size:,} points: {t_field * 1e3:.0f} ms vectorized, "
+        f"about {t_loop:.1f} s one point at a time"
+    )
+
+    t_start = time.perf_counter()
+    lines = nullclines(X, Y, U, V)
+    points = equilibria(plane, X, Y, U, V)
+    print(f"  Nullclines and equilibria: {time.perf_counter() - t_start:.2f} s")
+    for point, kind in points:
+        print(f"    ({point[0]:.4g}, {point[1]:.4g}): {kind}")
+
+    seeds = seed_grid(plane, n_seeds)
+    t_start = time.perf_counter()
+    trajectories, nfev = integrate_batch(plane, seeds)
+    t_batch = time.perf_counter() - t_start
+
+    # The same seeds, one solve_ivp call each, on a sample of the batch
+    n_sample = 100
+    t_start = time.perf_counter()
+    deviation = 0.0
+    for k in range(n_sample):
+        sol = solve_ivp(
+            plane.model,
+            (0, plane.t_end),
+            seeds[k],
+            t_eval=np.linspace(0, plane.t_end, trajectories.shape[1]),
+            rtol=1e-6,
+        )
+        scale = np.abs(sol.y.T).max(axis=0) + 1e-12
+        deviation = max(deviation, np.max(np.abs(sol.y.T - trajectories[k]) / scale))
+    t_single = (time.perf_counter() - t_start) * n_seeds / n_sample
+    print(
+        f"  {n_seeds} trajectories: {t_batch:.2f} s as a batch ({nfev} calls), "
+        f"about {t_single:.1f} s one at a time; max deviation {deviation:.1e}"
+    )
+    portraits.append((plane, (X, Y, U, V), lines, points, trajectories))
+
+# --- Plot Results ---
+t_start = time.perf_counter()
+fig, axs = plt.subplots(2, 2, figsize=(13, 11), constrained_layout=True)
+fig.suptitle("Phase Portraits of 2-D Models")
+markers = {
+    "saddle": ("X", "black"),
+    "center": ("o", "white"),
+    "stable node": ("o", "black"),
+    "stable focus": ("o", "black"),
+    "unstable node": ("o", "white"),
+    "unstable focus": ("o", "white"),
+}
+
+for ax, (plane, (X, Y, U, V), lines, points, trajectories) in zip(
+    axs.flat, portraits, strict=True
+):
+    ax.add_collection(
+        LineCollection(trajectories[::4], color="tab:gray", alpha=0.15, lw=0.5)
+    )
+    speed = np.hypot(U / np.ptp(X), V / np.ptp(Y))
+    ax.streamplot(
+        X,
+        Y,
+        U,
+        V,
+        color=np.log10(speed + 1e-12),
+        cmap="viridis",
+        density=1.4,
+        linewidth=0.8,
+    )
+    for label, color, segments in zip(
+        ["$\\dot{x} = 0$", "$\\dot{y} = 0$"],
+        ["tab:orange", "tab:red"],
+        lines,
+        strict=True,
+    ):
+        for k, segment in enumerate(segments):
+            ax.plot(*segment.T, color=color, lw=2, label=label if k == 0 else None)
+    for kind in dict.fromkeys(kind for _, kind in points):
+        xy = np.array([p for p, k in points if k == kind])
+        marker, face = markers[kind]
+        ax.plot(
+            *xy.T, marker, ms=9, mfc=face, mec="black", linestyle="none", label=kind
+        )
+    ax.set_xlim(*plane.x_range)
+    ax.set_ylim(*plane.y_range)
+    ax.set_title(plane.name)
+    ax.set_xlabel(plane.labels[0])
+    ax.set_ylabel(plane.labels[1])
+    ax.legend(loc="upper right", framealpha=0.9)
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Rendered in {time.perf_counter() - t_start:.1f} s")
+print(f"Plot saved to {save_path}")
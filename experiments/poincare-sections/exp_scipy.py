@@ -0,0 +1,355 @@
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import g as gravity
+from scipy.integrate import DOP853, solve_ivp
+from scipy.optimize import brentq
+from scipy.special import ellipk
+
+rtol: Final = 1e-9
+atol: Final = 1e-12
+
+# --- Forced Duffing Oscillator ---
+alpha: Final = -1.0
+"""Linear stiffness coefficient (negative: double-well potential)"""
+
+delta: Final = 0.3
+"""Damping coefficient [1/s]"""
+
+gamma: Final = 0.45
+"""Forcing amplitude [m/s²] (chaotic, see the Lyapunov exponents experiment)"""
+
+omega: Final = 1.2
+"""Forcing frequency [rad/s]"""
+
+T_forcing: Final = 2 * np.pi / omega
+"""Period of the forcing [s]"""
+
+
+def duffing(t: float, y: np.ndarray):
+    """
+    Forced, damped Duffing oscillator.
+
+    Parameters:
+    - t: time [s]
+    - y: state vector
+    """
+    x = y[0]  # Position [m]
+    v = y[1]  # Velocity [m/s]
+
+    dxdt = v
+    d2x_dt2 = -delta * v - alpha * x - x * x**2 + gamma * np.cos(omega * t)
+    return [dxdt, d2x_dt2]
+
+
+def x_crossing(t, y):
+    """Section x = 0, crossed upwards (v > 0)"""
+    return y[0]
+
+
+x_crossing.direction = 1
+
+# --- Simple Pendulum ---
+g: Final = gravity
+"""Gravitational acceleration [m/s²]"""
+
+L: Final = 1.0
+"""Pendulum length [m]"""
+
+theta0: Final = np.deg2rad(30.0)
+"""Initial angle [rad], with no initial angular velocity"""
+
+T_pendulum: Final = 4 * np.sqrt(L / g) * ellipk(np.sin(theta0 / 2) ** 2)
+"""Exact period of the pendulum [s]"""
+
+omega_bottom: Final = np.sqrt(2 * g / L * (1 - np.cos(theta0)))
+"""Exact angular velocity at the bottom, theta = 0 [rad/s]"""
+
+
+def pendulum(t: float, y: np.ndarray):
+    """
+    Simple pendulum (no damping, no external force).
+
+    Parameters:
+    - t: time [s]
+    - y: state vector
+    """
+    theta = y[0]  # Angle [rad]
+    omega = y[1]  # Angular velocity [rad/s]
+
+    dtheta_dt = omega
+    domega_dt = -(g / L) * np.sin(theta)
+    return [dtheta_dt, domega_dt]
+
+
+def bottom_crossing(t, y):
+    """Section theta = 0, crossed upwards (omega > 0)"""
+    return y[0]
+
+
+bottom_crossing.direction = 1
+
+
+# --- Poincaré Sampler ---
+class SectionPoints:
+    """
+    Points of a section, as rows (t, y), in a growing preallocated array.
+
+    The array doubles its capacity when it is full, so appending n points costs
+    O(n) copies in total, and the array is at most twice as large as its points.
+    """
+
+    def __init__(self, n_columns: int, capacity: int = 1024):
+        self.data = np.empty((capacity, n_columns))
+        self.size = 0
+
+    def append(self, row):
+        if self.size == len(self.data):
+            grown = np.empty((2 * len(self.data), self.data.shape[1]))
+            grown[: self.size] = self.data
+            self.data = grown
+        self.data[self.size] = row
+        self.size += 1
+
+    @property
+    def points(self) -> np.ndarray:
+        """View of the filled rows"""
+        return self.data[: self.size]
+
+
+def crossing_time(section: Callable, dense: Callable, t_old: float, t: float):
+    """Root of section(t, y(t)) within a step, on the dense output y(t) of the step"""
+    return brentq(lambda t_: section(t_, dense(t_)), t_old, t, xtol=1e-14, rtol=1e-15)
+
+
+def poincare(
+    fun: Callable,
+    t_span: tuple,
+    y0: list,
+    sections: list = (),
+    period: float | None = None,
+):
+    """
+    Integrate a model, and keep only its crossings of some sections.
+
+    The model is integrated step by step with DOP853, and nothing is stored
+    but the section points. After each step, the sign of every section
+    function is compared with the previous one; on a crossing, the dense
+    output of the step (an interpolant of the same order as the method) is
+    built, and the crossing time is found on it with brentq. A section
+    function can have a direction attribute, as for the events of solve_ivp.
+
+    With a period, the state is also sampled at t_span[0] + k * period
+    (stroboscopic map), from the dense output of the step that contains
+    each sample time.
+
+    Parameters:
+    - fun: right-hand side f(t, y)
+    - t_span: initial and final times [s]
+    - y0: initial state
+    - sections: section functions s(t, y), crossed where s = 0
+    - period: period of the stroboscopic sampling [s]
+
+    Returns:
+    - Points of each section, and of the stroboscopic map (or None), as
+      arrays of rows (t, y)
+    - Number of calls to the model
+    """
+    solver = DOP853(fun, t_span[0], y0, t_span[1], rtol=rtol, atol=atol)
+    crossings = [SectionPoints(1 + len(y0)) for _ in sections]
+    strobe = SectionPoints(1 + len(y0)) if period else None
+    values = [s(solver.t, solver.y) for s in sections]
+    k = 1  # Next stroboscopic sample
+
+    while solver.status == "running":
+        solver.step()
+        t_old, t = solver.t_old, solver.t
+        dense = None
+        for i, s in enumerate(sections):
+            value = s(t, solver.y)
+            direction = getattr(s, "direction", 0)
+            crossed = (values[i] < 0 <= value and direction >= 0) or (
+                values[i] > 0 >= value and direction <= 0
+            )
+            if crossed:
+                dense = dense or solver.dense_output()
+                t_cross = crossing_time(s, dense, t_old, t)
+                crossings[i].append([t_cross, *dense(t_cross)])
+            values[i] = value
+        while period and t_span[0] + k * period <= t:
+            dense = dense or solver.dense_output()
+            t_sample = t_span[0] + k * period
+            strobe.append([t_sample, *dense(t_sample)])
+            k += 1
+
+    points = [c.points for c in crossings]
+    return points, strobe.points if strobe else None, solver.nfev
+
+
+def dense_samples(fun: Callable, t_span: tuple, y0: list, samples_per_period: int):
+    """
+    Integrate a model with solve_ivp, and keep evenly spaced samples, as the
+    model scripts do, with samples_per_period samples per forcing period.
+    """
+    n = round((t_span[1] - t_span[0]) / T_forcing * samples_per_period) + 1
+    t_eval = np.linspace(*t_span, n)
+    return solve_ivp(
+        fun, t_span, y0, method="DOP853", t_eval=t_eval, rtol=rtol, atol=atol
+    )
+
+
+def interpolated_crossings(t: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Upward crossings of y[0] = 0, by linear interpolation between samples"""
+    i = np.flatnonzero((y[0, :-1] < 0) & (y[0, 1:] >= 0))
+    w = -y[0, i] / (y[0, i + 1] - y[0, i])
+    return np.column_stack(
+        [t[i] + w * (t[i + 1] - t[i]), *(y[:, i] + w * (y[:, i + 1] - y[:, i]))]
+    )
+
+
+def peak_memory(function: Callable, *args, **kwargs):
+    """Call a function, and return its result and its peak of allocated memory [B]"""
+    tracemalloc.start()
+    result = function(*args, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+# --- Accuracy: Simple Pendulum ---
+n_swings = 1000
+t_span = (0.0, n_swings * T_pendulum)
+y0_pendulum = [theta0, 0.0]
+
+start = time.perf_counter()
+(bottom,), strobe_pendulum, nfev = poincare(
+    pendulum, t_span, y0_pendulum, [bottom_crossing], period=T_pendulum
+)
+print(
+    f"Simple pendulum, {n_swings} periods: {time.perf_counter() - start:.2f} s, "
+    f"{nfev} calls, {len(bottom)} crossings"
+)
+error_sampler = np.abs(bottom[:, 2] - omega_bottom)
+drift = np.abs(strobe_pendulum[:, 1:] - y0_pendulum).max(axis=1)
+print(f"  Crossings, dense output: max error {error_sampler.max():.1e} rad/s")
+print(f"  Stroboscopic map at the exact period: max drift {drift.max():.1e}")
+
+error_samples = {}
+for per_second in [10, 100, 1000]:
+    t_eval = np.linspace(*t_span, round(t_span[1] * per_second) + 1)
+    sol = solve_ivp(
+        pendulum, t_span, y0_pendulum, "DOP853", t_eval=t_eval, rtol=rtol, atol=atol
+    )
+    crossings = interpolated_crossings(sol.t, sol.y)
+    error_samples[per_second] = np.abs(crossings[:, 2] - omega_bottom)
+    print(
+        f"  Crossings, {per_second:>4} samples/s, interpolated: max error "
+        f"{error_samples[per_second].max():.1e} rad/s"
+    )
+
+# --- Memory: Forced Duffing Oscillator ---
+y0_duffing = [1.0, 0.0]
+samples_per_period = 50
+memory = {"Poincaré sampler": [], "solve_ivp, every step": [], "Dense samples": []}
+runs = [100, 1000]
+print(f"\nForced Duffing oscillator, gamma = {gamma}, omega = {omega}: peak memory")
+for n in runs:
+    t_span = (0.0, n * T_forcing)
+    _, peak = peak_memory(
+        poincare, duffing, t_span, y0_duffing, [x_crossing], period=T_forcing
+    )
+    memory["Poincaré sampler"].append(peak)
+    _, peak = peak_memory(
+        solve_ivp,
+        duffing,
+        t_span,
+        y0_duffing,
+        method="DOP853",
+        events=x_crossing,
+        rtol=rtol,
+        atol=atol,
+    )
+    memory["solve_ivp, every step"].append(peak)
+    _, peak = peak_memory(
+        dense_samples, duffing, t_span, y0_duffing, samples_per_period
+    )
+    memory["Dense samples"].append(peak)
+for name, peaks in memory.items():
+    per_period = (peaks[1] - peaks[0]) / (runs[1] - runs[0])
+    extrapolated = peaks[0] + per_period * (10**6 - runs[0])
+    print(
+        f"  {name:<22}: {peaks[0] / 1e6:6.2f} MB ({runs[0]} periods), "
+        f"{peaks[1] / 1e6:6.2f} MB ({runs[1]} periods), {per_period:5.0f} B/period, "
+        f"about {extrapolated / 1e6:7.0f} MB for 10⁶ periods"
+    )
+
+# --- Long Run ---
+n_long = 100_000
+start = time.perf_counter()
+(section,), strobe, nfev = poincare(
+    duffing, (0.0, n_long * T_forcing), y0_duffing, [x_crossing], period=T_forcing
+)
+elapsed = time.perf_counter() - start
+print(
+    f"\n{n_long} periods: {elapsed:.0f} s, {nfev / n_long:.0f} calls per period, "
+    f"{len(strobe)} stroboscopic points ({strobe.nbytes / 1e6:.1f} MB), "
+    f"{len(section)} crossings of x = 0 ({section.nbytes / 1e6:.1f} MB)"
+)
+
+# --- Plot Results ---
+fig, axs = plt.subplots(2, 2, figsize=(13, 11), constrained_layout=True)
+fig.suptitle("Poincaré Sections")
+
+ax = axs[0, 0]
+ax.plot(strobe[:, 1], strobe[:, 2], ",", color="black", alpha=0.5)
+ax.set_title(f"Forced Duffing oscillator: stroboscopic map, {len(strobe):,} points")
+ax.set_xlabel("Position / m")
+ax.set_ylabel("Velocity / m$\\cdot$s$^{-1}$")
+
+ax = axs[0, 1]
+phase = np.mod(omega * section[:, 0], 2 * np.pi)
+ax.plot(phase, section[:, 2], ",", color="black", alpha=0.5)
+ax.set_title(
+    f"Forced Duffing oscillator: section $x = 0$, $v > 0$, {len(section):,} points"
+)
+ax.set_xlabel("Phase of the forcing $\\omega t$ mod $2\\pi$ / rad")
+ax.set_ylabel("Velocity / m$\\cdot$s$^{-1}$")
+
+ax = axs[1, 0]
+ax.semilogy(error_sampler + 1e-17, ".", ms=3, label="Dense output + brentq")
+for per_second, error in error_samples.items():
+    ax.semilogy(error, ".", ms=3, label=f"{per_second} samples/s, interpolated")
+ax.set_title("Simple pendulum: error of the velocity at $\\theta = 0$")
+ax.set_xlabel("Crossing")
+ax.set_ylabel("Error / rad$\\cdot$s$^{-1}$")
+ax.grid(True, which="both", alpha=0.3)
+ax.legend(loc="lower right")
+
+ax = axs[1, 1]
+n_periods = np.geomspace(runs[0], 1e6, 100)
+for name, peaks in memory.items():
+    per_period = (peaks[1] - peaks[0]) / (runs[1] - runs[0])
+    (line,) = ax.loglog(runs, peaks, "o", label=name)
+    ax.loglog(
+        n_periods,
+        peaks[0] + per_period * (n_periods - runs[0]),
+        "--",
+        color=line.get_color(),
+    )
+ax.set_title("Forced Duffing oscillator: peak memory (dashed: extrapolated)")
+ax.set_xlabel("Periods of the forcing")
+ax.set_ylabel("Memory / B")
+ax.grid(True, which="both", alpha=0.3)
+ax.legend()
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
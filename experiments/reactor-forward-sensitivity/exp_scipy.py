@@ -0,0 +1,310 @@
+import os
+import time
+from collections.abc import Callable
+
+import matplotlib.pyplot as plt
+import numpy as np
+import sympy as sp
+from scipy.constants import gas_constant, zero_Celsius
+from scipy.integrate import solve_ivp
+
+
+# --- Forward Sensitivity Equations ---
+def build_sensitivity_model(
+    f: sp.Matrix, states: sp.Matrix, params: sp.Matrix, inputs: sp.Matrix
+):
+    """
+    Augment a symbolic model with its forward sensitivity equations.
+
+    For dx/dt = f(x, p, u), the sensitivities S = dx/dp follow
+
+        dS/dt = (df/dx) S + df/dp,  S(0) = 0
+
+    Both Jacobians are derived symbolically. The augmented state is
+    [x, S.ravel()], with S of shape (n_states, n_params).
+
+    Returns:
+    - rhs(t, z, p, u_func): right-hand side of the augmented system
+    - jac(t, z, p, u_func): block-diagonal Jacobian used by the stiff solver
+    """
+    n, n_p = len(states), len(params)
+    args = (list(states), list(params), list(inputs))
+    f_func = sp.lambdify(args, f, "numpy")
+    fx_func = sp.lambdify(args, f.jacobian(states), "numpy")
+    fp_func = sp.lambdify(args, f.jacobian(params), "numpy")
+
+    def rhs(t: float, z: np.ndarray, p: np.ndarray, u_func: Callable):
+        x = z[:n]
+        S = z[n:].reshape(n, n_p)
+        u = u_func(t)
+
+        dxdt = np.asarray(f_func(x, p, u), dtype=float).ravel()
+        dSdt = np.asarray(fx_func(x, p, u), dtype=float) @ S + np.asarray(
+            fp_func(x, p, u), dtype=float
+        )
+        return np.concatenate([dxdt, dSdt.ravel()])
+
+    def jac(t: float, z: np.ndarray, p: np.ndarray, u_func: Callable):
+        # The coupling of S into dx/dt is zero, and dS/dx is neglected, which only
+        # slows the Newton iterations down without changing the solution
+        fx = np.asarray(fx_func(z[:n], p, u_func(t)), dtype=float)
+        J = np.zeros((n * (n_p + 1), n * (n_p + 1)))
+        J[:n, :n] = fx
+        J[n:, n:] = np.kron(fx, np.eye(n_p))
+        return J
+
+    return rhs, jac
+
+
+def solve_with_sensitivities(
+    model: tuple[sp.Matrix, sp.Matrix, sp.Matrix, sp.Matrix],
+    p0: np.ndarray,
+    x0: np.ndarray,
+    u_func: Callable,
+    t_eval: np.ndarray,
+):
+    """
+    Integrate a model and its sensitivities in a single stiff solve.
+
+    Returns:
+    - x: states, shape (n_states, n_times)
+    - S: sensitivities dx/dp keyed by parameter name, each (n_states, n_times)
+    - sol: solve_ivp result
+    """
+    f, states, params, inputs = model
+    n, n_p = len(states), len(params)
+    rhs, jac = build_sensitivity_model(f, states, params, inputs)
+
+    z0 = np.concatenate([x0, np.zeros(n * n_p)])
+    sol = solve_ivp(
+        rhs,
+        [t_eval[0], t_eval[-1]],
+        z0,
+        method="BDF",
+        t_eval=t_eval,
+        args=(p0, u_func),
+        jac=jac,
+        rtol=1e-8,
+        atol=1e-10,
+    )
+    S = sol.y[n:].reshape(n, n_p, -1)
+    return sol.y[:n], {str(p): S[:, j] for j, p in enumerate(params)}, sol
+
+
+def finite_difference_sensitivities(
+    model: tuple[sp.Matrix, sp.Matrix, sp.Matrix, sp.Matrix],
+    p0: np.ndarray,
+    x0: np.ndarray,
+    u_func: Callable,
+    t_eval: np.ndarray,
+    rel_step: float = 1e-5,
+):
+    """
+    Central finite-difference sensitivities, for comparison (2 solves per p),
+    keyed by parameter name as in solve_with_sensitivities.
+    """
+    f, states, params, inputs = model
+    f_func = sp.lambdify((list(states), list(params), list(inputs)), f, "numpy")
+
+    def rhs(t: float, x: np.ndarray, p: np.ndarray):
+        return np.asarray(f_func(x, p, u_func(t)), dtype=float).ravel()
+
+    S = {}
+    for j, param in enumerate(params):
+        dp = rel_step * abs(p0[j])
+        x_pm = []
+        for sign in (1, -1):
+            p = p0.copy()
+            p[j] += sign * dp
+            sol = solve_ivp(
+                rhs,
+                [t_eval[0], t_eval[-1]],
+                x0,
+                method="BDF",
+                t_eval=t_eval,
+                args=(p,),
+                rtol=1e-8,
+                atol=1e-10,
+            )
+            x_pm.append(sol.y)
+        S[str(param)] = (x_pm[0] - x_pm[1]) / (2 * dp)
+    return S
+
+
+# --- Symbolic Models ---
+def cstr_with_cooling():
+    """CSTR with cooling jacket, sensitivities with respect to k0, E, ΔHr and U."""
+    rho, cp, rho_c, cp_c = 1000.0, 239.0, 1000.0, 4180.0
+    R, A, V_c = gas_constant, 2.7520, 0.55
+
+    V, C_A, T, T_c = sp.symbols("V C_A T T_c")
+    k0, E, delta_Hr, U = sp.symbols(r"k_0 E \Delta{}H_r U")
+    q1, q, C_A1, T1, q_c, T_c0 = sp.symbols("q_1 q C_A1 T_1 q_c T_c0")
+
+    Gamma = k0 * sp.exp(-E / (R * T)) * C_A
+    f = sp.Matrix(
+        [
+            q1 - q,
+            ((C_A1 - C_A) * q1 - Gamma * V) / V,
+            (rho * q1 * cp * (T1 - T) + (-delta_Hr) * Gamma * V + U * A * (T_c - T))
+            / (rho * V * cp),
+            (rho_c * q_c * cp_c * (T_c0 - T_c) - U * A * (T_c - T))
+            / (rho_c * V_c * cp_c),
+        ]
+    )
+    states = sp.Matrix([V, C_A, T, T_c])
+    params = sp.Matrix([k0, E, delta_Hr, U])
+    inputs = sp.Matrix([q1, q, C_A1, T1, q_c, T_c0])
+    return f, states, params, inputs
+
+
+def two_cstrs_and_separator():
+    """Reactor-separator system, sensitivities with respect to the kinetics."""
+    rho, Cp, m, R = 1000.0, 4.2, 0.00279, 8.314
+    alphaA, alphaB, alphaC, eps, xA0 = 5.0, 1.0, 0.5, 0.02, 1.0
+
+    x = sp.symbols("V1 V2 V3 T1 T2 T3 x_A1 x_B1 x_A2 x_B2 x_A3 x_B3")
+    V1, V2, V3, T1, T2, T3, xA1, xB1, xA2, xB2, xA3, xB3 = x
+    p = sp.symbols(r"k_1 k_2 E_1 E_2 \Delta{}H_1 \Delta{}H_2")
+    k1, k2, E1, E2, dH1, dH2 = p
+    u = sp.symbols("F_f1 F_f2 F_1 F_2 F_3 F_R Q_1 Q_2 Q_3 T_0")
+    Ff1, Ff2, F1, F2, F3, FR, Q1, Q2, Q3, T0 = u
+
+    xC3 = 1 - xA3 - xB3
+    FP = eps * FR
+    k11 = k1 * sp.exp(-E1 / (R * T1))
+    k21 = k2 * sp.exp(-E2 / (R * T1))
+    k12 = k1 * sp.exp(-E1 / (R * T2))
+    k22 = k2 * sp.exp(-E2 / (R * T2))
+    denom = alphaA * xA3 + alphaB * xB3 + alphaC * xC3
+    xAR = alphaA * xA3 / denom
+    xBR = alphaB * xB3 / denom
+
+    f = sp.Matrix(
+        [
+            Ff1 + FR - F1,
+            Ff2 + F1 - F2,
+            F2 - FP - FR - F3,
+            (Ff1 / V1) * (T0 - T1)
+            + (FR / V1) * (T3 - T1)
+            + Q1 / (rho * Cp * V1)
+            - (m / Cp) * (k11 * xA1 * dH1 + k21 * xB1 * dH2),
+            (Ff2 / V2) * (T0 - T2)
+            + (F1 / V2) * (T1 - T2)
+            + Q2 / (rho * Cp * V2)
+            - (m / Cp) * (k12 * xA2 * dH1 + k22 * xB2 * dH2),
+            (F2 / V3) * (T2 - T3) + Q3 / (rho * Cp * V3),
+            (Ff1 / V1) * (xA0 - xA1) + (FR / V1) * (xAR - xA1) - k11 * xA1,
+            (FR / V1) * (xBR - xB1) - (Ff1 / V1) * xB1 + k11 * xA1 - k21 * xB1,
+            (Ff2 / V2) * (xA0 - xA2) + (F1 / V2) * (xA1 - xA2) - k12 * xA2,
+            (F1 / V2) * (xB1 - xB2) - (Ff2 / V2) * xB2 + k12 * xA2 - k22 * xB2,
+            (F2 / V3) * (xA2 - xA3) - ((FP + FR) / V3) * (xAR - xA3),
+            (F2 / V3) * (xB2 - xB3) - ((FP + FR) / V3) * (xBR - xB3),
+        ]
+    )
+    return f, sp.Matrix(x), sp.Matrix(p), sp.Matrix(u)
+
+
+# --- Make simulations ---
+cases = {
+    "CSTR with Cooling": (
+        cstr_with_cooling(),
+        np.array([1.2e9, 8.75e3 * gas_constant, -5.0e7, 915.6]),  # k0, E, ΔHr, U
+        np.array([1.5, 0.9, zero_Celsius + 25.0, zero_Celsius + 20.0]),
+        lambda t: [0.1, 0.1, 1.0, zero_Celsius + 50.0, 0.005, zero_Celsius + 20.0],
+        np.linspace(0, 60 * 20, 300),
+        2,  # Index of the reactor temperature
+    ),
+    "Two CSTRs and Separator": (
+        two_cstrs_and_separator(),
+        np.array([2.77e3 * 3600, 2.5e3 * 3600, 5.0e4, 6.0e4, -6.0e4, -7.0e4]),
+        np.array(
+            [
+                1.0,
+                0.5,
+                1.0,
+                432.4,
+                427.1,
+                432.1,
+                0.536,
+                0.448,
+                0.545,
+                0.438,
+                0.298,
+                0.670,
+            ]
+        ),
+        lambda t: [
+            5.04,
+            5.04,
+            22.04,
+            27.08,
+            9.74,
+            17.0,
+            715.3e3,
+            579.8e3,
+            568.7e3,
+            359.1 if t < 0.2 else 370.0,
+        ],
+        np.linspace(0, 2.5, 300),
+        3,  # Index of the temperature of reactor 1
+    ),
+}
+
+results = {}
+for name, (model, p0, x0, u_func, t_eval, i_T) in cases.items():
+    start = time.perf_counter()
+    x, S, sol = solve_with_sensitivities(model, p0, x0, u_func, t_eval)
+    t_sens = time.perf_counter() - start
+
+    start = time.perf_counter()
+    S_fd = finite_difference_sensitivities(model, p0, x0, u_func, t_eval)
+    t_fd = time.perf_counter() - start
+
+    # Compare on the normalized sensitivities p * dT/dp
+    scaled = {p: p_j * S[p][i_T] for p, p_j in zip(S, p0)}
+    scaled_fd = {p: p_j * S_fd[p][i_T] for p, p_j in zip(S_fd, p0)}
+    error = max(np.max(np.abs(scaled[p] - scaled_fd[p])) for p in scaled) / max(
+        np.max(np.abs(dTdp)) for dTdp in scaled.values()
+    )
+    print(
+        f"{name}: sensitivity solve {t_sens:.2f} s, finite differences {t_fd:.2f} s, "
+        f"max relative difference {error:.1e}"
+    )
+    results[name] = (t_eval, scaled, scaled_fd)
+
+# Finite differences depend on the step: E sits inside an exponential, so large
+# steps are dominated by truncation error and tiny steps by round-off error
+model, p0, x0, u_func, t_eval, i_T = cases["CSTR with Cooling"]
+_, S, _ = solve_with_sensitivities(model, p0, x0, u_func, t_eval)
+print(
+    f"CSTR E * dT/dE at the final time, sensitivity equations: {p0[1] * S['E'][i_T, -1]:.2f} K"
+)
+for rel_step in (1e-3, 1e-4, 1e-5, 1e-6):
+    S_fd = finite_difference_sensitivities(model, p0, x0, u_func, t_eval, rel_step)
+    print(
+        f"  finite differences (step {rel_step:.0e}): {p0[1] * S_fd['E'][i_T, -1]:.2f} K"
+    )
+
+# --- Plot results ---
+fig, axs = plt.subplots(2, 1, figsize=(8, 8), constrained_layout=True)
+fig.suptitle("Forward Sensitivities of the Reactor Temperature")
+
+for ax, (name, (t_eval, scaled, scaled_fd)) in zip(axs, results.items()):
+    t_plot = t_eval / 60 if name == "CSTR with Cooling" else t_eval
+    for p, dTdp in scaled.items():
+        line = ax.plot(t_plot, dTdp, label=f"${p}$")[0]
+        ax.plot(t_plot[::15], scaled_fd[p][::15], "o", color=line.get_color(), ms=3)
+    ax.plot([], [], "ko", ms=3, label="Finite differences")
+    ax.set_title(name)
+    ax.set_ylabel("$p \\, \\partial T / \\partial p$ / K")
+    ax.set_xlabel("Time / min" if name == "CSTR with Cooling" else "Time / h")
+    ax.grid(True)
+    ax.legend(ncol=2)
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -0,0 +1,444 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy import stats
+from scipy.constants import gas_constant, zero_Celsius
+from scipy.integrate import solve_ivp
+from scipy.stats import qmc
+
+# --- Define Models ---
+# The uncertain parameters are received as arrays, one value per ensemble member.
+# The states of each member are stored side by side, shape (n_batch, n_states).
+
+# CSTR with cooling jacket
+rho: Final = 1000.0  # Reactor fluid density [kg/m³]
+cp: Final = 239.0  # Reactor fluid heat capacity [J/(kg·K)]
+rho_c: Final = 1000.0  # Coolant density [kg/m³]
+cp_c: Final = 4180.0  # Coolant heat capacity [J/(kg·K)]
+R: Final = gas_constant  # Universal gas constant [J/(mol·K)]
+A: Final = 2.7520  # Heat transfer area [m²]
+V_c: Final = 0.55  # Cooling jacket volume [m³]
+q1: Final = 0.1  # Inlet and outlet flow rate [m³/s]
+C_A1: Final = 1.0  # Inlet concentration of A [mol/m³]
+T_in: Final = zero_Celsius + 50.0  # Inlet temperature [K]
+q_c: Final = 0.005  # Coolant flow rate [m³/s]
+T_c0: Final = zero_Celsius + 20.0  # Coolant inlet temperature [K]
+
+
+def cstr_batch(t: float, y: np.ndarray, p: dict[str, np.ndarray]):
+    V, C_A, T, T_c = y.reshape(-1, 4).T
+
+    Gamma = p["k0"] * np.exp(-p["E"] / (R * T)) * C_A  # Reaction rate [mol/(m³·s)]
+
+    dVdt = np.zeros_like(V)
+    dCAdt = ((C_A1 - C_A) * q1 - Gamma * V) / V
+    dTdt = (
+        rho * q1 * cp * (T_in - T)
+        + (-p["delta_Hr"]) * Gamma * V
+        + p["U"] * A * (T_c - T)
+    ) / (rho * V * cp)
+    dTcdt = (rho_c * q_c * cp_c * (T_c0 - T_c) - p["U"] * A * (T_c - T)) / (
+        rho_c * V_c * cp_c
+    )
+    return np.column_stack([dVdt, dCAdt, dTdt, dTcdt]).ravel()
+
+
+# Two CSTRs and separator (both versions share the same constants)
+Cp: Final = 4.2  # Heat capacity [kJ/kg·K]
+m: Final = 0.00279  # Molality [kmol/kg]
+R_kJ: Final = 8.314  # Universal gas constant [kJ/kmol·K]
+alphaA: Final = 5.0  # Relative volatility of component A [-]
+alphaB: Final = 1.0  # Relative volatility of component B [-]
+alphaC: Final = 0.5  # Relative volatility of component C [-]
+eps: Final = 0.02  # Purge ratio [-]
+xA0: Final = 1.0  # Feed mole fraction of component A [-]
+Ff1: Final = 5.04  # Feed flow rate to reactor 1 [m³/h]
+Ff2: Final = 5.04  # Feed flow rate to reactor 2 [m³/h]
+FR: Final = 17.0  # Recycle flow rate [m³/h]
+F3: Final = 9.74  # Product stream flow rate from separator [m³/h]
+Q1: Final = 715.3e3  # Heat input to reactor 1 [kJ/h]
+Q2: Final = 579.8e3  # Heat input to reactor 2 [kJ/h]
+Q3: Final = 568.7e3  # Heat input to separator [kJ/h]
+
+
+def T0_func(t: float) -> float:
+    """Feed temperature [K]"""
+    return 359.1 if t < 0.2 else 370.0
+
+
+def reactor_separator_balances(
+    t: float,
+    V1: float | np.ndarray,
+    V2: float | np.ndarray,
+    V3: float | np.ndarray,
+    F1: float,
+    F2: float,
+    x: np.ndarray,
+    p: dict[str, np.ndarray],
+):
+    """Energy and component balances shared by both reactor-separator models."""
+    T1, T2, T3, xA1, xB1, xA2, xB2, xA3, xB3 = x
+    T0 = T0_func(t)
+
+    xC3 = 1 - xA3 - xB3
+    FP = eps * FR
+
+    k11 = p["k1"] * np.exp(-p["E1"] / (R_kJ * T1))
+    k21 = p["k2"] * np.exp(-p["E2"] / (R_kJ * T1))
+    k12 = p["k1"] * np.exp(-p["E1"] / (R_kJ * T2))
+    k22 = p["k2"] * np.exp(-p["E2"] / (R_kJ * T2))
+
+    denom = alphaA * xA3 + alphaB * xB3 + alphaC * xC3
+    xAR = alphaA * xA3 / denom
+    xBR = alphaB * xB3 / denom
+
+    dT1dt = (
+        (Ff1 / V1) * (T0 - T1)
+        + (FR / V1) * (T3 - T1)
+        + Q1 / (rho * Cp * V1)
+        - (m / Cp) * (k11 * xA1 * p["dH1"] + k21 * xB1 * p["dH2"])
+    )
+    dT2dt = (
+        (Ff2 / V2) * (T0 - T2)
+        + (F1 / V2) * (T1 - T2)
+        + Q2 / (rho * Cp * V2)
+        - (m / Cp) * (k12 * xA2 * p["dH1"] + k22 * xB2 * p["dH2"])
+    )
+    dT3dt = (F2 / V3) * (T2 - T3) + Q3 / (rho * Cp * V3)
+
+    dxA1dt = (Ff1 / V1) * (xA0 - xA1) + (FR / V1) * (xAR - xA1) - k11 * xA1
+    dxB1dt = (FR / V1) * (xBR - xB1) - (Ff1 / V1) * xB1 + k11 * xA1 - k21 * xB1
+    dxA2dt = (Ff2 / V2) * (xA0 - xA2) + (F1 / V2) * (xA1 - xA2) - k12 * xA2
+    dxB2dt = (F1 / V2) * (xB1 - xB2) - (Ff2 / V2) * xB2 + k12 * xA2 - k22 * xB2
+    dxA3dt = (F2 / V3) * (xA2 - xA3) - ((FP + FR) / V3) * (xAR - xA3)
+    dxB3dt = (F2 / V3) * (xB2 - xB3) - ((FP + FR) / V3) * (xBR - xB3)
+
+    return [dT1dt, dT2dt, dT3dt, dxA1dt, dxB1dt, dxA2dt, dxB2dt, dxA3dt, dxB3dt]
+
+
+def two_cstrs_batch(t: float, y: np.ndarray, p: dict[str, np.ndarray]):
+    y = y.reshape(-1, 12).T
+    V1, V2, V3 = y[0:3]
+
+    F1 = 22.04  # Outlet flow rate from reactor 1 [m³/h]
+    F2 = 27.08  # Outlet flow rate from reactor 2 [m³/h]
+    FP = eps * FR
+
+    dV1dt = np.full_like(V1, Ff1 + FR - F1)
+    dV2dt = np.full_like(V2, Ff2 + F1 - F2)
+    dV3dt = np.full_like(V3, F2 - FP - FR - F3)
+
+    dxdt = reactor_separator_balances(t, V1, V2, V3, F1, F2, y[3:], p)
+    return np.column_stack([dV1dt, dV2dt, dV3dt, *dxdt]).ravel()
+
+
+def simple_two_cstrs_batch(t: float, y: np.ndarray, p: dict[str, np.ndarray]):
+    # Constant volumes, the outlet flows follow the inlet flows
+    F1 = Ff1 + FR
+    F2 = Ff2 + F1
+
+    dxdt = reactor_separator_balances(t, 1.0, 0.5, 1.0, F1, F2, y.reshape(-1, 9).T, p)
+    return np.column_stack(dxdt).ravel()
+
+
+# --- Uncertain Parameters ---
+# Pre-exponential factors and heat transfer coefficients are strictly positive and
+# known within a factor, so they are log-normal. Activation energies and heats of
+# reaction are normal, with a small spread on E since it sits inside an exponential.
+E_nom: Final = 8.75e3 * R  # Nominal activation energy of the CSTR [J/mol]
+
+cstr_dists: Final = {
+    "k0": stats.lognorm(s=0.2, scale=1.2e9),
+    "E": stats.norm(loc=E_nom, scale=0.005 * E_nom),
+    "delta_Hr": stats.norm(loc=-5.0e7, scale=2.5e6),
+    "U": stats.lognorm(s=0.1, scale=915.6),
+}
+
+reactor_separator_dists: Final = {
+    "k1": stats.lognorm(s=0.2, scale=2.77e3 * 3600),
+    "k2": stats.lognorm(s=0.2, scale=2.5e3 * 3600),
+    "E1": stats.norm(loc=5.0e4, scale=250.0),
+    "E2": stats.norm(loc=6.0e4, scale=300.0),
+    "dH1": stats.norm(loc=-6.0e4, scale=3.0e3),
+    "dH2": stats.norm(loc=-7.0e4, scale=3.5e3),
+}
+
+
+def sample_parameters(
+    dists: dict[str, stats.rv_continuous], n: int, method: str, seed: int = 42
+) -> dict[str, np.ndarray]:
+    """
+    Sample the parameter distributions.
+
+    Parameters:
+    - dists: frozen SciPy distribution of each parameter
+    - n: number of samples
+    - method: "random", "lhs" (Latin hypercube) or "sobol" (scrambled Sobol)
+    - seed: random seed, for reproducibility
+
+    Uniform samples on the unit hypercube are mapped to each distribution
+    through its inverse CDF.
+    """
+    d = len(dists)
+    if method == "random":
+        unit = np.random.default_rng(seed).random((n, d))
+    elif method == "lhs":
+        unit = qmc.LatinHypercube(d=d, rng=seed).random(n)
+    elif method == "sobol":
+        unit = qmc.Sobol(d=d, rng=seed).random(n)
+    else:
+        raise ValueError(f"Unknown sampling method: {method}")
+
+    return {name: dist.ppf(unit[:, j]) for j, (name, dist) in enumerate(dists.items())}
+
+
+# --- Streaming Percentiles ---
+class P2Quantile:
+    """
+    Online quantile estimator (P² algorithm, Jain and Chlamtac, 1985).
+
+    Five markers track the minimum, the maximum, the desired quantile and two
+    intermediate quantiles. Each new observation only moves the markers, so the
+    memory cost is constant. All operations are vectorized over an array of
+    independent cells, here one cell per state and time point.
+    """
+
+    def __init__(self, p: float, shape: tuple[int, ...]):
+        self.p = p
+        self.count = 0
+        self.q = np.zeros((5, *shape))  # Marker heights
+        self.n = np.zeros((5, *shape))  # Marker positions
+        self.n_desired = np.array([1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5])
+        self.dn_desired = np.array([0, p / 2, p, (1 + p) / 2, 1])
+
+    def update(self, x: np.ndarray):
+        """Add one observation to every cell."""
+        if self.count < 5:
+            self.q[self.count] = x
+            self.count += 1
+            if self.count == 5:
+                self.q.sort(axis=0)
+                self.n[:] = np.arange(1, 6).reshape(-1, *([1] * x.ndim))
+            return
+        self.count += 1
+
+        q, n = self.q, self.n
+        np.minimum(q[0], x, out=q[0])
+        np.maximum(q[4], x, out=q[4])
+
+        # Increment the positions of the markers above the observation
+        k = (x >= q[1]).astype(int) + (x >= q[2]) + (x >= q[3])
+        n += np.arange(5).reshape(-1, *([1] * x.ndim)) > k
+        self.n_desired += self.dn_desired
+
+        # Adjust the three middle markers if they are off their desired position
+        for i in (1, 2, 3):
+            d = self.n_desired[i] - n[i]
+            move = ((d >= 1) & (n[i + 1] - n[i] > 1)) | (
+                (d <= -1) & (n[i - 1] - n[i] < -1)
+            )
+            if not move.any():
+                continue
+            s = np.sign(d)
+
+            # Piecewise-parabolic prediction
+            q_new = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+            )
+            # Linear prediction when the parabola leaves the neighbor markers
+            neighbor_q = np.where(s > 0, q[i + 1], q[i - 1])
+            neighbor_n = np.where(s > 0, n[i + 1], n[i - 1])
+            q_linear = q[i] + s * (neighbor_q - q[i]) / (neighbor_n - n[i])
+            q_new = np.where((q[i - 1] < q_new) & (q_new < q[i + 1]), q_new, q_linear)
+
+            q[i] = np.where(move, q_new, q[i])
+            n[i] = np.where(move, n[i] + s, n[i])
+
+    @property
+    def value(self) -> np.ndarray:
+        if self.count < 5:
+            return np.quantile(self.q[: self.count], self.p, axis=0)
+        return self.q[2]
+
+
+# --- Ensemble Runner ---
+def run_ensemble(
+    model: Callable,
+    y0: np.ndarray,
+    t_eval: np.ndarray,
+    dists: dict[str, stats.rv_continuous],
+    n_samples: int,
+    method: str,
+    percentiles: tuple[float, ...] = (5, 50, 95),
+    threshold: tuple[int, float] | None = None,
+    chunk_size: int = 128,
+) -> tuple[dict[float, np.ndarray], np.ndarray | None]:
+    """
+    Propagate the parameter uncertainty through a batched model.
+
+    The ensemble is integrated in chunks, and each trajectory only updates the
+    streaming estimators before being discarded.
+
+    Parameters:
+    - model: batched model function
+    - y0: initial state, shared by all members
+    - t_eval: output times
+    - dists: distribution of each uncertain parameter
+    - n_samples: ensemble size
+    - method: sampling design (see sample_parameters)
+    - percentiles: percentiles to estimate
+    - threshold: optional (state index, value) whose exceedance probability is tracked
+    - chunk_size: number of members integrated together
+
+    Returns:
+    - Dictionary mapping each percentile to an array of shape (n_states, n_times)
+    - Probability of exceeding the threshold at each time, or None
+    """
+    n_states = len(y0)
+    samples = sample_parameters(dists, n_samples, method)
+    estimators = {
+        pc: P2Quantile(pc / 100, (n_states, t_eval.size)) for pc in percentiles
+    }
+    n_exceed = np.zeros(t_eval.size)
+
+    for start in range(0, n_samples, chunk_size):
+        p = {
+            name: values[start : start + chunk_size] for name, values in samples.items()
+        }
+        n = next(iter(p.values())).size
+
+        sol = solve_ivp(
+            model,
+            [t_eval[0], t_eval[-1]],
+            np.tile(y0, n),
+            method="LSODA",
+            t_eval=t_eval,
+            args=(p,),
+            rtol=1e-6,
+            atol=1e-8,
+            lband=n_states - 1,
+            uband=n_states - 1,
+        )
+        trajectories = sol.y.reshape(n, n_states, t_eval.size)
+        for trajectory in trajectories:
+            for estimator in estimators.values():
+                estimator.update(trajectory)
+        if threshold is not None:
+            n_exceed += np.sum(trajectories[:, threshold[0]] > threshold[1], axis=0)
+
+    bands = {pc: estimator.value for pc, estimator in estimators.items()}
+    return bands, (n_exceed / n_samples if threshold is not None else None)
+
+
+# --- Make simulations ---
+n_samples = 1024  # Power of 2, as required by the Sobol sequence
+T_ignition = zero_Celsius + 100.0  # CSTR temperature considered as ignited [K]
+
+# Model, initial state, output times, distributions and index of the temperature
+cases = {
+    "CSTR with Cooling": (
+        cstr_batch,
+        np.array([1.5, 0.9, zero_Celsius + 25.0, zero_Celsius + 20.0]),
+        np.linspace(0, 60 * 20, 200),
+        cstr_dists,
+        2,
+    ),
+    "Two CSTRs and Separator": (
+        two_cstrs_batch,
+        np.array(
+            [
+                1.0,
+                0.5,
+                1.0,
+                432.4,
+                427.1,
+                432.1,
+                0.536,
+                0.448,
+                0.545,
+                0.438,
+                0.298,
+                0.670,
+            ]
+        ),
+        np.linspace(0, 2.5, 200),
+        reactor_separator_dists,
+        3,
+    ),
+    "Simple Two CSTRs and Separator": (
+        simple_two_cstrs_batch,
+        np.array([432.4, 427.1, 432.1, 0.536, 0.448, 0.545, 0.438, 0.298, 0.670]),
+        np.linspace(0, 2.5, 200),
+        reactor_separator_dists,
+        0,
+    ),
+}
+
+results = {}
+for name, (model, y0, t_eval, dists, i_T) in cases.items():
+    threshold = (i_T, T_ignition) if model is cstr_batch else None
+    for method in ("random", "lhs", "sobol"):
+        start = time.perf_counter()
+        bands, p_exceed = run_ensemble(
+            model, y0, t_eval, dists, n_samples, method, threshold=threshold
+        )
+        elapsed = time.perf_counter() - start
+
+        p5, p50, p95 = (bands[pc][i_T, -1] - zero_Celsius for pc in (5, 50, 95))
+        print(
+            f"{name:30s} {method:6s}: final T [°C] 5%={p5:6.1f} 50%={p50:6.1f} "
+            f"95%={p95:6.1f} ({elapsed:.1f} s)"
+        )
+        if p_exceed is not None:
+            print(f"{'':30s} {'':6s}  ignition probability: {p_exceed[-1]:.1%}")
+    results[name] = (t_eval, bands, p_exceed)  # Sobol results are plotted
+
+# --- Plot results ---
+fig, axs = plt.subplots(3, 2, figsize=(10, 10), constrained_layout=True)
+fig.suptitle(f"Monte Carlo Uncertainty Propagation ({n_samples} Sobol samples)")
+
+panels = {
+    "CSTR with Cooling": ((2, "$T$ / °C", zero_Celsius), None),
+    "Two CSTRs and Separator": ((3, "$T_1$ / °C", zero_Celsius), (9, "$x_{B2}$", 0)),
+    "Simple Two CSTRs and Separator": (
+        (0, "$T_1$ / °C", zero_Celsius),
+        (6, "$x_{B2}$", 0),
+    ),
+}
+for row, (name, row_panels) in enumerate(panels.items()):
+    t_eval, bands, p_exceed = results[name]
+    is_cstr = name == "CSTR with Cooling"
+    t_plot = t_eval / 60 if is_cstr else t_eval
+
+    for col, panel in enumerate(row_panels):
+        ax = axs[row, col]
+        if panel is None:
+            ax.plot(t_plot, 100 * p_exceed, color="tab:red")
+            ax.set_ylabel(f"P(T > {T_ignition - zero_Celsius:.0f} °C) / %")
+        else:
+            i, label, offset = panel
+            ax.fill_between(
+                t_plot,
+                bands[5][i] - offset,
+                bands[95][i] - offset,
+                alpha=0.3,
+                label="5–95% band",
+            )
+            ax.plot(t_plot, bands[50][i] - offset, label="Median")
+            ax.set_ylabel(label)
+            ax.legend()
+        ax.set_title(name)
+        ax.set_xlabel("Time / min" if is_cstr else "Time / h")
+        ax.grid(True)
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -0,0 +1,296 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+# --- Define Model ---
+# The process model is written for a batch: the rows of x are independent
+# copies of the state (linearization points, sigma points, or particles).
+rho: Final = 1000.0  # Density [kg/m³]
+Cp: Final = 4.2  # Heat capacity [kJ/kg·K]
+m: Final = 0.00279  # Molality [kmol/kg]
+R: Final = 8.314  # Universal gas constant [kJ/kmol·K]
+alphaA: Final = 5.0  # Relative volatility of component A [-]
+alphaB: Final = 1.0  # Relative volatility of component B [-]
+alphaC: Final = 0.5  # Relative volatility of component C [-]
+eps: Final = 0.02  # Purge ratio [-]
+xA0: Final = 1.0  # Feed mole fraction of component A [-]
+k1: Final = 2.77e3 * 3600  # Pre-exponential factor, reaction 1 [1/h]
+k2: Final = 2.5e3 * 3600  # Pre-exponential factor, reaction 2 [1/h]
+E1: Final = 5.0e4  # Activation energy, reaction 1 [kJ/kmol]
+E2: Final = 6.0e4  # Activation energy, reaction 2 [kJ/kmol]
+dH1: Final = -6.0e4  # Heat of reaction 1 [kJ/kmol]
+dH2: Final = -7.0e4  # Heat of reaction 2 [kJ/kmol]
+Ff1: Final = 5.04  # Feed flow rate to reactor 1 [m³/h]
+Ff2: Final = 5.04  # Feed flow rate to reactor 2 [m³/h]
+F1: Final = 22.04  # Outlet flow rate from reactor 1 [m³/h]
+F2: Final = 27.08  # Outlet flow rate from reactor 2 [m³/h]
+F3: Final = 9.74  # Product stream flow rate from separator [m³/h]
+FR: Final = 17.0  # Recycle flow rate [m³/h]
+Q1: Final = 715.3e3  # Heat input to reactor 1 [kJ/h]
+Q2: Final = 579.8e3  # Heat input to reactor 2 [kJ/h]
+Q3: Final = 568.7e3  # Heat input to separator [kJ/h]
+
+STATES: Final = ["V1", "V2", "V3", "T1", "T2", "T3"] + [
+    f"x_{{{c}{i}}}" for i in (1, 2, 3) for c in "AB"
+]
+MEASURED: Final = [3, 4, 5]  # Only the temperatures are measured
+
+
+def model(x: np.ndarray, T0: float) -> np.ndarray:
+    """
+    Two CSTRs and a separator, for a batch of states.
+
+    Parameters:
+    - x: states, shape (n_batch, 12)
+    - T0: feed temperature [K]
+    """
+    V1, V2, V3, T1, T2, T3, xA1, xB1, xA2, xB2, xA3, xB3 = x.T
+
+    xC3 = 1 - xA3 - xB3
+    FP = eps * FR
+
+    k11 = k1 * np.exp(-E1 / (R * T1))
+    k21 = k2 * np.exp(-E2 / (R * T1))
+    k12 = k1 * np.exp(-E1 / (R * T2))
+    k22 = k2 * np.exp(-E2 / (R * T2))
+
+    denom = alphaA * xA3 + alphaB * xB3 + alphaC * xC3
+    xAR = alphaA * xA3 / denom
+    xBR = alphaB * xB3 / denom
+
+    dxdt = np.empty_like(x)
+    dxdt[:, 0] = Ff1 + FR - F1
+    dxdt[:, 1] = Ff2 + F1 - F2
+    dxdt[:, 2] = F2 - FP - FR - F3
+    dxdt[:, 3] = (
+        (Ff1 / V1) * (T0 - T1)
+        + (FR / V1) * (T3 - T1)
+        + Q1 / (rho * Cp * V1)
+        - (m / Cp) * (k11 * xA1 * dH1 + k21 * xB1 * dH2)
+    )
+    dxdt[:, 4] = (
+        (Ff2 / V2) * (T0 - T2)
+        + (F1 / V2) * (T1 - T2)
+        + Q2 / (rho * Cp * V2)
+        - (m / Cp) * (k12 * xA2 * dH1 + k22 * xB2 * dH2)
+    )
+    dxdt[:, 5] = (F2 / V3) * (T2 - T3) + Q3 / (rho * Cp * V3)
+    dxdt[:, 6] = (Ff1 / V1) * (xA0 - xA1) + (FR / V1) * (xAR - xA1) - k11 * xA1
+    dxdt[:, 7] = (FR / V1) * (xBR - xB1) - (Ff1 / V1) * xB1 + k11 * xA1 - k21 * xB1
+    dxdt[:, 8] = (Ff2 / V2) * (xA0 - xA2) + (F1 / V2) * (xA1 - xA2) - k12 * xA2
+    dxdt[:, 9] = (F1 / V2) * (xB1 - xB2) - (Ff2 / V2) * xB2 + k12 * xA2 - k22 * xB2
+    dxdt[:, 10] = (F2 / V3) * (xA2 - xA3) - ((FP + FR) / V3) * (xAR - xA3)
+    dxdt[:, 11] = (F2 / V3) * (xB2 - xB3) - ((FP + FR) / V3) * (xBR - xB3)
+    return dxdt
+
+
+# --- State Estimators ---
+# All estimators receive the process model f(x, u) and propagate every copy of
+# the state they need in a single batched call.
+Model = Callable[[np.ndarray, float], np.ndarray]
+
+
+def propagate(f: Model, x: np.ndarray, u: float, dt: float, n_steps: int = 4):
+    """Integrate a batch of states over one sampling period (fixed-step RK4)."""
+    h = dt / n_steps
+    for _ in range(n_steps):
+        k1 = f(x, u)
+        k2 = f(x + h / 2 * k1, u)
+        k3 = f(x + h / 2 * k2, u)
+        k4 = f(x + h * k3, u)
+        x = x + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+    return x
+
+
+def kalman_update(x, P, z, z_pred, S, C):
+    """Kalman correction with innovation covariance S and cross covariance C."""
+    K = np.linalg.solve(S, C.T).T
+    return x + K @ (z - z_pred), P - K @ S @ K.T
+
+
+def ekf_step(f: Model, x, P, z, u, dt, Q, R):
+    """
+    Extended Kalman filter step.
+
+    The Jacobian of the discrete-time transition is obtained by finite
+    differences: the estimate and its n perturbed copies are propagated together
+    in one batch.
+    """
+    n = x.size
+    dx = 1e-6 * np.maximum(np.abs(x), 1.0)
+    X = propagate(f, np.vstack([x, x + np.diag(dx)]), u, dt)
+    F = ((X[1:] - X[0]) / dx[:, None]).T
+
+    x, P = X[0], F @ P @ F.T + Q
+    H = np.eye(n)[MEASURED]
+    return kalman_update(x, P, z, x[MEASURED], H @ P @ H.T + R, P @ H.T)
+
+
+def ukf_step(f: Model, x, P, z, u, dt, Q, R, alpha=1.0, beta=2.0, kappa=0.0):
+    """
+    Unscented Kalman filter step (scaled sigma points).
+
+    The 2n + 1 sigma points are propagated together in one batch.
+    """
+    n = x.size
+    lam = alpha**2 * (n + kappa) - n
+    w_m = np.full(2 * n + 1, 1 / (2 * (n + lam)))
+    w_c = w_m.copy()
+    w_m[0] = lam / (n + lam)
+    w_c[0] = lam / (n + lam) + 1 - alpha**2 + beta
+
+    L = np.linalg.cholesky((n + lam) * P)
+    X = propagate(f, np.vstack([x, x + L.T, x - L.T]), u, dt)
+
+    x = w_m @ X
+    dX = X - x
+    P = (w_c * dX.T) @ dX + Q
+
+    # Measurements are a subset of the states, so the propagated sigma points
+    # are reused
+    Z = X[:, MEASURED]
+    z_pred = w_m @ Z
+    dZ = Z - z_pred
+    S = (w_c * dZ.T) @ dZ + R
+    C = (w_c * dX.T) @ dZ
+    return kalman_update(x, P, z, z_pred, S, C)
+
+
+def pf_step(f: Model, particles, z, u, dt, Q_std, R_std, rng):
+    """
+    Bootstrap particle filter step.
+
+    All particles are propagated in one batch, disturbed by the process noise,
+    and weighted by the likelihood of the measurement. The particles are then
+    resampled (systematic resampling), so they all carry the same weight.
+    """
+    n_particles = particles.shape[0]
+    particles = propagate(f, particles, u, dt)
+    particles += rng.normal(0.0, Q_std, particles.shape)
+
+    log_w = -0.5 * np.sum(((z - particles[:, MEASURED]) / R_std) ** 2, axis=1)
+    w = np.exp(log_w - log_w.max())
+    w /= w.sum()
+    estimate = w @ particles
+
+    positions = (rng.random() + np.arange(n_particles)) / n_particles
+    idx = np.searchsorted(np.cumsum(w), positions)
+    return particles[np.minimum(idx, n_particles - 1)], estimate
+
+
+# --- Simulated Plant ---
+dt: Final = 0.01  # Sampling period [h]
+n_samples: Final = 250  # 2.5 hours
+Q_std: Final = np.r_[np.zeros(3), np.full(3, 0.2), np.full(6, 0.002)]  # Process noise
+R_std: Final = np.full(3, 0.5)  # Temperature sensor noise [K]
+
+x_true0 = np.array(
+    [1.0, 0.5, 1.0, 432.4, 427.1, 432.1, 0.536, 0.448, 0.545, 0.438, 0.298, 0.670]
+)
+t = np.arange(n_samples + 1) * dt
+T0 = np.where(t < 0.2, 359.1, 370.0)  # Feed temperature, known to the filters [K]
+
+rng = np.random.default_rng(seed=42)
+x_true = np.empty((n_samples + 1, 12))
+x_true[0] = x_true0
+for k in range(n_samples):
+    x_true[k + 1] = propagate(model, x_true[k : k + 1], T0[k], dt)[0]
+    x_true[k + 1] += rng.normal(0.0, Q_std)
+z_meas = x_true[:, MEASURED] + rng.normal(0.0, R_std, (n_samples + 1, 3))
+
+# Initial guess: temperatures from the sensors, compositions unknown
+x_hat0 = x_true0.copy()
+x_hat0[MEASURED] = z_meas[0]
+x_hat0[6:] = [0.7, 0.25, 0.7, 0.25, 0.45, 0.5]
+P0_std = np.r_[np.full(3, 1e-3), R_std, np.full(6, 0.15)]
+Q_cov = np.diag(np.maximum(Q_std, 1e-6) ** 2)
+R_cov = np.diag(R_std**2)
+
+
+def run_filter(name: str, n_particles: int = 1000, seed: int = 0):
+    """Run one estimator over the whole record. Returns estimates and wall time."""
+    estimates = np.empty((n_samples + 1, 12))
+    estimates[0] = x_hat0
+    x, P = x_hat0.copy(), np.diag(P0_std**2)
+    rng = np.random.default_rng(seed)
+    particles = x_hat0 + rng.normal(0.0, P0_std, (n_particles, 12))
+
+    start = time.perf_counter()
+    for k in range(n_samples):
+        z = z_meas[k + 1]
+        if name == "EKF":
+            x, P = ekf_step(model, x, P, z, T0[k], dt, Q_cov, R_cov)
+        elif name == "UKF":
+            x, P = ukf_step(model, x, P, z, T0[k], dt, Q_cov, R_cov)
+        else:
+            particles, x = pf_step(model, particles, z, T0[k], dt, Q_std, R_std, rng)
+        estimates[k + 1] = x
+    return estimates, time.perf_counter() - start
+
+
+def composition_rmse(estimates: np.ndarray) -> float:
+    """RMS error of the six mole fractions over the whole record."""
+    return np.sqrt(np.mean((estimates[:, 6:] - x_true[:, 6:]) ** 2))
+
+
+# --- Benchmark ---
+results = {name: run_filter(name) for name in ("EKF", "UKF", "PF")}
+for name, (estimates, wall_time) in results.items():
+    print(
+        f"{name}: {n_samples / wall_time:8.0f} samples/s, "
+        f"composition RMSE {composition_rmse(estimates):.4f}"
+    )
+
+particle_counts = [30, 100, 300, 1000, 3000, 10000]
+throughput, rmse = [], []
+for n_particles in particle_counts:
+    runs = [run_filter("PF", n_particles, seed) for seed in range(2)]
+    throughput.append(2 * n_samples / sum(wall_time for _, wall_time in runs))
+    rmse.append(np.mean([composition_rmse(estimates) for estimates, _ in runs]))
+    print(
+        f"PF, {n_particles:5d} particles: {throughput[-1]:6.0f} samples/s, "
+        f"composition RMSE {rmse[-1]:.4f}"
+    )
+
+# --- Plot results ---
+fig, axs = plt.subplots(2, 2, figsize=(12, 8), constrained_layout=True)
+fig.suptitle("Reactor-Separator System: State Estimation from Temperatures")
+
+for ax, i in zip(axs[0], (STATES.index("x_{B1}"), STATES.index("x_{A3}"))):
+    ax.plot(t, x_true[:, i], "k", lw=2, label="True")
+    for name, (estimates, _) in results.items():
+        ax.plot(t, estimates[:, i], label=name if name != "PF" else "PF (1000)")
+    ax.set_xlabel("Time / h")
+    ax.set_ylabel(f"${STATES[i]}$ (not measured)")
+
+axs[0, 0].set_title("Fraction of B in Reactor 1")
+axs[0, 1].set_title("Fraction of A in the Separator")
+
+axs[1, 0].semilogx(particle_counts, rmse, "o-", label="PF")
+for name, ls in (("EKF", "--"), ("UKF", ":")):
+    axs[1, 0].axhline(composition_rmse(results[name][0]), ls=ls, color="k", label=name)
+axs[1, 0].set_xlabel("Number of particles")
+axs[1, 0].set_ylabel("RMS error of mole fractions")
+axs[1, 0].set_title("Accuracy")
+
+axs[1, 1].loglog(particle_counts, throughput, "o-", label="PF")
+for name, ls in (("EKF", "--"), ("UKF", ":")):
+    axs[1, 1].axhline(n_samples / results[name][1], ls=ls, color="k", label=name)
+axs[1, 1].set_xlabel("Number of particles")
+axs[1, 1].set_ylabel("Throughput / samples$\\cdot$s$^{-1}$")
+axs[1, 1].set_title("Throughput")
+
+for ax in axs.flat:
+    ax.grid(True)
+    ax.legend()
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
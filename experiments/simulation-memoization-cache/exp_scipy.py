@@ -0,0 +1,318 @@
+import hashlib
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import zero_Celsius
+from scipy.integrate import solve_ivp
+
+# --- Define Models ---
+# Mass–spring–damper (same as the damping-effect-analysis experiment)
+m: Final = 1.0  # Mass [kg]
+
+k: Final = 20.0  # Spring stiffness [N/m]
+
+
+def mass_spring_damper(t: float, y: np.ndarray, u: np.ndarray, c: float):
+    x = y[0]  # Displacement [m]
+    v = y[1]  # Velocity [m/s]
+
+    F_ext = u[0]  # External applied force [N]
+
+    dxdt = v
+    dvdt = (F_ext - c * v - k * x) / m
+    return [dxdt, dvdt]
+
+
+# Heated tank (same as the tank/with-heating model)
+rho: Final = 1000.0  # Liquid density (water) [kg/m³]
+cp: Final = 4180.0  # Specific heat capacity (water) [J/(kg·K)]
+rho_j: Final = 958.0  # Condensate density (liquid water at 100°C) [kg/m³]
+lambda_j: Final = 2.256e6  # Latent heat of condensation of water [J/kg]
+A: Final = np.pi * (1.5**2)  # Tank cross-sectional area [m²]
+
+
+def heated_tank(t: float, y: np.ndarray, u: np.ndarray, k_out: float):
+    L = y[0]  # Liquid level [m]
+    T = y[1]  # Liquid temperature [K]
+
+    q_in = u[0]  # Inlet flow rate [m³/s]
+    q_j = u[1]  # Jacket condensate flow [m³/s]
+    T_in = u[2]  # Inlet temperature [K]
+
+    dLdt = (q_in - k_out * np.sqrt(L)) / A
+    dTdt = (rho * q_in * cp * (T_in - T) + rho_j * q_j * lambda_j) / (rho * A * L * cp)
+    return [dLdt, dTdt]
+
+
+MODELS: Final[dict[str, Callable]] = {
+    "mass-spring-damper": mass_spring_damper,
+    "tank-with-heating": heated_tank,
+}
+"""Model registry, the cache key uses the model id instead of the function"""
+
+
+# --- Simulation Cache ---
+def canonical_key(
+    model_id: str,
+    params: dict[str, float],
+    y0: np.ndarray,
+    t_eval: np.ndarray,
+    u_times: np.ndarray,
+    u_values: np.ndarray,
+    method: str,
+    rtol: float,
+    atol: float,
+) -> str:
+    """
+    Build a canonical hash that identifies a simulation request.
+
+    Floats are hashed through their exact binary representation, and parameters
+    are sorted by name, so equal requests always produce the same key.
+
+    Parameters:
+    - model_id: name of the model in the registry
+    - params: model parameters
+    - y0: initial state
+    - t_eval: output times
+    - u_times: switching times of the piecewise-constant input schedule
+    - u_values: input vector held from each switching time, shape (n_switch, n_u)
+    - method: solve_ivp integration method
+    - rtol, atol: solver tolerances
+    """
+    h = hashlib.sha256()
+    h.update(model_id.encode())
+    for name in sorted(params):
+        h.update(name.encode())
+        h.update(float(params[name]).hex().encode())
+    for array in (y0, t_eval, u_times, u_values):
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        h.update(str(array.shape).encode())
+        h.update(array.tobytes())
+    h.update(method.encode())
+    h.update(float(rtol).hex().encode())
+    h.update(float(atol).hex().encode())
+    return h.hexdigest()
+
+
+class SimulationCache:
+    """
+    Two-tier memoization cache for simulated trajectories.
+
+    The memory tier is an LRU dictionary bounded by the total size of the stored
+    arrays. The optional disk tier stores each trajectory as a compressed ``.npz``
+    file named after its key, so it survives between runs.
+    """
+
+    def __init__(self, max_bytes: int, cache_dir: str | Path | None = None):
+        self.max_bytes = max_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: OrderedDict[str, tuple[np.ndarray, np.ndarray]] = OrderedDict()
+        self.n_bytes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: str) -> tuple[np.ndarray, np.ndarray] | None:
+        """Return the cached (t, y) pair, or None when the key is unknown."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return self._entries[key]
+
+        if self.cache_dir is not None:
+            path = self.cache_dir / f"{key}.npz"
+            if path.exists():
+                with np.load(path) as data:
+                    entry = (data["t"], data["y"])
+                for array in entry:
+                    array.flags.writeable = False
+                self._store(key, entry)
+                self.stats["disk_hits"] += 1
+                return entry
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, t: np.ndarray, y: np.ndarray):
+        """Store a trajectory in the memory tier and, if enabled, on disk."""
+        t.flags.writeable = False
+        y.flags.writeable = False
+        self._store(key, (t, y))
+
+        if self.cache_dir is not None:
+            np.savez_compressed(self.cache_dir / f"{key}.npz", t=t, y=y)
+
+    def _store(self, key: str, entry: tuple[np.ndarray, np.ndarray]):
+        size = entry[0].nbytes + entry[1].nbytes
+        if size > self.max_bytes:
+            return  # Too large for the memory tier
+
+        if key in self._entries:
+            self.n_bytes -= sum(a.nbytes for a in self._entries.pop(key))
+        self._entries[key] = entry
+        self.n_bytes += size
+
+        # Evict the least recently used trajectories until the budget is respected
+        while self.n_bytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self.n_bytes -= old[0].nbytes + old[1].nbytes
+            self.stats["evictions"] += 1
+
+
+def simulate(
+    cache: SimulationCache,
+    model_id: str,
+    params: dict[str, float],
+    y0: np.ndarray,
+    t_eval: np.ndarray,
+    u_times: np.ndarray,
+    u_values: np.ndarray,
+    method: str = "RK45",
+    rtol: float = 1e-3,
+    atol: float = 1e-6,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate a registered model, reusing a cached trajectory when available.
+
+    The input is piecewise constant: ``u_values[i]`` is applied from
+    ``u_times[i]`` until the next switching time. Each constant-input segment
+    is integrated separately, so the solver never steps over a discontinuity.
+    The parameters are passed to the model by name, so their order in
+    ``params`` does not matter, as in the cache key.
+
+    Returns:
+    - t: output times
+    - y: states at the output times, shape (n_states, n_times)
+    """
+    y0 = np.asarray(y0, dtype=float)
+    t_eval = np.asarray(t_eval, dtype=float)
+    u_times = np.asarray(u_times, dtype=float)
+    u_values = np.atleast_2d(np.asarray(u_values, dtype=float))
+    if u_times[0] > t_eval[0]:
+        raise ValueError(
+            f"The input schedule starts at t = {u_times[0]}, after the first "
+            f"output time t = {t_eval[0]}"
+        )
+
+    key = canonical_key(
+        model_id, params, y0, t_eval, u_times, u_values, method, rtol, atol
+    )
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    model = MODELS[model_id]
+
+    def rhs(t, y, u):
+        return model(t, y, u, **params)
+
+    y = np.empty((y0.size, t_eval.size))
+    t_bounds = np.append(np.maximum(u_times, t_eval[0]), t_eval[-1])
+    y_start = y0
+    for i in range(u_times.size):
+        t_start, t_end = t_bounds[i], t_bounds[i + 1]
+        if t_end <= t_start:
+            continue
+        mask = (t_eval >= t_start) & (t_eval <= t_end)
+        sol = solve_ivp(
+            rhs,
+            [t_start, t_end],
+            y_start,
+            method=method,
+            t_eval=t_eval[mask],
+            args=(u_values[i],),
+            rtol=rtol,
+            atol=atol,
+            dense_output=True,
+        )
+        y[:, mask] = sol.y
+        y_start = sol.sol(t_end)
+
+    t = t_eval.copy()
+    cache.put(key, t, y)
+    return t, y
+
+
+# --- Benchmark ---
+# Damping grid from the damping-effect-analysis experiment
+zeta_values = np.array([-1.8, -1, -0.2, 0, 0.2, 1, 1.8])
+damping_coeffs = zeta_values * 2 * np.sqrt(k * m)
+t_msd = np.linspace(0, 6, 1000)  # Simulation time [s]
+
+# Step test of the heated tank: inlet flow rises from 0.2 to 0.3 m³/s at t = 500 s
+t_tank = np.linspace(0, 1000, 1000)  # Simulation time [s]
+tank_u_times = np.array([0.0, 500.0])
+tank_u_values = np.array(
+    [[0.2, 0.015, zero_Celsius + 28.0], [0.3, 0.015, zero_Celsius + 28.0]]
+)
+
+
+def run_all_requests(cache: SimulationCache) -> float:
+    """Run the whole request set once and return the mean time per request [s]."""
+    times = []
+    for c in damping_coeffs:
+        start = time.perf_counter()
+        simulate(
+            cache, "mass-spring-damper", {"c": c}, [0.0, 0.0], t_msd, [0.0], [[10.0]]
+        )
+        times.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    simulate(
+        cache,
+        "tank-with-heating",
+        {"k_out": 0.12},
+        [0.5, zero_Celsius + 28.0],
+        t_tank,
+        tank_u_times,
+        tank_u_values,
+    )
+    times.append(time.perf_counter() - start)
+    return float(np.mean(times))
+
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    cache = SimulationCache(max_bytes=16 * 2**20, cache_dir=tmp_dir)
+    t_cold = run_all_requests(cache)  # Every request is simulated
+    t_memory = run_all_requests(cache)  # Every request is served from memory
+
+    # A fresh cache pointing to the same directory only has the disk tier filled
+    disk_cache = SimulationCache(max_bytes=16 * 2**20, cache_dir=tmp_dir)
+    t_disk = run_all_requests(disk_cache)
+
+print(f"Cold (solver):  {1e3 * t_cold:10.3f} ms per request")
+print(f"Disk tier hit:  {1e3 * t_disk:10.3f} ms per request")
+print(f"Memory LRU hit: {1e6 * t_memory:10.3f} µs per request")
+print(f"Cache stats: {cache.stats}")
+
+# A small memory budget forces the LRU tier to evict old trajectories
+small_cache = SimulationCache(max_bytes=3 * 2 * t_msd.size * 8)
+run_all_requests(small_cache)
+print(f"Small cache stats: {small_cache.stats}, stored bytes: {small_cache.n_bytes}")
+
+# --- Plot results ---
+labels = ["Cold (solver)", "Disk tier hit", "Memory LRU hit"]
+mean_times = np.array([t_cold, t_disk, t_memory])
+
+fig, ax = plt.subplots(figsize=(8, 5), constrained_layout=True)
+bars = ax.bar(labels, mean_times, color=["tab:red", "tab:orange", "tab:green"])
+ax.bar_label(bars, labels=[f"{1e6 * t:.1f} µs" for t in mean_times])
+ax.set_yscale("log")
+ax.set_ylabel("Mean time per request / s")
+ax.set_title("Memoized Simulations (damping grid + heated tank step test)")
+ax.grid(True, axis="y")
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -0,0 +1,391 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import gas_constant, zero_Celsius
+from scipy.integrate import solve_ivp
+from scipy.sparse import csc_matrix, csr_matrix
+
+Model = Callable[[float, np.ndarray], np.ndarray]
+
+
+# --- Sparsity Detection ---
+def trace_sparsity(f: Model, t: float, y: np.ndarray) -> csr_matrix:
+    """
+    Sparsity pattern of the Jacobian of f by NaN propagation.
+
+    Each state is set to NaN in turn: the derivatives that become NaN depend on
+    it. The pattern only depends on the structure of the equations, not on the
+    values of the states (n calls to f).
+
+    Parameters:
+    - f: model right-hand side f(t, y)
+    - t: time
+    - y: state vector (any point where f is finite)
+    Returns:
+    - pattern: boolean sparse matrix, shape (n, n)
+    """
+    rows, cols = [], []
+    with np.errstate(invalid="ignore"):
+        for j in range(len(y)):
+            y_j = y.copy()
+            y_j[j] = np.nan
+            (i,) = np.nonzero(np.isnan(f(t, y_j)))
+            rows.append(i)
+            cols.append(np.full(len(i), j))
+    rows, cols = np.concatenate(rows), np.concatenate(cols)
+    return csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)), (len(y),) * 2)
+
+
+def probe_sparsity(
+    f: Model, t: float, y: np.ndarray, n_points: int = 3, scale: float = 0.05
+) -> csr_matrix:
+    """
+    Sparsity pattern of the Jacobian of f by probing.
+
+    Dense finite-difference Jacobians are computed at y and at random points
+    around it, and every entry that is nonzero in any of them is kept
+    (n_points · (n + 1) calls to f).
+
+    Parameters:
+    - f: model right-hand side f(t, y)
+    - t: time
+    - y: state vector
+    - n_points: number of probed points
+    - scale: relative size of the random perturbations around y
+    Returns:
+    - pattern: boolean sparse matrix, shape (n, n)
+    """
+    rng = np.random.default_rng(seed=0)
+    pattern = np.zeros((len(y), len(y)), dtype=bool)
+    for k in range(n_points):
+        y_k = y if k == 0 else y * (1 + scale * rng.uniform(-1, 1, len(y)))
+        pattern |= dense_jacobian(f, t, y_k) != 0
+    return csr_matrix(pattern)
+
+
+def color_columns(pattern: csr_matrix) -> np.ndarray:
+    """
+    Greedy coloring of the columns of a sparsity pattern (largest degree first).
+
+    Two columns that share a nonzero row get different colors, so all the
+    columns of one color can be perturbed together.
+
+    Returns:
+    - colors: color of each column, from 0 to n_colors - 1
+    """
+    S = csc_matrix(pattern, dtype=float)
+    conflicts = csr_matrix(S.T @ S)
+    degree = np.diff(conflicts.indptr)
+    colors = np.full(S.shape[1], -1)
+    for j in np.argsort(-degree, kind="stable"):
+        neighbors = conflicts.indices[conflicts.indptr[j] : conflicts.indptr[j + 1]]
+        used = set(colors[neighbors])
+        color = 0
+        while color in used:
+            color += 1
+        colors[j] = color
+    return colors
+
+
+# --- Finite-Difference Jacobians ---
+def step(y: np.ndarray) -> np.ndarray:
+    return np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(y), 1.0)
+
+
+def dense_jacobian(f: Model, t: float, y: np.ndarray) -> np.ndarray:
+    """Forward-difference Jacobian, one call to f per state."""
+    f0, h = f(t, y), step(y)
+    J = np.empty((len(f0), len(y)))
+    for j in range(len(y)):
+        y_j = y.copy()
+        y_j[j] += h[j]
+        J[:, j] = (f(t, y_j) - f0) / h[j]
+    return J
+
+
+class ColoredJacobian:
+    """
+    Compressed forward-difference Jacobian, one call to f per color.
+
+    The columns of each color are perturbed together. Their nonzeros are in
+    different rows, so each entry of the difference belongs to a single column.
+    An instance is a jac(t, y) callable for the stiff solvers of solve_ivp.
+    """
+
+    def __init__(self, f: Model, pattern: csr_matrix):
+        self.f = f
+        coo = pattern.tocoo()
+        self.rows, self.cols = coo.row, coo.col
+        self.shape = pattern.shape
+        self.colors = color_columns(pattern)
+        self.n_colors = self.colors.max() + 1
+        self.seeds = [np.flatnonzero(self.colors == c) for c in range(self.n_colors)]
+        self.entries = [
+            np.flatnonzero(self.colors[self.cols] == c) for c in range(self.n_colors)
+        ]
+
+    def __call__(self, t: float, y: np.ndarray) -> csc_matrix:
+        f0, h = self.f(t, y), step(y)
+        values = np.empty(len(self.rows))
+        for seed, entries in zip(self.seeds, self.entries):
+            y_c = y.copy()
+            y_c[seed] += h[seed]
+            df = self.f(t, y_c) - f0
+            values[entries] = df[self.rows[entries]] / h[self.cols[entries]]
+        return csc_matrix((values, (self.rows, self.cols)), self.shape)
+
+
+# --- Reactor-Separator Network ---
+# The two-CSTRs-and-separator model of the library (time in hours)
+rho: Final = 1000.0  # Fluid density [kg/m³]
+Cp: Final = 4.2  # Heat capacity [kJ/kg·K]
+m: Final = 0.00279  # Molality [kmol/kg]
+R_n: Final = 8.314  # Universal gas constant [kJ/kmol·K]
+k1: Final = 2.77e3 * 3600  # Pre-exponential factor for reaction A -> B [1/h]
+k2: Final = 2.5e3 * 3600  # Pre-exponential factor for reaction B -> C [1/h]
+E1: Final = 5.0e4  # Activation energy for reaction A -> B [kJ/kmol]
+E2: Final = 6.0e4  # Activation energy for reaction B -> C [kJ/kmol]
+dH1: Final = -6.0e4  # Heat of reaction A -> B [kJ/kmol]
+dH2: Final = -7.0e4  # Heat of reaction B -> C [kJ/kmol]
+alphaA: Final = 5.0  # Relative volatility of component A [-]
+alphaB: Final = 1.0  # Relative volatility of component B [-]
+alphaC: Final = 0.5  # Relative volatility of component C [-]
+eps: Final = 0.02  # Purge ratio [-]
+xA0: Final = 1.0  # Feed mole fraction of component A [-]
+# Inputs: Ff1, Ff2, F1, F2, F3, FR [m³/h], Q1, Q2, Q3 [kJ/h], T0 [K]
+u_network: Final = (
+    5.04,
+    5.04,
+    22.04,
+    27.08,
+    9.74,
+    17.0,
+    715.3e3,
+    579.8e3,
+    568.7e3,
+    370.0,
+)
+y0_network: Final = np.array(
+    [1.0, 0.5, 1.0, 432.4, 427.1, 432.1, 0.536, 0.448, 0.545, 0.438, 0.298, 0.670]
+)
+
+
+def network(t: float, y: np.ndarray) -> np.ndarray:
+    V1, V2, V3, T1, T2, T3, xA1, xB1, xA2, xB2, xA3, xB3 = y
+    Ff1, Ff2, F1, F2, F3, FR, Q1, Q2, Q3, T0 = u_network
+
+    xC3 = 1 - xA3 - xB3
+    FP = eps * FR
+
+    k11 = k1 * np.exp(-E1 / (R_n * T1))
+    k21 = k2 * np.exp(-E2 / (R_n * T1))
+    k12 = k1 * np.exp(-E1 / (R_n * T2))
+    k22 = k2 * np.exp(-E2 / (R_n * T2))
+
+    denom = alphaA * xA3 + alphaB * xB3 + alphaC * xC3
+    xAR = alphaA * xA3 / denom
+    xBR = alphaB * xB3 / denom
+
+    return np.array(
+        [
+            Ff1 + FR - F1,
+            Ff2 + F1 - F2,
+            F2 - FP - FR - F3,
+            (Ff1 / V1) * (T0 - T1)
+            + (FR / V1) * (T3 - T1)
+            + Q1 / (rho * Cp * V1)
+            - (m / Cp) * (k11 * xA1 * dH1 + k21 * xB1 * dH2),
+            (Ff2 / V2) * (T0 - T2)
+            + (F1 / V2) * (T1 - T2)
+            + Q2 / (rho * Cp * V2)
+            - (m / Cp) * (k12 * xA2 * dH1 + k22 * xB2 * dH2),
+            (F2 / V3) * (T2 - T3) + Q3 / (rho * Cp * V3),
+            (Ff1 / V1) * (xA0 - xA1) + (FR / V1) * (xAR - xA1) - k11 * xA1,
+            (FR / V1) * (xBR - xB1) - (Ff1 / V1) * xB1 + k11 * xA1 - k21 * xB1,
+            (Ff2 / V2) * (xA0 - xA2) + (F1 / V2) * (xA1 - xA2) - k12 * xA2,
+            (F1 / V2) * (xB1 - xB2) - (Ff2 / V2) * xB2 + k12 * xA2 - k22 * xB2,
+            (F2 / V3) * (xA2 - xA3) - ((FP + FR) / V3) * (xAR - xA3),
+            (F2 / V3) * (xB2 - xB3) - ((FP + FR) / V3) * (xBR - xB3),
+        ]
+    )
+
+
+# --- Cascade of Cooled CSTRs ---
+# N copies of the CSTR-with-cooling model in series. The process stream flows
+# from reactor 1 to reactor N, and the coolant flows through the jackets in the
+# opposite direction (countercurrent).
+rho_r: Final = 1000.0  # Reactor fluid density [kg/m³]
+cp_r: Final = 239.0  # Reactor fluid heat capacity [J/(kg·K)]
+rho_c: Final = 1000.0  # Coolant density [kg/m³]
+cp_c: Final = 4180.0  # Coolant heat capacity [J/(kg·K)]
+k0: Final = 1.2e9  # Pre-exponential factor [1/s]
+E: Final = 8.75e3 * gas_constant  # Activation energy [J/mol]
+delta_Hr: Final = -5.0e7  # Reaction enthalpy [J/mol]
+U: Final = 915.6  # Overall heat transfer coefficient [W/(m²·K)]
+A: Final = 2.7520  # Heat transfer area [m²]
+V_c: Final = 0.55  # Cooling jacket volume [m³]
+q: Final = 0.1  # Process flow rate [m³/s]
+C_A1: Final = 1.0  # Feed concentration of A [mol/m³]
+T1: Final = zero_Celsius + 50.0  # Feed temperature [K]
+q_c: Final = 0.005  # Coolant flow rate [m³/s]
+T_c0: Final = zero_Celsius + 20.0  # Coolant inlet temperature [K]
+
+
+def cascade(t: float, y: np.ndarray) -> np.ndarray:
+    """States [V, C_A, T, T_c] of each reactor, stacked reactor after reactor."""
+    V, C_A, T, T_c = y.reshape(-1, 4).T
+    C_in = np.r_[C_A1, C_A[:-1]]
+    T_in = np.r_[T1, T[:-1]]
+    T_c_in = np.r_[T_c[1:], T_c0]
+
+    Gamma = k0 * np.exp(-E / (gas_constant * T)) * C_A
+    Q = U * A * (T_c - T)
+
+    dydt = np.empty((len(V), 4))
+    dydt[:, 0] = q - q
+    dydt[:, 1] = ((C_in - C_A) * q - Gamma * V) / V
+    dydt[:, 2] = (rho_r * q * cp_r * (T_in - T) + (-delta_Hr) * Gamma * V + Q) / (
+        rho_r * V * cp_r
+    )
+    dydt[:, 3] = (rho_c * q_c * cp_c * (T_c_in - T_c) - Q) / (rho_c * V_c * cp_c)
+    return dydt.ravel()
+
+
+def cascade_initial_state(n: int) -> np.ndarray:
+    return np.tile([1.5, 0.9, zero_Celsius + 25.0, zero_Celsius + 20.0], n)
+
+
+# --- Sparsity Patterns ---
+def counted(f: Model) -> Model:
+    """Wrap f to count its calls."""
+
+    def wrapper(t, y):
+        wrapper.calls += 1
+        return f(t, y)
+
+    wrapper.calls = 0
+    return wrapper
+
+
+n_small: Final = 10  # Reactors in the cascade shown in the plot
+cases = {
+    "Reactor-separator network": (network, y0_network),
+    f"Cascade of {n_small} CSTRs": (cascade, cascade_initial_state(n_small)),
+}
+patterns, colorings = {}, {}
+print(f"{'Model':<26} {'States':>6} {'Traced':>7} {'Probed':>7} {'Colors':>7}")
+for name, (f, y0) in cases.items():
+    traced = trace_sparsity(f, 0.0, y0)
+    probed = probe_sparsity(f, 0.0, y0)
+    patterns[name], colorings[name] = traced, color_columns(traced)
+    print(
+        f"{name:<26} {len(y0):>6} {traced.nnz:>7} {probed.nnz:>7} "
+        f"{colorings[name].max() + 1:>7}"
+    )
+
+# Probing only sees the entries that are nonzero at the probed points: with
+# empty reactors (C_A = 0), the reaction rate does not change with temperature
+y_empty = cascade_initial_state(n_small)
+y_empty[1::4] = 0.0
+missed = (
+    patterns[f"Cascade of {n_small} CSTRs"] > probe_sparsity(cascade, 0.0, y_empty)
+).nnz
+print(f"Entries missed by probing with empty reactors: {missed}")
+
+# --- Compressed Finite Differences ---
+y0_check = cascade_initial_state(100)
+colored = ColoredJacobian(cascade, trace_sparsity(cascade, 0.0, y0_check))
+J_dense = dense_jacobian(cascade, 0.0, y0_check)
+J_colored = colored(0.0, y0_check).toarray()
+jac_error = np.abs(J_colored - J_dense).max() / np.abs(J_dense).max()
+print(f"\nColored vs dense Jacobian, 400 states: relative difference {jac_error:.1e}")
+
+# --- Stiff Solves ---
+t_span: Final = (0.0, 1200.0)  # Simulation time [s]
+n_reactors: Final = [10, 30, 100, 300]
+n_dense_max: Final = 100  # Largest cascade solved with dense Jacobians
+variants: Final = ["Dense", "jac_sparsity", "Colored jac"]
+results = {v: {"n": [], "time": [], "calls": [], "calls_jac": []} for v in variants}
+
+print(f"\n{'States':>6} {'Variant':<13} {'Jacobians':>9} {'RHS calls':>10} {'Time':>8}")
+for n in n_reactors:
+    y0 = cascade_initial_state(n)
+    start = time.perf_counter()
+    pattern = trace_sparsity(cascade, 0.0, y0)
+    jac = ColoredJacobian(counted(cascade), pattern)
+    setup = time.perf_counter() - start
+
+    for variant in variants:
+        if variant == "Dense" and n > n_dense_max:
+            continue
+        f = counted(cascade)
+        options = {
+            "Dense": {},
+            "jac_sparsity": {"jac_sparsity": pattern},
+            "Colored jac": {"jac": jac},
+        }[variant]
+        jac.f.calls = 0
+        start = time.perf_counter()
+        sol = solve_ivp(f, t_span, y0, method="BDF", rtol=1e-6, atol=1e-8, **options)
+        elapsed = time.perf_counter() - start
+        if variant == "Colored jac":
+            elapsed += setup
+        calls = f.calls + jac.f.calls
+        r = results[variant]
+        r["n"].append(4 * n)
+        r["time"].append(elapsed)
+        r["calls"].append(calls)
+        r["calls_jac"].append((calls - sol.nfev) / sol.njev)
+        print(
+            f"{4 * n:>6} {variant:<13} {sol.njev:>9} {calls:>10} {elapsed:>7.2f}s"
+            f"  ({r['calls_jac'][-1]:.0f} calls per Jacobian)"
+        )
+    print(f"{'':>6} {jac.n_colors} colors, detection and coloring {setup * 1e3:.0f} ms")
+
+# --- Plot Results ---
+fig, axs = plt.subplots(2, 2, figsize=(12, 10), constrained_layout=True)
+fig.suptitle("Sparse Jacobians: Pattern Detection and Colored Finite Differences")
+
+for ax, name in zip(axs[0], patterns):
+    coo = patterns[name].tocoo()
+    colors = colorings[name]
+    ax.scatter(coo.col, coo.row, c=colors[coo.col], cmap="tab10", vmin=0, vmax=9, s=30)
+    ax.set_xlim(-0.5, patterns[name].shape[1] - 0.5)
+    ax.set_ylim(patterns[name].shape[0] - 0.5, -0.5)
+    ax.set_aspect("equal")
+    ax.set_title(f"{name}: {colors.max() + 1} colors")
+    ax.set_xlabel("State (column)")
+    ax.set_ylabel("Derivative (row)")
+
+ax = axs[1, 0]
+n_all = np.array(results["jac_sparsity"]["n"])
+ax.loglog(n_all, n_all + 1, "k--", label="Dense (n + 1)")
+for variant, marker in zip(variants, "s^o"):
+    r = results[variant]
+    ax.loglog(r["n"], r["calls_jac"], marker=marker, label=variant)
+ax.set_title("RHS calls per Jacobian")
+ax.set_xlabel("Number of states")
+ax.set_ylabel("RHS calls")
+ax.legend()
+ax.grid(which="both", alpha=0.3)
+
+ax = axs[1, 1]
+for variant, marker in zip(variants, "s^o"):
+    r = results[variant]
+    ax.loglog(r["n"], r["time"], marker=marker, label=variant)
+ax.set_title("BDF solve time, cascade of cooled CSTRs")
+ax.set_xlabel("Number of states")
+ax.set_ylabel("Time / s")
+ax.legend()
+ax.grid(which="both", alpha=0.3)
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -0,0 +1,347 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import g
+from scipy.integrate import solve_ivp
+
+t_end: Final = 1000.0
+"""Length of the long runs [s]"""
+
+
+# --- Separable Models ---
+class SeparableModel:
+    """
+    Mechanical system with a separable Hamiltonian and optional linear damping:
+
+        dq/dt = p / M
+        dp/dt = F(q) - (c / M) * p,    F(q) = -dV/dq
+
+    All the methods accept arrays of states, so a batch of initial conditions is
+    advanced with one call. The number of calls to the force is counted.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        M: float,
+        potential: Callable,
+        force: Callable,
+        c: float = 0.0,
+    ):
+        self.name, self.M, self.c = name, M, c
+        self._potential, self._force = potential, force
+        self.n_force = 0
+
+    def force(self, q: np.ndarray) -> np.ndarray:
+        self.n_force += 1
+        return self._force(q)
+
+    def energy(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """Total energy, kinetic plus potential"""
+        return p**2 / (2 * self.M) + self._potential(q)
+
+    def rhs(self, t: float, y: np.ndarray) -> np.ndarray:
+        """First-order form for solve_ivp, with y = [q, p] (stacked for a batch)"""
+        q, p = np.split(y, 2)
+        return np.concatenate([p / self.M, self.force(q) - (self.c / self.M) * p])
+
+
+def simple_pendulum(L: float = 1.0) -> SeparableModel:
+    """Simple pendulum, with q = theta [rad] and p = omega [rad/s] (unit inertia)"""
+    return SeparableModel(
+        "Simple pendulum",
+        M=1.0,
+        potential=lambda q: (g / L) * (1 - np.cos(q)),
+        force=lambda q: -(g / L) * np.sin(q),
+    )
+
+
+def physical_pendulum(m: float = 1.0, L: float = 0.5, k: float = 0.3):
+    """Physical pendulum, with q = theta [rad] and p = J * omega [kg·m²/s]"""
+    return SeparableModel(
+        "Physical pendulum",
+        M=(1 / 3) * m * (2 * L) ** 2,
+        potential=lambda q: m * g * L * (1 - np.cos(q)),
+        force=lambda q: -m * g * L * np.sin(q),
+        c=k,
+    )
+
+
+def duffing(alpha: float = 1.0) -> SeparableModel:
+    """Unforced Duffing oscillator, with q = x [m] and p = v [m/s] (unit mass)"""
+    return SeparableModel(
+        "Duffing oscillator",
+        M=1.0,
+        potential=lambda q: alpha * q**2 / 2 + q**4 / 4,
+        force=lambda q: -alpha * q - q**3,
+    )
+
+
+# --- Geometric Integrators ---
+def stormer_verlet(model: SeparableModel, q, p, h: float):
+    """
+    One step of the Störmer–Verlet method (kick, drift, kick), of order 2.
+
+    The damping is solved exactly in two half steps around the conservative
+    step (conformal symplectic splitting), so the method stays symmetric.
+    """
+    decay = np.exp(-(model.c / model.M) * h / 2)
+    p = p * decay
+    p = p + (h / 2) * model.force(q)
+    q = q + h * p / model.M
+    p = p + (h / 2) * model.force(q)
+    return q, p * decay
+
+
+yoshida_weights: Final = np.array([1, -(2 ** (1 / 3)), 1]) / (2 - 2 ** (1 / 3))
+"""Step fractions of the three Störmer–Verlet substeps of the Yoshida method"""
+
+
+def yoshida4(model: SeparableModel, q, p, h: float):
+    """
+    One step of the fourth-order Yoshida method: three Störmer–Verlet substeps,
+    the middle one backwards in time, which cancel the third-order error.
+    """
+    for w in yoshida_weights:
+        q, p = stormer_verlet(model, q, p, w * h)
+    return q, p
+
+
+def implicit_midpoint(model: SeparableModel, q, p, h: float, tol: float = 1e-13):
+    """
+    One step of the implicit midpoint rule, of order 2:
+
+        y1 = y0 + h * f((y0 + y1) / 2)
+
+    The implicit equation is solved by fixed-point iteration, for the whole
+    batch at once, until the update is below tol.
+    """
+    q1, p1 = q, p
+    for _ in range(50):
+        q_m, p_m = (q + q1) / 2, (p + p1) / 2
+        q_new = q + h * p_m / model.M
+        p_new = p + h * (model.force(q_m) - (model.c / model.M) * p_m)
+        change = max(np.max(np.abs(q_new - q1)), np.max(np.abs(p_new - p1)))
+        q1, p1 = q_new, p_new
+        if change < tol * (1 + np.max(np.abs(q1)) + np.max(np.abs(p1))):
+            return q1, p1
+    raise RuntimeError("The implicit midpoint iteration did not converge")
+
+
+def integrate(step: Callable, model: SeparableModel, q0, p0, h: float, t_end: float):
+    """
+    Integrate a batch of initial conditions with a fixed step size.
+
+    Parameters:
+    - step: one-step method, step(model, q, p, h)
+    - model: separable model
+    - q0, p0: initial positions and momenta (arrays of the same shape)
+    - h: step size
+    - t_end: final time (rounded to a whole number of steps)
+
+    Returns:
+    - Times, and positions and momenta at each step, of shape (n_steps + 1, ...)
+    """
+    n_steps = round(t_end / h)
+    q, p = np.asarray(q0, dtype=float), np.asarray(p0, dtype=float)
+    qs, ps = np.empty((n_steps + 1, *q.shape)), np.empty((n_steps + 1, *q.shape))
+    qs[0], ps[0] = q, p
+    for i in range(n_steps):
+        q, p = step(model, q, p, h)
+        qs[i + 1], ps[i + 1] = q, p
+    return np.arange(n_steps + 1) * h, qs, ps
+
+
+def integrate_rk(model: SeparableModel, q0, p0, t_end: float, **options):
+    """Integrate a batch of initial conditions with solve_ivp (shared steps)"""
+    q0, p0 = np.atleast_1d(q0).astype(float), np.atleast_1d(p0).astype(float)
+    sol = solve_ivp(model.rhs, (0, t_end), np.concatenate([q0, p0]), **options)
+    qs, ps = np.split(sol.y.T, 2, axis=1)
+    return sol.t, qs, ps
+
+
+methods = {
+    "Störmer–Verlet": (stormer_verlet, 0.05),
+    "Yoshida 4": (yoshida4, 0.1),
+    "Implicit midpoint": (implicit_midpoint, 0.05),
+}
+"""Geometric integrators, with the step size [s] used in the long runs"""
+
+colors = {
+    "RK45, rtol=1e-3": "tab:red",
+    "RK45, rtol=1e-6": "tab:orange",
+    "RK45, rtol=1e-9": "tab:brown",
+    "Störmer–Verlet": "tab:blue",
+    "Yoshida 4": "tab:green",
+    "Implicit midpoint": "tab:purple",
+}
+
+
+def run(name: str, model: SeparableModel, q0, p0, t_end: float):
+    """Run a method by name, and return (t, q, p, force calls, time)"""
+    model.n_force = 0
+    t_start = time.perf_counter()
+    if name.startswith("RK45"):
+        rtol = float(name.split("=")[1])
+        t, qs, ps = integrate_rk(model, q0, p0, t_end, rtol=rtol, atol=rtol * 1e-3)
+    else:
+        step, h = methods[name]
+        t, qs, ps = integrate(step, model, q0, p0, h, t_end)
+    return t, qs, ps, model.n_force, time.perf_counter() - t_start
+
+
+def energy_error(model: SeparableModel, qs, ps) -> np.ndarray:
+    """Relative energy error at each step, for each initial condition"""
+    E = model.energy(qs, ps)
+    return np.abs(E - E[0]) / np.abs(E[0])
+
+
+# --- Long Run: Simple Pendulum ---
+pendulum = simple_pendulum()
+theta0 = np.deg2rad(60.0)
+ref = solve_ivp(
+    pendulum.rhs, (0, t_end), [theta0, 0.0], method="DOP853", rtol=1e-13, atol=1e-13
+)
+theta_ref = ref.y[0, -1]
+
+print(f"Simple pendulum, theta0 = 60 deg, {t_end:.0f} s (about 480 periods)")
+print(
+    f"{'Method':>20}{'Force calls':>13}{'Time / s':>10}"
+    f"{'Max energy error':>18}{'Final angle error / deg':>25}"
+)
+long_runs = {}
+for name in colors:
+    t, qs, ps, n_force, elapsed = run(name, pendulum, theta0, 0.0, t_end)
+    dE = energy_error(pendulum, qs, ps).ravel()
+    long_runs[name] = t, dE
+    angle_error = np.rad2deg(abs(qs[-1].item() - theta_ref))
+    print(
+        f"{name:>20}{n_force:>13}{elapsed:>10.2f}{dE.max():>18.1e}{angle_error:>25.2f}"
+    )
+
+# --- Batch: Initial Angles up to the Separatrix ---
+angles = np.deg2rad(np.linspace(5, 175, 64))
+print(f"\nSimple pendulum, batch of {angles.size} initial angles, 5 to 175 deg")
+print(f"{'Method':>20}{'Force calls':>13}{'Time / s':>10}{'Max energy error':>18}")
+batch_errors = {}
+for name in colors:
+    t, qs, ps, n_force, elapsed = run(name, pendulum, angles, 0 * angles, t_end)
+    dE = energy_error(pendulum, qs, ps)
+    batch_errors[name] = dE.max(axis=0)
+    print(f"{name:>20}{n_force:>13}{elapsed:>10.2f}{dE.max():>18.1e}")
+
+# Looping over the initial conditions instead of batching them
+t_start = time.perf_counter()
+for angle in angles:
+    integrate(stormer_verlet, pendulum, angle, 0.0, methods["Störmer–Verlet"][1], t_end)
+print(
+    f"Störmer–Verlet, one initial condition at a time: "
+    f"{time.perf_counter() - t_start:.2f} s"
+)
+
+# --- Work-Precision: Duffing Oscillator ---
+oscillator = duffing()
+x0 = 1.0
+print(f"\nDuffing oscillator, x0 = {x0} m, {t_end:.0f} s: max energy error")
+work = {}
+for name in colors:
+    if name.startswith("RK45"):
+        continue
+    step, _ = methods[name]
+    work[name] = []
+    for h in [0.4, 0.2, 0.1, 0.05]:
+        oscillator.n_force = 0
+        _, qs, ps = integrate(step, oscillator, x0, 0.0, h, t_end)
+        dE = energy_error(oscillator, qs, ps).max()
+        work[name].append((oscillator.n_force, dE))
+        print(f"{name:>20}, h = {h:<5}: {oscillator.n_force:>8} force calls, {dE:.1e}")
+for method in ["RK45", "DOP853"]:
+    work[method] = []
+    for rtol in [1e-3, 1e-5, 1e-7, 1e-9]:
+        oscillator.n_force = 0
+        _, qs, ps = integrate_rk(
+            oscillator, x0, 0.0, t_end, method=method, rtol=rtol, atol=rtol * 1e-3
+        )
+        dE = energy_error(oscillator, qs, ps).max()
+        work[method].append((oscillator.n_force, dE))
+        print(
+            f"{method:>20}, rtol = {rtol:.0e}: {oscillator.n_force:>8} calls, {dE:.1e}"
+        )
+
+# --- Weak Damping: Physical Pendulum ---
+rod = physical_pendulum()
+t_damped = 30.0
+ref = solve_ivp(
+    rod.rhs,
+    (0, t_damped),
+    [theta0, 0.0],
+    method="DOP853",
+    rtol=1e-13,
+    atol=1e-16,
+    dense_output=True,
+)
+print(f"\nPhysical pendulum (k = {rod.c} N·m·s/rad), theta0 = 60 deg, {t_damped:.0f} s")
+damped = {}
+for name in colors:
+    t, qs, ps, n_force, _ = run(name, rod, theta0, 0.0, t_damped)
+    E_ref = rod.energy(*ref.sol(t))
+    damped[name] = t, np.abs(rod.energy(qs, ps).ravel() / E_ref - 1)
+    print(
+        f"{name:>20}: {n_force:>6} force calls, max energy error relative to the "
+        f"reference {damped[name][1].max():.1e}"
+    )
+
+# --- Plot Results ---
+fig, axs = plt.subplots(2, 2, figsize=(13, 10), constrained_layout=True)
+fig.suptitle("Geometric Integrators for Long Pendulum and Oscillator Runs")
+
+ax = axs[0, 0]
+for name, (t, dE) in long_runs.items():
+    ax.loglog(t[1:], np.maximum.accumulate(dE)[1:], color=colors[name], label=name)
+ax.set_xlim(0.1, t_end)
+ax.set_title("Simple pendulum, $\\theta_0 = 60°$")
+ax.set_xlabel("Time / s")
+ax.set_ylabel("Max relative energy error up to t")
+ax.grid(True, which="both", alpha=0.3)
+ax.legend()
+
+ax = axs[0, 1]
+for name, dE in batch_errors.items():
+    ax.semilogy(np.rad2deg(angles), dE, "o-", color=colors[name], label=name, ms=3)
+ax.set_title(f"Simple pendulum, batch of {angles.size} initial angles, {t_end:.0f} s")
+ax.set_xlabel("Initial angle / deg")
+ax.set_ylabel("Max relative energy error")
+ax.grid(True, which="both", alpha=0.3)
+ax.legend()
+
+ax = axs[1, 0]
+markers = {"RK45": "s--", "DOP853": "^--"}
+for name, points in work.items():
+    n_force, dE = zip(*points, strict=True)
+    color = colors.get(name, "tab:red" if name == "RK45" else "tab:gray")
+    ax.loglog(n_force, dE, markers.get(name, "o-"), color=color, label=name)
+ax.set_title(f"Duffing oscillator, $x_0 = {x0:g}$ m, {t_end:.0f} s")
+ax.set_xlabel("Calls to the force")
+ax.set_ylabel("Max relative energy error")
+ax.grid(True, which="both", alpha=0.3)
+ax.legend()
+
+ax = axs[1, 1]
+for name, (t, dE) in damped.items():
+    ax.semilogy(t[1:], dE[1:], color=colors[name], label=name, lw=0.8)
+ax.set_title("Physical pendulum with damping, $\\theta_0 = 60°$")
+ax.set_xlabel("Time / s")
+ax.set_ylabel("Energy error, relative to the reference energy")
+ax.grid(True, which="both", alpha=0.3)
+ax.legend()
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
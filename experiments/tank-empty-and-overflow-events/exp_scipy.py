@@ -0,0 +1,349 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import g
+from scipy.integrate import solve_ivp
+
+rtol: Final = 1e-6
+atol: Final = 1e-9
+
+t_interval: Final = 300.0
+"""Time between changes of the inlet flow [s]"""
+
+n_intervals: Final = 48
+"""Number of inlet flow changes (4 hours)"""
+
+max_nfev: Final = 200_000
+"""Number of calls to the model after which a run is considered stalled"""
+
+
+# --- Tanks ---
+def smooth_sqrt(x, x_eps: float):
+    """Square root of x, with a bounded slope 1/sqrt(x_eps) at zero, and odd."""
+    return x / (x**2 + x_eps**2) ** 0.25
+
+
+def exact_sqrt(x, x_eps: float):
+    """Square root of x, NaN for x < 0."""
+    with np.errstate(invalid="ignore"):
+        return np.sqrt(x)
+
+
+class Tank:
+    """
+    Tank whose level h follows dh/dt = (q_in - q_out(h)) / area(h).
+
+    The level is held at h_lo (empty) or h_hi (full) while the flows push it out
+    of the tank.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        area: Callable,
+        q_out: Callable,
+        h_lo: float,
+        h_hi: float,
+        h0: float,
+        flows: tuple,
+    ):
+        self.name, self.area, self.q_out = name, area, q_out
+        self.h_lo, self.h_hi, self.h0, self.flows = h_lo, h_hi, h0, flows
+
+
+h_min: Final = 1e-2
+"""Level below which a tank is considered empty [m]"""
+
+# Cubic tank with gravity-driven outlet
+L: Final = 4.0
+A_p: Final = np.pi * 0.1**2
+alpha: Final = A_p * np.sqrt(1000.0 * g * A_p / 1.0)
+
+
+def cubic(sqrt: Callable, h_eps: float = 1e-3) -> Tank:
+    return Tank(
+        "Cubic tank",
+        area=lambda h: L**2,
+        q_out=lambda h: alpha * sqrt(h, h_eps),
+        h_lo=h_min,
+        h_hi=L,
+        h0=0.1,
+        flows=(0.0, 0.6, 1.5),
+    )
+
+
+# Conical tank with gravity-driven outlet
+H: Final = 4.0
+R: Final = 1.5
+k: Final = 0.8
+
+
+def conical(sqrt: Callable, h_eps: float = 1e-3) -> Tank:
+    smooth = sqrt is smooth_sqrt
+    return Tank(
+        "Conical tank",
+        area=lambda h: np.pi * R**2 * (h**2 + smooth * h_eps**2) / H**2,
+        q_out=lambda h: k * sqrt(h, h_eps),
+        h_lo=h_min,
+        h_hi=H,
+        h0=0.5,
+        flows=(0.0, 0.8, 1.8),
+    )
+
+
+# Cubic tank with pumped inlet and outlet
+def pumped() -> Tank:
+    return Tank(
+        "Pumped tank",
+        area=lambda h: L**2,
+        q_out=lambda h: 0.5,
+        h_lo=0.0,
+        h_hi=L,
+        h0=2.0,
+        flows=(0.0, 0.3, 0.9),
+    )
+
+
+# --- Simulation ---
+class Stalled(Exception):
+    """Raised when a run exceeds max_nfev calls to the model."""
+
+
+def simulate(
+    tank: Tank,
+    q_in: np.ndarray,
+    events: bool,
+    method: str = "RK45",
+    budget: int = max_nfev,
+    **options,
+):
+    """
+    Simulate the tank with a piecewise constant inlet flow.
+
+    The solver restarts at each change of the inlet flow. With events, it also
+    stops when the level reaches a limit, and holds it there until the flows
+    move it away.
+
+    Parameters:
+    - tank: simulated tank
+    - q_in: inlet flow in each interval of t_interval [m³/s]
+    - events: whether to enforce the limits of the tank with events
+    - method, options: solver and options passed to solve_ivp
+    - budget: number of calls to the model after which the run is stopped
+
+    Returns:
+    - Dictionary with the segments, the number of calls (and of calls that
+      returned NaN), steps and events, and the time reached
+    """
+    nfev, n_nan = 0, 0
+
+    def flow(t, y, q):
+        nonlocal nfev, n_nan
+        nfev += 1
+        if nfev > budget:
+            raise Stalled
+        dhdt = (q - tank.q_out(y[0])) / tank.area(y[0])
+        n_nan += np.isnan(dhdt)
+        return [dhdt]
+
+    def held(t, y, q):
+        nonlocal nfev
+        nfev += 1
+        return [0.0]
+
+    def empty(t, y, q):
+        return y[0] - tank.h_lo
+
+    def full(t, y, q):
+        return y[0] - tank.h_hi
+
+    def leave(t, y, q):
+        dq = q - tank.q_out(limit)
+        return dq if limit == tank.h_lo else -dq
+
+    empty.terminal, empty.direction = True, -1
+    full.terminal, full.direction = True, 1
+    leave.terminal, leave.direction = True, 1
+
+    limit, t_now, y_now = None, 0.0, np.array([tank.h0])
+    segments, n_events, status = [], 0, "completed"
+    try:
+        for i, q in enumerate(q_in):
+            t_end = (i + 1) * t_interval
+            if limit is not None and leave(t_now, y_now, q) > 0:
+                limit = None
+            while t_now < t_end:
+                if limit is None:
+                    rhs, limit_events, first_step = flow, [empty, full], None
+                else:  # Nothing changes until the next inlet flow: one step
+                    rhs, limit_events, first_step = held, leave, t_end - t_now
+                sol = solve_ivp(
+                    rhs,
+                    [t_now, t_end],
+                    y_now,
+                    method=method,
+                    args=(q,),
+                    events=limit_events if events else None,
+                    first_step=first_step,
+                    dense_output=True,
+                    **options,
+                )
+                if len(sol.t) > 1:
+                    segments.append(sol)
+                t_now, y_now = sol.t[-1], sol.y[:, -1].copy()
+                if sol.status == -1:
+                    raise Stalled
+                if sol.status == 1:
+                    n_events += 1
+                    if limit is None:
+                        limit = tank.h_hi if len(sol.t_events[-1]) else tank.h_lo
+                        y_now[0] = limit
+                    else:
+                        limit = None
+    except Stalled:
+        status = "stalled" if nfev > budget else "failed"
+
+    steps = np.concatenate([np.diff(sol.t) for sol in segments])
+    return {
+        "segments": segments,
+        "nfev": nfev,
+        "n_nan": n_nan,
+        "steps": steps,
+        "events": n_events,
+        "t_reached": t_now,
+        "status": status,
+    }
+
+
+def evaluate(run: dict, t: np.ndarray) -> np.ndarray:
+    """Level of a run at the times t [m], NaN after the time reached."""
+    h = np.full(len(t), np.nan)
+    for sol in run["segments"]:
+        in_segment = (t >= sol.t[0]) & (t <= sol.t[-1])
+        if in_segment.any():
+            h[in_segment] = sol.sol(t[in_segment])[0]
+    return h
+
+
+# --- Scenario ---
+# Random inlet flow, changing every t_interval between the three flows of each
+# tank: no flow, a flow that settles inside the tank, and a flow that overflows
+rng = np.random.default_rng(0)
+choices = rng.integers(0, 3, n_intervals)
+t_total = n_intervals * t_interval
+t_plot = np.linspace(0, t_total, 4001)
+
+variants = {
+    "Exact, no events": (exact_sqrt, False),
+    "Exact, events": (exact_sqrt, True),
+    "Smoothed, no events": (smooth_sqrt, False),
+    "Smoothed, events": (smooth_sqrt, True),
+}
+builders = {"Cubic tank": cubic, "Conical tank": conical}
+
+# Reference solutions: events, smoothing 1000 times narrower, and tight tolerances
+references = {}
+for tank in [cubic(smooth_sqrt, 1e-6), conical(smooth_sqrt, 1e-6), pumped()]:
+    q_in = np.array(tank.flows)[choices]
+    run = simulate(tank, q_in, True, "DOP853", budget=10**7, rtol=1e-10, atol=1e-12)
+    references[tank.name] = evaluate(run, t_plot)
+
+print(f"Scenario: {n_intervals} changes of the inlet flow, {t_total / 3600:.0f} hours")
+print(
+    f"\n{'Tank':<14}{'Equations':<22}{'Status':<11}{'Reached':>9}{'Calls':>9}"
+    f"{'NaN':>6}{'Steps':>8}{'Events':>8}{'Median step':>13}{'Max error':>11}"
+    f"{'Time':>9}"
+)
+runs = {}
+for tank_name in ["Cubic tank", "Conical tank", "Pumped tank"]:
+    for variant, (sqrt, events) in variants.items():
+        if tank_name == "Pumped tank":
+            if variant.startswith("Exact"):
+                continue  # No square root in the model
+            tank = pumped()
+        else:
+            tank = builders[tank_name](sqrt)
+        q_in = np.array(tank.flows)[choices]
+
+        t_start = time.perf_counter()
+        run = simulate(tank, q_in, events, rtol=rtol, atol=atol)
+        run["time"] = time.perf_counter() - t_start
+        run["h"] = evaluate(run, t_plot)
+        runs[tank_name, variant] = run
+
+        error = np.nanmax(np.abs(run["h"] - references[tank_name]))
+        print(
+            f"{tank_name:<14}{variant:<22}{run['status']:<11}"
+            f"{run['t_reached']:>8.0f}s{run['nfev']:>9}{run['n_nan']:>6}"
+            f"{len(run['steps']):>8}"
+            f"{run['events']:>8}{np.median(run['steps']):>13.1e}{error:>11.1e}"
+            f"{run['time']:>8.2f}s"
+        )
+
+# --- Width of the Smoothing ---
+# Wider smoothing moves the solution away from the exact square root
+h_eps_values = [1e-1, 1e-2, 1e-3, 1e-4, 1e-5]
+print(f"\n{'Tank':<14}{'h_eps':>8}{'Calls':>9}{'Max error':>11}")
+for tank_name, build in builders.items():
+    for h_eps in h_eps_values:
+        tank = build(smooth_sqrt, h_eps)
+        run = simulate(tank, np.array(tank.flows)[choices], True, rtol=rtol, atol=atol)
+        error = np.nanmax(np.abs(evaluate(run, t_plot) - references[tank_name]))
+        print(f"{tank_name:<14}{h_eps:>8.0e}{run['nfev']:>9}{error:>11.1e}")
+
+# --- Plot Results ---
+fig, axs = plt.subplots(3, 2, figsize=(14, 11), constrained_layout=True)
+fig.suptitle("Tank Limits: Empty and Overflow Events with Smoothed Outflows")
+colors = {
+    "Exact, no events": "tab:red",
+    "Exact, events": "tab:orange",
+    "Smoothed, no events": "tab:purple",
+    "Smoothed, events": "tab:blue",
+}
+
+for row, tank_name in enumerate(["Cubic tank", "Conical tank", "Pumped tank"]):
+    ax = axs[row, 0]
+    h_top = H if tank_name == "Conical tank" else L
+    ax.axhline(h_top, color="gray", linestyle="--")
+    ax.axhline(0, color="gray", linestyle="--")
+    for variant, color in colors.items():
+        if (tank_name, variant) not in runs:
+            continue
+        run = runs[tank_name, variant]
+        label = (
+            variant if run["status"] == "completed" else f"{variant} ({run['status']})"
+        )
+        ax.plot(t_plot / 3600, run["h"], color=color, label=label, alpha=0.8)
+    ax.set_title(f"{tank_name}: level")
+    ax.set_xlabel("Time / h")
+    ax.set_ylabel("Level / m")
+    ax.set_ylim(-0.5, h_top + 1.5)
+    ax.grid(True)
+    ax.legend(loc="upper right", fontsize=8, ncol=2)
+
+    ax = axs[row, 1]
+    for variant, color in colors.items():
+        if (tank_name, variant) not in runs:
+            continue
+        run = runs[tank_name, variant]
+        t_steps = np.concatenate([sol.t[1:] for sol in run["segments"]])
+        ax.semilogy(
+            t_steps / 3600, run["steps"], ".", color=color, markersize=2, label=variant
+        )
+    ax.set_title(f"{tank_name}: step size")
+    ax.set_xlabel("Time / h")
+    ax.set_ylabel("Step size / s")
+    ax.set_xlim(0, t_total / 3600)
+    ax.grid(True)
+    ax.legend(loc="lower right", fontsize=8, markerscale=4)
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "results"), exist_ok=True)
+save_path = os.path.join(script_dir, "results", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -0,0 +1,164 @@
+import os
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import zero_Celsius
+from scipy.integrate import solve_ivp
+
+# --- Model Constants ---
+rho: Final = 1000.0
+"""Density of both fluids (water) [kg/m³]"""
+
+cp: Final = 4180.0
+"""Heat capacity of both fluids (water) [J/(kg·K)]"""
+
+U: Final = 1500.0
+"""Overall heat transfer coefficient [W/(m²·K)]"""
+
+L: Final = 10.0
+"""Exchanger length [m]"""
+
+A_h: Final = 2.0e-3
+"""Cross-sectional area of the inner tube (hot fluid) [m²]"""
+
+A_c: Final = 3.0e-3
+"""Cross-sectional area of the annulus (cold fluid) [m²]"""
+
+P: Final = 0.157
+"""Perimeter of the inner tube (heat transfer area per unit length) [m]"""
+
+
+# --- System Dynamics ---
+def model(t: float, y: np.ndarray, u: np.ndarray):
+    """
+    Differential equations for the double-pipe heat exchanger, discretized by
+    the method of lines.
+
+    The exchanger is divided into N cells of length dz. The states of each cell
+    are stored together, y = [T_h, T_c] of cell 1, then of cell 2, and so on, so
+    the Jacobian is banded, with 2 diagonals below and 2 above the main
+    diagonal.
+
+    Parameters:
+    - t: time [s]
+    - y: state vector (2·N)
+    - u: input vector
+    """
+    # States
+    T_h = y[0::2]  # Hot fluid temperature in each cell [K]
+    T_c = y[1::2]  # Cold fluid temperature in each cell [K]
+
+    # Inputs
+    q_h = u[0]  # Hot fluid flow rate [m³/s]
+    T_h_in = u[1](t)  # Hot fluid inlet temperature, at z = 0 [K]
+    q_c = u[2]  # Cold fluid flow rate [m³/s]
+    T_c_in = u[3]  # Cold fluid inlet temperature, at z = L [K]
+
+    dz = L / len(T_h)
+    v_h = q_h / A_h  # Hot fluid velocity [m/s]
+    v_c = q_c / A_c  # Cold fluid velocity [m/s]
+
+    # Heat transferred from the hot to the cold fluid, per unit length [W/m]
+    Q = U * P * (T_h - T_c)
+
+    # Upwind differences: the hot fluid flows towards +z, the cold fluid
+    # towards -z (countercurrent)
+    dThdz = np.diff(T_h, prepend=T_h_in) / dz
+    dTcdz = np.diff(T_c, append=T_c_in) / dz
+
+    # --- Balances ---
+    dydt = np.empty_like(y)
+    dydt[0::2] = -v_h * dThdz - Q / (rho * cp * A_h)
+    dydt[1::2] = v_c * dTcdz + Q / (rho * cp * A_c)
+    return dydt
+
+
+def steady_state_duty(q_h: float, T_h_in: float, q_c: float, T_c_in: float):
+    """
+    Heat duty of the countercurrent exchanger at steady state, from the
+    effectiveness-NTU relation.
+
+    Returns:
+    - Q: heat transferred from the hot to the cold fluid [W]
+    """
+    C_h, C_c = rho * cp * q_h, rho * cp * q_c  # Heat capacity rates [W/K]
+    C_min, C_max = min(C_h, C_c), max(C_h, C_c)
+    C_r = C_min / C_max
+    NTU = U * P * L / C_min
+    e = np.exp(-NTU * (1 - C_r))
+    effectiveness = (1 - e) / (1 - C_r * e)
+    return effectiveness * C_min * (T_h_in - T_c_in)
+
+
+# --- Model Inputs ---
+q_h = 0.3e-3
+"""Hot fluid volumetric flow rate [m³/s]"""
+
+q_c = 0.4e-3
+"""Cold fluid volumetric flow rate [m³/s]"""
+
+T_c_in = zero_Celsius + 20.0
+"""Cold fluid inlet temperature [K]"""
+
+
+def T_h_in(t: float) -> float:
+    """Hot fluid inlet temperature [K]: a step from 60 °C to 90 °C at t = 300 s"""
+    return zero_Celsius + (60.0 if t < 300 else 90.0)
+
+
+u = [q_h, T_h_in, q_c, T_c_in]
+"""Inputs vector"""
+
+# --- Initial Conditions ---
+# Both fluids start at the cold inlet temperature
+N = 200  # Number of cells
+z = (np.arange(N) + 0.5) * L / N  # Cell centers [m]
+y0 = np.full(2 * N, T_c_in)
+
+# --- Simulation ---
+t = np.linspace(0, 60 * 10, 601)  # Simulation time [s]
+sol = solve_ivp(
+    model, [t[0], t[-1]], y0, t_eval=t, args=(u,), method="LSODA", lband=2, uband=2
+)
+
+# --- Model Output ---
+T_h = sol.y[0::2]
+"""Hot fluid temperature, shape (N, len(t)) [K]"""
+
+T_c = sol.y[1::2]
+"""Cold fluid temperature, shape (N, len(t)) [K]"""
+
+Q = rho * cp * q_h * (T_h_in(t[-1]) - T_h[-1, -1])
+"""Heat duty at the end of the simulation [W]"""
+
+Q_ss = steady_state_duty(q_h, T_h_in(t[-1]), q_c, T_c_in)
+print(f"Heat duty: {Q / 1e3:.2f} kW (effectiveness-NTU: {Q_ss / 1e3:.2f} kW)")
+
+# --- Plot results ---
+fig, axs = plt.subplots(2, 1, figsize=(8, 8), constrained_layout=True)
+fig.suptitle("Double-Pipe Countercurrent Heat Exchanger")
+
+for t_k, color in zip([60, 300, 360, 420, 600], plt.cm.viridis(np.linspace(0, 0.9, 5))):
+    k = np.searchsorted(sol.t, t_k)
+    axs[0].plot(z, T_h[:, k] - zero_Celsius, color=color, label=f"t = {t_k} s")
+    axs[0].plot(z, T_c[:, k] - zero_Celsius, "--", color=color)
+axs[0].set_title("Hot fluid (solid) and cold fluid (dashed)")
+axs[0].set_xlabel("Axial position / m")
+axs[0].set_ylabel("Temperature / °C")
+
+axs[1].plot(sol.t, T_h[-1] - zero_Celsius, label="Hot fluid outlet ($z = L$)")
+axs[1].plot(sol.t, T_c[0] - zero_Celsius, label="Cold fluid outlet ($z = 0$)")
+axs[1].set_xlabel("Time / s")
+axs[1].set_ylabel("Temperature / °C")
+
+for ax in axs:
+    ax.legend()
+    ax.grid(True)
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "simulations"), exist_ok=True)
+save_path = os.path.join(script_dir, "simulations", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
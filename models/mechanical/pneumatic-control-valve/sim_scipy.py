@@ -26,9 +26,26 @@ x_min: Final = 2.92 / 100
 x_max: Final = 14.62 / 100
 """Fully closed position [m]"""
 
+e: Final = 0.3
+"""Coefficient of restitution of the stops [-]"""
+
+v_stick: Final = 1e-3
+"""Impact speed below which the stem stays at the stop [m/s]"""
+
+F_stick: Final = 1e-6
+"""Net force needed to pull the stem away from a stop [N]"""
+
+
+# --- Algebraic Functions ---
+def F_net(x: float, v: float, P: float):
+    """Net force on the stem, positive towards the closed position [N]"""
+    return A * P - b * v - k * x
+
 
 # --- System Dynamics ---
-def model(t: float, y: np.ndarray, P_func: Callable[[float], float]):
+def model(
+    t: float, y: np.ndarray, P_func: Callable[[float], float], stop: float | None
+):
     """
     Differential equation for the pneumatic control valve.
 
@@ -36,18 +53,42 @@ def model(t: float, y: np.ndarray, P_func: Callable[[float], float]):
     - t: time [s]
     - y: state vector
     - P_func: function returning the pneumatic pressure [Pa]
+    - stop: position of the stop holding the stem [m], or None if it moves
     """
     x = y[0]  # Displacement [m]
     v = y[1]  # Velocity [m/s]
     P = P_func(t)  # Pressure input [Pa]
 
     # Derivatives
-    dxdt = v
-    dvdt = (A * P - b * v - k * x) / m
+    if stop is None:
+        dxdt = v
+        dvdt = F_net(x, v, P) / m
+    else:  # The stop holds the stem
+        dxdt = 0.0
+        dvdt = 0.0
 
     return [dxdt, dvdt]
 
 
+# --- Travel Limits ---
+# The stem moves freely between the stops, and the solver stops exactly when it
+# reaches one. It then bounces back with the coefficient of restitution, or
+# stays at the stop if it arrived too slowly, until the net force pulls it away.
+def hit_stop(t, y, P_func, stop):
+    """Positive between the stops, zero when the stem reaches one"""
+    return (y[0] - x_min) * (x_max - y[0])
+
+
+def leave_stop(t, y, P_func, stop):
+    """Positive when the net force pulls the stem away from its stop"""
+    F = F_net(y[0], 0.0, P_func(t))
+    return (F if stop == x_min else -F) - F_stick
+
+
+hit_stop.terminal, hit_stop.direction = True, -1
+leave_stop.terminal, leave_stop.direction = True, 1
+
+
 # --- Model Input ---
 def P_input(t: float):
     """Example pneumatic control signal [Pa]
@@ -62,20 +103,68 @@ def P_input(t: float):
         return 15 * psi
 
 
+def hold(func: Callable[[float], float], t_last: float):
+    """Input func, held at its value at t_last for later times"""
+    return lambda t: func(min(t, t_last))
+
+
 # --- Initial Conditions ---
 x0 = x_min  # Initial displacement [m]
 v0 = 0.0  # Initial velocity [m/s]
 y0 = [x0, v0]
 
 # --- Simulation ---
+# Restart the solver at each event and at the step of the input
 t = np.linspace(0, 1, 1000)  # Simulation time [s]
-sol = solve_ivp(model, [t[0], t[-1]], y0, t_eval=t, args=(P_input,))
+t_breaks = [0.5, t[-1]]  # Step of the pressure input, and end time [s]
+
+stop = x_min if leave_stop(t[0], y0, P_input, x_min) < 0 else None
+t_now, y_now, first_step = t[0], np.array(y0), None
+segments = []
+while t_now < t[-1]:
+    t_next = min(t_b for t_b in t_breaks if t_b > t_now)
+    t_last = np.nextafter(t_next, t_now)  # The input steps after the segment
+    sol = solve_ivp(
+        model,
+        [t_now, t_next],
+        y_now,
+        args=(hold(P_input, t_last), stop),
+        events=hit_stop if stop is None else leave_stop,
+        first_step=first_step and min(first_step, t_next - t_now),
+        dense_output=True,
+    )
+    segments.append(sol)
+    t_now, y_now, first_step = sol.t[-1], sol.y[:, -1].copy(), None
+    if sol.status == 0:  # Step of the input, or end of the simulation
+        # The new input may pull the stem away from its stop
+        if stop is not None and leave_stop(t_now, y_now, P_input, stop) > 0:
+            stop = None
+        continue
+
+    if stop is not None:  # The net force pulls the stem away from the stop
+        stop = None
+        continue
+
+    # The stem hits a stop, and bounces back or stays there
+    x_stop = x_min if y_now[0] < (x_min + x_max) / 2 else x_max
+    y_now[0], y_now[1] = x_stop, -e * y_now[1]
+    if abs(y_now[1]) < v_stick and leave_stop(t_now, y_now, P_input, x_stop) < 0:
+        y_now[1], stop = 0.0, x_stop
+    else:  # A first step short enough to see the stem leave the stop
+        F = F_net(x_stop, 0.0, P_input(t_now))
+        first_step = abs(y_now[1]) * m / max(abs(F), F_stick)
+
+y_sol = np.empty((len(y0), len(t)))
+for sol in segments:
+    in_segment = (t >= sol.t[0]) & (t <= sol.t[-1])
+    if in_segment.any():  # Short bounces may fall between two output times
+        y_sol[:, in_segment] = sol.sol(t[in_segment])
 
 # --- Model Outputs ---
-x = sol.y[0]
+x = y_sol[0]
 """Valve stem displacement [m]"""
 
-v = sol.y[1]
+v = y_sol[1]
 """Valve stem velocity [m/s]"""
 
 # --- Plot results ---
@@ -83,15 +172,15 @@ fig, axs = plt.subplots(2, 1, figsize=(8, 6), sharex=True, constrained_layout=Tr
 fig.suptitle("Pneumatic Control Valve")
 
 # Pressure input
-P = np.array([P_input(t) for t in sol.t]) / psi
-axs[0].plot(sol.t, P, label="$P(t)$", color="tab:orange")
+P = np.array([P_input(t_i) for t_i in t]) / psi
+axs[0].plot(t, P, label="$P(t)$", color="tab:orange")
 axs[0].set_ylabel("Pressure / psi")
 axs[0].grid(True)
 axs[0].legend()
 
 # Displacement
 axs[1].axhline(x_min * 100, color="tab:red", linestyle="--", label="Valve Limits")
-axs[1].plot(sol.t, x * 100, label="$x(t)$")
+axs[1].plot(t, x * 100, label="$x(t)$")
 axs[1].axhline(x_max * 100, color="tab:red", linestyle="--")
 
 axs[1].set_ylabel("Displacement / cm")
@@ -37,6 +37,15 @@ x_min: Final = 0 / 100
 x_max: Final = 3.0 / 100
 """Fully open position [m]"""
 
+e: Final = 0.5
+"""Coefficient of restitution of the stops [-]"""
+
+v_stick: Final = 1e-3
+"""Impact speed below which the plunger stays at the stop [m/s]"""
+
+F_stick: Final = 1e-6
+"""Net force needed to pull the plunger away from a stop [N]"""
+
 
 # --- Algebraic Functions ---
 def L(x: float):
@@ -64,21 +73,28 @@ def F_magnetic(i: float, x: float):
     return 0.5 * dLdx(x) * i**2
 
 
+def F_net(x: float, v: float, i: float, dP: float):
+    """Net force on the plunger, positive towards the open position [N]"""
+    return F_magnetic(i, x) - c * v - k * x - F_fluid(x, dP)
+
+
 # --- System Dynamics ---
 def model(
     t: float,
     y: np.ndarray,
     u_func: Callable[[float], float],
     dP_func: Callable[[float], float],
+    stop: float | None,
 ):
     """
-    Differential equation for the pneumatic control valve.
+    Differential equation for the solenoid valve.
 
     Parameters:
     - t: time [s]
     - y: state vector
     - u_func: function returning the applied coil voltage [V]
-    - P_func: function returning the pressure differential [Pa]
+    - dP_func: function returning the pressure differential [Pa]
+    - stop: position of the stop holding the plunger [m], or None if it moves
     """
     x = y[0]  # Displacement [m]
     v = y[1]  # Velocity [m/s]
@@ -87,17 +103,37 @@ def model(
     u = u_func(t)  # Applied coil voltage [V]
     dP = dP_func(t)  # Pressure differential [Pa]
 
-    # Enforce position limits
-    x = np.clip(x, x_min, x_max)
-
     # Derivatives
-    dxdt = v
-    dvdt = (F_magnetic(i, x) - c * v - k * x - F_fluid(x, dP)) / m
+    if stop is None:
+        dxdt = v
+        dvdt = F_net(x, v, i, dP) / m
+    else:  # The stop holds the plunger
+        dxdt = 0.0
+        dvdt = 0.0
     di_dt = (u - R * i - i * dLdx(x) * v) / L(x)
 
     return [dxdt, dvdt, di_dt]
 
 
+# --- Travel Limits ---
+# The plunger moves freely between the stops, and the solver stops exactly when
+# it reaches one. It then bounces back with the coefficient of restitution, or
+# stays at the stop if it arrived too slowly, until the net force pulls it away.
+def hit_stop(t, y, u_func, dP_func, stop):
+    """Positive between the stops, zero when the plunger reaches one"""
+    return (y[0] - x_min) * (x_max - y[0])
+
+
+def leave_stop(t, y, u_func, dP_func, stop):
+    """Positive when the net force pulls the plunger away from its stop"""
+    F = F_net(y[0], 0.0, y[2], dP_func(t))
+    return (F if stop == x_min else -F) - F_stick
+
+
+hit_stop.terminal, hit_stop.direction = True, -1
+leave_stop.terminal, leave_stop.direction = True, 1
+
+
 # --- Model Input ---
 def u_input(t: float):
     """Example voltage input [V]"""
@@ -114,6 +150,11 @@ def dP_input(t: float):
     return 20000.0
 
 
+def hold(func: Callable[[float], float], t_last: float):
+    """Input func, held at its value at t_last for later times"""
+    return lambda t: func(min(t, t_last))
+
+
 # --- Initial Conditions ---
 x0 = x_min  # Initial displacement [m]
 v0 = 0.0  # Initial velocity [m/s]
@@ -121,39 +162,82 @@ i0 = 0.0  # Initial current [A]
 y0 = [x0, v0, i0]
 
 # --- Simulation ---
+# Restart the solver at each event and at each step of the input
 t = np.linspace(0, 1, 1000)  # Simulation time [s]
-sol = solve_ivp(model, [t[0], t[-1]], y0, t_eval=t, args=(u_input, dP_input))
+t_breaks = [0.2, 0.6, t[-1]]  # Steps of the voltage input, and end time [s]
+
+stop = x_min if leave_stop(t[0], y0, u_input, dP_input, x_min) < 0 else None
+t_now, y_now, first_step = t[0], np.array(y0), None
+segments = []
+while t_now < t[-1]:
+    t_next = min(t_b for t_b in t_breaks if t_b > t_now)
+    t_last = np.nextafter(t_next, t_now)  # The input steps after the segment
+    sol = solve_ivp(
+        model,
+        [t_now, t_next],
+        y_now,
+        args=(hold(u_input, t_last), dP_input, stop),
+        events=hit_stop if stop is None else leave_stop,
+        first_step=first_step and min(first_step, t_next - t_now),
+        dense_output=True,
+    )
+    segments.append(sol)
+    t_now, y_now, first_step = sol.t[-1], sol.y[:, -1].copy(), None
+    if sol.status == 0:  # Step of the input, or end of the simulation
+        # The new input may pull the plunger away from its stop
+        if stop is not None and leave_stop(t_now, y_now, u_input, dP_input, stop) > 0:
+            stop = None
+        continue
+
+    if stop is not None:  # The net force pulls the plunger away from the stop
+        stop = None
+        continue
+
+    # The plunger hits a stop, and bounces back or stays there
+    x_stop = x_min if y_now[0] < (x_min + x_max) / 2 else x_max
+    y_now[0], y_now[1] = x_stop, -e * y_now[1]
+    if (
+        abs(y_now[1]) < v_stick
+        and leave_stop(t_now, y_now, u_input, dP_input, x_stop) < 0
+    ):
+        y_now[1], stop = 0.0, x_stop
+    else:  # A first step short enough to see the plunger leave the stop
+        F = F_net(x_stop, 0.0, y_now[2], dP_input(t_now))
+        first_step = abs(y_now[1]) * m / max(abs(F), F_stick)
+
+y_sol = np.empty((len(y0), len(t)))
+for sol in segments:
+    in_segment = (t >= sol.t[0]) & (t <= sol.t[-1])
+    if in_segment.any():  # Short bounces may fall between two output times
+        y_sol[:, in_segment] = sol.sol(t[in_segment])
 
 # --- Model Outputs ---
-x = sol.y[0]
+x = y_sol[0]
 """Valve plunger displacement [m]"""
 
-v = sol.y[1]
+v = y_sol[1]
 """Valve plunger velocity [m/s]"""
 
-i = sol.y[2]
+i = y_sol[2]
 """Coil current [A]"""
 
-# Enforce position limits on output
-x = np.clip(x, x_min, x_max)
-
 # --- Plot results ---
 fig, axs = plt.subplots(3, 1, figsize=(8, 8), sharex=True, layout="tight")
 fig.suptitle("Solenoid Valve")
 
 # Voltage input
-u = np.array([u_input(t) for t in sol.t])
-axs[0].plot(sol.t, u, label="$u(t)$")
+u = np.array([u_input(t_i) for t_i in t])
+axs[0].plot(t, u, label="$u(t)$")
 axs[0].set_ylabel("Coil Voltage / V")
 
 # Displacement
 axs[1].axhline(x_min * 100, color="tab:red", linestyle="--", label="Valve Limits")
-axs[1].plot(sol.t, x * 100, label="$x(t)$")
+axs[1].plot(t, x * 100, label="$x(t)$")
 axs[1].axhline(x_max * 100, color="tab:red", linestyle="--")
 axs[1].set_ylabel("Displacement / cm")
 
 # Current
-axs[2].plot(sol.t, i, label="$i(t)$")
+axs[2].plot(t, i, label="$i(t)$")
 axs[2].set_ylabel("Coil Current / A")
 
 for ax in axs:
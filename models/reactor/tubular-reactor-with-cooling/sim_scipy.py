@@ -0,0 +1,193 @@
+import os
+from typing import Final
+
+import matplotlib.pyplot as plt
+import numpy as np
+from scipy.constants import gas_constant, zero_Celsius
+from scipy.integrate import solve_ivp
+
+# --- Model Constants ---
+rho: Final = 1000.0
+"""Reactor fluid density [kg/m³]"""
+
+cp: Final = 239.0
+"""Reactor fluid heat capacity [J/(kg·K)]"""
+
+rho_c: Final = 1000.0
+"""Coolant density [kg/m³]"""
+
+cp_c: Final = 4180.0
+"""Coolant heat capacity [J/(kg·K)]"""
+
+k0: Final = 1.2e9
+"""Pre-exponential factor [1/s]"""
+
+R: Final = gas_constant
+"""Universal gas constant [J/(mol·K)]"""
+
+E: Final = 8.75e3 * R
+"""Activation energy [J/mol]"""
+
+delta_Hr: Final = -5.0e7
+"""Reaction enthalpy [J/mol] (negative for exothermic)"""
+
+U: Final = 915.6
+"""Overall heat transfer coefficient [W/(m²·K)]"""
+
+L: Final = 6.0
+"""Tube length [m]"""
+
+A_t: Final = 0.25
+"""Tube cross-sectional area [m²]"""
+
+A_c: Final = 0.55 / L
+"""Cooling jacket cross-sectional area [m²]"""
+
+P: Final = 2 * np.sqrt(np.pi * A_t)
+"""Tube perimeter (heat transfer area per unit length) [m]"""
+
+D_ax: Final = 0.024
+"""Axial dispersion coefficient of mass and heat [m²/s]"""
+
+
+# --- System Dynamics ---
+def model(t: float, y: np.ndarray, u: np.ndarray):
+    """
+    Differential equations for the tubular reactor, discretized by the method
+    of lines.
+
+    The tube is divided into N cells of length dz. The states of each cell are
+    stored together, y = [C_A, T, T_c] of cell 1, then of cell 2, and so on, so
+    each equation only involves the neighboring cells: the Jacobian is banded,
+    with 3 diagonals below and 3 above the main diagonal.
+
+    Parameters:
+    - t: time [s]
+    - y: state vector (3·N)
+    - u: input vector
+    """
+    # States
+    C_A = y[0::3]  # Concentration of A in each cell [mol/m³]
+    T = y[1::3]  # Reactor temperature in each cell [K]
+    T_c = y[2::3]  # Coolant temperature in each cell [K]
+
+    # Inputs
+    q = u[0]  # Process flow rate [m³/s]
+    C_A1 = u[1]  # Inlet concentration of A [mol/m³]
+    T1 = u[2]  # Inlet temperature [K]
+    q_c = u[3]  # Coolant flow rate [m³/s]
+    T_c0 = u[4]  # Coolant inlet temperature [K]
+
+    dz = L / len(C_A)
+    v = q / A_t  # Process fluid velocity [m/s]
+    v_c = q_c / A_c  # Coolant velocity [m/s]
+
+    # Reaction rate (Arrhenius)
+    Gamma = k0 * np.exp(-E / (R * T)) * C_A  # [mol/(m³·s)]
+
+    # Heat transferred from the coolant to the tube, per unit length [W/m]
+    Q = U * P * (T_c - T)
+
+    # Fluxes through the cell faces (upwind convection, central dispersion).
+    # The inlet face carries the feed, and the dispersive flux vanishes at both
+    # ends of the tube (Danckwerts boundary conditions).
+    def face_flux(x, x_in):
+        flux = np.empty(len(x) + 1)
+        flux[0] = v * x_in
+        flux[1:] = v * x
+        flux[1:-1] -= D_ax * np.diff(x) / dz
+        return flux
+
+    N_A = face_flux(C_A, C_A1)
+    N_T = face_flux(T, T1)
+
+    # The coolant flows from z = L to z = 0 (countercurrent)
+    N_c = np.append(v_c * T_c, v_c * T_c0)
+
+    # --- Balances ---
+    dCAdt = -np.diff(N_A) / dz - Gamma
+    dTdt = -np.diff(N_T) / dz + ((-delta_Hr) * Gamma + Q / A_t) / (rho * cp)
+    dTcdt = np.diff(N_c) / dz - Q / (rho_c * cp_c * A_c)
+
+    dydt = np.empty_like(y)
+    dydt[0::3] = dCAdt
+    dydt[1::3] = dTdt
+    dydt[2::3] = dTcdt
+    return dydt
+
+
+# --- Model Inputs ---
+q = 0.1
+"""Process volumetric flow rate [m³/s]"""
+
+C_A1 = 1.0
+"""Species A concentration in the feed [mol/m³]"""
+
+T1 = zero_Celsius + 70.0
+"""Feed temperature [K]"""
+
+q_c = 0.005
+"""Coolant volumetric flow rate [m³/s]"""
+
+T_c0 = zero_Celsius + 20.0
+"""Coolant inlet temperature [K]"""
+
+u = np.array([q, C_A1, T1, q_c, T_c0])
+"""Inputs vector"""
+
+# --- Initial Conditions ---
+# The tube is full of solvent, without reactant, at the coolant temperature
+N = 200  # Number of cells
+z = (np.arange(N) + 0.5) * L / N  # Cell centers [m]
+y0 = np.tile([0.0, zero_Celsius + 25.0, zero_Celsius + 20.0], N)
+
+# --- Simulation ---
+t = np.linspace(0, 60 * 4, 241)  # Simulation time [s]
+sol = solve_ivp(
+    model, [t[0], t[-1]], y0, t_eval=t, args=(u,), method="LSODA", lband=3, uband=3
+)
+
+# --- Model Output ---
+C_A = sol.y[0::3]
+"""Concentration of species A, shape (N, len(t)) [mol/m³]"""
+
+T = sol.y[1::3]
+"""Reactor temperature, shape (N, len(t)) [K]"""
+
+T_c = sol.y[2::3]
+"""Coolant temperature, shape (N, len(t)) [K]"""
+
+# --- Plot results ---
+fig, axs = plt.subplots(2, 2, figsize=(12, 8), constrained_layout=True)
+fig.suptitle("Tubular Reactor with Cooling Jacket")
+
+times = [10, 20, 30, 60, 240]  # Profiles shown [s]
+for t_k in times:
+    k = np.searchsorted(sol.t, t_k)
+    axs[0, 0].plot(z, C_A[:, k], label=f"t = {t_k} s")
+    axs[0, 1].plot(z, T[:, k] - zero_Celsius, label=f"t = {t_k} s")
+axs[0, 1].plot(z, T_c[:, -1] - zero_Celsius, "k--", label="$T_c$, t = 240 s")
+axs[0, 0].set_ylabel("Concentration / mol$\\cdot$m$^{-3}$")
+axs[0, 1].set_ylabel("Temperature / °C")
+for ax in axs[0]:
+    ax.set_xlabel("Axial position / m")
+
+axs[1, 0].plot(sol.t, C_A[-1], label="$C_A$ at the outlet")
+axs[1, 0].set_ylabel("Concentration / mol$\\cdot$m$^{-3}$")
+axs[1, 1].plot(sol.t, T.max(axis=0) - zero_Celsius, label="Hot spot")
+axs[1, 1].plot(sol.t, T[-1] - zero_Celsius, label="$T$ at the outlet")
+axs[1, 1].plot(sol.t, T_c[0] - zero_Celsius, label="$T_c$ at the jacket outlet")
+axs[1, 1].set_ylabel("Temperature / °C")
+for ax in axs[1]:
+    ax.set_xlabel("Time / s")
+
+for ax in axs.flat:
+    ax.legend()
+    ax.grid(True)
+
+# Save plot to file
+script_dir = os.path.dirname(os.path.abspath(__file__))
+os.makedirs(os.path.join(script_dir, "simulations"), exist_ok=True)
+save_path = os.path.join(script_dir, "simulations", "scipy.png")
+plt.savefig(save_path)
+print(f"Plot saved to {save_path}")
@@ -1,4 +1,5 @@
 import os
+from collections.abc import Callable
 from typing import Final
 
 import matplotlib.pyplot as plt
@@ -15,39 +16,144 @@ R: Final = 1.5
 k: Final = 0.8
 """Outlet discharge parameter [m^2.5/s]"""
 
+h_min: Final = 1e-2
+"""Level below which the tank is considered empty [m]"""
+
+h_eps: Final = 1e-3
+"""Level below which the area and the outlet flow are smoothed [m]"""
+
+smooth: Final = False
+"""Smooth the area and the outlet flow below h_eps, instead of the exact ones"""
+
+
+# --- Algebraic Functions ---
+def smooth_sqrt(x: float, x_eps: float):
+    """Square root of x, close to sqrt(x) above x_eps, and finite slope at zero"""
+    return x / (x**2 + x_eps**2) ** 0.25
+
+
+def q_out(h: float):
+    """Outlet flow [m³/s]"""
+    if smooth:
+        return k * smooth_sqrt(h, h_eps)
+    return k * np.sqrt(max(h, 0.0))  # A trial step may end below zero
+
+
+def area(h: float):
+    """Cross-sectional area of the liquid surface [m²]"""
+    if smooth:
+        return np.pi * R**2 * (h**2 + h_eps**2) / H**2
+    return np.pi * R**2 * h**2 / H**2
+
 
 # --- System Dynamics ---
-def model(t: float, h: float, q_in: float):
+def model(
+    t: float,
+    y: np.ndarray,
+    q_in_func: Callable[[float], float],
+    limit: float | None,
+):
     """
     Differential equation for the tank level.
 
     Parameters:
     - t: time [s]
-    - h: liquid level [m]
-    - q_in: inlet flow [m³/s]
+    - y: state vector
+    - q_in_func: function returning the inlet flow [m³/s]
+    - limit: level at which the tank is held empty or full [m], or None
     """
+    h = y[0]  # Liquid level [m]
+    q_in = q_in_func(t)  # Inlet flow [m³/s]
+
+    if limit is None:
+        dhdt = (q_in - q_out(h)) / area(h)
+    else:  # The outlet drains all the inflow, or the excess flows over the top
+        dhdt = 0.0
+
+    return [dhdt]
 
-    dhdt = (H**2 / (np.pi * R**2)) * (q_in / (h**2) - k / np.sqrt(h**3))
-    return dhdt
+
+# --- Tank Limits ---
+# The cross section of the cone vanishes at the bottom, so the level falls
+# faster and faster as the tank empties. The solver stops exactly when the
+# level reaches h_min, or the top of the tank, and the level then stays there
+# until the inflow moves it away.
+def hit_limit(t, y, q_in_func, limit):
+    """Positive inside the tank, zero when the level reaches h_min or the top"""
+    return (y[0] - h_min) * (H - y[0])
+
+
+def leave_limit(t, y, q_in_func, limit):
+    """Positive when the flows move the level away from its limit"""
+    dq = q_in_func(t) - q_out(limit)
+    return dq if limit == h_min else -dq
+
+
+hit_limit.terminal, hit_limit.direction = True, -1
+leave_limit.terminal, leave_limit.direction = True, 1
 
 
 # --- Model Input ---
-q_in = 1.5
-"""Inlet flow rate [m³/s]"""
+def q_in_input(t: float):
+    """Example inlet flow [m³/s]"""
+    if 40 <= t < 60:
+        return 0.0
+    return 1.5
+
+
+def hold(func: Callable[[float], float], t_last: float):
+    """Input func, held at its value at t_last for later times"""
+    return lambda t: func(min(t, t_last))
+
 
 # --- Simulation ---
+# Restart the solver at each event and at each step of the inlet flow
 h0 = 0.5  # Initial level [m]
 t = np.linspace(0, 100, 1000)  # Simulation time [s]
-sol = solve_ivp(model, [t[0], t[-1]], [h0], t_eval=t, args=(q_in,))
+t_breaks = [40, 60, t[-1]]  # Steps of the inlet flow, and end time [s]
+
+limit = None
+t_now, y_now = t[0], np.array([h0])
+segments = []
+while t_now < t[-1]:
+    t_next = min(t_b for t_b in t_breaks if t_b > t_now)
+    t_last = np.nextafter(t_next, t_now)  # The input steps after the segment
+    sol = solve_ivp(
+        model,
+        [t_now, t_next],
+        y_now,
+        args=(hold(q_in_input, t_last), limit),
+        events=hit_limit if limit is None else leave_limit,
+        dense_output=True,
+    )
+    segments.append(sol)
+    t_now, y_now = sol.t[-1], sol.y[:, -1].copy()
+    if sol.status == 0:  # Step of the input, or end of the simulation
+        # The new input may move the level away from its limit
+        if limit is not None and leave_limit(t_now, y_now, q_in_input, limit) > 0:
+            limit = None
+        continue
+
+    if limit is None:  # The tank empties or fills up
+        limit = h_min if y_now[0] < H / 2 else H
+        y_now[0] = limit
+    else:  # The level moves away from its limit
+        limit = None
+
+y_sol = np.empty((1, len(t)))
+for sol in segments:
+    in_segment = (t >= sol.t[0]) & (t <= sol.t[-1])
+    if in_segment.any():
+        y_sol[:, in_segment] = sol.sol(t[in_segment])
 
 # --- Model Output ---
-h = sol.y[0]
+h = y_sol[0]
 """Liquid level [m]"""
 
 # --- Plot results ---
 plt.axhline(H, color="tab:red", linestyle="--", label="Tank Limits")
-plt.plot(sol.t, h, label="$h(t)$")
-plt.axhline(0, color="tab:red", linestyle="--")
+plt.plot(t, h, label="$h(t)$")
+plt.axhline(h_min, color="tab:red", linestyle="--")
 
 plt.xlabel("Time / s")
 plt.ylabel("Level / m")
@@ -1,4 +1,5 @@
 import os
+from collections.abc import Callable
 from typing import Final
 
 import matplotlib.pyplot as plt
@@ -14,39 +15,118 @@ A: Final = L**2
 
 
 # --- System Dynamics ---
-def model(t: float, h: float, Q_in: float, Q_out: float):
+def model(
+    t: float,
+    y: np.ndarray,
+    Q_in_func: Callable[[float], float],
+    Q_out: float,
+    limit: float | None,
+):
     """
     Differential equation for the tank level.
 
     Parameters:
     - t: time [s]
-    - h: liquid level [m]
-    - Q_in: inlet flow [m³/s]
+    - y: state vector
+    - Q_in_func: function returning the inlet flow [m³/s]
     - Q_out: outlet flow [m³/s]
+    - limit: level at which the tank is held empty or full [m], or None
     """
-    dhdt = (Q_in - Q_out) / A
-    return dhdt
+    Q_in = Q_in_func(t)  # Inlet flow [m³/s]
+
+    if limit is None:
+        dhdt = (Q_in - Q_out) / A
+    else:  # The outlet pump runs dry, or the excess flows over the top
+        dhdt = 0.0
+
+    return [dhdt]
+
+
+# --- Tank Limits ---
+# The solver stops exactly when the tank empties or fills up. The level then
+# stays at the limit until the balance of the pumps turns back: an empty tank
+# only delivers its inflow to the outlet pump, and a full tank overflows.
+def hit_limit(t, y, Q_in_func, Q_out, limit):
+    """Positive inside the tank, zero when the level reaches the bottom or the top"""
+    return y[0] * (L - y[0])
+
+
+def leave_limit(t, y, Q_in_func, Q_out, limit):
+    """Positive when the balance of the pumps moves the level away from its limit"""
+    dQ = Q_in_func(t) - Q_out
+    return dQ if limit == 0 else -dQ
+
+
+hit_limit.terminal, hit_limit.direction = True, -1
+leave_limit.terminal, leave_limit.direction = True, 1
 
 
 # --- Model Inputs ---
-Q_in = 0.3
-"""Inlet flow rate [m³/s]"""
+def Q_in_input(t: float):
+    """Example inlet flow [m³/s]"""
+    if t < 200:
+        return 0.3
+    return 0.9
+
+
+def hold(func: Callable[[float], float], t_last: float):
+    """Input func, held at its value at t_last for later times"""
+    return lambda t: func(min(t, t_last))
+
 
 Q_out = 0.5
 """Outlet flow rate [m³/s]"""
 
 # --- Simulation ---
+# Restart the solver at each event and at the step of the inlet flow
 h0 = 2  # Initial level [m]
-t = np.linspace(0, 100, 1000)  # Simulation time [s]
-sol = solve_ivp(model, [t[0], t[-1]], [h0], t_eval=t, args=(Q_in, Q_out))
+t = np.linspace(0, 450, 1000)  # Simulation time [s]
+t_breaks = [200, t[-1]]  # Steps of the inlet flow, and end time [s]
+
+limit = None
+t_now, y_now = t[0], np.array([h0], dtype=float)
+segments = []
+while t_now < t[-1]:
+    t_next = min(t_b for t_b in t_breaks if t_b > t_now)
+    t_last = np.nextafter(t_next, t_now)  # The input steps after the segment
+    sol = solve_ivp(
+        model,
+        [t_now, t_next],
+        y_now,
+        args=(hold(Q_in_input, t_last), Q_out, limit),
+        events=hit_limit if limit is None else leave_limit,
+        dense_output=True,
+    )
+    segments.append(sol)
+    t_now, y_now = sol.t[-1], sol.y[:, -1].copy()
+    if sol.status == 0:  # Step of the input, or end of the simulation
+        # The new input may move the level away from its limit
+        if (
+            limit is not None
+            and leave_limit(t_now, y_now, Q_in_input, Q_out, limit) > 0
+        ):
+            limit = None
+        continue
+
+    if limit is None:  # The tank empties or fills up
+        limit = 0 if y_now[0] < L / 2 else L
+        y_now[0] = limit
+    else:  # The level moves away from its limit
+        limit = None
+
+y_sol = np.empty((1, len(t)))
+for sol in segments:
+    in_segment = (t >= sol.t[0]) & (t <= sol.t[-1])
+    if in_segment.any():
+        y_sol[:, in_segment] = sol.sol(t[in_segment])
 
 # --- Model Output ---
-h = sol.y[0]
+h = y_sol[0]
 """Liquid level [m]"""
 
 # --- Plot results ---
 plt.axhline(L, color="tab:red", linestyle="--", label="Tank Limits")
-plt.plot(sol.t, h, label="$h(t)$")
+plt.plot(t, h, label="$h(t)$")
 plt.axhline(0, color="tab:red", linestyle="--")
 
 plt.xlabel("Time / s")
@@ -1,4 +1,6 @@
 import os
+from collections.abc import Callable
+from itertools import pairwise
 from typing import Final
 
 import matplotlib.pyplot as plt
@@ -25,43 +27,90 @@ k1: Final = 0.01
 k2: Final = 0.015
 """Outlet flow coefficient [kg/(s*Pa^0.5)]"""
 
+dP_eps: Final = 1e3
+"""Pressure drop below which the square root of the flows is smoothed [Pa]"""
+
+smooth: Final = False
+"""Smooth the square root of the flows below dP_eps, instead of the exact one"""
+
+
+# --- Algebraic Functions ---
+def signed_sqrt(x: float):
+    """Square root of |x|, with the sign of x"""
+    if smooth:  # Finite slope 1/sqrt(dP_eps) at zero
+        return x / (x**2 + dP_eps**2) ** 0.25
+    return np.sign(x) * np.sqrt(abs(x))
+
 
 # --- System Dynamics ---
-def model(t: float, P: float, P1: float, P2: float):
+def model(t: float, P: float, P1_func: Callable[[float], float], P2: float):
     """
     Differential equation for the vessel pressure.
 
     Parameters:
     - t: time [s]
-    - P: pressure inside the vessel [m]
-    - P1: inlet pressure [Pa]
+    - P: pressure inside the vessel [Pa]
+    - P1_func: function returning the inlet pressure [Pa]
     - P2: outlet pressure [Pa]
     """
-    dPdt = (R * T / (V * MM)) * (k1 * np.sqrt(P1 - P) - k2 * np.sqrt(P - P2))
+    P1 = P1_func(t)  # Inlet pressure [Pa]
+
+    # The flows reverse when the pressure drops do, instead of becoming NaN
+    F1 = k1 * signed_sqrt(P1 - P)  # Inlet mass flow [kg/s]
+    F2 = k2 * signed_sqrt(P - P2)  # Outlet mass flow [kg/s]
+
+    dPdt = (R * T / (V * MM)) * (F1 - F2)
     return dPdt
 
 
 # --- Model Inputs ---
-P1 = C.atm * 2
-"""Inlet pressure [Pa]"""
+def P1_input(t: float):
+    """Example inlet pressure [Pa]"""
+    if t < 1.5:
+        return C.atm * 2
+    return C.atm * 1.2
+
 
 P2 = C.atm
 """Outlet pressure [Pa]"""
 
+
+def hold(func: Callable[[float], float], t_last: float):
+    """Input func, held at its value at t_last for later times"""
+    return lambda t: func(min(t, t_last))
+
+
 # --- Simulation ---
 P0 = C.atm * 1.5  # Initial pressure [Pa]
 t = np.linspace(0, 3, 1000)  # Simulation time [s]
-sol = solve_ivp(model, [t[0], t[-1]], [P0], t_eval=t, args=(P1, P2))
+t_breaks = [t[0], 1.5, t[-1]]  # Step of the inlet pressure [s]
+
+# Restart the solver at the step of the inlet pressure
+y_sol = np.empty((1, len(t)))
+y_now = [P0]
+for t_start, t_end in pairwise(t_breaks):
+    t_last = np.nextafter(t_end, t_start)  # The input steps after the segment
+    sol = solve_ivp(
+        model,
+        [t_start, t_end],
+        y_now,
+        args=(hold(P1_input, t_last), P2),
+        dense_output=True,
+    )
+    in_segment = (t >= t_start) & (t <= t_end)
+    y_sol[:, in_segment] = sol.sol(t[in_segment])
+    y_now = sol.y[:, -1]
 
 # --- Model Output ---
-P = sol.y[0]
+P = y_sol[0]
 """Pressure inside the vessel [Pa]"""
 
 # --- Plot results ---
 # Convert pressure from Pa to bar for easier visualization
-plt.plot(sol.t, P1 * 1e-5 * np.ones_like(sol.t), label="$P_1(t)$")
-plt.plot(sol.t, P * 1e-5, label="$P(t)$")
-plt.plot(sol.t, P2 * 1e-5 * np.ones_like(sol.t), label="$P_2(t)$")
+P1 = np.array([P1_input(t_i) for t_i in t])
+plt.plot(t, P1 * 1e-5, label="$P_1(t)$")
+plt.plot(t, P * 1e-5, label="$P(t)$")
+plt.plot(t, P2 * 1e-5 * np.ones_like(t), label="$P_2(t)$")
 
 plt.xlabel("Time / s")
 plt.ylabel("Pressure / Bar")